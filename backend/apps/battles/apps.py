@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class BattlesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.battles"
+
+    def ready(self):
+        from .signals import connect_roster_cache_signals
+
+        connect_roster_cache_signals()
@@ -0,0 +1,23 @@
+from apps.jobs.queue import register_job, register_periodic_job
+
+from .models import Battle
+from .presence import PRESENCE_SWEEP_SECONDS, sweep_presence
+
+PROCESS_ENDED_BATTLE_JOB = "battles.process_ended_battle"
+SWEEP_BATTLE_PRESENCE_JOB = "battles.sweep_presence"
+
+
+@register_job(PROCESS_ENDED_BATTLE_JOB)
+def process_ended_battle(battle_id: int) -> None:
+    """Generate the campaign's pivotal moments for an ended battle. Safe to run again on retry."""
+    from apps.campaigns.pivotal_moments import generate_pivotal_moments_for_battle
+
+    battle = Battle.objects.filter(id=battle_id).first()
+    if battle is None:
+        return
+    generate_pivotal_moments_for_battle(battle)
+
+
+@register_periodic_job(SWEEP_BATTLE_PRESENCE_JOB, every_seconds=PRESENCE_SWEEP_SECONDS)
+def sweep_battle_presence() -> None:
+    sweep_presence()
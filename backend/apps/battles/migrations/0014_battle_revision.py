@@ -0,0 +1,23 @@
+# Generated by Django 5.0.3 on 2026-10-16 20:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('battles', '0013_battleparticipant_battle_notes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='battle',
+            name='revision',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='battleparticipant',
+            name='revision',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
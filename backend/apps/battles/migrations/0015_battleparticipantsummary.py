@@ -0,0 +1,117 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _non_negative_int(value):
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _summarize(postbattle_json):
+    postbattle_json = postbattle_json if isinstance(postbattle_json, dict) else {}
+    unit_results = postbattle_json.get("unit_results", {})
+    if not isinstance(unit_results, dict) or not unit_results:
+        return {"kills": None, "ooas": None, "xp_gain": None, "deaths_json": [], "exploration_json": []}
+
+    summary = {"kills": 0, "ooas": 0, "xp_gain": 0, "deaths_json": [], "exploration_json": []}
+    for result in unit_results.values():
+        if not isinstance(result, dict):
+            continue
+        summary["kills"] += _non_negative_int(result.get("kill_count", 0))
+        summary["xp_gain"] += _non_negative_int(result.get("xp_earned", 0))
+        if bool(result.get("out_of_action", False)):
+            summary["ooas"] += 1
+        unit_name = str(result.get("unit_name", "")).strip()
+        if bool(result.get("dead", False)) and unit_name:
+            summary["deaths_json"].append(unit_name)
+
+    exploration = postbattle_json.get("exploration", {})
+    dice_values = exploration.get("dice_values", []) if isinstance(exploration, dict) else []
+    for entry in dice_values if isinstance(dice_values, list) else []:
+        try:
+            summary["exploration_json"].append(int(entry))
+        except (TypeError, ValueError):
+            continue
+    return summary
+
+
+def backfill_battle_summaries(apps, schema_editor):
+    Battle = apps.get_model("battles", "Battle")
+    BattleParticipant = apps.get_model("battles", "BattleParticipant")
+    BattleParticipantSummary = apps.get_model("battles", "BattleParticipantSummary")
+
+    # History pages are keyed on ended_at, so older ended rows without one fall back to created_at.
+    Battle.objects.filter(status="ended", ended_at__isnull=True).update(ended_at=models.F("created_at"))
+
+    participants = BattleParticipant.objects.filter(battle__status="ended").only(
+        "id", "battle_id", "warband_id", "postbattle_json"
+    )
+    BattleParticipantSummary.objects.bulk_create(
+        [
+            BattleParticipantSummary(
+                participant_id=participant.id,
+                battle_id=participant.battle_id,
+                warband_id=participant.warband_id,
+                **_summarize(participant.postbattle_json),
+            )
+            for participant in participants.iterator()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("battles", "0014_battle_revision"),
+        ("warbands", "0024_warband_rating_gold"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="battle",
+            index=models.Index(fields=["campaign", "status", "-ended_at", "-id"], name="battle_history_idx"),
+        ),
+        migrations.CreateModel(
+            name="BattleParticipantSummary",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("kills", models.PositiveIntegerField(blank=True, null=True)),
+                ("ooas", models.PositiveIntegerField(blank=True, null=True)),
+                ("xp_gain", models.PositiveIntegerField(blank=True, null=True)),
+                ("deaths_json", models.JSONField(blank=True, default=list)),
+                ("exploration_json", models.JSONField(blank=True, default=list)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "battle",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="participant_summaries",
+                        to="battles.battle",
+                    ),
+                ),
+                (
+                    "participant",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="summary",
+                        to="battles.battleparticipant",
+                    ),
+                ),
+                (
+                    "warband",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="battle_summaries",
+                        to="warbands.warband",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "battle_participant_summary",
+                "indexes": [models.Index(fields=["battle", "participant"], name="battle_part_battle__067a77_idx")],
+            },
+        ),
+        migrations.RunPython(backfill_battle_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,135 @@
+from django.db import migrations, models
+
+BACKFILL_BATCH_SIZE = 1000
+KILL_COLUMNS = (
+    "killer_unit_type",
+    "killer_unit_id",
+    "killer_warband_id",
+    "killer_is_leader",
+    "victim_unit_type",
+    "victim_unit_id",
+    "victim_warband_id",
+    "victim_is_leader",
+    "victim_is_caster",
+    "victim_is_large",
+)
+
+
+def _unit_type(value) -> str:
+    return str(value or "").strip().lower()[:32]
+
+
+def _positive_int(value) -> int | None:
+    try:
+        parsed = int(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed > 0 else None
+
+
+def _fill_kill_columns(event) -> None:
+    payload = event.payload_json if isinstance(event.payload_json, dict) else {}
+    if event.type == "unit_kill_recorded":
+        killer = payload.get("killer")
+        victim = payload.get("victim")
+        killer = killer if isinstance(killer, dict) else {}
+        victim = victim if isinstance(victim, dict) else {}
+    else:
+        killer = {"unit_type": payload.get("killer_unit_type"), "unit_id": payload.get("killer_unit_id")}
+        victim = {}
+
+    event.killer_unit_type = _unit_type(killer.get("unit_type"))
+    event.killer_unit_id = _positive_int(killer.get("unit_id"))
+    event.killer_warband_id = _positive_int(killer.get("warband_id"))
+    event.killer_is_leader = killer.get("is_leader") is True
+    event.victim_unit_type = _unit_type(victim.get("unit_type"))
+    event.victim_unit_id = _positive_int(victim.get("unit_id"))
+    event.victim_warband_id = _positive_int(victim.get("warband_id"))
+    event.victim_is_leader = victim.get("is_leader") is True
+    event.victim_is_caster = victim.get("is_caster") is True and victim.get("caster_type") in {"Wizard", "Priest"}
+    event.victim_is_large = victim.get("is_large") is True
+
+
+def backfill_kill_columns(apps, schema_editor, batch_size=BACKFILL_BATCH_SIZE):
+    BattleEvent = apps.get_model("battles", "BattleEvent")
+
+    events = BattleEvent.objects.filter(type__in=["kill_recorded", "unit_kill_recorded"]).only(
+        "id", "type", "payload_json"
+    )
+    last_id = 0
+    while True:
+        batch = list(events.filter(id__gt=last_id).order_by("id")[:batch_size])
+        if not batch:
+            break
+        for event in batch:
+            _fill_kill_columns(event)
+        BattleEvent.objects.bulk_update(batch, KILL_COLUMNS)
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("battles", "0015_battleparticipantsummary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="battleevent",
+            name="killer_is_leader",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="battleevent",
+            name="killer_unit_id",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="battleevent",
+            name="killer_unit_type",
+            field=models.CharField(blank=True, default="", max_length=32),
+        ),
+        migrations.AddField(
+            model_name="battleevent",
+            name="killer_warband_id",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="battleevent",
+            name="victim_is_caster",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="battleevent",
+            name="victim_is_large",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="battleevent",
+            name="victim_is_leader",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="battleevent",
+            name="victim_unit_id",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="battleevent",
+            name="victim_unit_type",
+            field=models.CharField(blank=True, default="", max_length=32),
+        ),
+        migrations.AddField(
+            model_name="battleevent",
+            name="victim_warband_id",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="battleevent",
+            index=models.Index(fields=["killer_unit_type", "killer_unit_id"], name="battle_event_killer_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="battleevent",
+            index=models.Index(fields=["victim_unit_type", "victim_unit_id"], name="battle_event_victim_idx"),
+        ),
+        migrations.RunPython(backfill_kill_columns, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 from .battle import Battle
 from .event import BattleEvent
 from .participant import BattleParticipant
+from .summary import BattleParticipantSummary
 
-__all__ = ["Battle", "BattleParticipant", "BattleEvent"]
+__all__ = ["Battle", "BattleParticipant", "BattleParticipantSummary", "BattleEvent"]
@@ -1,5 +1,12 @@
 from django.conf import settings
-from django.db import models
+from django.db import connections, models, router
+
+
+class BattleQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        # Every write advances the revision the state ETag is built from, however it is made.
+        kwargs.setdefault("revision", models.F("revision") + 1)
+        return super().update(**kwargs)
 
 
 class Battle(models.Model):
@@ -56,6 +63,9 @@ class Battle(models.Model):
     started_at = models.DateTimeField(null=True, blank=True)
     ended_at = models.DateTimeField(null=True, blank=True)
     post_processed_at = models.DateTimeField(null=True, blank=True)
+    revision = models.PositiveBigIntegerField(default=0)
+
+    objects = BattleQuerySet.as_manager()
 
     class Meta:
         db_table = "battle"
@@ -68,7 +78,28 @@ class Battle(models.Model):
         indexes = [
             models.Index(fields=["campaign", "status"]),
             models.Index(fields=["status", "created_at"]),
+            models.Index(fields=["campaign", "status", "-ended_at", "-id"], name="battle_history_idx"),
         ]
 
     def __str__(self):
         return f"{self.campaign_id}:{self.id} ({self.status})"
+
+    def save(self, *args, **kwargs):
+        if self.pk is None:
+            return super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        self.revision = models.F("revision") + 1
+        if update_fields is not None:
+            kwargs["update_fields"] = [*update_fields, "revision"]
+        super().save(*args, **kwargs)
+        # Leave the new value deferred: it is only read back if something asks for it.
+        del self.revision
+
+    @classmethod
+    def bump_revision(cls, battle_id: int) -> int:
+        """Advance the revision and return the new value in a single statement."""
+        connection = connections[router.db_for_write(cls)]
+        table = connection.ops.quote_name(cls._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(f"UPDATE {table} SET revision = revision + 1 WHERE id = %s RETURNING revision", [battle_id])
+            return cursor.fetchone()[0]
@@ -71,12 +71,82 @@ class BattleEvent(models.Model):
     payload_json = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Copied out of payload_json for kill events so kill totals and kill history are indexed queries.
+    killer_unit_type = models.CharField(max_length=32, blank=True, default="")
+    killer_unit_id = models.PositiveIntegerField(null=True, blank=True)
+    killer_warband_id = models.PositiveIntegerField(null=True, blank=True)
+    killer_is_leader = models.BooleanField(default=False)
+    victim_unit_type = models.CharField(max_length=32, blank=True, default="")
+    victim_unit_id = models.PositiveIntegerField(null=True, blank=True)
+    victim_warband_id = models.PositiveIntegerField(null=True, blank=True)
+    victim_is_leader = models.BooleanField(default=False)
+    victim_is_caster = models.BooleanField(default=False)
+    victim_is_large = models.BooleanField(default=False)
+
+    KILL_TYPES = (TYPE_KILL_RECORDED, TYPE_UNIT_KILL_RECORDED)
+    KILL_COLUMNS = (
+        "killer_unit_type",
+        "killer_unit_id",
+        "killer_warband_id",
+        "killer_is_leader",
+        "victim_unit_type",
+        "victim_unit_id",
+        "victim_warband_id",
+        "victim_is_leader",
+        "victim_is_caster",
+        "victim_is_large",
+    )
+
     class Meta:
         db_table = "battle_event"
         indexes = [
             models.Index(fields=["battle", "id"]),
             models.Index(fields=["battle", "type"]),
+            models.Index(fields=["killer_unit_type", "killer_unit_id"], name="battle_event_killer_idx"),
+            models.Index(fields=["victim_unit_type", "victim_unit_id"], name="battle_event_victim_idx"),
         ]
 
     def __str__(self):
         return f"{self.battle_id}:{self.id}:{self.type}"
+
+    def save(self, *args, **kwargs):
+        if self.pk is None:
+            self.fill_kill_columns()
+        return super().save(*args, **kwargs)
+
+    def fill_kill_columns(self) -> None:
+        """Set the killer/victim columns from payload_json. Other event types keep the defaults."""
+        payload = self.payload_json if isinstance(self.payload_json, dict) else {}
+        if self.type == self.TYPE_UNIT_KILL_RECORDED:
+            killer = payload.get("killer")
+            victim = payload.get("victim")
+            killer = killer if isinstance(killer, dict) else {}
+            victim = victim if isinstance(victim, dict) else {}
+        elif self.type == self.TYPE_KILL_RECORDED:
+            killer = {"unit_type": payload.get("killer_unit_type"), "unit_id": payload.get("killer_unit_id")}
+            victim = {}
+        else:
+            killer = victim = {}
+
+        self.killer_unit_type = _unit_type(killer.get("unit_type"))
+        self.killer_unit_id = _positive_int(killer.get("unit_id"))
+        self.killer_warband_id = _positive_int(killer.get("warband_id"))
+        self.killer_is_leader = killer.get("is_leader") is True
+        self.victim_unit_type = _unit_type(victim.get("unit_type"))
+        self.victim_unit_id = _positive_int(victim.get("unit_id"))
+        self.victim_warband_id = _positive_int(victim.get("warband_id"))
+        self.victim_is_leader = victim.get("is_leader") is True
+        self.victim_is_caster = victim.get("is_caster") is True and victim.get("caster_type") in {"Wizard", "Priest"}
+        self.victim_is_large = victim.get("is_large") is True
+
+
+def _unit_type(value) -> str:
+    return str(value or "").strip().lower()[:32]
+
+
+def _positive_int(value) -> int | None:
+    try:
+        parsed = int(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed > 0 else None
@@ -4,6 +4,18 @@ from django.db import models
 from .battle import Battle
 
 
+class BattleParticipantQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """Advance the battle and participant revisions unless only heartbeat fields change."""
+        if "revision" in kwargs or set(kwargs) <= BattleParticipant.PRESENCE_FIELDS:
+            return super().update(**kwargs)
+        updated = 0
+        for battle_id in set(self.values_list("battle_id", flat=True)):
+            revision = Battle.bump_revision(battle_id)
+            updated += self.filter(battle_id=battle_id).update(**kwargs, revision=revision)
+        return updated
+
+
 class BattleParticipant(models.Model):
     STATUS_INVITED = "invited"
     STATUS_ACCEPTED = "accepted"
@@ -38,6 +50,9 @@ class BattleParticipant(models.Model):
         (CONNECTION_OFFLINE, "Offline"),
     )
 
+    # Heartbeat-only fields; writing just these does not advance the battle revision.
+    PRESENCE_FIELDS = frozenset({"last_seen_at", "last_event_id"})
+
     battle = models.ForeignKey(
         Battle,
         related_name="participants",
@@ -86,9 +101,12 @@ class BattleParticipant(models.Model):
     postbattle_json = models.JSONField(default=dict, blank=True)
     declared_rating = models.PositiveIntegerField(null=True, blank=True)
     battle_notes = models.TextField(blank=True, default="")
+    revision = models.PositiveBigIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = BattleParticipantQuerySet.as_manager()
+
     class Meta:
         db_table = "battle_participant"
         constraints = [
@@ -108,3 +126,11 @@ class BattleParticipant(models.Model):
 
     def __str__(self):
         return f"{self.battle_id}:{self.user_id}:{self.status}"
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or not set(update_fields) <= self.PRESENCE_FIELDS:
+            self.revision = Battle.bump_revision(self.battle_id)
+            if update_fields is not None:
+                kwargs["update_fields"] = [*update_fields, "revision"]
+        return super().save(*args, **kwargs)
@@ -0,0 +1,39 @@
+from django.db import models
+
+from .battle import Battle
+from .participant import BattleParticipant
+
+
+class BattleParticipantSummary(models.Model):
+    """Post-battle totals for one participant, written once when the battle ends."""
+
+    participant = models.OneToOneField(
+        BattleParticipant,
+        related_name="summary",
+        on_delete=models.CASCADE,
+    )
+    battle = models.ForeignKey(
+        Battle,
+        related_name="participant_summaries",
+        on_delete=models.CASCADE,
+    )
+    warband = models.ForeignKey(
+        "warbands.Warband",
+        related_name="battle_summaries",
+        on_delete=models.CASCADE,
+    )
+    kills = models.PositiveIntegerField(null=True, blank=True)
+    ooas = models.PositiveIntegerField(null=True, blank=True)
+    xp_gain = models.PositiveIntegerField(null=True, blank=True)
+    deaths_json = models.JSONField(default=list, blank=True)
+    exploration_json = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "battle_participant_summary"
+        indexes = [
+            models.Index(fields=["battle", "participant"]),
+        ]
+
+    def __str__(self):
+        return f"{self.battle_id}:{self.warband_id} kills={self.kills}"
@@ -0,0 +1,108 @@
+"""Battle presence kept in the cache.
+
+Polling a battle only refreshes a cache entry for the participant. `sweep_presence` runs as a
+periodic background job; it copies the latest heartbeats of online participants to the database in
+one write and marks the ones that have gone quiet as offline.
+"""
+
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.realtime.services import queue_battle_event
+
+from .models import BattleParticipant
+
+PRESENCE_TIMEOUT_SECONDS = 90
+PRESENCE_CACHE_TIMEOUT = 60 * 60 * 24
+PRESENCE_SWEEP_SECONDS = 30
+
+
+def _presence_key(participant_id: int) -> str:
+    return f"battles:presence:{participant_id}"
+
+
+def touch_presence(participant: BattleParticipant, *, last_event_id: int | None = None) -> None:
+    """Record a heartbeat. Only a participant coming back online is written to the database."""
+    cache_key = _presence_key(participant.id)
+    if last_event_id is None:
+        entry = cache.get(cache_key) or {}
+        last_event_id = max(entry.get("last_event_id", 0), participant.last_event_id)
+    now = timezone.now()
+    cache.set(cache_key, {"last_seen_at": now, "last_event_id": last_event_id}, timeout=PRESENCE_CACHE_TIMEOUT)
+
+    participant.last_seen_at = now
+    participant.last_event_id = last_event_id
+    if participant.connection_state != BattleParticipant.CONNECTION_ONLINE:
+        participant.connection_state = BattleParticipant.CONNECTION_ONLINE
+        participant.save(update_fields=["connection_state", "last_seen_at", "last_event_id"])
+
+
+def sweep_presence(now=None) -> tuple[int, int]:
+    """Flush cached heartbeats and mark silent participants offline. Returns (flushed, offline)."""
+    now = now or timezone.now()
+    cutoff = now - timedelta(seconds=PRESENCE_TIMEOUT_SECONDS)
+    participants = list(
+        BattleParticipant.objects.filter(connection_state=BattleParticipant.CONNECTION_ONLINE).only(
+            "id", "battle_id", "user_id", "connection_state", "last_seen_at", "last_event_id"
+        )
+    )
+    if not participants:
+        return 0, 0
+    entries = cache.get_many([_presence_key(participant.id) for participant in participants])
+
+    seen: list[BattleParticipant] = []
+    silent: list[BattleParticipant] = []
+    for participant in participants:
+        entry = entries.get(_presence_key(participant.id))
+        if entry:
+            changed = (entry["last_seen_at"], entry["last_event_id"]) != (
+                participant.last_seen_at,
+                participant.last_event_id,
+            )
+            participant.last_seen_at = entry["last_seen_at"]
+            participant.last_event_id = entry["last_event_id"]
+        else:
+            changed = False
+        if participant.last_seen_at is None or participant.last_seen_at < cutoff:
+            silent.append(participant)
+        elif changed:
+            seen.append(participant)
+
+    offline = 0
+    with transaction.atomic():
+        # Heartbeat fields never advance the battle revision, so one bulk write covers them.
+        BattleParticipant.objects.bulk_update(seen, ["last_seen_at", "last_event_id"])
+        for participant in silent:
+            # A heartbeat may have landed since the cache was read; leave that participant online.
+            entry = cache.get(_presence_key(participant.id))
+            if entry and entry["last_seen_at"] >= cutoff:
+                continue
+            # Only flip rows that are still online and still stale in the database.
+            marked = BattleParticipant.objects.filter(
+                Q(last_seen_at__lt=cutoff) | Q(last_seen_at__isnull=True),
+                id=participant.id,
+                connection_state=BattleParticipant.CONNECTION_ONLINE,
+            ).update(
+                connection_state=BattleParticipant.CONNECTION_OFFLINE,
+                last_seen_at=participant.last_seen_at,
+                last_event_id=participant.last_event_id,
+            )
+            if not marked:
+                continue
+            offline += 1
+            queue_battle_event(
+                participant.battle_id,
+                "participant_presence_updated",
+                {
+                    "battle_id": participant.battle_id,
+                    "participant_id": participant.id,
+                    "user_id": participant.user_id,
+                    "connection_state": BattleParticipant.CONNECTION_OFFLINE,
+                    "last_seen_at": participant.last_seen_at.isoformat() if participant.last_seen_at else None,
+                },
+            )
+    return len(seen), offline
@@ -0,0 +1,52 @@
+from django.core.cache import cache
+from django.db import transaction
+
+ROSTER_CACHE_TIMEOUT = 60 * 60
+
+
+def _roster_version_key(warband_id: int) -> str:
+    return f"battles:roster-version:{warband_id}"
+
+
+def roster_cache_key(battle_id: int, warband_id: int, version: int) -> str:
+    return f"battles:roster:{battle_id}:{warband_id}:v{version}"
+
+
+def get_roster_versions(warband_ids: list[int]) -> dict[int, int]:
+    stored = cache.get_many([_roster_version_key(warband_id) for warband_id in warband_ids])
+    return {warband_id: stored.get(_roster_version_key(warband_id), 0) for warband_id in warband_ids}
+
+
+def get_cached_rosters(battle_id: int, warband_ids: list[int]) -> tuple[dict[int, dict], dict[int, int]]:
+    versions = get_roster_versions(warband_ids)
+    keys = {warband_id: roster_cache_key(battle_id, warband_id, versions[warband_id]) for warband_id in warband_ids}
+    stored = cache.get_many(list(keys.values()))
+    rosters = {warband_id: stored[key] for warband_id, key in keys.items() if key in stored}
+    return rosters, versions
+
+
+def set_cached_rosters(battle_id: int, rosters: dict[int, dict], versions: dict[int, int]) -> None:
+    cache.set_many(
+        {
+            roster_cache_key(battle_id, warband_id, versions.get(warband_id, 0)): roster
+            for warband_id, roster in rosters.items()
+        },
+        timeout=ROSTER_CACHE_TIMEOUT,
+    )
+
+
+def _bump_roster_version(warband_id: int) -> None:
+    key = _roster_version_key(warband_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+
+
+def invalidate_warband_roster(warband_id: int | None) -> None:
+    if not warband_id:
+        return
+    # Bump now so this request sees fresh data, and again after commit so a
+    # concurrent reader cannot re-cache the pre-commit roster under the new version.
+    _bump_roster_version(warband_id)
+    transaction.on_commit(lambda: _bump_roster_version(warband_id))
@@ -0,0 +1,69 @@
+from django.db.models.signals import post_delete, post_save
+
+from apps.warbands.models import (
+    Henchman,
+    HenchmenGroup,
+    HenchmenGroupItem,
+    HenchmenGroupSkill,
+    HenchmenGroupSpecial,
+    Hero,
+    HeroItem,
+    HeroSkill,
+    HeroSpecial,
+    HeroSpell,
+    HiredSword,
+    HiredSwordItem,
+    HiredSwordSkill,
+    HiredSwordSpecial,
+    HiredSwordSpell,
+)
+
+from .roster_cache import invalidate_warband_roster
+
+UNIT_MODELS = (Hero, HiredSword, HenchmenGroup)
+UNIT_LINK_MODELS = {
+    HeroItem: "hero",
+    HeroSkill: "hero",
+    HeroSpecial: "hero",
+    HeroSpell: "hero",
+    HiredSwordItem: "hired_sword",
+    HiredSwordSkill: "hired_sword",
+    HiredSwordSpecial: "hired_sword",
+    HiredSwordSpell: "hired_sword",
+    Henchman: "group",
+    HenchmenGroupItem: "henchmen_group",
+    HenchmenGroupSkill: "henchmen_group",
+    HenchmenGroupSpecial: "henchmen_group",
+}
+
+
+def _unit_warband_id(instance, parent_field: str) -> int | None:
+    field = instance._meta.get_field(parent_field)
+    if field.is_cached(instance):
+        parent = getattr(instance, parent_field)
+        return parent.warband_id if parent else None
+    parent_id = getattr(instance, field.attname)
+    return field.related_model.objects.filter(id=parent_id).values_list("warband_id", flat=True).first()
+
+
+def _invalidate_unit_roster(sender, instance, **kwargs):
+    invalidate_warband_roster(instance.warband_id)
+
+
+def _invalidate_unit_link_roster(sender, instance, **kwargs):
+    invalidate_warband_roster(_unit_warband_id(instance, UNIT_LINK_MODELS[sender]))
+
+
+def connect_roster_cache_signals():
+    for model in UNIT_MODELS:
+        post_save.connect(_invalidate_unit_roster, sender=model, dispatch_uid=f"battle-roster-{model.__name__}-save")
+        post_delete.connect(
+            _invalidate_unit_roster, sender=model, dispatch_uid=f"battle-roster-{model.__name__}-delete"
+        )
+    for model in UNIT_LINK_MODELS:
+        post_save.connect(
+            _invalidate_unit_link_roster, sender=model, dispatch_uid=f"battle-roster-{model.__name__}-save"
+        )
+        post_delete.connect(
+            _invalidate_unit_link_roster, sender=model, dispatch_uid=f"battle-roster-{model.__name__}-delete"
+        )
@@ -0,0 +1,148 @@
+"""Battle and participant lifecycle rules.
+
+Transition views consult these tables before moving a battle or a participant to a new status,
+and read how far the participants have got from one grouped count instead of a pair of exists()
+queries per question.
+"""
+
+from dataclasses import dataclass
+
+from django.db.models import Count, Q
+
+from .models import Battle, BattleParticipant
+
+BATTLE_TRANSITIONS: dict[str, frozenset[str]] = {
+    Battle.STATUS_INVITING: frozenset({Battle.STATUS_PREBATTLE, Battle.STATUS_CANCELED}),
+    Battle.STATUS_REPORTED_RESULT_PENDING: frozenset({Battle.STATUS_ENDED, Battle.STATUS_CANCELED}),
+    Battle.STATUS_PREBATTLE: frozenset({Battle.STATUS_ACTIVE, Battle.STATUS_CANCELED}),
+    Battle.STATUS_ACTIVE: frozenset({Battle.STATUS_POSTBATTLE, Battle.STATUS_CANCELED}),
+    Battle.STATUS_POSTBATTLE: frozenset({Battle.STATUS_ENDED, Battle.STATUS_CANCELED}),
+    Battle.STATUS_ENDED: frozenset(),
+    Battle.STATUS_CANCELED: frozenset(),
+}
+
+# A battle canceled by its creator or the campaign owner takes every participant with it, so
+# canceled_prebattle is reachable from every live status of the normal flow.
+PARTICIPANT_TRANSITIONS: dict[str, frozenset[str]] = {
+    BattleParticipant.STATUS_INVITED: frozenset(
+        {
+            BattleParticipant.STATUS_ACCEPTED,
+            BattleParticipant.STATUS_JOINED_PREBATTLE,
+            BattleParticipant.STATUS_READY,
+            BattleParticipant.STATUS_CANCELED_PREBATTLE,
+        }
+    ),
+    BattleParticipant.STATUS_ACCEPTED: frozenset(
+        {
+            BattleParticipant.STATUS_JOINED_PREBATTLE,
+            BattleParticipant.STATUS_READY,
+            BattleParticipant.STATUS_CANCELED_PREBATTLE,
+        }
+    ),
+    BattleParticipant.STATUS_JOINED_PREBATTLE: frozenset(
+        {
+            BattleParticipant.STATUS_READY,
+            BattleParticipant.STATUS_IN_BATTLE,
+            BattleParticipant.STATUS_CANCELED_PREBATTLE,
+        }
+    ),
+    BattleParticipant.STATUS_READY: frozenset(
+        {
+            BattleParticipant.STATUS_ACCEPTED,
+            BattleParticipant.STATUS_JOINED_PREBATTLE,
+            BattleParticipant.STATUS_IN_BATTLE,
+            BattleParticipant.STATUS_CANCELED_PREBATTLE,
+        }
+    ),
+    BattleParticipant.STATUS_CANCELED_PREBATTLE: frozenset(
+        {
+            BattleParticipant.STATUS_JOINED_PREBATTLE,
+            BattleParticipant.STATUS_READY,
+        }
+    ),
+    BattleParticipant.STATUS_IN_BATTLE: frozenset(
+        {
+            BattleParticipant.STATUS_FINISHED_BATTLE,
+            BattleParticipant.STATUS_CANCELED_PREBATTLE,
+        }
+    ),
+    BattleParticipant.STATUS_FINISHED_BATTLE: frozenset(
+        {
+            BattleParticipant.STATUS_CONFIRMED_POSTBATTLE,
+            BattleParticipant.STATUS_CANCELED_PREBATTLE,
+        }
+    ),
+    BattleParticipant.STATUS_CONFIRMED_POSTBATTLE: frozenset({BattleParticipant.STATUS_CANCELED_PREBATTLE}),
+    BattleParticipant.STATUS_REPORTED_RESULT_PENDING: frozenset(
+        {
+            BattleParticipant.STATUS_REPORTED_RESULT_APPROVED,
+            BattleParticipant.STATUS_REPORTED_RESULT_DECLINED,
+        }
+    ),
+    BattleParticipant.STATUS_REPORTED_RESULT_APPROVED: frozenset({BattleParticipant.STATUS_REPORTED_RESULT_DECLINED}),
+    BattleParticipant.STATUS_REPORTED_RESULT_DECLINED: frozenset(),
+}
+
+ACCEPTED_PARTICIPANT_STATUSES = (
+    BattleParticipant.STATUS_ACCEPTED,
+    BattleParticipant.STATUS_JOINED_PREBATTLE,
+    BattleParticipant.STATUS_READY,
+)
+
+
+def can_transition_battle(current: str, target: str) -> bool:
+    return target in BATTLE_TRANSITIONS.get(current, frozenset())
+
+
+def can_transition_participant(current: str, target: str) -> bool:
+    return target in PARTICIPANT_TRANSITIONS.get(current, frozenset())
+
+
+@dataclass(frozen=True)
+class ParticipantProgress:
+    """How many of a battle's participants sit in each status."""
+
+    counts: dict[str, int]
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def count(self, *statuses: str) -> int:
+        return sum(self.counts.get(status, 0) for status in statuses)
+
+    def _all(self, *statuses: str, among: int | None = None) -> bool:
+        among = self.total if among is None else among
+        return among > 0 and self.count(*statuses) == among
+
+    @property
+    def started(self) -> int:
+        return self.total - self.count(BattleParticipant.STATUS_CANCELED_PREBATTLE)
+
+    @property
+    def all_accepted(self) -> bool:
+        return self._all(*ACCEPTED_PARTICIPANT_STATUSES)
+
+    @property
+    def all_ready(self) -> bool:
+        return self._all(BattleParticipant.STATUS_READY)
+
+    @property
+    def all_canceled_prebattle(self) -> bool:
+        return self._all(BattleParticipant.STATUS_CANCELED_PREBATTLE)
+
+    @property
+    def all_reported_result_approved(self) -> bool:
+        return self._all(BattleParticipant.STATUS_REPORTED_RESULT_APPROVED)
+
+    @property
+    def all_started_confirmed(self) -> bool:
+        return self._all(BattleParticipant.STATUS_CONFIRMED_POSTBATTLE, among=self.started)
+
+
+def participant_progress(battle_id: int) -> ParticipantProgress:
+    """Count a battle's participants per status in a single query."""
+    counts = BattleParticipant.objects.filter(battle_id=battle_id).aggregate(
+        **{status: Count("id", filter=Q(status=status)) for status, _ in BattleParticipant.STATUS_CHOICES}
+    )
+    return ParticipantProgress(counts={status: count for status, count in counts.items() if count})
@@ -0,0 +1,74 @@
+from .models import Battle, BattleParticipant, BattleParticipantSummary
+
+SUMMARY_UPDATE_FIELDS = ["battle", "warband", "kills", "ooas", "xp_gain", "deaths_json", "exploration_json"]
+
+
+def _non_negative_int(value) -> int:
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def summarize_postbattle(postbattle_json) -> dict:
+    """Reduce a participant's postbattle payload to the totals shown in battle history."""
+    postbattle_json = postbattle_json if isinstance(postbattle_json, dict) else {}
+    unit_results = postbattle_json.get("unit_results", {})
+    if not isinstance(unit_results, dict) or not unit_results:
+        return {"kills": None, "ooas": None, "xp_gain": None, "deaths_json": [], "exploration_json": []}
+
+    kills = 0
+    ooas = 0
+    xp_gain = 0
+    deaths = []
+    for result in unit_results.values():
+        if not isinstance(result, dict):
+            continue
+        kills += _non_negative_int(result.get("kill_count", 0))
+        xp_gain += _non_negative_int(result.get("xp_earned", 0))
+        if bool(result.get("out_of_action", False)):
+            ooas += 1
+        if bool(result.get("dead", False)):
+            unit_name = str(result.get("unit_name", "")).strip()
+            if unit_name:
+                deaths.append(unit_name)
+
+    exploration_raw = postbattle_json.get("exploration", {})
+    if not isinstance(exploration_raw, dict):
+        exploration_raw = {}
+    dice_values_raw = exploration_raw.get("dice_values", [])
+    exploration = []
+    if isinstance(dice_values_raw, list):
+        for entry in dice_values_raw:
+            try:
+                exploration.append(int(entry))
+            except (TypeError, ValueError):
+                continue
+
+    return {
+        "kills": kills,
+        "ooas": ooas,
+        "xp_gain": xp_gain,
+        "deaths_json": deaths,
+        "exploration_json": exploration,
+    }
+
+
+def write_battle_summaries(battle: Battle) -> None:
+    participants = BattleParticipant.objects.filter(battle_id=battle.id).only("id", "warband_id", "postbattle_json")
+    summaries = [
+        BattleParticipantSummary(
+            participant_id=participant.id,
+            battle_id=battle.id,
+            warband_id=participant.warband_id,
+            **summarize_postbattle(participant.postbattle_json),
+        )
+        for participant in participants
+    ]
+    if summaries:
+        BattleParticipantSummary.objects.bulk_create(
+            summaries,
+            update_conflicts=True,
+            unique_fields=["participant"],
+            update_fields=SUMMARY_UPDATE_FIELDS,
+        )
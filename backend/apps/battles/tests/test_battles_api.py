@@ -1,16 +1,42 @@
+from datetime import timedelta
+from importlib import import_module
+from unittest.mock import patch
+
+from django.apps import apps as django_apps
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from rest_framework.test import APIClient, APITestCase
 
-from apps.battles.models import Battle, BattleParticipant
+from apps.battles.models import Battle, BattleEvent, BattleParticipant
+from apps.battles.presence import PRESENCE_TIMEOUT_SECONDS, sweep_presence, touch_presence
+from apps.battles.states import (
+    BATTLE_TRANSITIONS,
+    PARTICIPANT_TRANSITIONS,
+    can_transition_battle,
+    can_transition_participant,
+    participant_progress,
+)
+from apps.battles.views.shared import (
+    _append_battle_event,
+    _apply_participant_postbattle_results,
+    _finalize_battle,
+    _remove_used_single_use_items,
+)
 from apps.items.models import Item
 from apps.campaigns.models import (
+    BattleMomentState,
     Campaign,
     CampaignMembership,
     PivotalMoment,
     CampaignRole,
 )
+from apps.campaigns.pivotal_moments import generate_pivotal_moments_for_battle
+from apps.jobs.queue import drain_jobs
+from apps.realtime.models import RealtimeOutboxEvent
 from apps.special.models import Special
 from apps.warbands.models import (
     Henchman,
@@ -416,6 +442,129 @@ class BattleApiTests(APITestCase):
         )
         self.assertEqual(response.status_code, 201)
 
+    def test_participant_progress_is_read_in_one_query(self):
+        data = self._create_battle()
+        battle_id = data["battle"]["id"]
+
+        with self.assertNumQueries(1):
+            progress = participant_progress(battle_id)
+        self.assertEqual(progress.counts, {BattleParticipant.STATUS_INVITED: 1, BattleParticipant.STATUS_ACCEPTED: 1})
+        self.assertFalse(progress.all_accepted)
+
+        self._ready_both_and_start(battle_id)
+        BattleParticipant.objects.filter(battle_id=battle_id, user=self.player).update(
+            status=BattleParticipant.STATUS_CONFIRMED_POSTBATTLE
+        )
+        progress = participant_progress(battle_id)
+        self.assertFalse(progress.all_started_confirmed)
+
+        BattleParticipant.objects.filter(battle_id=battle_id, user=self.owner).update(
+            status=BattleParticipant.STATUS_CANCELED_PREBATTLE
+        )
+        progress = participant_progress(battle_id)
+        self.assertTrue(progress.all_started_confirmed)
+        self.assertFalse(progress.all_canceled_prebattle)
+        self.assertFalse(participant_progress(0).all_started_confirmed)
+
+    def test_state_machine_covers_every_status(self):
+        self.assertEqual(set(BATTLE_TRANSITIONS), {status for status, _ in Battle.STATUS_CHOICES})
+        self.assertEqual(set(PARTICIPANT_TRANSITIONS), {status for status, _ in BattleParticipant.STATUS_CHOICES})
+        self.assertTrue(can_transition_battle(Battle.STATUS_ACTIVE, Battle.STATUS_POSTBATTLE))
+        self.assertFalse(can_transition_battle(Battle.STATUS_ENDED, Battle.STATUS_CANCELED))
+        self.assertFalse(
+            can_transition_participant(
+                BattleParticipant.STATUS_CONFIRMED_POSTBATTLE, BattleParticipant.STATUS_FINISHED_BATTLE
+            )
+        )
+
+    def test_polling_battle_state_only_writes_when_coming_online(self):
+        data = self._create_battle()
+        battle_id = data["battle"]["id"]
+        participant = BattleParticipant.objects.get(battle_id=battle_id, user=self.owner)
+        self.assertEqual(participant.connection_state, BattleParticipant.CONNECTION_OFFLINE)
+
+        self.client.force_authenticate(user=self.owner)
+        response = self.client.get(f"/api/campaigns/{self.campaign.id}/battles/{battle_id}/state/")
+        self.assertEqual(response.status_code, 200)
+        participant.refresh_from_db()
+        self.assertEqual(participant.connection_state, BattleParticipant.CONNECTION_ONLINE)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/api/campaigns/{self.campaign.id}/battles/{battle_id}/state/")
+            self.assertEqual(response.status_code, 200)
+            response = self.client.get(f"/api/campaigns/{self.campaign.id}/battles/{battle_id}/rosters/")
+            self.assertEqual(response.status_code, 200)
+        self.assertFalse([query for query in queries.captured_queries if not query["sql"].startswith("SELECT")])
+
+    def test_presence_sweep_flushes_heartbeats_and_marks_silent_participants_offline(self):
+        data = self._create_battle()
+        battle_id = data["battle"]["id"]
+        owner_participant = BattleParticipant.objects.get(battle_id=battle_id, user=self.owner)
+        player_participant = BattleParticipant.objects.get(battle_id=battle_id, user=self.player)
+        touch_presence(owner_participant)
+        touch_presence(player_participant)
+        revision = Battle.objects.get(id=battle_id).revision
+
+        touch_presence(owner_participant, last_event_id=5)
+        self.assertEqual(sweep_presence(), (1, 0))
+        owner_participant.refresh_from_db()
+        self.assertEqual(owner_participant.last_event_id, 5)
+        self.assertEqual(Battle.objects.get(id=battle_id).revision, revision)
+        self.assertEqual(sweep_presence(), (0, 0))
+
+        later = timezone.now() + timedelta(seconds=PRESENCE_TIMEOUT_SECONDS + 1)
+        touch_presence(player_participant)
+        with patch("apps.battles.presence.timezone.now", return_value=later):
+            touch_presence(owner_participant)
+        self.assertEqual(sweep_presence(now=later), (1, 1))
+
+        player_participant.refresh_from_db()
+        self.assertEqual(player_participant.connection_state, BattleParticipant.CONNECTION_OFFLINE)
+        owner_participant.refresh_from_db()
+        self.assertEqual(owner_participant.connection_state, BattleParticipant.CONNECTION_ONLINE)
+        self.assertGreater(Battle.objects.get(id=battle_id).revision, revision)
+        presence_events = [
+            row.payload_json
+            for row in RealtimeOutboxEvent.objects.filter(channel=f"private-battle-{battle_id}")
+            if row.payload_json.get("type") == "participant_presence_updated"
+        ]
+        self.assertEqual(
+            [(event["payload"]["user_id"], event["payload"]["connection_state"]) for event in presence_events],
+            [(self.player.id, BattleParticipant.CONNECTION_OFFLINE)],
+        )
+
+    def test_presence_sweep_leaves_participants_whose_stored_heartbeat_is_fresh(self):
+        data = self._create_battle()
+        battle_id = data["battle"]["id"]
+        participant = BattleParticipant.objects.get(battle_id=battle_id, user=self.player)
+        touch_presence(participant)
+        later = timezone.now() + timedelta(seconds=PRESENCE_TIMEOUT_SECONDS + 1)
+        # Another request brought the row up to date after the cache entry went stale.
+        BattleParticipant.objects.filter(id=participant.id).update(last_seen_at=later)
+
+        self.assertEqual(sweep_presence(now=later), (0, 0))
+
+        participant.refresh_from_db()
+        self.assertEqual(participant.connection_state, BattleParticipant.CONNECTION_ONLINE)
+
+    def test_join_only_applies_allowed_participant_transitions(self):
+        data = self._create_battle()
+        battle_id = data["battle"]["id"]
+        self._ready_both_and_start(battle_id)
+        BattleParticipant.objects.filter(battle_id=battle_id, user=self.player).update(
+            status=BattleParticipant.STATUS_CANCELED_PREBATTLE
+        )
+
+        self.client.force_authenticate(user=self.player)
+        response = self.client.post(f"/api/campaigns/{self.campaign.id}/battles/{battle_id}/join/", format="json")
+        self.assertEqual(response.status_code, 200)
+
+        participant = BattleParticipant.objects.get(battle_id=battle_id, user=self.player)
+        self.assertEqual(participant.status, BattleParticipant.STATUS_CANCELED_PREBATTLE)
+        self.assertFalse(
+            BattleEvent.objects.filter(battle_id=battle_id, type=BattleEvent.TYPE_PARTICIPANT_JOINED_BATTLE).exists()
+        )
+
     def test_start_requires_all_ready(self):
         data = self._create_battle()
         battle_id = data["battle"]["id"]
@@ -730,6 +879,63 @@ class BattleApiTests(APITestCase):
         owner_hero.refresh_from_db()
         self.assertEqual(owner_hero.kills, 2)
 
+    def _postbattle_roster(self, warband, size, special):
+        heroes = [
+            Hero.objects.create(warband=warband, name=f"Hero {index}", unit_type="Champion") for index in range(size)
+        ]
+        hired_swords = [
+            HiredSword.objects.create(warband=warband, name=f"Sword {index}", unit_type="Pit Fighter")
+            for index in range(size)
+        ]
+        henchmen = []
+        for index in range(size):
+            group = HenchmenGroup.objects.create(warband=warband, name=f"Group {index}", unit_type="Warriors")
+            henchmen.append(Henchman.objects.create(group=group, name=f"Henchman {index}"))
+
+        unit_information = {}
+        unit_results = {}
+        for unit_type, units in (("hero", heroes), ("hired_sword", hired_swords), ("henchman", henchmen)):
+            for unit in units:
+                unit_key = f"{unit_type}:{unit.id}"
+                unit_information[unit_key] = {"kill_count": 1, "stats_override": {"movement": 5}}
+                unit_results[unit_key] = {
+                    "unit_name": unit.name,
+                    "xp_earned": 2,
+                    "dead": unit_type == "henchman",
+                    "special_ids": [special.id] if unit_type == "hero" else [],
+                }
+        return heroes, unit_information, {"unit_results": unit_results}
+
+    def test_postbattle_application_query_count_does_not_grow_with_roster(self):
+        data = self._create_battle()
+        battle = Battle.objects.get(id=data["battle"]["id"])
+        special = Special.objects.create(campaign=self.campaign, name="Old Wound", type="Injury")
+
+        query_counts = []
+        for user, warband, size in ((self.owner, self.owner_warband, 2), (self.player, self.player_warband, 8)):
+            heroes, unit_information, postbattle_json = self._postbattle_roster(warband, size, special)
+            HeroSpecial.objects.create(hero=heroes[0], special=special)
+            participant = BattleParticipant.objects.get(battle=battle, user=user)
+            participant.selected_unit_keys_json = list(unit_information)
+            participant.unit_information_json = unit_information
+            participant.save(update_fields=["selected_unit_keys_json", "unit_information_json"])
+
+            with CaptureQueriesContext(connection) as queries:
+                _apply_participant_postbattle_results(battle, participant, postbattle_json)
+            query_counts.append(len(queries))
+
+            self.assertEqual(HeroSpecial.objects.filter(hero__warband=warband, special=special).count(), size)
+            self.assertFalse(HenchmenGroup.objects.filter(warband=warband, dead=False).exists())
+            self.assertEqual(
+                list(Hero.objects.filter(warband=warband).values_list("kills", "xp", "movement").distinct()),
+                [(1, 2, 5)],
+            )
+            self.assertEqual(
+                set(HiredSword.objects.filter(warband=warband).values_list("kills", "xp", "movement")), {(1, 2, 5)}
+            )
+
+        self.assertEqual(query_counts[0], query_counts[1])
+
     def test_postbattle_save_preserves_upkeep_while_clearing_exploration(self):
         data = self._create_battle()
         battle_id = data["battle"]["id"]
@@ -1651,6 +1857,60 @@ class BattleApiTests(APITestCase):
         self.assertEqual(payload["victim"]["caster_type"], "Wizard")
         self.assertTrue(payload["victim"]["is_large"])
 
+        event = BattleEvent.objects.get(id=response.data["events"][0]["id"])
+        self.assertEqual((event.killer_unit_type, event.killer_unit_id), ("hero", owner_hero.id))
+        self.assertEqual((event.victim_unit_type, event.victim_unit_id), ("hero", player_hero.id))
+        self.assertEqual(event.killer_warband_id, self.owner_warband.id)
+        self.assertEqual(event.victim_warband_id, self.player_warband.id)
+        self.assertTrue(event.killer_is_leader)
+        self.assertFalse(event.victim_is_leader)
+        self.assertTrue(event.victim_is_caster)
+        self.assertTrue(event.victim_is_large)
+
+    def test_kill_columns_migration_fills_older_kill_events(self):
+        data = self._create_battle()
+        battle = Battle.objects.get(id=data["battle"]["id"])
+        events = BattleEvent.objects.bulk_create(
+            [
+                BattleEvent(
+                    battle=battle,
+                    type=BattleEvent.TYPE_UNIT_KILL_RECORDED,
+                    payload_json={
+                        "killer": {"unit_type": "henchman", "unit_id": 7, "warband_id": self.owner_warband.id},
+                        "victim": {
+                            "unit_type": "hero",
+                            "unit_id": 9,
+                            "warband_id": self.player_warband.id,
+                            "is_leader": True,
+                        },
+                    },
+                ),
+                BattleEvent(
+                    battle=battle,
+                    type=BattleEvent.TYPE_KILL_RECORDED,
+                    payload_json={"killer_unit_type": "Hired_Sword", "killer_unit_id": "4"},
+                ),
+                BattleEvent(battle=battle, type=BattleEvent.TYPE_ITEM_USED, payload_json={"unit_key": "hero:1"}),
+            ]
+        )
+
+        migration = import_module("apps.battles.migrations.0016_battleevent_kill_columns")
+        migration.backfill_kill_columns(django_apps, None, batch_size=1)
+
+        rows = list(
+            BattleEvent.objects.filter(id__in=[event.id for event in events])
+            .order_by("id")
+            .values_list("killer_unit_type", "killer_unit_id", "victim_unit_type", "victim_unit_id", "victim_is_leader")
+        )
+        self.assertEqual(
+            rows,
+            [
+                ("henchman", 7, "hero", 9, True),
+                ("hired_sword", 4, "", None, False),
+                ("", None, "", None, False),
+            ],
+        )
+
     def test_warband_hero_kill_history_returns_named_kills_and_counts(self):
         data = self._create_battle()
         battle_id = data["battle"]["id"]
@@ -1897,6 +2157,24 @@ class BattleApiTests(APITestCase):
         )
         self.assertEqual(response.status_code, 404)
 
+    @override_settings(JOBS_DISPATCH="worker", REALTIME_OUTBOX_DISPATCH="worker")
+    def test_ending_a_battle_resets_trading_actions_once(self):
+        data = self._create_battle()
+        battle = Battle.objects.get(id=data["battle"]["id"])
+        hero = Hero.objects.create(warband=self.owner_warband, name="Merchant", trading_action=False)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            _finalize_battle(battle, self.owner, [])
+        hero.refresh_from_db()
+        self.assertTrue(hero.trading_action)
+
+        # The warband trades again before the follow-up job runs; the job must not hand it back.
+        Hero.objects.filter(id=hero.id).update(trading_action=False)
+        self.assertEqual(drain_jobs(), 1)
+        hero.refresh_from_db()
+        self.assertFalse(hero.trading_action)
+
+    @override_settings(JOBS_DISPATCH="inline", REALTIME_OUTBOX_DISPATCH="worker")
     def test_pivotal_moments_are_written_only_when_battle_ends(self):
         data = self._create_battle()
         battle_id = data["battle"]["id"]
@@ -1984,29 +2262,30 @@ class BattleApiTests(APITestCase):
         self.assertFalse(PivotalMoment.objects.filter(battle_id=battle_id).exists())
 
         self.client.force_authenticate(user=self.player)
-        response = self.client.post(
-            f"/api/campaigns/{self.campaign.id}/battles/{battle_id}/finalize-postbattle/",
-            {
-                "postbattle_json": {
-                    "exploration": {"dice_values": [], "resource_id": None},
-                    "unit_results": {
-                        f"hero:{player_hero.id}": {
-                            "unit_name": player_hero.name,
-                            "unit_kind": "hero",
-                            "unit_type": player_hero.unit_type,
-                            "group_name": "",
-                            "out_of_action": True,
-                            "kill_count": 0,
-                            "xp_earned": 1,
-                            "dead": False,
-                            "special_ids": [],
-                            "serious_injury_rolls": [],
-                        }
-                    },
-                }
-            },
-            format="json",
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f"/api/campaigns/{self.campaign.id}/battles/{battle_id}/finalize-postbattle/",
+                {
+                    "postbattle_json": {
+                        "exploration": {"dice_values": [], "resource_id": None},
+                        "unit_results": {
+                            f"hero:{player_hero.id}": {
+                                "unit_name": player_hero.name,
+                                "unit_kind": "hero",
+                                "unit_type": player_hero.unit_type,
+                                "group_name": "",
+                                "out_of_action": True,
+                                "kill_count": 0,
+                                "xp_earned": 1,
+                                "dead": False,
+                                "special_ids": [],
+                                "serious_injury_rolls": [],
+                            }
+                        },
+                    }
+                },
+                format="json",
+            )
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data["battle"]["status"], "ended")
 
@@ -2024,6 +2303,7 @@ class BattleApiTests(APITestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(PivotalMoment.objects.filter(battle_id=battle_id).count(), 3)
 
+    @override_settings(JOBS_DISPATCH="inline", REALTIME_OUTBOX_DISPATCH="worker")
     def test_pivotal_moments_include_giant_slayer_when_large_target_is_killed(self):
         data = self._create_battle()
         battle_id = data["battle"]["id"]
@@ -2108,29 +2388,30 @@ class BattleApiTests(APITestCase):
         self.assertEqual(response.status_code, 200)
 
         self.client.force_authenticate(user=self.player)
-        response = self.client.post(
-            f"/api/campaigns/{self.campaign.id}/battles/{battle_id}/finalize-postbattle/",
-            {
-                "postbattle_json": {
-                    "exploration": {"dice_values": [], "resource_id": None},
-                    "unit_results": {
-                        f"hero:{player_hero.id}": {
-                            "unit_name": player_hero.name,
-                            "unit_kind": "hero",
-                            "unit_type": player_hero.unit_type,
-                            "group_name": "",
-                            "out_of_action": True,
-                            "kill_count": 0,
-                            "xp_earned": 1,
-                            "dead": False,
-                            "special_ids": [],
-                            "serious_injury_rolls": [],
-                        }
-                    },
-                }
-            },
-            format="json",
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f"/api/campaigns/{self.campaign.id}/battles/{battle_id}/finalize-postbattle/",
+                {
+                    "postbattle_json": {
+                        "exploration": {"dice_values": [], "resource_id": None},
+                        "unit_results": {
+                            f"hero:{player_hero.id}": {
+                                "unit_name": player_hero.name,
+                                "unit_kind": "hero",
+                                "unit_type": player_hero.unit_type,
+                                "group_name": "",
+                                "out_of_action": True,
+                                "kill_count": 0,
+                                "xp_earned": 1,
+                                "dead": False,
+                                "special_ids": [],
+                                "serious_injury_rolls": [],
+                            }
+                        },
+                    }
+                },
+                format="json",
+            )
         self.assertEqual(response.status_code, 200)
 
         giant_slayer = PivotalMoment.objects.filter(
@@ -2141,6 +2422,73 @@ class BattleApiTests(APITestCase):
         self.assertEqual(giant_slayer.unit_name, owner_hero.name)
         self.assertIn(player_hero.name, giant_slayer.detail)
 
+    def _leader_kill_payload(self, killer_warband, victim_warband, killer_id, victim_id):
+        return {
+            "killer": {
+                "unit_key": f"hero:{killer_id}",
+                "unit_type": "hero",
+                "unit_id": killer_id,
+                "warband_id": killer_warband.id,
+                "name": f"Leader {killer_id}",
+                "is_leader": True,
+            },
+            "victim": {
+                "unit_key": f"hero:{victim_id}",
+                "unit_type": "hero",
+                "unit_id": victim_id,
+                "warband_id": victim_warband.id,
+                "name": f"Leader {victim_id}",
+                "is_leader": True,
+            },
+            "earned_xp": True,
+        }
+
+    def test_pivotal_moments_are_detected_as_kill_events_are_appended(self):
+        data = self._create_battle()
+        battle = Battle.objects.get(id=data["battle"]["id"])
+
+        for victim_id in (2, 3):
+            _append_battle_event(
+                battle,
+                BattleEvent.TYPE_UNIT_KILL_RECORDED,
+                actor_user=self.owner,
+                payload=self._leader_kill_payload(self.owner_warband, self.player_warband, 1, victim_id),
+            )
+
+        state = BattleMomentState.objects.get(battle=battle)
+        self.assertEqual([pending["kind"] for pending in state.pending_json], ["there_can_be_only_one"])
+        self.assertEqual(state.detector_state_json["there_can_be_only_one"], {"warband_ids": [self.owner_warband.id]})
+
+        Battle.objects.filter(id=battle.id).update(status=Battle.STATUS_ENDED, ended_at=timezone.now())
+        battle.refresh_from_db()
+        generate_pivotal_moments_for_battle(battle)
+
+        moment = PivotalMoment.objects.get(battle=battle, kind="there_can_be_only_one")
+        self.assertEqual(moment.warband_id, self.owner_warband.id)
+        self.assertEqual(moment.detail, "Leader 1 slew the enemy leader Leader 2.")
+        self.assertFalse(BattleMomentState.objects.filter(battle=battle).exists())
+
+    def test_pivotal_moments_replay_kill_events_recorded_without_detector_state(self):
+        data = self._create_battle()
+        battle = Battle.objects.get(id=data["battle"]["id"])
+        event = BattleEvent(
+            battle=battle,
+            type=BattleEvent.TYPE_UNIT_KILL_RECORDED,
+            payload_json=self._leader_kill_payload(self.player_warband, self.owner_warband, 5, 6),
+        )
+        event.fill_kill_columns()
+        BattleEvent.objects.bulk_create([event])
+        self.assertFalse(BattleMomentState.objects.filter(battle=battle).exists())
+
+        Battle.objects.filter(id=battle.id).update(status=Battle.STATUS_ENDED, ended_at=timezone.now())
+        battle.refresh_from_db()
+        generate_pivotal_moments_for_battle(battle)
+
+        self.assertEqual(
+            list(PivotalMoment.objects.filter(battle=battle).values_list("kind", "warband_id")),
+            [("there_can_be_only_one", self.player_warband.id)],
+        )
+
     def test_postbattle_leader_death_reassigns_living_leader(self):
         data = self._create_battle()
         battle_id = data["battle"]["id"]
@@ -2381,6 +2729,58 @@ class BattleApiTests(APITestCase):
         self.assertFalse(HeroItem.objects.filter(hero=owner_hero, item=healing_herbs).exists())
         self.assertTrue(HeroItem.objects.filter(hero=owner_hero, item=sword).exists())
 
+    def _record_item_uses(self, battle, user, unit_key, item, count):
+        BattleEvent.objects.bulk_create(
+            [
+                BattleEvent(
+                    battle=battle,
+                    actor_user=user,
+                    type=BattleEvent.TYPE_ITEM_USED,
+                    payload_json={"unit_key": unit_key, "item_id": item.id},
+                )
+                for _ in range(count)
+            ]
+        )
+
+    def test_used_single_use_items_are_removed_in_a_fixed_number_of_queries(self):
+        data = self._create_battle()
+        battle = Battle.objects.get(id=data["battle"]["id"])
+        potion = Item.objects.create(name="Potion", type="Miscellaneous", single_use=True)
+        sword = Item.objects.create(name="Sword", type="Weapons", single_use=False)
+
+        query_counts = []
+        for user, warband, uses in ((self.owner, self.owner_warband, 1), (self.player, self.player_warband, 4)):
+            hero = Hero.objects.create(warband=warband, name="Hero", unit_type="Champion")
+            hired_sword = HiredSword.objects.create(warband=warband, name="Sword", unit_type="Pit Fighter")
+            group = HenchmenGroup.objects.create(warband=warband, name="Group", unit_type="Warriors")
+            members = [Henchman.objects.create(group=group, name=f"Member {index}") for index in range(2)]
+            HeroItem.objects.bulk_create([HeroItem(hero=hero, item=potion) for _ in range(uses + 1)])
+            HeroItem.objects.create(hero=hero, item=sword)
+            HiredSwordItem.objects.bulk_create(
+                [HiredSwordItem(hired_sword=hired_sword, item=potion) for _ in range(uses + 1)]
+            )
+            HenchmenGroupItem.objects.bulk_create(
+                [HenchmenGroupItem(henchmen_group=group, item=potion) for _ in range(2 * uses + 1)]
+            )
+
+            self._record_item_uses(battle, user, f"hero:{hero.id}", potion, uses)
+            self._record_item_uses(battle, user, f"hero:{hero.id}", sword, uses)
+            self._record_item_uses(battle, user, f"hired_sword:{hired_sword.id}", potion, uses)
+            for member in members:
+                self._record_item_uses(battle, user, f"henchman:{member.id}", potion, uses)
+
+            participant = BattleParticipant.objects.get(battle=battle, user=user)
+            with CaptureQueriesContext(connection) as queries:
+                _remove_used_single_use_items(battle, participant)
+            query_counts.append(len(queries))
+
+            self.assertEqual(HeroItem.objects.filter(hero=hero, item=potion).count(), 1)
+            self.assertEqual(HeroItem.objects.filter(hero=hero, item=sword).count(), 1)
+            self.assertEqual(HiredSwordItem.objects.filter(hired_sword=hired_sword, item=potion).count(), 1)
+            self.assertEqual(HenchmenGroupItem.objects.filter(henchmen_group=group, item=potion).count(), 1)
+
+        self.assertEqual(query_counts[0], query_counts[1])
+
     def test_non_creator_cannot_end_active_battle(self):
         data = self._create_battle()
         battle_id = data["battle"]["id"]
@@ -2836,6 +3236,125 @@ class BattleApiTests(APITestCase):
         event_types = [event["type"] for event in response.data["events"]]
         self.assertIn("battle_started", event_types)
 
+    def test_state_returns_not_modified_for_matching_etag(self):
+        data = self._create_battle()
+        battle_id = data["battle"]["id"]
+        url = f"/api/campaigns/{self.campaign.id}/battles/{battle_id}/state/"
+
+        self.client.force_authenticate(user=self.owner)
+        self.client.get(url)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+        response = self.client.get(f"{url}?view=active", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        self.client.force_authenticate(user=self.player)
+        response = self.client.post(
+            f"/api/campaigns/{self.campaign.id}/battles/{battle_id}/join/",
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.client.force_authenticate(user=self.owner)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_state_etag_depends_on_the_delta_query(self):
+        data = self._create_battle()
+        battle_id = data["battle"]["id"]
+        url = f"/api/campaigns/{self.campaign.id}/battles/{battle_id}/state/"
+
+        self.client.force_authenticate(user=self.owner)
+        self.client.get(url)
+        response = self.client.get(f"{url}?sinceRevision=1")
+        self.assertEqual(response.status_code, 200)
+        delta_etag = response["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=delta_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data["delta"])
+
+    def test_queryset_updates_and_saves_advance_the_battle_revision(self):
+        data = self._create_battle()
+        battle = Battle.objects.get(id=data["battle"]["id"])
+        revision = battle.revision
+
+        Battle.objects.filter(id=battle.id).update(scenario="Ambush")
+        self.assertEqual(Battle.objects.get(id=battle.id).revision, revision + 1)
+
+        BattleParticipant.objects.filter(battle=battle, user=self.player).update(battle_notes="Flank left")
+        self.assertEqual(Battle.objects.get(id=battle.id).revision, revision + 2)
+        participant = BattleParticipant.objects.get(battle=battle, user=self.player)
+        self.assertEqual(participant.revision, revision + 2)
+
+        BattleParticipant.objects.filter(id=participant.id).update(last_event_id=4)
+        self.assertEqual(Battle.objects.get(id=battle.id).revision, revision + 2)
+
+        battle.scenario = "Street Fight"
+        with CaptureQueriesContext(connection) as queries:
+            battle.save(update_fields=["scenario"])
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(battle.revision, revision + 3)
+
+    def test_state_since_revision_returns_only_changed_participants(self):
+        data = self._create_battle()
+        battle_id = data["battle"]["id"]
+        url = f"/api/campaigns/{self.campaign.id}/battles/{battle_id}/state/"
+
+        for user in (self.owner, self.player):
+            self.client.force_authenticate(user=user)
+            response = self.client.post(
+                f"/api/campaigns/{self.campaign.id}/battles/{battle_id}/join/",
+                format="json",
+            )
+            self.assertEqual(response.status_code, 200)
+
+        self.client.force_authenticate(user=self.owner)
+        self.client.get(url)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data["delta"])
+        self.assertEqual(len(response.data["participants"]), 2)
+        revision = response.data["battle"]["revision"]
+
+        response = self.client.get(f"{url}?sinceRevision={revision}")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["delta"])
+        self.assertEqual(response.data["participants"], [])
+
+        self.client.force_authenticate(user=self.player)
+        response = self.client.post(
+            f"/api/campaigns/{self.campaign.id}/battles/{battle_id}/config/",
+            {"battle_notes": "Hold the bridge."},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.client.force_authenticate(user=self.owner)
+        response = self.client.get(f"{url}?sinceRevision={revision}")
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(response.data["battle"]["revision"], revision)
+        self.assertEqual(
+            [participant["user"]["id"] for participant in response.data["participants"]],
+            [self.player.id],
+        )
+
+    def test_state_rejects_invalid_since_revision(self):
+        data = self._create_battle()
+        battle_id = data["battle"]["id"]
+        self.client.force_authenticate(user=self.owner)
+        response = self.client.get(
+            f"/api/campaigns/{self.campaign.id}/battles/{battle_id}/state/?sinceRevision=abc"
+        )
+        self.assertEqual(response.status_code, 400)
+
     def test_config_persists_selected_units_and_overrides(self):
         data = self._create_battle()
         battle_id = data["battle"]["id"]
@@ -3092,6 +3611,33 @@ class BattleApiTests(APITestCase):
         self.assertEqual(len(henchmen_group_entry["members"]), 1)
         self.assertEqual(henchmen_group_entry["members"][0]["items"][0]["name"], "Healing Herbs")
 
+    def test_battle_rosters_are_cached_until_warband_units_change(self):
+        data = self._create_battle()
+        battle_id = data["battle"]["id"]
+        url = f"/api/campaigns/{self.campaign.id}/battles/{battle_id}/rosters/"
+        owner_hero = Hero.objects.create(warband=self.owner_warband, name="Captain Wolf", unit_type="Captain")
+
+        self.client.force_authenticate(user=self.owner)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[str(self.owner.id)]["heroes"][0]["displayName"], "Captain Wolf")
+
+        Hero.objects.filter(id=owner_hero.id).update(name="Renamed Silently")
+        response = self.client.get(url)
+        self.assertEqual(response.data[str(self.owner.id)]["heroes"][0]["displayName"], "Captain Wolf")
+
+        item = Item.objects.create(name="Rope & Hook", type="miscellaneous")
+        HeroItem.objects.create(hero=owner_hero, item=item)
+        response = self.client.get(url)
+        owner_hero_entry = response.data[str(self.owner.id)]["heroes"][0]
+        self.assertEqual(owner_hero_entry["displayName"], "Renamed Silently")
+        self.assertEqual([entry["name"] for entry in owner_hero_entry["items"]], ["Rope & Hook"])
+        self.assertEqual(response.data[str(self.player.id)]["heroes"], [])
+
+        owner_hero.delete()
+        response = self.client.get(url)
+        self.assertEqual(response.data[str(self.owner.id)]["heroes"], [])
+
     def test_config_persists_battle_notes(self):
         data = self._create_battle()
         battle_id = data["battle"]["id"]
@@ -9,10 +9,10 @@ from apps.core.throttling import BATTLE_WRITE_THROTTLE_CLASSES
 from apps.warbands.models import Warband
 
 from ..models import Battle, BattleEvent, BattleParticipant
+from ..states import can_transition_battle, can_transition_participant, participant_progress
 from .shared import (
     INGAME_EVENT_TYPES,
     KILLER_UNIT_TYPES,
-    _all_started_participants_confirmed,
     _apply_participant_postbattle_results,
     _append_battle_event,
     _build_battle_unit_event_payload,
@@ -325,7 +325,7 @@ class CampaignBattleFinishView(APIView):
                 return _response_with_snapshot(battle.id, events)
             if battle.status == Battle.STATUS_POSTBATTLE:
                 return _response_with_snapshot(battle.id, events)
-            if battle.status != Battle.STATUS_ACTIVE:
+            if not can_transition_battle(battle.status, Battle.STATUS_POSTBATTLE):
                 return Response({"detail": "Battle is not active"}, status=400)
             if battle.created_by_user_id != request.user.id:
                 return Response({"detail": "Only the battle creator can end the active battle"}, status=403)
@@ -363,9 +363,7 @@ class CampaignBattleFinishView(APIView):
                 Warband.objects.filter(id__in=resolved_loser_ids, losses__isnull=True).update(losses=1)
 
             for entry in participants:
-                if entry.status == BattleParticipant.STATUS_CANCELED_PREBATTLE:
-                    continue
-                if entry.status == BattleParticipant.STATUS_CONFIRMED_POSTBATTLE:
+                if not can_transition_participant(entry.status, BattleParticipant.STATUS_FINISHED_BATTLE):
                     continue
                 entry.status = BattleParticipant.STATUS_FINISHED_BATTLE
                 entry.finished_at = entry.finished_at or now
@@ -456,7 +454,7 @@ class CampaignBattleFinalizePostbattleView(APIView):
                 return _response_with_snapshot(battle.id, events)
             if battle.status != Battle.STATUS_POSTBATTLE:
                 return Response({"detail": "Battle is not in postbattle"}, status=400)
-            if participant.status != BattleParticipant.STATUS_FINISHED_BATTLE:
+            if not can_transition_participant(participant.status, BattleParticipant.STATUS_CONFIRMED_POSTBATTLE):
                 return Response({"detail": "You must enter postbattle before finalizing"}, status=400)
 
             try:
@@ -482,7 +480,7 @@ class CampaignBattleFinalizePostbattleView(APIView):
             )
             events.append(event)
 
-            if battle.status != Battle.STATUS_ENDED and _all_started_participants_confirmed(battle.id):
+            if battle.status != Battle.STATUS_ENDED and participant_progress(battle.id).all_started_confirmed:
                 _finalize_battle(battle, request.user, events)
 
             _touch_participant(
@@ -506,7 +504,7 @@ class CampaignBattleConfirmView(CampaignBattleFinalizePostbattleView):
                 return _response_with_snapshot(battle.id, events)
             if battle.status != Battle.STATUS_POSTBATTLE:
                 return Response({"detail": "Battle is not in postbattle"}, status=400)
-            if participant.status != BattleParticipant.STATUS_FINISHED_BATTLE:
+            if not can_transition_participant(participant.status, BattleParticipant.STATUS_CONFIRMED_POSTBATTLE):
                 return Response({"detail": "You must enter postbattle before leaving"}, status=400)
 
             participant.postbattle_json = {
@@ -537,7 +535,7 @@ class CampaignBattleConfirmView(CampaignBattleFinalizePostbattleView):
             )
             events.append(event)
 
-            if battle.status != Battle.STATUS_ENDED and _all_started_participants_confirmed(battle.id):
+            if battle.status != Battle.STATUS_ENDED and participant_progress(battle.id).all_started_confirmed:
                 _finalize_battle(battle, request.user, events)
 
             _touch_participant(
@@ -3,6 +3,7 @@ from datetime import datetime, time
 
 from django.db import transaction
 from django.utils.dateparse import parse_date
+from django.utils.http import parse_etags
 from django.utils import timezone
 from rest_framework import permissions, status
 from rest_framework.response import Response
@@ -16,14 +17,12 @@ from apps.notifications.utils import resolve_notification, resolve_notifications
 from apps.warbands.models import Warband
 
 from ..models import Battle, BattleEvent, BattleParticipant
+from ..states import can_transition_battle, can_transition_participant, participant_progress
 from .shared import (
-    _all_participants_accepted,
-    _all_participants_canceled_prebattle,
-    _all_participants_ready,
-    _all_reported_result_participants_approved,
     _append_battle_event,
     _battle_rosters_payload,
     _battle_snapshot,
+    _battle_state_etag,
     _battle_state_payload,
     _cancel_battle_for_all_participants,
     _commit_reported_result_battle,
@@ -499,6 +498,14 @@ class CampaignBattleReportedResultCreateView(APIView):
         return _response_with_snapshot(battle.id, events, response_status=status.HTTP_201_CREATED)
 
 
+def _etag_matches(request, etag: str) -> bool:
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    weak_etag = etag.removeprefix("W/")
+    return any(candidate.removeprefix("W/") == weak_etag for candidate in parse_etags(if_none_match))
+
+
 class CampaignBattleStateView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
@@ -517,11 +524,29 @@ class CampaignBattleStateView(APIView):
         if view not in {"full", "prebattle", "active", "postbattle"}:
             return Response({"detail": "Invalid view"}, status=400)
 
-        payload = _battle_state_payload(battle.id, since_event_id_int, participant_view=view)
+        since_revision = request.query_params.get("sinceRevision", "0")
+        try:
+            since_revision_int = max(0, int(since_revision))
+        except (TypeError, ValueError):
+            return Response({"detail": "Invalid sinceRevision"}, status=400)
+
+        etag = _battle_state_etag(
+            battle, participant_view=view, since_event_id=since_event_id_int, since_revision=since_revision_int
+        )
+        if _etag_matches(request, etag):
+            _touch_participant(participant)
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        payload = _battle_state_payload(
+            battle.id,
+            since_event_id_int,
+            participant_view=view,
+            since_revision=since_revision_int,
+        )
         events = payload.get("events", [])
         last_event_id = events[-1]["id"] if events else None
         _touch_participant(participant, last_event_id=last_event_id)
-        return Response(payload)
+        return Response(payload, headers={"ETag": etag})
 
 
 class CampaignBattleRosterView(APIView):
@@ -637,13 +662,17 @@ class CampaignBattleJoinView(APIView):
             event_type = None
 
             if battle.status == Battle.STATUS_INVITING:
-                if participant.status == BattleParticipant.STATUS_INVITED:
+                if participant.status == BattleParticipant.STATUS_INVITED and can_transition_participant(
+                    participant.status, BattleParticipant.STATUS_ACCEPTED
+                ):
                     participant.status = BattleParticipant.STATUS_ACCEPTED
                     participant.responded_at = now
                     participant.save(update_fields=["status", "responded_at", "updated_at"])
                     state_changed = True
 
-                if _all_participants_accepted(battle.id):
+                if participant_progress(battle.id).all_accepted and can_transition_battle(
+                    battle.status, Battle.STATUS_PREBATTLE
+                ):
                     battle.status = Battle.STATUS_PREBATTLE
                     battle.save(update_fields=["status", "updated_at"])
                     state_changed = True
@@ -651,7 +680,9 @@ class CampaignBattleJoinView(APIView):
                         BattleParticipant.objects.select_for_update().filter(battle_id=battle.id)
                     )
                     for entry in participant_entries:
-                        if entry.status == BattleParticipant.STATUS_ACCEPTED:
+                        if entry.status == BattleParticipant.STATUS_ACCEPTED and can_transition_participant(
+                            entry.status, BattleParticipant.STATUS_JOINED_PREBATTLE
+                        ):
                             entry.status = BattleParticipant.STATUS_JOINED_PREBATTLE
                             entry.joined_at = entry.joined_at or now
                             entry.save(update_fields=["status", "joined_at", "updated_at"])
@@ -669,23 +700,22 @@ class CampaignBattleJoinView(APIView):
                         )
                     resolve_notifications_for_reference(Notification.TYPE_BATTLE_INVITE, str(battle.id))
             elif battle.status == Battle.STATUS_PREBATTLE:
-                if participant.status != BattleParticipant.STATUS_READY:
+                # Joining again must not drop a ready participant back to joined.
+                if participant.status != BattleParticipant.STATUS_READY and can_transition_participant(
+                    participant.status, BattleParticipant.STATUS_JOINED_PREBATTLE
+                ):
                     participant.status = BattleParticipant.STATUS_JOINED_PREBATTLE
                     participant.joined_at = participant.joined_at or now
                     participant.save(update_fields=["status", "joined_at", "updated_at"])
                     state_changed = True
             elif battle.status == Battle.STATUS_ACTIVE:
-                if participant.status not in (
-                    BattleParticipant.STATUS_FINISHED_BATTLE,
-                    BattleParticipant.STATUS_CONFIRMED_POSTBATTLE,
-                ):
-                    if participant.status != BattleParticipant.STATUS_IN_BATTLE:
-                        participant.status = BattleParticipant.STATUS_IN_BATTLE
-                        participant.battle_joined_at = participant.battle_joined_at or now
-                        participant.save(update_fields=["status", "battle_joined_at", "updated_at"])
-                        event_type = BattleEvent.TYPE_PARTICIPANT_JOINED_BATTLE
+                if can_transition_participant(participant.status, BattleParticipant.STATUS_IN_BATTLE):
+                    participant.status = BattleParticipant.STATUS_IN_BATTLE
+                    participant.battle_joined_at = participant.battle_joined_at or now
+                    participant.save(update_fields=["status", "battle_joined_at", "updated_at"])
+                    event_type = BattleEvent.TYPE_PARTICIPANT_JOINED_BATTLE
             else:
-                if participant.status != BattleParticipant.STATUS_CONFIRMED_POSTBATTLE:
+                if can_transition_participant(participant.status, BattleParticipant.STATUS_FINISHED_BATTLE):
                     participant.status = BattleParticipant.STATUS_FINISHED_BATTLE
                     participant.finished_at = participant.finished_at or now
                     participant.save(update_fields=["status", "finished_at", "updated_at"])
@@ -748,7 +778,7 @@ class CampaignBattleReportedResultApproveView(APIView):
             resolve_notification(request.user.id, Notification.TYPE_BATTLE_RESULT_REQUEST, str(battle.id))
             _touch_participant(participant)
 
-            if _all_reported_result_participants_approved(battle.id):
+            if participant_progress(battle.id).all_reported_result_approved:
                 _commit_reported_result_battle(battle)
                 battle.status = Battle.STATUS_ENDED
                 battle.ended_at = battle.ended_at or now
@@ -858,7 +888,7 @@ class CampaignBattleReadyView(APIView):
             now = timezone.now()
             state_changed = False
             if ready:
-                if participant.status != BattleParticipant.STATUS_READY:
+                if can_transition_participant(participant.status, BattleParticipant.STATUS_READY):
                     if participant.status == BattleParticipant.STATUS_ACCEPTED:
                         participant.joined_at = participant.joined_at or now
                     participant.status = BattleParticipant.STATUS_READY
@@ -918,7 +948,7 @@ class CampaignBattleCancelView(APIView):
                 return Response({"detail": "Battle is already canceled"}, status=400)
 
             state_changed = False
-            if participant.status != BattleParticipant.STATUS_CANCELED_PREBATTLE:
+            if can_transition_participant(participant.status, BattleParticipant.STATUS_CANCELED_PREBATTLE):
                 now = timezone.now()
                 participant.status = BattleParticipant.STATUS_CANCELED_PREBATTLE
                 participant.canceled_at = now
@@ -926,7 +956,7 @@ class CampaignBattleCancelView(APIView):
                 participant.save(update_fields=["status", "canceled_at", "responded_at", "updated_at"])
                 state_changed = True
 
-            if _all_participants_canceled_prebattle(battle.id):
+            if participant_progress(battle.id).all_canceled_prebattle:
                 battle.status = Battle.STATUS_CANCELED
                 battle.ended_at = timezone.now()
                 battle.save(update_fields=["status", "ended_at", "updated_at"])
@@ -998,8 +1028,6 @@ class CampaignBattleStartView(APIView):
                 return Response({"detail": "Only the battle creator can start this battle"}, status=403)
             if battle.flow_type != Battle.FLOW_TYPE_NORMAL:
                 return Response({"detail": "Reported results do not have an active battle phase"}, status=400)
-            if battle.status in (Battle.STATUS_ACTIVE, Battle.STATUS_POSTBATTLE, Battle.STATUS_ENDED):
-                return Response({"detail": "Battle already started"}, status=400)
             if battle.status == Battle.STATUS_INVITING:
                 return Response(
                     {"detail": "Waiting for all participants to accept invitation"},
@@ -1007,7 +1035,9 @@ class CampaignBattleStartView(APIView):
                 )
             if battle.status == Battle.STATUS_CANCELED:
                 return Response({"detail": "Battle is canceled"}, status=400)
-            if not _all_participants_ready(battle.id):
+            if not can_transition_battle(battle.status, Battle.STATUS_ACTIVE):
+                return Response({"detail": "Battle already started"}, status=400)
+            if not participant_progress(battle.id).all_ready:
                 return Response({"detail": "All participants must be ready before starting"}, status=400)
 
             now = timezone.now()
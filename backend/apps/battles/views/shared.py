@@ -1,22 +1,26 @@
-import logging
 from collections import defaultdict
 from decimal import Decimal
 
-from django.db import models, transaction
-from django.db.models import F
+from django.db import models
+from django.db.models import Count, F
+from django.db.models.functions import RowNumber
 from django.utils import timezone
 from rest_framework.response import Response
 
+from apps.campaigns.kill_stats import refresh_unit_kill_stats
 from apps.campaigns.models import CampaignSettings
+from apps.campaigns.pivotal_moments import observe_battle_event
 from apps.campaigns.permissions import get_membership
+from apps.items.effects import campaign_item_effects, effective_item_cost
+from apps.jobs.queue import enqueue_job
 from apps.items.models import Item
 from apps.logs.utils import log_warband_event
 from apps.notifications.models import Notification
 from apps.notifications.utils import resolve_notifications_for_reference
 from apps.realtime.services import (
     get_battle_channel_name,
-    send_battle_event,
-    send_user_notification,
+    queue_battle_event,
+    queue_user_notification,
 )
 from apps.special.models import Special
 from apps.warbands.models import (
@@ -35,11 +39,14 @@ from apps.warbands.models import (
 from apps.warbands.utils.leaders import ensure_single_living_leader
 from apps.warbands.utils.henchmen_level import count_new_henchmen_level_ups
 from apps.warbands.utils.hero_level import count_new_level_ups
+from apps.warbands.utils.totals import refresh_warband_rating
 from apps.warbands.utils.trades import TradeHelper
 
+from ..jobs import PROCESS_ENDED_BATTLE_JOB
 from ..models import Battle, BattleEvent, BattleParticipant
-
-logger = logging.getLogger(__name__)
+from ..presence import touch_presence
+from ..roster_cache import get_cached_rosters, invalidate_warband_roster, set_cached_rosters
+from ..summaries import write_battle_summaries
 
 KILLER_UNIT_TYPES = {"hero", "hired_sword", "henchman", "custom", "bestiary"}
 AGGREGATED_KILLER_UNIT_TYPES = {"hero", "hired_sword", "henchman"}
@@ -61,6 +68,11 @@ NUMERIC_STAT_KEYS = {
 }
 ARMOUR_SAVE_STAT_KEY = "armour_save"
 ALL_OVERRIDE_STAT_KEYS = NUMERIC_STAT_KEYS | {ARMOUR_SAVE_STAT_KEY}
+SINGLE_USE_ITEM_LINKS = {
+    "hero": (HeroItem, "hero"),
+    "hired_sword": (HiredSwordItem, "hired_sword"),
+    "henchman": (HenchmenGroupItem, "henchmen_group"),
+}
 
 
 def _display_name(user):
@@ -85,6 +97,7 @@ def _serialize_battle(battle: Battle) -> dict:
         "started_at": battle.started_at.isoformat() if battle.started_at else None,
         "ended_at": battle.ended_at.isoformat() if battle.ended_at else None,
         "post_processed_at": (battle.post_processed_at.isoformat() if battle.post_processed_at else None),
+        "revision": battle.revision,
         "channel": get_battle_channel_name(battle.id),
     }
 
@@ -94,6 +107,7 @@ def _serialize_participant(participant: BattleParticipant, participant_view: str
         "id": participant.id,
         "battle_id": participant.battle_id,
         "status": participant.status,
+        "revision": participant.revision,
         "connection_state": participant.connection_state,
         "last_event_id": participant.last_event_id,
         "last_seen_at": participant.last_seen_at.isoformat() if participant.last_seen_at else None,
@@ -151,24 +165,43 @@ def _serialize_event(event: BattleEvent) -> dict:
     }
 
 
-def _battle_snapshot(battle_id: int, participant_view: str = "full") -> dict:
+def _battle_snapshot(battle_id: int, participant_view: str = "full", since_revision: int = 0) -> dict:
     battle = Battle.objects.filter(id=battle_id).first()
-    participants = (
-        BattleParticipant.objects.select_related("user", "warband").filter(battle_id=battle_id).order_by("id")
-    )
+    participants = BattleParticipant.objects.select_related("user", "warband").filter(battle_id=battle_id)
+    if since_revision > 0:
+        participants = participants.filter(revision__gt=since_revision)
     return {
         "battle": _serialize_battle(battle) if battle else None,
-        "participants": [_serialize_participant(participant, participant_view) for participant in participants],
+        "participants": [
+            _serialize_participant(participant, participant_view) for participant in participants.order_by("id")
+        ],
     }
 
 
-def _battle_state_payload(battle_id: int, since_event_id: int, participant_view: str = "full") -> dict:
-    snapshot = _battle_snapshot(battle_id, participant_view=participant_view)
+def _battle_state_payload(
+    battle_id: int,
+    since_event_id: int,
+    participant_view: str = "full",
+    since_revision: int = 0,
+) -> dict:
+    snapshot = _battle_snapshot(battle_id, participant_view=participant_view, since_revision=since_revision)
+    snapshot["delta"] = since_revision > 0
     events = BattleEvent.objects.filter(battle_id=battle_id, id__gt=since_event_id).order_by("id")
     snapshot["events"] = [_serialize_event(event) for event in events]
     return snapshot
 
 
+def _battle_state_etag(
+    battle: Battle, participant_view: str = "full", since_event_id: int = 0, since_revision: int = 0
+) -> str:
+    last_event_id = (
+        BattleEvent.objects.filter(battle_id=battle.id).order_by("-id").values_list("id", flat=True).first() or 0
+    )
+    # A delta response differs from a full one at the same revision, so the query is part of the tag.
+    query = f"{participant_view}-se{since_event_id}-sr{since_revision}"
+    return f'W/"battle-{battle.id}-r{battle.revision}-e{last_event_id}-{query}"'
+
+
 def _battle_item_entries_from_links(links, *, item_attr: str = "item") -> list[dict]:
     counts: dict[tuple[int, str], dict] = {}
     for link in links:
@@ -306,14 +339,7 @@ def _serialize_battle_henchmen_group_roster_entry(group: HenchmenGroup) -> dict:
     }
 
 
-def _battle_rosters_payload(battle_id: int) -> dict:
-    participants = list(
-        BattleParticipant.objects.select_related("warband").filter(battle_id=battle_id).order_by("id")
-    )
-    warband_ids = [participant.warband_id for participant in participants]
-    if not warband_ids:
-        return {}
-
+def _build_warband_rosters(warband_ids: list[int]) -> dict[int, dict]:
     heroes_by_warband: defaultdict[int, list[dict]] = defaultdict(list)
     heroes = (
         Hero.objects.filter(warband_id__in=warband_ids, dead=False)
@@ -364,14 +390,32 @@ def _battle_rosters_payload(battle_id: int) -> dict:
             _serialize_battle_henchmen_group_roster_entry(group)
         )
 
-    payload = {}
-    for participant in participants:
-        payload[str(participant.user_id)] = {
-            "heroes": heroes_by_warband[participant.warband_id],
-            "hiredSwords": hired_swords_by_warband[participant.warband_id],
-            "henchmenGroups": henchmen_groups_by_warband[participant.warband_id],
+    return {
+        warband_id: {
+            "heroes": heroes_by_warband[warband_id],
+            "hiredSwords": hired_swords_by_warband[warband_id],
+            "henchmenGroups": henchmen_groups_by_warband[warband_id],
         }
-    return payload
+        for warband_id in warband_ids
+    }
+
+
+def _battle_rosters_payload(battle_id: int) -> dict:
+    participants = list(
+        BattleParticipant.objects.filter(battle_id=battle_id).order_by("id").values_list("user_id", "warband_id")
+    )
+    warband_ids = [warband_id for _user_id, warband_id in participants]
+    if not warband_ids:
+        return {}
+
+    rosters, versions = get_cached_rosters(battle_id, warband_ids)
+    missing_warband_ids = [warband_id for warband_id in warband_ids if warband_id not in rosters]
+    if missing_warband_ids:
+        built_rosters = _build_warband_rosters(missing_warband_ids)
+        set_cached_rosters(battle_id, built_rosters, versions)
+        rosters.update(built_rosters)
+
+    return {str(user_id): rosters[warband_id] for user_id, warband_id in participants}
 
 
 def _append_battle_event(
@@ -386,39 +430,14 @@ def _append_battle_event(
         type=event_type,
         payload_json=payload or {},
     )
+    observe_battle_event(battle, event)
     serialized = _serialize_event(event)
-    transaction.on_commit(
-        lambda battle_id=battle.id, event_name=event_type, data=serialized: _send_battle_event_after_commit(
-            battle_id, event_name, data
-        )
-    )
+    queue_battle_event(battle.id, event_type, serialized)
     return serialized
 
 
 def _notify_user(user_id: int, event: str, payload: dict) -> None:
-    transaction.on_commit(
-        lambda uid=user_id, event_name=event, data=payload: _send_user_notification_after_commit(
-            uid, event_name, data
-        )
-    )
-
-
-def _send_battle_event_after_commit(battle_id: int, event_name: str, payload: dict) -> None:
-    logger.info("Sending battle event after commit battle_id=%s event=%s", battle_id, event_name)
-    try:
-        send_battle_event(battle_id, event_name, payload)
-    except Exception:
-        logger.exception("Failed battle event after commit battle_id=%s event=%s", battle_id, event_name)
-        raise
-
-
-def _send_user_notification_after_commit(user_id: int, event_name: str, payload: dict) -> None:
-    logger.info("Sending user notification after commit user_id=%s event=%s", user_id, event_name)
-    try:
-        send_user_notification(user_id, event_name, payload)
-    except Exception:
-        logger.exception("Failed user notification after commit user_id=%s event=%s", user_id, event_name)
-        raise
+    queue_user_notification(user_id, event, payload)
 
 
 def _notify_battle_state_changed(battle: Battle, *, actor_user_id: int | None = None, reason: str = "") -> None:
@@ -431,9 +450,7 @@ def _notify_battle_state_changed(battle: Battle, *, actor_user_id: int | None =
         payload["actor_user_id"] = actor_user_id
     if reason:
         payload["reason"] = reason
-    transaction.on_commit(
-        lambda battle_id=battle.id, data=payload: send_battle_event(battle_id, "battle_state_updated", data)  # type: ignore[misc]
-    )
+    queue_battle_event(battle.id, "battle_state_updated", payload)
 
 
 def _cancel_battle_for_all_participants(
@@ -497,13 +514,7 @@ def _cancel_battle_for_all_participants(
 
 
 def _touch_participant(participant: BattleParticipant, *, last_event_id: int | None = None) -> None:
-    participant.connection_state = BattleParticipant.CONNECTION_ONLINE
-    participant.last_seen_at = timezone.now()
-    update_fields = ["connection_state", "last_seen_at"]
-    if last_event_id is not None:
-        participant.last_event_id = last_event_id
-        update_fields.append("last_event_id")
-    participant.save(update_fields=update_fields)
+    touch_presence(participant, last_event_id=last_event_id)
 
 
 def _get_user_battle_participant(campaign_id: int, battle_id: int, user, for_update=False):
@@ -524,65 +535,6 @@ def _get_user_battle_participant(campaign_id: int, battle_id: int, user, for_upd
     return battle, participant
 
 
-def _all_participants_ready(battle_id: int) -> bool:
-    participants = BattleParticipant.objects.filter(battle_id=battle_id)
-    return participants.exists() and not participants.exclude(status=BattleParticipant.STATUS_READY).exists()
-
-
-def _all_participants_accepted(battle_id: int) -> bool:
-    participants = BattleParticipant.objects.filter(battle_id=battle_id)
-    return (
-        participants.exists()
-        and not participants.exclude(
-            status__in=(
-                BattleParticipant.STATUS_ACCEPTED,
-                BattleParticipant.STATUS_JOINED_PREBATTLE,
-                BattleParticipant.STATUS_READY,
-            )
-        ).exists()
-    )
-
-
-def _all_reported_result_participants_approved(battle_id: int) -> bool:
-    participants = BattleParticipant.objects.filter(battle_id=battle_id)
-    return (
-        participants.exists()
-        and not participants.exclude(status=BattleParticipant.STATUS_REPORTED_RESULT_APPROVED).exists()
-    )
-
-
-def _all_participants_canceled_prebattle(battle_id: int) -> bool:
-    participants = BattleParticipant.objects.filter(battle_id=battle_id)
-    return (
-        participants.exists() and not participants.exclude(status=BattleParticipant.STATUS_CANCELED_PREBATTLE).exists()
-    )
-
-
-def _all_started_participants_finished(battle_id: int) -> bool:
-    participants = BattleParticipant.objects.filter(battle_id=battle_id).exclude(
-        status=BattleParticipant.STATUS_CANCELED_PREBATTLE
-    )
-    return (
-        participants.exists()
-        and not participants.exclude(
-            status__in=(
-                BattleParticipant.STATUS_FINISHED_BATTLE,
-                BattleParticipant.STATUS_CONFIRMED_POSTBATTLE,
-            )
-        ).exists()
-    )
-
-
-def _all_started_participants_confirmed(battle_id: int) -> bool:
-    participants = BattleParticipant.objects.filter(battle_id=battle_id).exclude(
-        status=BattleParticipant.STATUS_CANCELED_PREBATTLE
-    )
-    return (
-        participants.exists()
-        and not participants.exclude(status=BattleParticipant.STATUS_CONFIRMED_POSTBATTLE).exists()
-    )
-
-
 def _latest_finished_participant(battle_id: int):
     return (
         BattleParticipant.objects.filter(
@@ -607,44 +559,20 @@ def _participant_permanent_selected_unit_keys(participant: BattleParticipant) ->
 
 
 def _apply_kill_aggregation(battle_id: int) -> None:
-    totals: dict[str, defaultdict[int, int]] = {
-        "hero": defaultdict(int),
-        "hired_sword": defaultdict(int),
-        "henchman": defaultdict(int),
-    }
-    kill_events = BattleEvent.objects.filter(
-        battle_id=battle_id,
-        type__in=(
-            BattleEvent.TYPE_KILL_RECORDED,
-            BattleEvent.TYPE_UNIT_KILL_RECORDED,
-        ),
-    ).values_list("type", "payload_json")
-
-    for event_type, payload in kill_events:
-        if not isinstance(payload, dict):
-            continue
-        if event_type == BattleEvent.TYPE_UNIT_KILL_RECORDED:
-            killer_payload = payload.get("killer", {})
-            if not isinstance(killer_payload, dict):
-                continue
-            unit_type = str(killer_payload.get("unit_type", "")).strip().lower()
-            unit_id = killer_payload.get("unit_id")
-        else:
-            unit_type = str(payload.get("killer_unit_type", "")).strip().lower()
-            unit_id = payload.get("killer_unit_id")
-        if unit_type not in KILLER_UNIT_TYPES:
-            continue
-        if unit_type not in AGGREGATED_KILLER_UNIT_TYPES:
-            continue
-        if unit_id is None:
-            continue
-        try:
-            parsed_unit_id = int(unit_id)
-        except (TypeError, ValueError):
-            continue
-        if parsed_unit_id <= 0:
-            continue
-        totals[unit_type][parsed_unit_id] += 1
+    totals: dict[str, dict[int, int]] = {unit_type: {} for unit_type in AGGREGATED_KILLER_UNIT_TYPES}
+    kill_counts = (
+        BattleEvent.objects.filter(
+            battle_id=battle_id,
+            type__in=BattleEvent.KILL_TYPES,
+            killer_unit_type__in=AGGREGATED_KILLER_UNIT_TYPES,
+            killer_unit_id__isnull=False,
+        )
+        .values_list("killer_unit_type", "killer_unit_id")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    for unit_type, unit_id, count in kill_counts:
+        totals[unit_type][unit_id] = count
 
     for unit_id, count in totals["hero"].items():
         Hero.objects.filter(id=unit_id).update(kills=F("kills") + count)
@@ -653,6 +581,10 @@ def _apply_kill_aggregation(battle_id: int) -> None:
     for unit_id, count in totals["henchman"].items():
         Henchman.objects.filter(id=unit_id).update(kills=F("kills") + count)
 
+    # The F() updates bypass post_save, so refresh the leaderboard rows explicitly.
+    for unit_kind, unit_totals in totals.items():
+        refresh_unit_kill_stats(unit_kind, unit_totals.keys())
+
 
 def _finalize_battle(battle: Battle, actor_user, events: list[dict]) -> None:
     if battle.status == Battle.STATUS_ENDED:
@@ -673,10 +605,11 @@ def _finalize_battle(battle: Battle, actor_user, events: list[dict]) -> None:
             payload={"winner_warband_ids": battle.winner_warband_ids_json or []},
         )
     )
+    write_battle_summaries(battle)
+    # Runs inside the ending transaction: a retried job could hand back trading actions a warband
+    # has already spent since the battle ended.
     _reset_trading_actions_for_battle_participants(battle)
-    from apps.campaigns.pivotal_moments import generate_pivotal_moments_for_battle
-
-    generate_pivotal_moments_for_battle(battle)
+    enqueue_job(PROCESS_ENDED_BATTLE_JOB, {"battle_id": battle.id}, user=actor_user)
 
 
 def _commit_reported_result_battle(battle: Battle) -> None:
@@ -703,6 +636,7 @@ def _commit_reported_result_battle(battle: Battle) -> None:
             "complete",
             _build_battle_complete_log_payload(battle, participant),
         )
+    write_battle_summaries(battle)
 
 
 def _battle_is_most_recent_for_warband(battle: Battle, warband_id: int) -> bool:
@@ -1417,11 +1351,11 @@ def _exploration_resource_amount(dice_values: list[int]) -> int:
     return 7
 
 
-def _resolve_find_item_cost(item: Item) -> int | None:
+def _resolve_find_item_cost(item: Item, effect_keys: tuple[str, ...]) -> int | None:
     costs = [availability.cost for availability in item.availabilities.all() if availability.cost is not None]
     if not costs:
         return None
-    return int(min(costs))
+    return int(effective_item_cost(item, min(costs), effect_keys))
 
 
 def _add_stash_items(warband: Warband, item: Item, costs: list[int | None]) -> WarbandItem | None:
@@ -1636,48 +1570,51 @@ def _remove_used_single_use_items(battle: Battle, participant: BattleParticipant
         ).values_list("id", "group_id")
     }
 
+    consumed_counts: dict[str, defaultdict[tuple[int, int], int]] = {
+        "hero": defaultdict(int),
+        "hired_sword": defaultdict(int),
+        "henchman": defaultdict(int),
+    }
     for (unit_type, unit_id, item_id), count in usage_counts.items():
         if item_id not in single_use_item_ids or count <= 0:
             continue
+        if unit_type == "henchman":
+            # Henchmen share their group's equipment, so usages by members of a group add up.
+            unit_id = henchman_group_ids.get(unit_id)
+            if not unit_id:
+                continue
+        consumed_counts[unit_type][(unit_id, item_id)] += count
 
-        if unit_type == "hero":
-            row_ids = list(
-                HeroItem.objects.select_for_update()
-                .filter(hero_id=unit_id, hero__warband_id=participant.warband_id, item_id=item_id)
-                .order_by("id")
-                .values_list("id", flat=True)[:count]
-            )
-            if row_ids:
-                HeroItem.objects.filter(id__in=row_ids).delete()
-            continue
+    for unit_type, (model, unit_field) in SINGLE_USE_ITEM_LINKS.items():
+        _delete_consumed_unit_items(model, unit_field, participant.warband_id, consumed_counts[unit_type])
 
-        if unit_type == "hired_sword":
-            row_ids = list(
-                HiredSwordItem.objects.select_for_update()
-                .filter(hired_sword_id=unit_id, hired_sword__warband_id=participant.warband_id, item_id=item_id)
-                .order_by("id")
-                .values_list("id", flat=True)[:count]
-            )
-            if row_ids:
-                HiredSwordItem.objects.filter(id__in=row_ids).delete()
-            continue
 
-        if unit_type == "henchman":
-            group_id = henchman_group_ids.get(unit_id)
-            if not group_id:
-                continue
-            row_ids = list(
-                HenchmenGroupItem.objects.select_for_update()
-                .filter(
-                    henchmen_group_id=group_id,
-                    henchmen_group__warband_id=participant.warband_id,
-                    item_id=item_id,
-                )
-                .order_by("id")
-                .values_list("id", flat=True)[:count]
-            )
-            if row_ids:
-                HenchmenGroupItem.objects.filter(id__in=row_ids).delete()
+def _delete_consumed_unit_items(model, unit_field: str, warband_id: int, counts: dict[tuple[int, int], int]) -> None:
+    """Delete the oldest `count` link rows of each (unit, item) pair."""
+    if not counts:
+        return
+    unit_id_field = f"{unit_field}_id"
+    pair_filter = models.Q()
+    pair_counts = []
+    for (unit_id, item_id), count in counts.items():
+        pair = models.Q(**{unit_id_field: unit_id, "item_id": item_id})
+        pair_filter |= pair
+        pair_counts.append(models.When(pair, then=models.Value(count)))
+    consumed_ids = (
+        model.objects.filter(pair_filter, **{f"{unit_field}__warband_id": warband_id})
+        .annotate(
+            usage_rank=models.Window(
+                RowNumber(),
+                partition_by=[F(unit_id_field), F("item_id")],
+                order_by=F("id").asc(),
+            ),
+            usage_count=models.Case(*pair_counts, output_field=models.IntegerField()),
+        )
+        .filter(usage_rank__lte=F("usage_count"))
+        .values("id")
+    )
+    # Prefetch the unit so the roster post_delete handler reads its warband without a query per row.
+    model.objects.filter(id__in=consumed_ids).prefetch_related(unit_field).delete()
 
 
 def _apply_participant_postbattle_results(battle: Battle, participant: BattleParticipant, postbattle_json: dict) -> None:
@@ -1724,6 +1661,15 @@ def _apply_participant_postbattle_results(battle: Battle, participant: BattlePar
         )
     }
 
+    # Changes are collected in memory and flushed below in a fixed number of queries, so the
+    # locks taken above are held for the same time whatever the size of the roster.
+    changed_heroes: dict[int, Hero] = {}
+    hero_update_fields: set[str] = set()
+    changed_hired_swords: dict[int, HiredSword] = {}
+    hired_sword_update_fields: set[str] = set()
+    changed_henchmen: dict[int, Henchman] = {}
+    killer_ids: defaultdict[str, set[int]] = defaultdict(set)
+    requested_specials: set[tuple[int, int]] = set()
     group_xp_by_id: dict[int, int] = {}
     group_stats_override_by_id: dict[int, dict[str, int | str]] = {}
     group_stats_update_fields_by_id: defaultdict[int, set[str]] = defaultdict(set)
@@ -1754,10 +1700,12 @@ def _apply_participant_postbattle_results(battle: Battle, participant: BattlePar
                 hero.dead = True
                 update_fields.append("dead")
             if update_fields:
-                hero.save(update_fields=[*dict.fromkeys(update_fields), "updated_at"])
+                hero_update_fields.update(update_fields)
+                changed_heroes[hero.id] = hero
+            if kill_count > 0:
+                killer_ids["hero"].add(hero.id)
             for special_id in result.get("special_ids", []):
-                if not HeroSpecial.objects.filter(hero_id=hero.id, special_id=special_id).exists():
-                    HeroSpecial.objects.create(hero_id=hero.id, special_id=special_id)
+                requested_specials.add((hero.id, special_id))
             continue
 
         if parsed["unit_type"] == "hired_sword":
@@ -1779,7 +1727,10 @@ def _apply_participant_postbattle_results(battle: Battle, participant: BattlePar
                 hired_sword.dead = True
                 update_fields.append("dead")
             if update_fields:
-                hired_sword.save(update_fields=[*dict.fromkeys(update_fields), "updated_at"])
+                hired_sword_update_fields.update(update_fields)
+                changed_hired_swords[hired_sword.id] = hired_sword
+            if kill_count > 0:
+                killer_ids["hired_sword"].add(hired_sword.id)
             continue
 
         if parsed["unit_type"] == "henchman":
@@ -1801,32 +1752,80 @@ def _apply_participant_postbattle_results(battle: Battle, participant: BattlePar
                 )
             if kill_count > 0:
                 henchman.kills += kill_count
+                killer_ids["henchman"].add(henchman.id)
+                changed_henchmen[henchman.id] = henchman
             if dead and not henchman.dead:
                 henchman.dead = True
-            henchman.save(update_fields=["kills", "dead"])
+                changed_henchmen[henchman.id] = henchman
             existing_group_xp = group_xp_by_id.get(henchman.group_id)
             if existing_group_xp is None:
                 group_xp_by_id[henchman.group_id] = effective_xp_earned
             elif existing_group_xp != effective_xp_earned:
                 raise ValueError("All henchmen in a group must share the same xp_earned value")
 
+    now = timezone.now()
+    if changed_heroes:
+        for hero in changed_heroes.values():
+            hero.updated_at = now
+        Hero.objects.bulk_update(changed_heroes.values(), [*sorted(hero_update_fields), "updated_at"])
+    if changed_hired_swords:
+        for hired_sword in changed_hired_swords.values():
+            hired_sword.updated_at = now
+        HiredSword.objects.bulk_update(
+            changed_hired_swords.values(), [*sorted(hired_sword_update_fields), "updated_at"]
+        )
+    if changed_henchmen:
+        Henchman.objects.bulk_update(changed_henchmen.values(), ["kills", "dead"])
+
+    if requested_specials:
+        existing_specials = set(
+            HeroSpecial.objects.filter(
+                hero_id__in={hero_id for hero_id, _ in requested_specials},
+                special_id__in={special_id for _, special_id in requested_specials},
+            ).values_list("hero_id", "special_id")
+        )
+        HeroSpecial.objects.bulk_create(
+            [
+                HeroSpecial(hero_id=hero_id, special_id=special_id)
+                for hero_id, special_id in sorted(requested_specials - existing_specials)
+            ]
+        )
+
     ensure_single_living_leader(participant.warband_id)
 
+    living_group_ids = set(
+        Henchman.objects.filter(group_id__in=henchmen_groups.keys(), dead=False)
+        .values_list("group_id", flat=True)
+        .distinct()
+    )
+    changed_groups: list[HenchmenGroup] = []
+    group_update_fields: set[str] = set()
     for group_id, group in henchmen_groups.items():
         xp_earned = 0 if group.no_level_ups else group_xp_by_id.get(group_id, 0)
-        update_fields = list(group_stats_update_fields_by_id.get(group_id, set()))
+        update_fields = set(group_stats_update_fields_by_id.get(group_id, set()))
         if xp_earned > 0:
             previous_xp = group.xp or 0
             next_xp = previous_xp + xp_earned
             group.xp = next_xp
             group.level_up += count_new_henchmen_level_ups(previous_xp, next_xp)
-            update_fields.extend(["xp", "level_up"])
-        all_group_members_dead = not Henchman.objects.filter(group_id=group_id, dead=False).exists()
+            update_fields.update(["xp", "level_up"])
+        all_group_members_dead = group_id not in living_group_ids
         if all_group_members_dead != group.dead:
             group.dead = all_group_members_dead
-            update_fields.append("dead")
+            update_fields.add("dead")
         if update_fields:
-            group.save(update_fields=[*dict.fromkeys(update_fields), "updated_at"])
+            group.updated_at = now
+            group_update_fields.update(update_fields)
+            changed_groups.append(group)
+    if changed_groups:
+        HenchmenGroup.objects.bulk_update(changed_groups, [*sorted(group_update_fields), "updated_at"])
+
+    # bulk_update bypasses post_save, so refresh what the unit signals would have.
+    for unit_kind, unit_ids in killer_ids.items():
+        refresh_unit_kill_stats(unit_kind, unit_ids)
+    if changed_heroes or changed_hired_swords or changed_henchmen or changed_groups or requested_specials:
+        refresh_warband_rating(participant.warband_id)
+        invalidate_warband_roster(participant.warband_id)
 
     exploration = normalized["exploration"]
     resource_id = exploration.get("resource_id")
@@ -1912,11 +1911,12 @@ def _apply_participant_postbattle_results(battle: Battle, participant: BattlePar
             .prefetch_related("availabilities")
         }
         stash_costs_by_item_id: defaultdict[int, list[int | None]] = defaultdict(list)
+        effect_keys = campaign_item_effects(battle.campaign_id)
         for item_id in requested_item_ids:
             item = available_items.get(item_id)
             if not item:
                 raise ValueError("One or more found items are no longer available")
-            base_cost = _resolve_find_item_cost(item)
+            base_cost = _resolve_find_item_cost(item, effect_keys)
             if base_cost is None:
                 raise ValueError("One or more found items no longer have an available cost")
             stash_costs_by_item_id[item.id].append(base_cost)
@@ -14,13 +14,16 @@ from apps.bestiary.models import (
     HiredSwordProfile,
     HiredSwordProfileRestriction,
 )
-from apps.items.models import (
-    Item,
-    ItemAvailability,
-    ItemAvailabilityRestriction,
+from apps.core.catalogue import bump_base_catalogues
+from apps.core.seeding import (
+    SEED_BATCH_SIZE,
+    record_sources,
+    replace_links,
+    sources_unchanged,
+    upsert_rows,
 )
-from apps.restrictions.models import Restriction
-from apps.restrictions.utils import parse_unique_to
+from apps.items.models import Item
+from apps.items.seeding import load_restriction_cache, replace_availabilities, resolve_restrictions
 from apps.skills.models import Skill
 from apps.special.models import Special
 from apps.spells.models import Spell
@@ -29,6 +32,14 @@ DEFAULT_JSON_PATHS = [
     Path("apps/bestiary/data/bestiary.json"),
     Path("apps/bestiary/data/hired-swords.json"),
 ]
+# Entries link to rows seeded from these files, so a change there must re-run the import.
+DEPENDENCY_PATHS = [
+    Path("apps/items/data/standard-items.json"),
+    Path("apps/skills/data/skills.json"),
+    Path("apps/spells/data/spells.json"),
+    Path("apps/special/data/special.json"),
+    Path("apps/restrictions/data/restrictions.json"),
+]
 
 STAT_FIELDS = [
     "movement",
@@ -77,6 +88,20 @@ EQUIPMENT_NAME_ALIASES = {
     "rope and hook": "rope & hook",
 }
 
+ENTRY_UPDATE_FIELDS = ["type", "description", "armour_save", "large", "caster", *STAT_FIELDS]
+SHOP_ITEM_UPDATE_FIELDS = ["subtype", "grade", "single_use", "description", "bestiary_entry_id"]
+PROFILE_UPDATE_FIELDS = [
+    "campaign",
+    "hire_cost",
+    "hire_cost_expression",
+    "upkeep_cost",
+    "upkeep_cost_expression",
+    "rating",
+    "grade",
+    "race",
+    "available_skill_types",
+]
+
 
 def _parse_armour_save(value):
     """Extract integer from strings like '4+', '5+'. Returns None if blank or '-'."""
@@ -124,22 +149,6 @@ def _resolve_equipment_item(item_name, item_type, item_cache, item_name_cache):
     return item_name_cache.get(alias_key)
 
 
-def _resolve_restrictions(unique_to_text, restriction_cache):
-    parsed = parse_unique_to(unique_to_text)
-    results = []
-    for entry in parsed:
-        cache_key = entry["restriction"]
-        restriction = restriction_cache.get(cache_key)
-        if not restriction:
-            restriction, _ = Restriction.objects.get_or_create(
-                restriction=entry["restriction"],
-                defaults={"type": entry["type"]},
-            )
-            restriction_cache[cache_key] = restriction
-        results.append((restriction, entry["additional_note"]))
-    return results
-
-
 def _extract_name_and_description(item):
     """Return (name, description) from either a plain string or a dict."""
     if isinstance(item, str):
@@ -149,32 +158,62 @@ def _extract_name_and_description(item):
     return "", ""
 
 
-def _sync_availabilities(item, availabilities_data, restriction_cache):
-    item.availabilities.all().delete()
-    if not availabilities_data:
-        return
-    for avail_data in availabilities_data:
-        variable_cost = (avail_data.get("variable_cost") or "").strip() or None
-        avail = ItemAvailability.objects.create(
-            item=item,
-            cost=_parse_int(avail_data.get("cost"), 0),
-            rarity=_normalize_rarity(avail_data.get("rarity")),
-            variable_cost=variable_cost,
-        )
-        unique_to_text = (avail_data.get("unique_to") or "").strip()
-        if unique_to_text:
-            resolved = _resolve_restrictions(unique_to_text, restriction_cache)
-            if resolved:
-                ItemAvailabilityRestriction.objects.bulk_create(
-                    [
-                        ItemAvailabilityRestriction(
-                            item_availability=avail,
-                            restriction=r,
-                            additional_note=note,
-                        )
-                        for r, note in resolved
-                    ]
-                )
+def _availability_row(avail_data):
+    return {
+        "cost": _parse_int(avail_data.get("cost"), 0),
+        "rarity": _normalize_rarity(avail_data.get("rarity")),
+        "variable_cost": (avail_data.get("variable_cost") or "").strip() or None,
+        "unique_to": (avail_data.get("unique_to") or "").strip(),
+    }
+
+
+def _optional_int(value):
+    return _parse_int(value) if value is not None else None
+
+
+class _SeedState:
+    """Lookup caches plus everything collected from the JSON before it is written in bulk."""
+
+    def __init__(self):
+        self.skill_cache = {skill.name.strip().lower(): skill for skill in Skill.objects.filter(campaign__isnull=True)}
+        self.special_cache = {
+            special.name.strip().lower(): special for special in Special.objects.filter(campaign__isnull=True)
+        }
+        self.spell_cache = {spell.name.strip().lower(): spell for spell in Spell.objects.filter(campaign__isnull=True)}
+        self.item_cache = {}
+        self.item_name_cache = {}
+        for item in Item.objects.filter(campaign__isnull=True):
+            normalized_name = _normalize_lookup_key(item.name)
+            self.item_cache[(normalized_name, _normalize_lookup_key(item.type))] = item
+            self.item_name_cache.setdefault(normalized_name, item)
+
+        self.entries = {}
+        self.entry_ids = {}
+        self.entry_skills = {}
+        self.entry_specials = {}
+        self.entry_spells = {}
+        self.entry_items = {}
+        self.shop_items = {}
+        self.shop_availabilities = {}
+        self.profiles = {}
+        self.profile_unique_to = {}
+        self.new_rows = {Skill: [], Special: []}
+        self.described_rows = {Skill: {}, Special: {}}
+        self.warnings = []
+
+    def lookup_or_create(self, model, cache, name, description, row_type, label, entry_name):
+        cache_key = name.lower()
+        row = cache.get(cache_key)
+        if not row:
+            row = model(name=name, type=row_type, description=description, campaign=None)
+            cache[cache_key] = row
+            self.new_rows[model].append(row)
+            self.warnings.append(f"  Created {label} '{name}' ({row_type}) for '{entry_name}'")
+        elif description and not row.description:
+            row.description = description
+            if row.pk:
+                self.described_rows[model][row.pk] = row
+        return row
 
 
 class Command(BaseCommand):
@@ -192,6 +231,11 @@ class Command(BaseCommand):
             action="store_true",
             help="Delete existing global bestiary entries before importing.",
         )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Import even when the source files are unchanged since the last run.",
+        )
 
     def handle(self, *args, **options):
         paths = (
@@ -204,267 +248,33 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING("No bestiary JSON files found."))
             return
 
-        if options.get("truncate"):
-            BestiaryEntry.objects.filter(campaign__isnull=True).delete()
-
-        # Build lookup caches for M2M resolution
-        skill_cache: dict[str, Skill] = {}
-        for s in Skill.objects.filter(campaign__isnull=True):
-            skill_cache[s.name.strip().lower()] = s
-
-        special_cache: dict[str, Special] = {}
-        for sp in Special.objects.filter(campaign__isnull=True):
-            special_cache[sp.name.strip().lower()] = sp
-
-        spell_cache: dict[str, Spell] = {}
-        for sl in Spell.objects.filter(campaign__isnull=True):
-            spell_cache[sl.name.strip().lower()] = sl
-
-        item_cache: dict[tuple[str, str], Item] = {}
-        item_name_cache: dict[str, Item] = {}
-        for i in Item.objects.filter(campaign__isnull=True):
-            normalized_name = _normalize_lookup_key(i.name)
-            normalized_type = _normalize_lookup_key(i.type)
-            key = (normalized_name, normalized_type)
-            item_cache[key] = i
-            item_name_cache.setdefault(normalized_name, i)
-
-        restriction_cache = {}
-        for r in Restriction.objects.all():
-            restriction_cache[r.restriction] = r
-
-        created = 0
-        updated = 0
-        items_created = 0
-        items_updated = 0
-        hired_swords_created = 0
-        hired_swords_updated = 0
-        warnings = []
+        source_paths = [p for p in [*paths, *DEPENDENCY_PATHS] if p.exists()]
+        truncate = options.get("truncate")
+        if not truncate and not options.get("force") and sources_unchanged("seed_bestiary", source_paths):
+            self.stdout.write("Bestiary unchanged since the last import, skipping.")
+            return
 
         with transaction.atomic():
+            if truncate:
+                BestiaryEntry.objects.filter(campaign__isnull=True).delete()
+
+            state = _SeedState()
             for path in paths:
                 if not path.exists():
-                    warnings.append(f"  File not found: {path}")
+                    state.warnings.append(f"  File not found: {path}")
                     continue
+                for entry_data in json.loads(path.read_text(encoding="utf-8-sig")):
+                    self._collect_entry(state, entry_data)
 
-                data = json.loads(path.read_text(encoding="utf-8-sig"))
-
-                for entry_data in data:
-                    name = entry_data.get("name", "").strip()
-                    entry_type = entry_data.get("type", "").strip()
-                    if not name or not entry_type:
-                        continue
-
-                    defaults = {
-                        "description": entry_data.get("description", ""),
-                        "armour_save": _parse_armour_save(entry_data.get("armour_save")),
-                        "large": bool(entry_data.get("large", False)),
-                        "caster": entry_data.get("caster", "No"),
-                    }
-                    for field in STAT_FIELDS:
-                        defaults[field] = _parse_int(entry_data.get(field), 0)
-
-                    entry, was_created = BestiaryEntry.objects.update_or_create(
-                        name=name,
-                        campaign=None,
-                        defaults={"type": entry_type, **defaults},
-                    )
+            created, updated = self._write_entries(state)
+            items_created, items_updated = self._write_shop_items(state)
+            hired_swords_created, hired_swords_updated = self._write_profiles(state)
+            record_sources("seed_bestiary", source_paths)
+
+        # The import touches items, skills, specials, spells and restrictions as well as entries.
+        bump_base_catalogues()
 
-                    if was_created:
-                        created += 1
-                    else:
-                        updated += 1
-
-                    # Sync skills (clear + re-add for idempotency)
-                    BestiaryEntrySkill.objects.filter(bestiary_entry=entry).delete()
-                    for skill_name in entry_data.get("skills", []):
-                        skill = skill_cache.get(skill_name.strip().lower())
-                        if skill:
-                            BestiaryEntrySkill.objects.create(bestiary_entry=entry, skill=skill)
-                        else:
-                            warnings.append(f"  Skill '{skill_name}' not found for '{name}'")
-
-                    # Sync specials
-                    BestiaryEntrySpecial.objects.filter(bestiary_entry=entry).delete()
-                    for special_item in entry_data.get("specials", []):
-                        special_name, special_desc = _extract_name_and_description(special_item)
-                        if not special_name:
-                            continue
-                        cache_key = special_name.lower()
-                        special = special_cache.get(cache_key)
-                        if not special:
-                            special = Special.objects.create(
-                                name=special_name,
-                                type=f"Hired Sword - {name}",
-                                description=special_desc,
-                                campaign=None,
-                            )
-                            special_cache[cache_key] = special
-                            warnings.append(f"  Created special '{special_name}' (Hired Sword - {name}) for '{name}'")
-                        elif special_desc and not special.description:
-                            special.description = special_desc
-                            special.save(update_fields=["description"])
-                        BestiaryEntrySpecial.objects.create(bestiary_entry=entry, special=special)
-
-                    # Sync spells
-                    BestiaryEntrySpell.objects.filter(bestiary_entry=entry).delete()
-                    for spell_item in entry_data.get("spells", []):
-                        spell_name, _ = _extract_name_and_description(spell_item)
-                        if not spell_name:
-                            continue
-                        spell = spell_cache.get(spell_name.lower())
-                        if spell:
-                            BestiaryEntrySpell.objects.create(bestiary_entry=entry, spell=spell)
-                        else:
-                            warnings.append(f"  Spell '{spell_name}' not found for '{name}'")
-
-                    # Sync equipment items
-                    BestiaryEntryItem.objects.filter(bestiary_entry=entry).delete()
-                    for equip in entry_data.get("equipment", []):
-                        if isinstance(equip, str):
-                            equip = {"item": equip, "quantity": 1}
-                        item_name = equip.get("item", "")
-                        item_type = equip.get("item_type", "")
-                        quantity = _parse_int(equip.get("quantity"), 1)
-                        item = _resolve_equipment_item(
-                            item_name=item_name,
-                            item_type=item_type,
-                            item_cache=item_cache,
-                            item_name_cache=item_name_cache,
-                        )
-                        if item:
-                            BestiaryEntryItem.objects.update_or_create(
-                                bestiary_entry=entry, item=item, defaults={"quantity": quantity}
-                            )
-                        else:
-                            warnings.append(f"  Equipment '{equip.get('item')}' not found for '{name}'")
-
-                    # Create/update the corresponding Animal shop item
-                    shop_item_data = entry_data.get("shop_item")
-                    if shop_item_data:
-                        item, item_was_created = Item.objects.update_or_create(
-                            name=name,
-                            type="Animal",
-                            defaults={
-                                "subtype": entry_type,
-                                "grade": shop_item_data.get("grade", "1a"),
-                                "single_use": bool(shop_item_data.get("single_use", False)),
-                                "description": entry_data.get("description", ""),
-                                "bestiary_entry": entry,
-                            },
-                        )
-                        _sync_availabilities(
-                            item,
-                            shop_item_data.get("availabilities", []),
-                            restriction_cache,
-                        )
-                        if item_was_created:
-                            items_created += 1
-                        else:
-                            items_updated += 1
-
-                    # Create/update the corresponding HiredSwordProfile record
-                    hired_sword_data = entry_data.get("hired_sword")
-                    if hired_sword_data:
-                        hire_cost = hired_sword_data.get("hire_cost")
-                        hire_cost_expr = hired_sword_data.get("hire_cost_expression", "").strip()
-                        upkeep_cost = hired_sword_data.get("upkeep_cost")
-                        upkeep_cost_expr = (
-                            hired_sword_data.get("upkeep_cost_expression", "")
-                            .strip()
-                        )
-                        rating = hired_sword_data.get("rating")
-                        available_skill_types = list(
-                            hired_sword_data.get("available_skill_types") or []
-                        )
-
-                        grade = hired_sword_data.get("grade", "").strip()
-                        race = hired_sword_data.get("race", "").strip()
-
-                        # Ensure special skills exist and fold their type into available_skill_types
-                        special_skill_type = f"Hired Sword - {name}"
-                        has_special_skills = False
-                        for skill_item in hired_sword_data.get(
-                            "available_special_skills", []
-                        ):
-                            skill_name, skill_desc = _extract_name_and_description(skill_item)
-                            if not skill_name:
-                                continue
-                            has_special_skills = True
-                            cache_key = skill_name.lower()
-                            skill = skill_cache.get(cache_key)
-                            if not skill:
-                                skill = Skill.objects.create(
-                                    name=skill_name,
-                                    type=special_skill_type,
-                                    description=skill_desc,
-                                    campaign=None,
-                                )
-                                skill_cache[cache_key] = skill
-                                warnings.append(
-                                    f"  Created skill '{skill_name}' "
-                                    f"({special_skill_type}) for '{name}'"
-                                )
-                            elif skill_desc and not skill.description:
-                                skill.description = skill_desc
-                                skill.save(update_fields=["description"])
-                        if has_special_skills and special_skill_type not in available_skill_types:
-                            available_skill_types.append(special_skill_type)
-
-                        profile, profile_created = (
-                            HiredSwordProfile.objects.update_or_create(
-                                bestiary_entry=entry,
-                                defaults={
-                                    "campaign": None,
-                                    "hire_cost": (
-                                        _parse_int(hire_cost)
-                                        if hire_cost is not None
-                                        else None
-                                    ),
-                                    "hire_cost_expression": hire_cost_expr,
-                                    "upkeep_cost": (
-                                        _parse_int(upkeep_cost)
-                                        if upkeep_cost is not None
-                                        else None
-                                    ),
-                                    "upkeep_cost_expression": upkeep_cost_expr,
-                                    "rating": (
-                                        _parse_int(rating)
-                                        if rating is not None
-                                        else None
-                                    ),
-                                    "grade": grade,
-                                    "race": race,
-                                    "available_skill_types": available_skill_types,
-                                },
-                            )
-                        )
-
-                        HiredSwordProfileRestriction.objects.filter(
-                            hired_sword_profile=profile
-                        ).delete()
-                        unique_to_text = (
-                            hired_sword_data.get("unique_to") or ""
-                        ).strip()
-                        if unique_to_text:
-                            resolved = _resolve_restrictions(unique_to_text, restriction_cache)
-                            if resolved:
-                                HiredSwordProfileRestriction.objects.bulk_create(
-                                    [
-                                        HiredSwordProfileRestriction(
-                                            hired_sword_profile=profile,
-                                            restriction=r,
-                                            additional_note=note,
-                                        )
-                                        for r, note in resolved
-                                    ]
-                                )
-                        if profile_created:
-                            hired_swords_created += 1
-                        else:
-                            hired_swords_updated += 1
-
-        for w in warnings:
+        for w in state.warnings:
             self.stdout.write(self.style.WARNING(w))
 
         self.stdout.write(
@@ -476,3 +286,233 @@ class Command(BaseCommand):
                 f"updated: {hired_swords_updated}."
             )
         )
+
+    def _collect_entry(self, state, entry_data):
+        name = entry_data.get("name", "").strip()
+        entry_type = entry_data.get("type", "").strip()
+        if not name or not entry_type:
+            return
+
+        values = {
+            "name": name,
+            "type": entry_type,
+            "description": entry_data.get("description", ""),
+            "armour_save": _parse_armour_save(entry_data.get("armour_save")),
+            "large": bool(entry_data.get("large", False)),
+            "caster": entry_data.get("caster", "No"),
+        }
+        for field in STAT_FIELDS:
+            values[field] = _parse_int(entry_data.get(field), 0)
+        state.entries[name] = values
+
+        skills = []
+        for skill_name in entry_data.get("skills", []):
+            skill = state.skill_cache.get(skill_name.strip().lower())
+            if skill:
+                skills.append(skill)
+            else:
+                state.warnings.append(f"  Skill '{skill_name}' not found for '{name}'")
+        state.entry_skills[name] = skills
+
+        specials = []
+        for special_item in entry_data.get("specials", []):
+            special_name, special_desc = _extract_name_and_description(special_item)
+            if special_name:
+                specials.append(
+                    state.lookup_or_create(
+                        Special,
+                        state.special_cache,
+                        special_name,
+                        special_desc,
+                        f"Hired Sword - {name}",
+                        "special",
+                        name,
+                    )
+                )
+        state.entry_specials[name] = specials
+
+        spells = []
+        for spell_item in entry_data.get("spells", []):
+            spell_name, _ = _extract_name_and_description(spell_item)
+            if not spell_name:
+                continue
+            spell = state.spell_cache.get(spell_name.lower())
+            if spell:
+                spells.append(spell)
+            else:
+                state.warnings.append(f"  Spell '{spell_name}' not found for '{name}'")
+        state.entry_spells[name] = spells
+
+        equipment = {}
+        for equip in entry_data.get("equipment", []):
+            if isinstance(equip, str):
+                equip = {"item": equip, "quantity": 1}
+            item = _resolve_equipment_item(
+                item_name=equip.get("item", ""),
+                item_type=equip.get("item_type", ""),
+                item_cache=state.item_cache,
+                item_name_cache=state.item_name_cache,
+            )
+            if item:
+                equipment[item.id] = _parse_int(equip.get("quantity"), 1)
+            else:
+                state.warnings.append(f"  Equipment '{equip.get('item')}' not found for '{name}'")
+        state.entry_items[name] = equipment
+
+        # The corresponding Animal shop item
+        shop_item_data = entry_data.get("shop_item")
+        if shop_item_data:
+            state.shop_items[name] = {
+                "name": name,
+                "type": "Animal",
+                "subtype": entry_type,
+                "grade": shop_item_data.get("grade", "1a"),
+                "single_use": bool(shop_item_data.get("single_use", False)),
+                "description": entry_data.get("description", ""),
+            }
+            state.shop_availabilities[name] = [
+                _availability_row(avail) for avail in shop_item_data.get("availabilities", [])
+            ]
+
+        hired_sword_data = entry_data.get("hired_sword")
+        if hired_sword_data:
+            self._collect_profile(state, name, hired_sword_data)
+
+    def _collect_profile(self, state, name, hired_sword_data):
+        available_skill_types = list(hired_sword_data.get("available_skill_types") or [])
+
+        # Ensure special skills exist and fold their type into available_skill_types
+        special_skill_type = f"Hired Sword - {name}"
+        has_special_skills = False
+        for skill_item in hired_sword_data.get("available_special_skills", []):
+            skill_name, skill_desc = _extract_name_and_description(skill_item)
+            if not skill_name:
+                continue
+            has_special_skills = True
+            state.lookup_or_create(Skill, state.skill_cache, skill_name, skill_desc, special_skill_type, "skill", name)
+        if has_special_skills and special_skill_type not in available_skill_types:
+            available_skill_types.append(special_skill_type)
+
+        state.profiles[name] = {
+            "campaign": None,
+            "hire_cost": _optional_int(hired_sword_data.get("hire_cost")),
+            "hire_cost_expression": hired_sword_data.get("hire_cost_expression", "").strip(),
+            "upkeep_cost": _optional_int(hired_sword_data.get("upkeep_cost")),
+            "upkeep_cost_expression": hired_sword_data.get("upkeep_cost_expression", "").strip(),
+            "rating": _optional_int(hired_sword_data.get("rating")),
+            "grade": hired_sword_data.get("grade", "").strip(),
+            "race": hired_sword_data.get("race", "").strip(),
+            "available_skill_types": available_skill_types,
+        }
+        state.profile_unique_to[name] = (hired_sword_data.get("unique_to") or "").strip()
+
+    def _write_entries(self, state):
+        existing = {entry.name: entry for entry in BestiaryEntry.objects.filter(campaign__isnull=True)}
+        created, updated = upsert_rows(BestiaryEntry, existing, state.entries, ENTRY_UPDATE_FIELDS)
+        state.entry_ids = {name: existing[name].id for name in state.entries}
+
+        for model in (Skill, Special):
+            model.objects.bulk_create(state.new_rows[model], batch_size=SEED_BATCH_SIZE)
+            if state.described_rows[model]:
+                model.objects.bulk_update(list(state.described_rows[model].values()), ["description"])
+
+        entry_ids = list(state.entry_ids.values())
+        replace_links(
+            BestiaryEntrySkill,
+            "bestiary_entry",
+            entry_ids,
+            [
+                BestiaryEntrySkill(bestiary_entry_id=state.entry_ids[name], skill_id=skill.id)
+                for name, skills in state.entry_skills.items()
+                for skill in skills
+            ],
+        )
+        replace_links(
+            BestiaryEntrySpecial,
+            "bestiary_entry",
+            entry_ids,
+            [
+                BestiaryEntrySpecial(bestiary_entry_id=state.entry_ids[name], special_id=special.id)
+                for name, specials in state.entry_specials.items()
+                for special in specials
+            ],
+        )
+        replace_links(
+            BestiaryEntrySpell,
+            "bestiary_entry",
+            entry_ids,
+            [
+                BestiaryEntrySpell(bestiary_entry_id=state.entry_ids[name], spell_id=spell.id)
+                for name, spells in state.entry_spells.items()
+                for spell in spells
+            ],
+        )
+        replace_links(
+            BestiaryEntryItem,
+            "bestiary_entry",
+            entry_ids,
+            [
+                BestiaryEntryItem(bestiary_entry_id=state.entry_ids[name], item_id=item_id, quantity=quantity)
+                for name, equipment in state.entry_items.items()
+                for item_id, quantity in equipment.items()
+            ],
+        )
+        return created, updated
+
+    def _write_shop_items(self, state):
+        if not state.shop_items:
+            return 0, 0
+        desired = {
+            (name, "Animal"): {**values, "bestiary_entry_id": state.entry_ids[name]}
+            for name, values in state.shop_items.items()
+        }
+        existing = {
+            (item.name, item.type): item
+            for item in Item.objects.filter(campaign__isnull=True, type="Animal", name__in=list(state.shop_items))
+        }
+        created, updated = upsert_rows(Item, existing, desired, SHOP_ITEM_UPDATE_FIELDS)
+        replace_availabilities(
+            {existing[(name, "Animal")].id: rows for name, rows in state.shop_availabilities.items()},
+            load_restriction_cache(),
+        )
+        return created, updated
+
+    def _write_profiles(self, state):
+        if not state.profiles:
+            return 0, 0
+        entry_ids = [state.entry_ids[name] for name in state.profiles]
+        existing_entry_ids = set(
+            HiredSwordProfile.objects.filter(bestiary_entry_id__in=entry_ids).values_list(
+                "bestiary_entry_id", flat=True
+            )
+        )
+        HiredSwordProfile.objects.bulk_create(
+            [
+                HiredSwordProfile(bestiary_entry_id=state.entry_ids[name], **values)
+                for name, values in state.profiles.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["bestiary_entry"],
+            update_fields=PROFILE_UPDATE_FIELDS,
+            batch_size=SEED_BATCH_SIZE,
+        )
+        profile_ids = dict(
+            HiredSwordProfile.objects.filter(bestiary_entry_id__in=entry_ids).values_list("bestiary_entry_id", "id")
+        )
+
+        restriction_cache = load_restriction_cache()
+        links = []
+        for name, unique_to_text in state.profile_unique_to.items():
+            if not unique_to_text:
+                continue
+            profile_id = profile_ids[state.entry_ids[name]]
+            links.extend(
+                HiredSwordProfileRestriction(
+                    hired_sword_profile_id=profile_id, restriction=restriction, additional_note=note
+                )
+                for restriction, note in resolve_restrictions(unique_to_text, restriction_cache)
+            )
+        replace_links(HiredSwordProfileRestriction, "hired_sword_profile", profile_ids.values(), links)
+
+        created = len(set(entry_ids) - existing_entry_ids)
+        return created, len(entry_ids) - created
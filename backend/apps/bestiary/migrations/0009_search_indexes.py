@@ -0,0 +1,22 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models.functions import Upper
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bestiary", "0008_hiredswordprofile_race"),
+        ("core", "0002_trigram_extension"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="bestiaryentry",
+            index=GinIndex(OpClass(Upper("name"), name="gin_trgm_ops"), name="bestiary_entry_search_trgm_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="bestiaryentry",
+            index=GinIndex(SearchVector("description", config="simple"), name="bestiary_entry_search_fts_idx"),
+        ),
+    ]
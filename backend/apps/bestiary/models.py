@@ -1,5 +1,6 @@
 from django.db import models
 
+from apps.core.search import search_indexes
 from apps.warbands.models.shared import StatBlock, stat_constraints
 
 
@@ -55,6 +56,7 @@ class BestiaryEntry(StatBlock):
         db_table = "bestiary_entry"
         ordering = ["type", "name"]
         verbose_name_plural = "bestiary entries"
+        indexes = search_indexes("bestiary_entry")
         constraints = stat_constraints("bestiary_entry")
 
     def __str__(self):
@@ -3,6 +3,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.campaigns.permissions import get_membership, has_campaign_permission
+from apps.core.catalogue import Catalogue, bump_catalogue_version
 from apps.warbands.models import Warband
 
 from .models import (
@@ -23,38 +24,24 @@ from .serializers import (
     HiredSwordProfileSummarySerializer,
 )
 
+BESTIARY_CATALOGUE = Catalogue(
+    kind="bestiary",
+    queryset=lambda: BestiaryEntry.objects.all(),
+    serialize=lambda entries: BestiaryEntrySummarySerializer(entries, many=True).data,
+)
+
 
 class BestiaryEntryListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        entries = BestiaryEntry.objects.all()
-
-        entry_type = request.query_params.get("type")
-        if entry_type:
-            entries = entries.filter(type__iexact=entry_type.strip())
-
-        search = request.query_params.get("search")
-        if search:
-            entries = entries.filter(name__icontains=search.strip())
-
         campaign_id = request.query_params.get("campaign_id")
         if campaign_id:
             membership = get_membership(request.user, campaign_id)
             if not membership:
                 return Response({"detail": "Not found"}, status=404)
 
-            campaign_entries = entries.filter(campaign_id=campaign_id)
-            base_entries = entries.filter(campaign__isnull=True)
-            if campaign_entries.exists():
-                base_entries = base_entries.exclude(name__in=campaign_entries.values_list("name", flat=True))
-            merged = list(campaign_entries.order_by("name", "id")) + list(base_entries.order_by("name", "id"))
-            serializer = BestiaryEntrySummarySerializer(merged, many=True)
-            return Response(serializer.data)
-
-        entries = entries.filter(campaign__isnull=True)
-        serializer = BestiaryEntrySummarySerializer(entries.order_by("name", "id"), many=True)
-        return Response(serializer.data)
+        return BESTIARY_CATALOGUE.response(request, campaign_id)
 
     def post(self, request):
         campaign_id = request.data.get("campaign_id")
@@ -72,6 +59,7 @@ class BestiaryEntryListView(APIView):
         entry = serializer.save()
 
         _sync_m2m(entry, request.data)
+        bump_catalogue_version("bestiary", entry.campaign_id)
 
         return Response(BestiaryEntrySerializer(entry).data, status=status.HTTP_201_CREATED)
 
@@ -121,6 +109,7 @@ class BestiaryEntryDetailView(APIView):
         serializer.save()
 
         _sync_m2m(entry, request.data)
+        bump_catalogue_version("bestiary", entry.campaign_id)
 
         entry.refresh_from_db()
         return Response(BestiaryEntrySerializer(entry).data)
@@ -139,6 +128,7 @@ class BestiaryEntryDetailView(APIView):
             return Response({"detail": "Forbidden"}, status=403)
 
         entry.delete()
+        bump_catalogue_version("bestiary", entry.campaign_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -313,6 +303,7 @@ class HiredSwordProfileListView(APIView):
         entry = serializer.save()
 
         _sync_m2m(entry, request.data)
+        bump_catalogue_version("bestiary", entry.campaign_id)
 
         profile = HiredSwordProfile.objects.create(
             campaign_id=campaign_id,
@@ -409,6 +400,7 @@ class HiredSwordProfileDetailView(APIView):
             serializer.save()
 
         _sync_m2m(entry, request.data)
+        bump_catalogue_version("bestiary", entry.campaign_id)
 
         restriction_entries = request.data.get("restriction_ids")
         if restriction_entries is not None:
@@ -431,4 +423,5 @@ class HiredSwordProfileDetailView(APIView):
             return Response({"detail": "Forbidden"}, status=403)
 
         profile.bestiary_entry.delete()
+        bump_catalogue_version("bestiary", profile.campaign_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
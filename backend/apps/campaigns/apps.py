@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class CampaignsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.campaigns"
+
+    def ready(self):
+        from .signals import connect_kill_stat_signals, connect_membership_cache_signals
+
+        connect_membership_cache_signals()
+        connect_kill_stat_signals()
@@ -0,0 +1,177 @@
+"""Stream a whole campaign out as NDJSON or a JSON array.
+
+Rows are read straight off the tables with `.values()` and written one at a time, so an export
+never holds more than one chunk of any table in memory, however big the campaign is. An export for
+a member only holds the rows that member can read through the API: their own trade requests, and
+the participants and events of battles they took part in.
+"""
+
+import json
+from collections.abc import AsyncIterator, Iterator
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, router
+from django.db.models import Q
+
+from apps.battles.models import Battle, BattleEvent, BattleParticipant, BattleParticipantSummary
+from apps.trades.models import TradeRequest
+from apps.warbands.models import (
+    Henchman,
+    HenchmenGroup,
+    HenchmenGroupItem,
+    HenchmenGroupSkill,
+    HenchmenGroupSpecial,
+    Hero,
+    HeroItem,
+    HeroSkill,
+    HeroSpecial,
+    HeroSpell,
+    HiredSword,
+    HiredSwordItem,
+    HiredSwordSkill,
+    HiredSwordSpecial,
+    HiredSwordSpell,
+    Warband,
+    WarbandItem,
+    WarbandLog,
+    WarbandResource,
+    WarbandTrade,
+)
+
+from .models import Campaign, CampaignHouseRule, PivotalMoment
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = ("ndjson", "json")
+EXPORT_CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+}
+
+# (record type, model, lookup from the model to the campaign id), in the order they are written.
+EXPORT_TABLES = (
+    ("campaign", Campaign, "id"),
+    ("house_rule", CampaignHouseRule, "campaign_id"),
+    ("warband", Warband, "campaign_id"),
+    ("warband_item", WarbandItem, "warband__campaign_id"),
+    ("warband_resource", WarbandResource, "warband__campaign_id"),
+    ("warband_log", WarbandLog, "warband__campaign_id"),
+    ("warband_trade", WarbandTrade, "warband__campaign_id"),
+    ("hero", Hero, "warband__campaign_id"),
+    ("hero_item", HeroItem, "hero__warband__campaign_id"),
+    ("hero_skill", HeroSkill, "hero__warband__campaign_id"),
+    ("hero_spell", HeroSpell, "hero__warband__campaign_id"),
+    ("hero_special", HeroSpecial, "hero__warband__campaign_id"),
+    ("hired_sword", HiredSword, "warband__campaign_id"),
+    ("hired_sword_item", HiredSwordItem, "hired_sword__warband__campaign_id"),
+    ("hired_sword_skill", HiredSwordSkill, "hired_sword__warband__campaign_id"),
+    ("hired_sword_spell", HiredSwordSpell, "hired_sword__warband__campaign_id"),
+    ("hired_sword_special", HiredSwordSpecial, "hired_sword__warband__campaign_id"),
+    ("henchmen_group", HenchmenGroup, "warband__campaign_id"),
+    ("henchman", Henchman, "group__warband__campaign_id"),
+    ("henchmen_group_item", HenchmenGroupItem, "henchmen_group__warband__campaign_id"),
+    ("henchmen_group_skill", HenchmenGroupSkill, "henchmen_group__warband__campaign_id"),
+    ("henchmen_group_special", HenchmenGroupSpecial, "henchmen_group__warband__campaign_id"),
+    ("trade_request", TradeRequest, "campaign_id"),
+    ("battle", Battle, "campaign_id"),
+    ("battle_participant", BattleParticipant, "battle__campaign_id"),
+    ("battle_participant_summary", BattleParticipantSummary, "battle__campaign_id"),
+    ("battle_event", BattleEvent, "battle__campaign_id"),
+    ("pivotal_moment", PivotalMoment, "campaign_id"),
+)
+
+
+def _iter_rows(queryset, chunk_size: int) -> Iterator[dict]:
+    queryset = queryset.order_by("pk")
+    settings_dict = connections[router.db_for_read(queryset.model)].settings_dict
+    if not settings_dict.get("DISABLE_SERVER_SIDE_CURSORS"):
+        yield from queryset.iterator(chunk_size=chunk_size)
+        return
+
+    # Without server-side cursors (transaction pooling) the driver would buffer the whole
+    # result set, so page through the table by primary key instead.
+    last_pk = None
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = list(page[:chunk_size])
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        last_pk = rows[-1]["id"]
+
+
+def _member_filter(record_type: str, user) -> Q:
+    """Rows of `record_type` that `user` can see; other members' trades and battles stay private."""
+    own_battles = BattleParticipant.objects.filter(user=user).values("battle_id")
+    if record_type == "trade_request":
+        return Q(from_user=user) | Q(to_user=user)
+    if record_type == "battle":
+        # Ended battles are in every member's battle history.
+        return Q(id__in=own_battles) | Q(status=Battle.STATUS_ENDED)
+    if record_type in ("battle_participant", "battle_event"):
+        return Q(battle_id__in=own_battles)
+    return Q()
+
+
+def iter_campaign_records(campaign_id: int, chunk_size: int = EXPORT_CHUNK_SIZE, user=None) -> Iterator[dict]:
+    """Yield `{"type": ..., "data": {...}}` for every row that belongs to the campaign.
+
+    With `user`, only the rows that user may read are included.
+    """
+    chunk_size = max(chunk_size, 1)
+    for record_type, model, campaign_lookup in EXPORT_TABLES:
+        queryset = model.objects.filter(**{campaign_lookup: campaign_id})
+        if user is not None:
+            queryset = queryset.filter(_member_filter(record_type, user))
+        for row in _iter_rows(queryset.values(), chunk_size):
+            yield {"type": record_type, "data": row}
+
+
+def iter_campaign_export(
+    campaign_id: int, export_format: str = "ndjson", chunk_size: int = EXPORT_CHUNK_SIZE, user=None
+) -> Iterator[str]:
+    """Yield the export as text pieces: one line per record, or the pieces of one JSON array."""
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {export_format}")
+
+    records = iter_campaign_records(campaign_id, chunk_size=chunk_size, user=user)
+    if export_format == "ndjson":
+        for record in records:
+            yield json.dumps(record, cls=DjangoJSONEncoder) + "\n"
+        return
+
+    yield "["
+    separator = "\n"
+    for record in records:
+        yield separator + json.dumps(record, cls=DjangoJSONEncoder)
+        separator = ",\n"
+    yield "\n]\n"
+
+
+def _next_pieces(pieces: Iterator[str], count: int) -> list[str]:
+    batch = []
+    for piece in pieces:
+        batch.append(piece)
+        if len(batch) >= count:
+            break
+    return batch
+
+
+async def aiter_campaign_export(
+    campaign_id: int, export_format: str = "ndjson", chunk_size: int = EXPORT_CHUNK_SIZE, user=None
+) -> AsyncIterator[str]:
+    """`iter_campaign_export` for ASGI, which would otherwise read a sync iterator into a list first.
+
+    Each chunk of pieces is produced on the sync thread, so the database cursor stays on the
+    connection that opened it.
+    """
+    chunk_size = max(chunk_size, 1)
+    pieces = iter_campaign_export(campaign_id, export_format, chunk_size=chunk_size, user=user)
+    next_pieces = sync_to_async(_next_pieces)
+    try:
+        while batch := await next_pieces(pieces, chunk_size):
+            for piece in batch:
+                yield piece
+    finally:
+        # Close the generator, and with it any open server-side cursor, if the client goes away.
+        await sync_to_async(pieces.close)()
@@ -0,0 +1,113 @@
+from apps.warbands.models import Henchman, Hero, HiredSword
+
+from .models import CampaignUnitKillStat
+
+UNIT_NAME_PREFIXES = {
+    CampaignUnitKillStat.UNIT_KIND_HERO: "Hero ",
+    CampaignUnitKillStat.UNIT_KIND_HIRED_SWORD: "Hired Sword ",
+    CampaignUnitKillStat.UNIT_KIND_HENCHMAN: "Henchman ",
+}
+STAT_UPDATE_FIELDS = [
+    "campaign",
+    "warband",
+    "unit_name",
+    "unit_name_sort",
+    "unit_type",
+    "warband_name",
+    "warband_name_sort",
+    "kills",
+]
+
+
+def _unit_rows(unit_kind: str, unit_ids):
+    if unit_kind == CampaignUnitKillStat.UNIT_KIND_HENCHMAN:
+        units = Henchman.objects.filter(id__in=unit_ids).select_related("group__warband")
+        return [(unit, unit.group.warband, unit.group.unit_type) for unit in units]
+    model = Hero if unit_kind == CampaignUnitKillStat.UNIT_KIND_HERO else HiredSword
+    units = model.objects.filter(id__in=unit_ids).select_related("warband")
+    return [(unit, unit.warband, unit.unit_type) for unit in units]
+
+
+def _build_stat(unit_kind: str, unit, warband, unit_type) -> CampaignUnitKillStat:
+    unit_name = (unit.name or "").strip() or f"{UNIT_NAME_PREFIXES[unit_kind]}{unit.id}"
+    return CampaignUnitKillStat(
+        campaign_id=warband.campaign_id,
+        warband_id=warband.id,
+        unit_kind=unit_kind,
+        unit_id=unit.id,
+        unit_name=unit_name,
+        unit_name_sort=unit_name.lower(),
+        unit_type=(unit_type or "").strip() or None,
+        warband_name=warband.name,
+        warband_name_sort=warband.name.lower(),
+        kills=unit.kills,
+    )
+
+
+def refresh_unit_kill_stats(unit_kind: str, unit_ids) -> None:
+    """Upsert leaderboard rows for the given units and drop units without kills."""
+    unit_ids = list(unit_ids)
+    if not unit_ids:
+        return
+    stats = [
+        _build_stat(unit_kind, unit, warband, unit_type)
+        for unit, warband, unit_type in _unit_rows(unit_kind, unit_ids)
+        if (unit.kills or 0) > 0
+    ]
+    scored_ids = {stat.unit_id for stat in stats}
+    CampaignUnitKillStat.objects.filter(unit_kind=unit_kind, unit_id__in=unit_ids).exclude(
+        unit_id__in=scored_ids
+    ).delete()
+    if stats:
+        CampaignUnitKillStat.objects.bulk_create(
+            stats,
+            update_conflicts=True,
+            unique_fields=["unit_kind", "unit_id"],
+            update_fields=STAT_UPDATE_FIELDS,
+        )
+
+
+def remove_unit_kill_stat(unit_kind: str, unit_id: int) -> None:
+    CampaignUnitKillStat.objects.filter(unit_kind=unit_kind, unit_id=unit_id).delete()
+
+
+def rename_warband_kill_stats(warband_id: int, warband_name: str) -> None:
+    CampaignUnitKillStat.objects.filter(warband_id=warband_id).exclude(warband_name=warband_name).update(
+        warband_name=warband_name,
+        warband_name_sort=warband_name.lower(),
+    )
+
+
+def refresh_henchmen_group_kill_stats(group_id: int) -> None:
+    refresh_unit_kill_stats(
+        CampaignUnitKillStat.UNIT_KIND_HENCHMAN,
+        Henchman.objects.filter(group_id=group_id).values_list("id", flat=True),
+    )
+
+
+def rebuild_campaign_kill_stats(campaign_id: int) -> None:
+    CampaignUnitKillStat.objects.filter(campaign_id=campaign_id).delete()
+    refresh_unit_kill_stats(
+        CampaignUnitKillStat.UNIT_KIND_HERO,
+        Hero.objects.filter(warband__campaign_id=campaign_id, kills__gt=0).values_list("id", flat=True),
+    )
+    refresh_unit_kill_stats(
+        CampaignUnitKillStat.UNIT_KIND_HIRED_SWORD,
+        HiredSword.objects.filter(warband__campaign_id=campaign_id, kills__gt=0).values_list("id", flat=True),
+    )
+    refresh_unit_kill_stats(
+        CampaignUnitKillStat.UNIT_KIND_HENCHMAN,
+        Henchman.objects.filter(group__warband__campaign_id=campaign_id, kills__gt=0).values_list("id", flat=True),
+    )
+
+
+def campaign_top_killers(campaign_id: int, *, limit: int = 5, offset: int = 0, warband_id=None, unit_kind=None):
+    stats = CampaignUnitKillStat.objects.filter(campaign_id=campaign_id)
+    if warband_id is not None:
+        stats = stats.filter(warband_id=warband_id)
+    if unit_kind:
+        stats = stats.filter(unit_kind=unit_kind)
+    rows = stats.order_by("-kills", "unit_name_sort", "warband_name_sort", "unit_id").values(
+        "unit_id", "unit_kind", "unit_name", "unit_type", "warband_id", "warband_name", "kills"
+    )[offset : offset + limit]
+    return list(rows)
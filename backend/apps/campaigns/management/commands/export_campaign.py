@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.campaigns.export import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, iter_campaign_export
+from apps.campaigns.models import Campaign
+
+
+class Command(BaseCommand):
+    help = "Write every warband, unit, item, log, trade, battle and event of a campaign as NDJSON or JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("campaign", type=int, help="Campaign id to export")
+        parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+        parser.add_argument("--output", help="File to write to (defaults to stdout)")
+        parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE, help="Rows read per database fetch")
+
+    def handle(self, *args, **options):
+        campaign_id = options["campaign"]
+        if not Campaign.objects.filter(id=campaign_id).exists():
+            raise CommandError(f"Campaign {campaign_id} does not exist")
+
+        pieces = iter_campaign_export(campaign_id, options["format"], chunk_size=options["chunk_size"])
+        if not options["output"]:
+            for piece in pieces:
+                self.stdout.write(piece, ending="")
+            return
+
+        with open(options["output"], "w", encoding="utf-8") as output:
+            for piece in pieces:
+                output.write(piece)
+        self.stderr.write(self.style.SUCCESS(f"Exported campaign {campaign_id} to {options['output']}"))
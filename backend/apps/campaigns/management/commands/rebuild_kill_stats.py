@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.campaigns.kill_stats import rebuild_campaign_kill_stats
+from apps.campaigns.models import Campaign
+
+
+class Command(BaseCommand):
+    help = "Rebuild the precomputed campaign kill leaderboard rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--campaign", type=int, help="Only rebuild this campaign")
+
+    def handle(self, *args, **options):
+        campaign_ids = Campaign.objects.order_by("id").values_list("id", flat=True)
+        if options["campaign"]:
+            campaign_ids = campaign_ids.filter(id=options["campaign"])
+
+        rebuilt = 0
+        for campaign_id in campaign_ids.iterator():
+            with transaction.atomic():
+                rebuild_campaign_kill_stats(campaign_id)
+            rebuilt += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt kill stats for {rebuilt} campaigns"))
@@ -5,6 +5,13 @@ from django.core.management.base import BaseCommand
 class Command(BaseCommand):
     help = "Run all seed commands in the correct order"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-import every data set even when its source files are unchanged.",
+        )
+
     def handle(self, *args, **options):
         seed_commands = [
             "seed_races",
@@ -18,7 +25,7 @@ class Command(BaseCommand):
         for command in seed_commands:
             self.stdout.write(f"Running {command}...")
             try:
-                call_command(command)
+                call_command(command, force=options.get("force", False))
                 self.stdout.write(self.style.SUCCESS(f"  {command} completed"))
             except Exception as e:
                 self.stdout.write(self.style.ERROR(f"  {command} failed: {e}"))
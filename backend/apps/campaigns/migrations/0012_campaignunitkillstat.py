@@ -0,0 +1,109 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_kill_stats(apps, schema_editor):
+    CampaignUnitKillStat = apps.get_model("campaigns", "CampaignUnitKillStat")
+    Hero = apps.get_model("warbands", "Hero")
+    HiredSword = apps.get_model("warbands", "HiredSword")
+    Henchman = apps.get_model("warbands", "Henchman")
+
+    def build(unit_kind, prefix, unit, warband, unit_type):
+        unit_name = (unit.name or "").strip() or f"{prefix}{unit.id}"
+        return CampaignUnitKillStat(
+            campaign_id=warband.campaign_id,
+            warband_id=warband.id,
+            unit_kind=unit_kind,
+            unit_id=unit.id,
+            unit_name=unit_name,
+            unit_name_sort=unit_name.lower(),
+            unit_type=(unit_type or "").strip() or None,
+            warband_name=warband.name,
+            warband_name_sort=warband.name.lower(),
+            kills=unit.kills,
+        )
+
+    stats = []
+    for hero in Hero.objects.filter(kills__gt=0).select_related("warband"):
+        stats.append(build("hero", "Hero ", hero, hero.warband, hero.unit_type))
+    for hired_sword in HiredSword.objects.filter(kills__gt=0).select_related("warband"):
+        stats.append(build("hired_sword", "Hired Sword ", hired_sword, hired_sword.warband, hired_sword.unit_type))
+    for henchman in Henchman.objects.filter(kills__gt=0).select_related("group__warband"):
+        stats.append(build("henchman", "Henchman ", henchman, henchman.group.warband, henchman.group.unit_type))
+    CampaignUnitKillStat.objects.bulk_create(stats, batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("campaigns", "0011_campaignsettings_enable_encampments_and_more"),
+        ("warbands", "0024_warband_rating_gold"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CampaignUnitKillStat",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "unit_kind",
+                    models.CharField(
+                        choices=[("hero", "Hero"), ("hired_sword", "Hired sword"), ("henchman", "Henchman")],
+                        max_length=20,
+                    ),
+                ),
+                ("unit_id", models.BigIntegerField()),
+                ("unit_name", models.CharField(max_length=160)),
+                ("unit_name_sort", models.CharField(max_length=160)),
+                ("unit_type", models.CharField(blank=True, max_length=120, null=True)),
+                ("warband_name", models.CharField(max_length=120)),
+                ("warband_name_sort", models.CharField(max_length=120)),
+                ("kills", models.PositiveIntegerField()),
+                (
+                    "campaign",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="unit_kill_stats",
+                        to="campaigns.campaign",
+                    ),
+                ),
+                (
+                    "warband",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="unit_kill_stats",
+                        to="warbands.warband",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "campaign_unit_kill_stats",
+                "indexes": [
+                    models.Index(
+                        models.F("campaign"),
+                        models.OrderBy(models.F("kills"), descending=True),
+                        models.F("unit_name_sort"),
+                        models.F("warband_name_sort"),
+                        models.F("unit_id"),
+                        name="kill_stats_campaign_rank_idx",
+                    ),
+                    models.Index(
+                        models.F("warband"),
+                        models.OrderBy(models.F("kills"), descending=True),
+                        models.F("unit_name_sort"),
+                        name="kill_stats_warband_rank_idx",
+                    ),
+                    models.Index(
+                        models.F("campaign"),
+                        models.F("unit_kind"),
+                        models.OrderBy(models.F("kills"), descending=True),
+                        models.F("unit_name_sort"),
+                        name="kill_stats_kind_rank_idx",
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(fields=("unit_kind", "unit_id"), name="unique_campaign_unit_kill_stat")
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_kill_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("battles", "0016_battleevent_kill_columns"),
+        ("campaigns", "0012_campaignunitkillstat"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BattleMomentState",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("detector_state_json", models.JSONField(blank=True, default=dict)),
+                ("pending_json", models.JSONField(blank=True, default=list)),
+                ("last_event_id", models.BigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "battle",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="moment_state", to="battles.battle"
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "campaign_battle_moment_state",
+            },
+        ),
+    ]
@@ -309,3 +309,74 @@ class PivotalMoment(models.Model):
     def save(self, *args, **kwargs):
         self.full_clean()
         return super().save(*args, **kwargs)
+
+
+class BattleMomentState(models.Model):
+    """Pivotal moment detector state of a battle that has not ended yet."""
+
+    battle = models.OneToOneField("battles.Battle", related_name="moment_state", on_delete=models.CASCADE)
+    detector_state_json = models.JSONField(default=dict, blank=True)
+    pending_json = models.JSONField(default=list, blank=True)
+    last_event_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "campaign_battle_moment_state"
+
+    def __str__(self):
+        return f"{self.battle_id}:{len(self.pending_json or [])}"
+
+
+class CampaignUnitKillStat(models.Model):
+    UNIT_KIND_HERO = "hero"
+    UNIT_KIND_HIRED_SWORD = "hired_sword"
+    UNIT_KIND_HENCHMAN = "henchman"
+
+    UNIT_KIND_CHOICES = (
+        (UNIT_KIND_HERO, "Hero"),
+        (UNIT_KIND_HIRED_SWORD, "Hired sword"),
+        (UNIT_KIND_HENCHMAN, "Henchman"),
+    )
+
+    campaign = models.ForeignKey(Campaign, related_name="unit_kill_stats", on_delete=models.CASCADE)
+    warband = models.ForeignKey("warbands.Warband", related_name="unit_kill_stats", on_delete=models.CASCADE)
+    unit_kind = models.CharField(max_length=20, choices=UNIT_KIND_CHOICES)
+    unit_id = models.BigIntegerField()
+    unit_name = models.CharField(max_length=160)
+    unit_name_sort = models.CharField(max_length=160)
+    unit_type = models.CharField(max_length=120, null=True, blank=True)
+    warband_name = models.CharField(max_length=120)
+    warband_name_sort = models.CharField(max_length=120)
+    kills = models.PositiveIntegerField()
+
+    class Meta:
+        db_table = "campaign_unit_kill_stats"
+        constraints = [
+            models.UniqueConstraint(fields=["unit_kind", "unit_id"], name="unique_campaign_unit_kill_stat"),
+        ]
+        indexes = [
+            models.Index(
+                "campaign",
+                models.F("kills").desc(),
+                "unit_name_sort",
+                "warband_name_sort",
+                "unit_id",
+                name="kill_stats_campaign_rank_idx",
+            ),
+            models.Index(
+                "warband",
+                models.F("kills").desc(),
+                "unit_name_sort",
+                name="kill_stats_warband_rank_idx",
+            ),
+            models.Index(
+                "campaign",
+                "unit_kind",
+                models.F("kills").desc(),
+                "unit_name_sort",
+                name="kill_stats_kind_rank_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.campaign_id}:{self.unit_kind}:{self.unit_id}={self.kills}"
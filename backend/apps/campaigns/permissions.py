@@ -1,8 +1,110 @@
+from contextvars import ContextVar
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+
 from .models import CampaignMembership, CampaignMembershipPermission
 
+MEMBERSHIP_CACHE_TIMEOUT = 60 * 15
+
+# Per-request memo of resolved memberships, installed by MembershipCacheMiddleware.
+_request_memberships: ContextVar[dict | None] = ContextVar("campaign_request_memberships", default=None)
+# Campaigns whose memberships this request changed; their lookups skip the shared cache.
+_request_changed_campaigns: ContextVar[set | None] = ContextVar("campaign_request_changed_campaigns", default=None)
+
+
+def _membership_version_key(campaign_id) -> str:
+    return f"campaigns:membership-version:{campaign_id}"
+
+
+def _membership_cache_key(campaign_id, user_id, version: int) -> str:
+    return f"campaigns:membership:{campaign_id}:{user_id}:v{version}"
+
+
+def _load_membership(user_id, campaign_id):
+    membership = (
+        CampaignMembership.objects.select_related("role").filter(campaign_id=campaign_id, user_id=user_id).first()
+    )
+    if membership and membership.role.slug not in ("owner", "admin"):
+        membership._permission_codes = frozenset(
+            CampaignMembershipPermission.objects.filter(membership=membership).values_list(
+                "permission__code", flat=True
+            )
+        )
+    return membership
+
 
 def get_membership(user, campaign_id):
-    return CampaignMembership.objects.select_related("role").filter(campaign_id=campaign_id, user=user).first()
+    user_id = getattr(user, "pk", None)
+    if user_id is None:
+        return None
+    try:
+        campaign_id = int(campaign_id)
+    except (TypeError, ValueError):
+        return None
+
+    memo = _request_memberships.get()
+    if memo is not None and (campaign_id, user_id) in memo:
+        return memo[(campaign_id, user_id)]
+
+    changed = _request_changed_campaigns.get()
+    if changed is not None and campaign_id in changed:
+        # The change may not be committed yet, and may still roll back.
+        membership = _load_membership(user_id, campaign_id)
+    else:
+        version = cache.get(_membership_version_key(campaign_id), 0)
+        key = _membership_cache_key(campaign_id, user_id, version)
+        membership = cache.get(key)
+        if membership is None:
+            membership = _load_membership(user_id, campaign_id)
+            # Non-members are not cached so a fresh membership is visible immediately.
+            if membership is not None:
+                cache.set(key, membership, timeout=MEMBERSHIP_CACHE_TIMEOUT)
+
+    if memo is not None:
+        memo[(campaign_id, user_id)] = membership
+    return membership
+
+
+def _bump_membership_version(campaign_id) -> None:
+    key = _membership_version_key(campaign_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+
+
+def invalidate_campaign_memberships(campaign_id) -> None:
+    """Drop cached memberships for a campaign now and again once the transaction commits.
+
+    Another request can cache the old rows between the first bump and the commit; the
+    second bump discards them. This request stops using the shared cache for the campaign,
+    so rows it reads before committing never reach it, even if the transaction rolls back.
+    """
+    _bump_membership_version(campaign_id)
+    transaction.on_commit(partial(_bump_membership_version, campaign_id))
+    changed = _request_changed_campaigns.get()
+    if changed is not None:
+        changed.add(int(campaign_id))
+    memo = _request_memberships.get()
+    if memo is not None:
+        for memo_key in [entry for entry in memo if entry[0] == int(campaign_id)]:
+            del memo[memo_key]
+
+
+class MembershipCacheMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _request_memberships.set({})
+        changed_token = _request_changed_campaigns.set(set())
+        try:
+            return self.get_response(request)
+        finally:
+            _request_changed_campaigns.reset(changed_token)
+            _request_memberships.reset(token)
 
 
 def is_owner(membership):
@@ -18,6 +120,9 @@ def has_campaign_permission(membership, permission_code):
         return False
     if membership.role.slug in ("owner", "admin"):
         return True
+    permission_codes = getattr(membership, "_permission_codes", None)
+    if permission_codes is not None:
+        return permission_code in permission_codes
     return CampaignMembershipPermission.objects.filter(
         membership=membership,
         permission__code=permission_code,
@@ -1,6 +1,9 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+
 from apps.battles.models import Battle, BattleEvent, BattleParticipant
 
-from .models import PivotalMoment
+from .models import BattleMomentState, PivotalMoment
 
 EVENT_DRIVEN_MOMENT_KINDS = {
     "hero_slayer": "Hero Slayer",
@@ -85,106 +88,139 @@ def _append_moment(
     )
 
 
+@dataclass(frozen=True)
+class MomentDetector:
+    """Decides, one appended event at a time, whether the event earns a moment of `kind`.
+
+    `detect` gets the event and this detector's own state for the battle, a JSON-serializable dict it
+    may update in place, so a detector never has to look back over earlier events.
+    """
+
+    kind: str
+    event_types: frozenset[str]
+    detect: Callable[[BattleEvent, dict], bool]
+
+
+MOMENT_DETECTORS: list[MomentDetector] = []
+
+EVENT_DRIVEN_MOMENT_DETAILS = {
+    "hero_slayer": "{killer} took {victim} out of action.",
+    "no_fairies": "{killer} brought down caster {victim}.",
+    "giant_slayer": "{killer} slew large target {victim}.",
+    "there_can_be_only_one": "{killer} slew the enemy leader {victim}.",
+}
+
+
+def moment_detector(kind: str, *event_types: str):
+    def decorator(func):
+        MOMENT_DETECTORS.append(MomentDetector(kind=kind, event_types=frozenset(event_types), detect=func))
+        return func
+
+    return decorator
+
+
+@moment_detector("hero_slayer", BattleEvent.TYPE_UNIT_KILL_RECORDED)
+def _detect_hero_slayer(event: BattleEvent, state: dict) -> bool:
+    return event.killer_unit_type == "henchman" and event.victim_unit_type == "hero"
+
+
+@moment_detector("no_fairies", BattleEvent.TYPE_UNIT_KILL_RECORDED)
+def _detect_no_fairies(event: BattleEvent, state: dict) -> bool:
+    return event.victim_is_caster
+
+
+@moment_detector("giant_slayer", BattleEvent.TYPE_UNIT_KILL_RECORDED)
+def _detect_giant_slayer(event: BattleEvent, state: dict) -> bool:
+    return event.killer_unit_type in {"hero", "henchman", "hired_sword"} and event.victim_is_large
+
+
+@moment_detector("there_can_be_only_one", BattleEvent.TYPE_UNIT_KILL_RECORDED)
+def _detect_there_can_be_only_one(event: BattleEvent, state: dict) -> bool:
+    if not (event.killer_is_leader and event.victim_is_leader):
+        return False
+    awarded = state.setdefault("warband_ids", [])
+    if event.killer_warband_id in awarded:
+        return False
+    awarded.append(event.killer_warband_id)
+    return True
+
+
+def _detectors_for(event_type: str) -> list[MomentDetector]:
+    return [detector for detector in MOMENT_DETECTORS if event_type in detector.event_types]
+
+
+def _pending_moment(kind: str, event: BattleEvent) -> dict:
+    payload = event.payload_json if isinstance(event.payload_json, dict) else {}
+    killer = payload.get("killer") if isinstance(payload.get("killer"), dict) else {}
+    victim = payload.get("victim") if isinstance(payload.get("victim"), dict) else {}
+    return {
+        "kind": kind,
+        "warband_id": event.killer_warband_id,
+        "source_event_id": event.id,
+        "killer_unit_key": str(killer.get("unit_key") or "").strip() or None,
+        "killer_name": str(killer.get("name") or "").strip() or None,
+        "victim_unit_key": str(victim.get("unit_key") or "").strip() or None,
+        "victim_name": str(victim.get("name") or "").strip() or None,
+    }
+
+
+def _observe(state: BattleMomentState, event: BattleEvent, detectors: list[MomentDetector]) -> None:
+    for detector in detectors:
+        detector_state = state.detector_state_json.setdefault(detector.kind, {})
+        if detector.detect(event, detector_state):
+            state.pending_json.append(_pending_moment(detector.kind, event))
+    state.last_event_id = max(state.last_event_id, event.id)
+
+
+def observe_battle_event(battle: Battle, event: BattleEvent) -> None:
+    """Run the detectors over a newly appended event. Call it while holding the battle row lock."""
+    detectors = _detectors_for(event.type)
+    if not detectors or battle.flow_type != Battle.FLOW_TYPE_NORMAL:
+        return
+    state, _ = BattleMomentState.objects.get_or_create(battle_id=battle.id)
+    _observe(state, event, detectors)
+    state.save(update_fields=["detector_state_json", "pending_json", "last_event_id", "updated_at"])
+
+
+def _caught_up_moment_state(battle: Battle) -> BattleMomentState:
+    # Normally every event was observed as it was appended and this reads nothing. Battles that
+    # started before the detectors existed are replayed here once.
+    state = BattleMomentState.objects.filter(battle_id=battle.id).first() or BattleMomentState(battle_id=battle.id)
+    event_types = {event_type for detector in MOMENT_DETECTORS for event_type in detector.event_types}
+    missed = BattleEvent.objects.filter(battle_id=battle.id, type__in=event_types, id__gt=state.last_event_id)
+    for event in missed.order_by("id"):
+        _observe(state, event, _detectors_for(event.type))
+    return state
+
+
 def _generate_event_driven_moments(
     battle: Battle,
     participants_by_warband_id: dict[int, BattleParticipant],
     names_by_key: dict[str, str],
     rows: list[PivotalMoment],
 ) -> None:
-    kill_events = BattleEvent.objects.filter(
-        battle_id=battle.id,
-        type=BattleEvent.TYPE_UNIT_KILL_RECORDED,
-    ).order_by("id")
-
-    for event in kill_events:
-        payload = event.payload_json if isinstance(event.payload_json, dict) else {}
-        killer = payload.get("killer", {})
-        victim = payload.get("victim", {})
-        if not isinstance(killer, dict) or not isinstance(victim, dict):
-            continue
-
-        killer_warband_id = killer.get("warband_id")
-        try:
-            killer_warband_id = int(killer_warband_id)
-        except (TypeError, ValueError):
-            continue
-
-        participant = participants_by_warband_id.get(killer_warband_id)
+    state = _caught_up_moment_state(battle)
+    for pending in state.pending_json:
+        participant = participants_by_warband_id.get(pending["warband_id"])
         if not participant:
             continue
 
-        killer_unit_type = str(killer.get("unit_type", "")).strip().lower()
-        victim_unit_type = str(victim.get("unit_type", "")).strip().lower()
-        killer_unit_key = str(killer.get("unit_key", "")).strip() or None
-        victim_unit_key = str(victim.get("unit_key", "")).strip() or None
-        killer_name = str(killer.get("name", "")).strip() or names_by_key.get(killer_unit_key or "", "Unknown unit")
-        victim_name = str(victim.get("name", "")).strip() or names_by_key.get(victim_unit_key or "", "Unknown unit")
-
-        if killer_unit_type == "henchman" and victim_unit_type == "hero":
-            _append_moment(
-                rows,
-                battle=battle,
-                participant=participant,
-                warband_id=participant.warband_id,
-                kind="hero_slayer",
-                headline=EVENT_DRIVEN_MOMENT_KINDS["hero_slayer"],
-                detail=f"{killer_name} took {victim_name} out of action.",
-                unit_key=killer_unit_key,
-                unit_name=killer_name,
-                source_event_id=event.id,
-            )
-
-        victim_is_caster = victim.get("is_caster")
-        victim_caster_type = str(victim.get("caster_type", "")).strip()
-        if victim_is_caster is True and victim_caster_type in {"Wizard", "Priest"}:
-            _append_moment(
-                rows,
-                battle=battle,
-                participant=participant,
-                warband_id=participant.warband_id,
-                kind="no_fairies",
-                headline=EVENT_DRIVEN_MOMENT_KINDS["no_fairies"],
-                detail=f"{killer_name} brought down caster {victim_name}.",
-                unit_key=killer_unit_key,
-                unit_name=killer_name,
-                source_event_id=event.id,
-            )
-
-        victim_is_large = victim.get("is_large")
-        if killer_unit_type in {"hero", "henchman", "hired_sword"} and victim_is_large is True:
-            _append_moment(
-                rows,
-                battle=battle,
-                participant=participant,
-                warband_id=participant.warband_id,
-                kind="giant_slayer",
-                headline=EVENT_DRIVEN_MOMENT_KINDS["giant_slayer"],
-                detail=f"{killer_name} slew large target {victim_name}.",
-                unit_key=killer_unit_key,
-                unit_name=killer_name,
-                source_event_id=event.id,
-            )
-
-        killer_is_leader = killer.get("is_leader")
-        victim_is_leader = victim.get("is_leader")
-        if killer_is_leader is True and victim_is_leader is True:
-            already_recorded = any(
-                r.kind == "there_can_be_only_one" and r.warband_id == participant.warband_id
-                for r in rows
-            )
-            if not already_recorded:
-                _append_moment(
-                    rows,
-                    battle=battle,
-                    participant=participant,
-                    warband_id=participant.warband_id,
-                    kind="there_can_be_only_one",
-                    headline=EVENT_DRIVEN_MOMENT_KINDS["there_can_be_only_one"],
-                    detail=f"{killer_name} slew the enemy leader {victim_name}.",
-                    unit_key=killer_unit_key,
-                    unit_name=killer_name,
-                    source_event_id=event.id,
-                )
+        killer_unit_key = pending["killer_unit_key"]
+        killer_name = pending["killer_name"] or names_by_key.get(killer_unit_key or "", "Unknown unit")
+        victim_name = pending["victim_name"] or names_by_key.get(pending["victim_unit_key"] or "", "Unknown unit")
+        kind = pending["kind"]
+        _append_moment(
+            rows,
+            battle=battle,
+            participant=participant,
+            warband_id=participant.warband_id,
+            kind=kind,
+            headline=EVENT_DRIVEN_MOMENT_KINDS[kind],
+            detail=EVENT_DRIVEN_MOMENT_DETAILS[kind].format(killer=killer_name, victim=victim_name),
+            unit_key=killer_unit_key,
+            unit_name=killer_name,
+            source_event_id=pending["source_event_id"],
+        )
 
 
 def _generate_warband_moments(
@@ -312,3 +348,4 @@ def generate_pivotal_moments_for_battle(battle: Battle) -> None:
 
     if rows:
         PivotalMoment.objects.bulk_create(rows)
+    BattleMomentState.objects.filter(battle_id=battle.id).delete()
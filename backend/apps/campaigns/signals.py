@@ -0,0 +1,101 @@
+from django.db.models.signals import post_delete, post_save
+
+from apps.warbands.models import Henchman, HenchmenGroup, Hero, HiredSword, Warband
+
+from .kill_stats import (
+    refresh_henchmen_group_kill_stats,
+    refresh_unit_kill_stats,
+    remove_unit_kill_stat,
+    rename_warband_kill_stats,
+)
+from .models import CampaignMembership, CampaignMembershipPermission, CampaignUnitKillStat
+from .permissions import invalidate_campaign_memberships
+
+KILL_STAT_UNIT_KINDS = {
+    Hero: CampaignUnitKillStat.UNIT_KIND_HERO,
+    HiredSword: CampaignUnitKillStat.UNIT_KIND_HIRED_SWORD,
+    Henchman: CampaignUnitKillStat.UNIT_KIND_HENCHMAN,
+}
+
+
+def _invalidate_membership(sender, instance, **kwargs):
+    invalidate_campaign_memberships(instance.campaign_id)
+
+
+def _invalidate_membership_permission(sender, instance, **kwargs):
+    campaign_id = (
+        CampaignMembership.objects.filter(id=instance.membership_id).values_list("campaign_id", flat=True).first()
+    )
+    if campaign_id is not None:
+        invalidate_campaign_memberships(campaign_id)
+
+
+def connect_membership_cache_signals():
+    post_save.connect(_invalidate_membership, sender=CampaignMembership, dispatch_uid="campaign-membership-save")
+    post_delete.connect(_invalidate_membership, sender=CampaignMembership, dispatch_uid="campaign-membership-delete")
+    post_save.connect(
+        _invalidate_membership_permission,
+        sender=CampaignMembershipPermission,
+        dispatch_uid="campaign-membership-permission-save",
+    )
+    post_delete.connect(
+        _invalidate_membership_permission,
+        sender=CampaignMembershipPermission,
+        dispatch_uid="campaign-membership-permission-delete",
+    )
+
+
+KILL_STAT_UNIT_FIELDS = {"kills", "name", "unit_type", "warband", "warband_id"}
+KILL_STAT_HENCHMAN_FIELDS = {"kills", "name", "group", "group_id"}
+
+
+def _refresh_kill_stat(unit_kind, instance, created, update_fields, tracked_fields):
+    if created and not instance.kills:
+        return
+    if update_fields is not None and not tracked_fields.intersection(update_fields):
+        return
+    refresh_unit_kill_stats(unit_kind, [instance.id])
+
+
+def _hero_saved(sender, instance, created, update_fields=None, **kwargs):
+    _refresh_kill_stat(CampaignUnitKillStat.UNIT_KIND_HERO, instance, created, update_fields, KILL_STAT_UNIT_FIELDS)
+
+
+def _hired_sword_saved(sender, instance, created, update_fields=None, **kwargs):
+    _refresh_kill_stat(
+        CampaignUnitKillStat.UNIT_KIND_HIRED_SWORD, instance, created, update_fields, KILL_STAT_UNIT_FIELDS
+    )
+
+
+def _henchman_saved(sender, instance, created, update_fields=None, **kwargs):
+    _refresh_kill_stat(
+        CampaignUnitKillStat.UNIT_KIND_HENCHMAN, instance, created, update_fields, KILL_STAT_HENCHMAN_FIELDS
+    )
+
+
+def _henchmen_group_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and "unit_type" not in update_fields):
+        return
+    refresh_henchmen_group_kill_stats(instance.id)
+
+
+def _warband_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and "name" not in update_fields):
+        return
+    rename_warband_kill_stats(instance.id, instance.name)
+
+
+def _unit_deleted(sender, instance, **kwargs):
+    remove_unit_kill_stat(KILL_STAT_UNIT_KINDS[sender], instance.id)
+
+
+def connect_kill_stat_signals():
+    post_save.connect(_hero_saved, sender=Hero, dispatch_uid="campaign-kill-stats-Hero-save")
+    post_save.connect(_hired_sword_saved, sender=HiredSword, dispatch_uid="campaign-kill-stats-HiredSword-save")
+    post_save.connect(_henchman_saved, sender=Henchman, dispatch_uid="campaign-kill-stats-Henchman-save")
+    post_save.connect(
+        _henchmen_group_saved, sender=HenchmenGroup, dispatch_uid="campaign-kill-stats-HenchmenGroup-save"
+    )
+    post_save.connect(_warband_saved, sender=Warband, dispatch_uid="campaign-kill-stats-Warband-save")
+    for model in KILL_STAT_UNIT_KINDS:
+        post_delete.connect(_unit_deleted, sender=model, dispatch_uid=f"campaign-kill-stats-{model.__name__}-delete")
@@ -1,10 +1,23 @@
+import json
+from io import StringIO
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
-from datetime import datetime, timezone as dt_timezone
+from datetime import UTC, datetime, timedelta
 from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
 
-from apps.battles.models import Battle, BattleParticipant
+from apps.battles.models import Battle, BattleEvent, BattleParticipant
+from apps.battles.summaries import write_battle_summaries
+from apps.bestiary.models import BestiaryEntry
+from apps.campaigns.export import aiter_campaign_export, iter_campaign_export
 from apps.campaigns.models import (
     CampaignBulletinEntry,
     CampaignMembership,
@@ -13,22 +26,30 @@ from apps.campaigns.models import (
     PivotalMoment,
 )
 from apps.items.models import (
+    CampaignItemEffect,
     Item,
     ItemAvailability,
     ItemAvailabilityRestriction,
     ItemProperty,
     ItemPropertyLink,
 )
+from apps.items.effects import disable_item_effect, enable_item_effect
+from apps.campaigns.permissions import (
+    MembershipCacheMiddleware,
+    _membership_cache_key,
+    _membership_version_key,
+    get_membership,
+    has_campaign_permission,
+)
 from apps.restrictions.models import Restriction
+from apps.trades.models import TradeRequest
 from apps.campaigns.views import _ensure_permissions, _ensure_roles
 from apps.warbands.models import (
     Henchman,
     HenchmenGroup,
-    HenchmenGroupItem,
     Hero,
     HeroItem,
     HiredSword,
-    HiredSwordItem,
     Warband,
     WarbandItem,
 )
@@ -218,12 +239,18 @@ class CampaignApiTests(APITestCase):
             ["Cathay Setting", "Nehekharan Setting"],
         )
 
-    def test_create_half_price_armour_rule_creates_discounted_campaign_clones(self):
+    def _campaign_catalogue(self, user, campaign_id):
+        self.client.force_authenticate(user=user)
+        response = self.client.get("/api/items/", {"campaign_id": campaign_id})
+        self.assertEqual(response.status_code, 200)
+        return {row["name"]: row for row in response.data}
+
+    def test_create_half_price_armour_rule_discounts_base_armour_in_campaign_catalogue(self):
         owner = self._create_user("owner@example.com", "Owner")
         campaign = self._create_campaign(owner)
         restriction = self._create_setting("Nobles")
         property_entry = ItemProperty.objects.create(name="Bulky", type="Armour", description="Very heavy.")
-        heavy_armour = self._create_base_item(
+        self._create_base_item(
             "Heavy Armour",
             cost=51,
             rarity=9,
@@ -232,7 +259,7 @@ class CampaignApiTests(APITestCase):
             restriction_links=[(restriction, "Only nobles")],
             properties=[property_entry],
         )
-        chaos_armour = self._create_base_item(
+        self._create_base_item(
             "Chaos Armour",
             grade="1c",
             cost=185,
@@ -241,67 +268,83 @@ class CampaignApiTests(APITestCase):
             save_value="4+",
         )
         self._create_base_item("Shield", subtype="Shield", cost=5, rarity=2, save_value="")
+        item_count = Item.objects.count()
 
         response = self._create_half_price_armour_rule(owner, campaign["id"])
 
         self.assertEqual(response.status_code, 201)
         self.assertEqual(response.data["effect_key"], "half_price_armour")
+        self.assertEqual(Item.objects.count(), item_count)
+        self.assertTrue(
+            CampaignItemEffect.objects.filter(campaign_id=campaign["id"], effect_key="half_price_armour").exists()
+        )
 
-        clones = Item.objects.filter(
-            campaign_id=campaign["id"],
-            generated_effect_key="half_price_armour",
-        ).select_related("source_item")
-        self.assertEqual(clones.count(), 2)
-        self.assertFalse(clones.filter(source_item__subtype="Shield").exists())
-
-        heavy_clone = clones.get(source_item=heavy_armour)
-        self.assertEqual(heavy_clone.name, heavy_armour.name)
-        self.assertEqual(heavy_clone.type, heavy_armour.type)
-        self.assertEqual(heavy_clone.subtype, heavy_armour.subtype)
-        self.assertEqual(heavy_clone.grade, heavy_armour.grade)
-        self.assertEqual(heavy_clone.description, heavy_armour.description)
-        self.assertEqual(heavy_clone.save_value, heavy_armour.save_value)
-        self.assertEqual(heavy_clone.source_item_id, heavy_armour.id)
-
-        heavy_clone_availability = heavy_clone.availabilities.get()
-        self.assertEqual(heavy_clone_availability.cost, 26)
-        self.assertEqual(heavy_clone_availability.rarity, 9)
+        catalogue = self._campaign_catalogue(owner, campaign["id"])
+        heavy_armour = catalogue["Heavy Armour"]
+        self.assertIsNone(heavy_armour["campaign_id"])
+        self.assertEqual(heavy_armour["save"], "5+")
+        self.assertEqual(heavy_armour["availabilities"][0]["cost"], 26)
+        self.assertEqual(heavy_armour["availabilities"][0]["rarity"], 9)
         self.assertEqual(
-            list(
-                heavy_clone_availability.restriction_links.order_by("id").values_list(
-                    "restriction__restriction",
-                    "additional_note",
-                )
-            ),
+            [
+                (entry["restriction"]["restriction"], entry["additional_note"])
+                for entry in heavy_armour["availabilities"][0]["restrictions"]
+            ],
             [("Nobles", "Only nobles")],
         )
-        self.assertEqual(
-            list(heavy_clone.property_links.values_list("property__name", flat=True)),
-            ["Bulky"],
-        )
+        self.assertEqual([entry["name"] for entry in heavy_armour["properties"]], ["Bulky"])
+        self.assertEqual(catalogue["Chaos Armour"]["availabilities"][0]["cost"], 93)
+        self.assertEqual(catalogue["Shield"]["availabilities"][0]["cost"], 5)
+
+        base_response = self.client.get("/api/items/")
+        base_costs = {row["name"]: row["availabilities"][0]["cost"] for row in base_response.data}
+        self.assertEqual(base_costs["Heavy Armour"], 51)
+
+    def test_bestiary_edit_refreshes_items_that_nest_the_entry(self):
+        owner = self._create_user("owner@example.com", "Owner")
+        campaign = self._create_campaign(owner)
+        entry = BestiaryEntry.objects.create(campaign_id=campaign["id"], name="Warhound", type="Animal")
+        Item.objects.create(campaign_id=campaign["id"], name="Warhound", type="Animal", bestiary_entry=entry)
 
-        chaos_clone = clones.get(source_item=chaos_armour)
-        self.assertEqual(chaos_clone.availabilities.get().cost, 93)
+        self.client.force_authenticate(user=owner)
+        first = self.client.get("/api/items/", {"campaign_id": campaign["id"]})
+        self.assertEqual(first.data[0]["bestiary_entry"]["name"], "Warhound")
+
+        response = self.client.patch(f"/api/bestiary/{entry.id}/", {"name": "War Mastiff"}, format="json")
+        self.assertEqual(response.status_code, 200)
 
-    def test_creating_half_price_armour_rule_twice_is_idempotent_for_generated_items(self):
+        refreshed = self.client.get(
+            "/api/items/", {"campaign_id": campaign["id"]}, HTTP_IF_NONE_MATCH=first["ETag"]
+        )
+        self.assertEqual(refreshed.status_code, 200)
+        self.assertEqual(refreshed.data[0]["bestiary_entry"]["name"], "War Mastiff")
+
+    def test_half_price_armour_effect_stays_until_the_last_rule_using_it_is_deleted(self):
         owner = self._create_user("owner@example.com", "Owner")
         campaign = self._create_campaign(owner)
-        source_item = self._create_base_item("Light Armour", cost=20, rarity=8)
+        self._create_base_item("Light Armour", cost=20, rarity=8)
+
+        def light_armour_cost():
+            return self._campaign_catalogue(owner, campaign["id"])["Light Armour"]["availabilities"][0]["cost"]
 
         first_response = self._create_half_price_armour_rule(owner, campaign["id"])
         second_response = self._create_half_price_armour_rule(owner, campaign["id"], title="Half Price Armour Copy")
 
         self.assertEqual(first_response.status_code, 201)
         self.assertEqual(second_response.status_code, 201)
-        clones = Item.objects.filter(
-            campaign_id=campaign["id"],
-            generated_effect_key="half_price_armour",
-            source_item=source_item,
-        )
-        self.assertEqual(clones.count(), 1)
-        self.assertEqual(clones.get().availabilities.get().cost, 10)
+        self.assertEqual(CampaignItemEffect.objects.filter(campaign_id=campaign["id"]).count(), 1)
+        self.assertEqual(light_armour_cost(), 10)
+
+        self.client.delete(f"/api/campaigns/{campaign['id']}/rules/{first_response.data['id']}/")
+        self.assertEqual(light_armour_cost(), 10)
+
+        delete_response = self.client.delete(f"/api/campaigns/{campaign['id']}/rules/{second_response.data['id']}/")
 
-    def test_create_half_price_armour_rule_remaps_owned_items_to_discounted_clones(self):
+        self.assertEqual(delete_response.status_code, 204)
+        self.assertFalse(CampaignItemEffect.objects.filter(campaign_id=campaign["id"]).exists())
+        self.assertEqual(light_armour_cost(), 20)
+
+    def test_half_price_armour_rule_keeps_owned_rows_and_discounts_new_purchases(self):
         owner = self._create_user("owner@example.com", "Owner")
         campaign = self._create_campaign(owner)
         armour = self._create_base_item("Ithilmar Armour", cost=91, rarity=11)
@@ -312,157 +355,68 @@ class CampaignApiTests(APITestCase):
             faction="Mercenaries",
         )
         hero = Hero.objects.create(warband=warband, name="Captain", unit_type="Leader")
-        hired_sword = HiredSword.objects.create(warband=warband, name="Scout", unit_type="Ranger")
-        group = HenchmenGroup.objects.create(warband=warband, name="Youngbloods", unit_type="Mercenary")
-        WarbandItem.objects.create(warband=warband, item=armour, quantity=2, cost=91)
         HeroItem.objects.create(hero=hero, item=armour, cost=91)
-        HiredSwordItem.objects.create(hired_sword=hired_sword, item=armour, cost=91)
-        HenchmenGroupItem.objects.create(henchmen_group=group, item=armour, cost=91)
 
         response = self._create_half_price_armour_rule(owner, campaign["id"])
 
         self.assertEqual(response.status_code, 201)
-        clone = Item.objects.get(
-            campaign_id=campaign["id"],
-            generated_effect_key="half_price_armour",
-            source_item=armour,
-        )
-        self.assertEqual(WarbandItem.objects.get(warband=warband).item_id, clone.id)
-        self.assertEqual(WarbandItem.objects.get(warband=warband).cost, 46)
-        self.assertEqual(HeroItem.objects.get(hero=hero).item_id, clone.id)
-        self.assertEqual(HeroItem.objects.get(hero=hero).cost, 46)
-        self.assertEqual(HiredSwordItem.objects.get(hired_sword=hired_sword).item_id, clone.id)
-        self.assertEqual(HiredSwordItem.objects.get(hired_sword=hired_sword).cost, 46)
-        self.assertEqual(HenchmenGroupItem.objects.get(henchmen_group=group).item_id, clone.id)
-        self.assertEqual(HenchmenGroupItem.objects.get(henchmen_group=group).cost, 46)
-
-    def test_delete_half_price_armour_rule_restores_owned_items_and_removes_clones(self):
-        owner = self._create_user("owner@example.com", "Owner")
-        campaign = self._create_campaign(owner)
-        armour = self._create_base_item("Gromril Armour", cost=150, rarity=11)
-        warband = Warband.objects.create(
-            campaign_id=campaign["id"],
-            user=owner,
-            name="Steel Faith",
-            faction="Dwarfs",
-        )
-        hero = Hero.objects.create(warband=warband, name="Noble", unit_type="Hero")
-        WarbandItem.objects.create(warband=warband, item=armour, quantity=1, cost=150)
-        HeroItem.objects.create(hero=hero, item=armour, cost=150)
+        self.assertEqual(HeroItem.objects.get(hero=hero).item_id, armour.id)
+        self.assertEqual(HeroItem.objects.get(hero=hero).cost, 91)
 
-        create_response = self._create_half_price_armour_rule(owner, campaign["id"])
-        rule_id = create_response.data["id"]
-        clone = Item.objects.get(
-            campaign_id=campaign["id"],
-            generated_effect_key="half_price_armour",
-            source_item=armour,
-        )
-        self.assertEqual(WarbandItem.objects.get(warband=warband).item_id, clone.id)
+        hero_response = self.client.get(f"/api/warbands/{warband.id}/heroes/{hero.id}/")
+        self.assertEqual(hero_response.status_code, 200)
+        self.assertEqual(hero_response.data["items"][0]["cost"], 91)
+        self.assertEqual(hero_response.data["items"][0]["availabilities"][0]["cost"], 46)
 
-        self.client.force_authenticate(user=owner)
-        delete_response = self.client.delete(f"/api/campaigns/{campaign['id']}/rules/{rule_id}/")
+        stash_response = self.client.post(f"/api/warbands/{warband.id}/items/", {"item_id": armour.id}, format="json")
+        self.assertEqual(stash_response.status_code, 201)
+        self.assertEqual(WarbandItem.objects.get(warband=warband, item=armour).cost, 46)
 
-        self.assertEqual(delete_response.status_code, 204)
-        self.assertFalse(
-            Item.objects.filter(
-                campaign_id=campaign["id"],
-                generated_effect_key="half_price_armour",
-            ).exists()
-        )
-        self.assertEqual(WarbandItem.objects.get(warband=warband).item_id, armour.id)
-        self.assertEqual(WarbandItem.objects.get(warband=warband).cost, 150)
-        self.assertEqual(HeroItem.objects.get(hero=hero).item_id, armour.id)
-        self.assertEqual(HeroItem.objects.get(hero=hero).cost, 150)
-
-    def test_delete_half_price_armour_rule_merges_stash_rows_on_revert_collision(self):
+    def test_toggling_house_rule_effects_does_not_touch_owned_rows(self):
         owner = self._create_user("owner@example.com", "Owner")
         campaign = self._create_campaign(owner)
-        armour = self._create_base_item("Lamellar Armour", cost=120, rarity=10)
+        armour = self._create_base_item("Heavy Armour", cost=50, rarity=8)
         warband = Warband.objects.create(
             campaign_id=campaign["id"],
             user=owner,
-            name="Golden Blades",
-            faction="Cathay",
-        )
-        WarbandItem.objects.create(warband=warband, item=armour, quantity=1, cost=120)
-
-        create_response = self._create_half_price_armour_rule(owner, campaign["id"])
-        rule_id = create_response.data["id"]
-        clone = Item.objects.get(
-            campaign_id=campaign["id"],
-            generated_effect_key="half_price_armour",
-            source_item=armour,
+            name="Iron Vultures",
+            faction="Mercenaries",
         )
-        self.assertEqual(WarbandItem.objects.get(warband=warband).item_id, clone.id)
-
-        WarbandItem.objects.create(warband=warband, item=armour, quantity=3, cost=120)
+        WarbandItem.objects.create(warband=warband, item=armour, quantity=1, cost=50)
 
-        self.client.force_authenticate(user=owner)
-        delete_response = self.client.delete(f"/api/campaigns/{campaign['id']}/rules/{rule_id}/")
+        def toggle_with_more_owned_rows(count):
+            for index in range(count):
+                hero = Hero.objects.create(warband=warband, name=f"Hero {index}", unit_type="Champion")
+                HeroItem.objects.create(hero=hero, item=armour, cost=50)
+            with CaptureQueriesContext(connection) as enable_queries:
+                enable_item_effect(campaign["id"], "half_price_armour")
+            with CaptureQueriesContext(connection) as disable_queries:
+                disable_item_effect(campaign["id"], "half_price_armour")
+            return len(enable_queries), len(disable_queries)
 
-        self.assertEqual(delete_response.status_code, 204)
-        stash_rows = WarbandItem.objects.filter(warband=warband, item=armour)
-        self.assertEqual(stash_rows.count(), 1)
-        self.assertEqual(stash_rows.get().quantity, 4)
-        self.assertEqual(stash_rows.get().cost, 120)
+        self.assertEqual(toggle_with_more_owned_rows(2), toggle_with_more_owned_rows(20))
+        self.assertEqual(HeroItem.objects.filter(item=armour, cost=50).count(), 22)
 
-    def test_create_improved_shields_rule_creates_campaign_shield_clones_with_cc_save_text(self):
+    def test_create_improved_shields_rule_adds_cc_save_text_to_campaign_shields(self):
         owner = self._create_user("owner@example.com", "Owner")
         campaign = self._create_campaign(owner)
-        shield = self._create_base_item("Shield", subtype="Shield", cost=5, rarity=2, save_value="6+")
-        pavise = self._create_base_item("Pavise", subtype="Shield", cost=25, rarity=8, save_value="6+")
-        buckler = self._create_base_item("Buckler", subtype="Shield", cost=5, rarity=2, save_value="")
+        self._create_base_item("Shield", subtype="Shield", cost=5, rarity=2, save_value="6+")
+        self._create_base_item("Pavise", subtype="Shield", cost=25, rarity=8, save_value="6+")
+        self._create_base_item("Buckler", subtype="Shield", cost=5, rarity=2, save_value="")
         self._create_base_item("Heavy Armour", subtype="Armour", cost=50, rarity=8, save_value="5+")
 
         response = self._create_improved_shields_rule(owner, campaign["id"])
 
         self.assertEqual(response.status_code, 201)
-        clones = Item.objects.filter(
-            campaign_id=campaign["id"],
-            generated_effect_key="improved_shields",
-        ).select_related("source_item")
-        self.assertEqual(clones.count(), 3)
-
-        shield_clone = clones.get(source_item=shield)
-        self.assertEqual(shield_clone.save_value, "6+ (5+ CC)")
-        self.assertEqual(shield_clone.availabilities.get().cost, 5)
-
-        pavise_clone = clones.get(source_item=pavise)
-        self.assertEqual(pavise_clone.save_value, "6+ (5+ CC)")
-        self.assertEqual(pavise_clone.availabilities.get().cost, 25)
-
-        buckler_clone = clones.get(source_item=buckler)
-        self.assertEqual(buckler_clone.save_value, "")
-
-    def test_create_improved_shields_rule_remaps_owned_items_to_shield_clones(self):
-        owner = self._create_user("owner@example.com", "Owner")
-        campaign = self._create_campaign(owner)
-        shield = self._create_base_item("Shield", subtype="Shield", cost=5, rarity=2, save_value="6+")
-        warband = Warband.objects.create(
-            campaign_id=campaign["id"],
-            user=owner,
-            name="Wardens",
-            faction="Mercenaries",
-        )
-        hero = Hero.objects.create(warband=warband, name="Captain", unit_type="Leader")
-        WarbandItem.objects.create(warband=warband, item=shield, quantity=2, cost=5)
-        HeroItem.objects.create(hero=hero, item=shield, cost=5)
-
-        response = self._create_improved_shields_rule(owner, campaign["id"])
-
-        self.assertEqual(response.status_code, 201)
-        clone = Item.objects.get(
-            campaign_id=campaign["id"],
-            generated_effect_key="improved_shields",
-            source_item=shield,
-        )
-        self.assertEqual(clone.save_value, "6+ (5+ CC)")
-        self.assertEqual(WarbandItem.objects.get(warband=warband).item_id, clone.id)
-        self.assertEqual(WarbandItem.objects.get(warband=warband).cost, 5)
-        self.assertEqual(HeroItem.objects.get(hero=hero).item_id, clone.id)
-        self.assertEqual(HeroItem.objects.get(hero=hero).cost, 5)
-
-    def test_delete_improved_shields_rule_restores_owned_items_and_removes_shield_clones(self):
+        catalogue = self._campaign_catalogue(owner, campaign["id"])
+        self.assertEqual(catalogue["Shield"]["save"], "6+ (5+ CC)")
+        self.assertEqual(catalogue["Shield"]["availabilities"][0]["cost"], 5)
+        self.assertEqual(catalogue["Pavise"]["save"], "6+ (5+ CC)")
+        self.assertEqual(catalogue["Pavise"]["availabilities"][0]["cost"], 25)
+        self.assertEqual(catalogue["Buckler"]["save"], "")
+        self.assertEqual(catalogue["Heavy Armour"]["save"], "5+")
+
+    def test_improved_shields_rule_applies_to_owned_shields_until_deleted(self):
         owner = self._create_user("owner@example.com", "Owner")
         campaign = self._create_campaign(owner)
         shield = self._create_base_item("Kite Shield", subtype="Shield", grade="1c", cost=10, rarity=2, save_value="5+")
@@ -472,29 +426,20 @@ class CampaignApiTests(APITestCase):
             name="Lances",
             faction="Bretonnians",
         )
-        WarbandItem.objects.create(warband=warband, item=shield, quantity=1, cost=10)
+        hero = Hero.objects.create(warband=warband, name="Captain", unit_type="Leader")
+        HeroItem.objects.create(hero=hero, item=shield, cost=10)
 
         create_response = self._create_improved_shields_rule(owner, campaign["id"])
-        rule_id = create_response.data["id"]
-        clone = Item.objects.get(
-            campaign_id=campaign["id"],
-            generated_effect_key="improved_shields",
-            source_item=shield,
-        )
-        self.assertEqual(WarbandItem.objects.get(warband=warband).item_id, clone.id)
+        hero_response = self.client.get(f"/api/warbands/{warband.id}/heroes/{hero.id}/")
+        self.assertEqual(hero_response.data["items"][0]["id"], shield.id)
+        self.assertEqual(hero_response.data["items"][0]["save"], "5+ (4+ CC)")
 
-        self.client.force_authenticate(user=owner)
-        delete_response = self.client.delete(f"/api/campaigns/{campaign['id']}/rules/{rule_id}/")
+        delete_response = self.client.delete(f"/api/campaigns/{campaign['id']}/rules/{create_response.data['id']}/")
 
         self.assertEqual(delete_response.status_code, 204)
-        self.assertFalse(
-            Item.objects.filter(
-                campaign_id=campaign["id"],
-                generated_effect_key="improved_shields",
-            ).exists()
-        )
-        self.assertEqual(WarbandItem.objects.get(warband=warband).item_id, shield.id)
-        self.assertEqual(WarbandItem.objects.get(warband=warband).cost, 10)
+        hero_response = self.client.get(f"/api/warbands/{warband.id}/heroes/{hero.id}/")
+        self.assertEqual(hero_response.data["items"][0]["save"], "5+")
+        self.assertEqual(HeroItem.objects.get(hero=hero).cost, 10)
 
     def test_list_campaigns_returns_only_user_campaigns(self):
         owner = self._create_user("owner@example.com", "Owner")
@@ -779,7 +724,7 @@ class CampaignApiTests(APITestCase):
             scenario="Street Fight",
             flow_type=Battle.FLOW_TYPE_NORMAL,
             status=Battle.STATUS_ENDED,
-            ended_at=datetime(2026, 3, 24, 18, 30, tzinfo=dt_timezone.utc),
+            ended_at=datetime(2026, 3, 24, 18, 30, tzinfo=UTC),
             winner_warband_ids_json=[owner_warband.id],
         )
         BattleParticipant.objects.create(
@@ -832,7 +777,7 @@ class CampaignApiTests(APITestCase):
             scenario="Ambush",
             flow_type=Battle.FLOW_TYPE_REPORTED_RESULT,
             status=Battle.STATUS_ENDED,
-            ended_at=datetime(2026, 3, 23, 11, 0, tzinfo=dt_timezone.utc),
+            ended_at=datetime(2026, 3, 23, 11, 0, tzinfo=UTC),
             winner_warband_ids_json=[player_warband.id],
         )
         BattleParticipant.objects.create(
@@ -856,7 +801,7 @@ class CampaignApiTests(APITestCase):
             scenario="Canceled Clash",
             flow_type=Battle.FLOW_TYPE_NORMAL,
             status=Battle.STATUS_CANCELED,
-            ended_at=datetime(2026, 3, 22, 11, 0, tzinfo=dt_timezone.utc),
+            ended_at=datetime(2026, 3, 22, 11, 0, tzinfo=UTC),
         )
         BattleParticipant.objects.create(
             battle=canceled_battle,
@@ -864,13 +809,16 @@ class CampaignApiTests(APITestCase):
             warband=owner_warband,
             status=BattleParticipant.STATUS_CANCELED_PREBATTLE,
         )
+        write_battle_summaries(normal_battle)
+        write_battle_summaries(reported_battle)
 
         self.client.force_authenticate(user=owner)
         response = self.client.get(f"/api/campaigns/{campaign['id']}/battle-history/")
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNone(response.data["next_cursor"])
 
-        latest_entry = response.data[0]
+        latest_entry = response.data["results"][0]
         self.assertEqual(latest_entry["scenario"], "Street Fight")
         self.assertEqual(latest_entry["winners"], [owner_warband.name])
         self.assertEqual(latest_entry["date"], "24/03/26")
@@ -886,7 +834,7 @@ class CampaignApiTests(APITestCase):
         self.assertEqual(owner_entry["xp_gain"], 6)
         self.assertEqual(owner_entry["exploration"], [4, 5])
 
-        reported_entry = response.data[1]
+        reported_entry = response.data["results"][1]
         self.assertEqual(reported_entry["scenario"], "Ambush")
         self.assertEqual(reported_entry["winners"], [player_warband.name])
         self.assertEqual(reported_entry["date"], "23/03/26")
@@ -899,6 +847,44 @@ class CampaignApiTests(APITestCase):
         self.assertIsNone(blank_owner_entry["xp_gain"])
         self.assertEqual(blank_owner_entry["exploration"], [])
 
+    def test_battle_history_paginates_with_cursor(self):
+        owner = self._create_user("owner@example.com", "Owner")
+        campaign = self._create_campaign(owner)
+        warband = Warband.objects.create(
+            campaign_id=campaign["id"],
+            user=owner,
+            name="Iron Vultures",
+            faction="Mercenaries",
+        )
+        ended_at = datetime(2026, 3, 24, 18, 30, tzinfo=UTC)
+        battle_ids = []
+        for scenario in ("First", "Second", "Third"):
+            battle = Battle.objects.create(
+                campaign_id=campaign["id"],
+                created_by_user=owner,
+                scenario=scenario,
+                status=Battle.STATUS_ENDED,
+                ended_at=ended_at,
+            )
+            BattleParticipant.objects.create(battle=battle, user=owner, warband=warband)
+            write_battle_summaries(battle)
+            battle_ids.append(battle.id)
+
+        self.client.force_authenticate(user=owner)
+        url = f"/api/campaigns/{campaign['id']}/battle-history/"
+        first_page = self.client.get(url, {"limit": 2})
+        self.assertEqual(first_page.status_code, 200)
+        self.assertEqual([entry["id"] for entry in first_page.data["results"]], [battle_ids[2], battle_ids[1]])
+        self.assertIsNotNone(first_page.data["next_cursor"])
+
+        second_page = self.client.get(url, {"limit": 2, "cursor": first_page.data["next_cursor"]})
+        self.assertEqual(second_page.status_code, 200)
+        self.assertEqual([entry["id"] for entry in second_page.data["results"]], [battle_ids[0]])
+        self.assertIsNone(second_page.data["next_cursor"])
+
+        invalid = self.client.get(url, {"cursor": "not-a-cursor"})
+        self.assertEqual(invalid.status_code, 400)
+
     def test_pivotal_moments_endpoint_returns_only_persisted_rows(self):
         owner = self._create_user("owner@example.com", "Owner")
         campaign = self._create_campaign(owner, max_players=3)
@@ -932,7 +918,7 @@ class CampaignApiTests(APITestCase):
             scenario="Old Clash",
             flow_type=Battle.FLOW_TYPE_NORMAL,
             status=Battle.STATUS_ENDED,
-            ended_at=datetime(2026, 3, 20, 12, 0, tzinfo=dt_timezone.utc),
+            ended_at=datetime(2026, 3, 20, 12, 0, tzinfo=UTC),
             winner_warband_ids_json=[owner_warband.id],
         )
         BattleParticipant.objects.create(
@@ -949,7 +935,7 @@ class CampaignApiTests(APITestCase):
             scenario="Street Fight",
             flow_type=Battle.FLOW_TYPE_NORMAL,
             status=Battle.STATUS_ENDED,
-            ended_at=datetime(2026, 3, 24, 18, 30, tzinfo=dt_timezone.utc),
+            ended_at=datetime(2026, 3, 24, 18, 30, tzinfo=UTC),
             winner_warband_ids_json=[owner_warband.id],
         )
         BattleParticipant.objects.create(
@@ -972,7 +958,7 @@ class CampaignApiTests(APITestCase):
             scenario="Reported Result",
             flow_type=Battle.FLOW_TYPE_REPORTED_RESULT,
             status=Battle.STATUS_ENDED,
-            ended_at=datetime(2026, 3, 25, 18, 30, tzinfo=dt_timezone.utc),
+            ended_at=datetime(2026, 3, 25, 18, 30, tzinfo=UTC),
             winner_warband_ids_json=[player_warband.id],
         )
         BattleParticipant.objects.create(
@@ -1092,6 +1078,46 @@ class CampaignApiTests(APITestCase):
         self.assertNotIn("Zero Hero", unit_names)
         self.assertNotIn("Foreign Killer", unit_names)
 
+    def test_top_killers_supports_filters_and_offset(self):
+        owner = self._create_user("owner@example.com", "Owner")
+        campaign = self._create_campaign(owner)
+
+        warband = Warband.objects.create(
+            campaign_id=campaign["id"],
+            user=owner,
+            name="Iron Vultures",
+            faction="Mercenaries",
+        )
+        hero = Hero.objects.create(warband=warband, name="Captain Wolf", unit_type="Captain", kills=9)
+        HiredSword.objects.create(warband=warband, name="Ogre Bodyguard", unit_type="Ogre", kills=7)
+        group = HenchmenGroup.objects.create(warband=warband, name="Black Knives", unit_type="Thugs")
+        henchman = Henchman.objects.create(group=group, name="Blade One", kills=3)
+
+        self.client.force_authenticate(user=owner)
+        url = f"/api/campaigns/{campaign['id']}/top-killers/"
+
+        response = self.client.get(url, {"limit": 1, "offset": 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([entry["unit_name"] for entry in response.data["top_killers"]], ["Ogre Bodyguard"])
+
+        response = self.client.get(url, {"unit_kind": "henchman", "warband_id": warband.id})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([entry["unit_id"] for entry in response.data["top_killers"]], [henchman.id])
+        self.assertEqual(response.data["top_killers"][0]["unit_type"], "Thugs")
+
+        hero.kills = 0
+        hero.save(update_fields=["kills"])
+        warband.name = "Gilded Vultures"
+        warband.save(update_fields=["name"])
+        response = self.client.get(url)
+        self.assertEqual(
+            [entry["unit_name"] for entry in response.data["top_killers"]], ["Ogre Bodyguard", "Blade One"]
+        )
+        self.assertEqual(response.data["top_killers"][0]["warband_name"], "Gilded Vultures")
+
+        response = self.client.get(url, {"unit_kind": "dragon"})
+        self.assertEqual(response.status_code, 400)
+
     def test_top_killers_returns_empty_list_when_no_kills_exist(self):
         owner = self._create_user("owner@example.com", "Owner")
         campaign = self._create_campaign(owner)
@@ -1120,6 +1146,172 @@ class CampaignApiTests(APITestCase):
         response = self.client.get(f"/api/campaigns/{campaign['id']}/top-killers/")
         self.assertEqual(response.status_code, 404)
 
+    def _create_export_fixture(self, owner, campaign_id):
+        warband = Warband.objects.create(campaign_id=campaign_id, user=owner, name="Iron Vultures", faction="Mercenaries")
+        Hero.objects.create(warband=warband, name="Captain Aldric", xp=12)
+        group = HenchmenGroup.objects.create(warband=warband, name="Swordsmen")
+        Henchman.objects.create(group=group, name="Otto")
+        battle = Battle.objects.create(
+            campaign_id=campaign_id,
+            created_by_user=owner,
+            scenario="Street Fight",
+            flow_type=Battle.FLOW_TYPE_NORMAL,
+            status=Battle.STATUS_ENDED,
+        )
+        BattleParticipant.objects.create(battle=battle, user=owner, warband=warband)
+        BattleEvent.objects.create(battle=battle, actor_user=owner, type=BattleEvent.TYPE_BATTLE_CREATED)
+        return warband
+
+    def _export_records(self, user, campaign_id):
+        self.client.force_authenticate(user=user)
+        response = self.client.get(f"/api/campaigns/{campaign_id}/export/")
+        self.assertEqual(response.status_code, 200)
+        return [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+
+    def test_export_streams_campaign_rows_as_ndjson(self):
+        owner = self._create_user("owner@example.com", "Owner")
+        campaign = self._create_campaign(owner)
+        warband = self._create_export_fixture(owner, campaign["id"])
+
+        other_owner = self._create_user("other@example.com", "Other")
+        other_campaign = self._create_campaign(other_owner, name="Elsewhere")
+        self._create_export_fixture(other_owner, other_campaign["id"])
+
+        self.client.force_authenticate(user=owner)
+        response = self.client.get(f"/api/campaigns/{campaign['id']}/export/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+        records = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        types = [record["type"] for record in records]
+        self.assertEqual(types[0], "campaign")
+        for record_type in ("warband", "hero", "henchmen_group", "henchman", "battle", "battle_event"):
+            self.assertEqual(types.count(record_type), 1, record_type)
+        self.assertEqual(next(r for r in records if r["type"] == "warband")["data"]["id"], warband.id)
+        self.assertEqual(next(r for r in records if r["type"] == "hero")["data"]["xp"], "12.0")
+        self.assertEqual(
+            next(r for r in records if r["type"] == "battle_event")["data"]["type"], BattleEvent.TYPE_BATTLE_CREATED
+        )
+
+        response = self.client.get(f"/api/campaigns/{campaign['id']}/export/?export_format=json")
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(json.loads(b"".join(response.streaming_content)), records)
+
+        response = self.client.get(f"/api/campaigns/{campaign['id']}/export/?export_format=xml")
+        self.assertEqual(response.status_code, 400)
+
+        self.client.force_authenticate(user=other_owner)
+        response = self.client.get(f"/api/campaigns/{campaign['id']}/export/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_export_leaves_out_other_members_trades_and_battles(self):
+        owner = self._create_user("owner@example.com", "Owner")
+        campaign = self._create_campaign(owner)
+        owner_warband = self._create_export_fixture(owner, campaign["id"])
+        ended_battle = Battle.objects.get(campaign_id=campaign["id"])
+
+        players = []
+        for email in ("alice@example.com", "bob@example.com"):
+            player = self._create_user(email)
+            self.client.force_authenticate(user=player)
+            response = self.client.post("/api/campaigns/join/", {"join_code": campaign["join_code"]}, format="json")
+            self.assertEqual(response.status_code, 201)
+            warband = Warband.objects.create(campaign_id=campaign["id"], user=player, name=email, faction="Skaven")
+            players.append((player, warband))
+        (alice, alice_warband), (bob, bob_warband) = players
+
+        expires_at = timezone.now() + timedelta(minutes=5)
+        private_trade = TradeRequest.objects.create(
+            campaign_id=campaign["id"],
+            from_user=alice,
+            to_user=bob,
+            from_warband=alice_warband,
+            to_warband=bob_warband,
+            expires_at=expires_at,
+        )
+        shared_trade = TradeRequest.objects.create(
+            campaign_id=campaign["id"],
+            from_user=owner,
+            to_user=alice,
+            from_warband=owner_warband,
+            to_warband=alice_warband,
+            expires_at=expires_at,
+        )
+        private_battle = Battle.objects.create(
+            campaign_id=campaign["id"], created_by_user=alice, scenario="Ambush", status=Battle.STATUS_ACTIVE
+        )
+        for player, warband in players:
+            BattleParticipant.objects.create(
+                battle=private_battle, user=player, warband=warband, battle_notes="Hold the bridge"
+            )
+        BattleEvent.objects.create(battle=private_battle, actor_user=alice, type=BattleEvent.TYPE_BATTLE_CREATED)
+
+        def ids(records, record_type, field="id"):
+            return {record["data"][field] for record in records if record["type"] == record_type}
+
+        records = self._export_records(owner, campaign["id"])
+        self.assertEqual(ids(records, "trade_request"), {str(shared_trade.id)})
+        self.assertEqual(ids(records, "battle"), {ended_battle.id})
+        self.assertEqual(ids(records, "battle_participant", "battle_id"), {ended_battle.id})
+        self.assertEqual(ids(records, "battle_event", "battle_id"), {ended_battle.id})
+        self.assertEqual(ids(records, "warband"), {owner_warband.id, alice_warband.id, bob_warband.id})
+
+        records = self._export_records(alice, campaign["id"])
+        self.assertEqual(ids(records, "trade_request"), {str(private_trade.id), str(shared_trade.id)})
+        self.assertEqual(ids(records, "battle"), {ended_battle.id, private_battle.id})
+        self.assertEqual(ids(records, "battle_participant", "battle_id"), {private_battle.id})
+        self.assertEqual(ids(records, "battle_event", "battle_id"), {private_battle.id})
+
+    def test_async_export_streams_the_same_pieces(self):
+        owner = self._create_user("owner@example.com", "Owner")
+        campaign = self._create_campaign(owner)
+        self._create_export_fixture(owner, campaign["id"])
+
+        async def collect():
+            return [piece async for piece in aiter_campaign_export(campaign["id"], "json", chunk_size=2, user=owner)]
+
+        self.assertEqual(
+            async_to_sync(collect)(), list(iter_campaign_export(campaign["id"], "json", chunk_size=2, user=owner))
+        )
+
+    def test_export_streams_an_async_iterator_under_asgi(self):
+        owner = self._create_user("owner@example.com", "Owner")
+        campaign = self._create_campaign(owner)
+        self._create_export_fixture(owner, campaign["id"])
+        expected = "".join(iter_campaign_export(campaign["id"], user=owner)).encode()
+        token = str(RefreshToken.for_user(owner).access_token)
+
+        async def fetch():
+            response = await self.async_client.get(
+                f"/api/campaigns/{campaign['id']}/export/", headers={"Authorization": f"Bearer {token}"}
+            )
+            return response, b"".join([chunk async for chunk in response.streaming_content])
+
+        response, body = async_to_sync(fetch)()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        self.assertEqual(body, expected)
+
+    def test_export_campaign_command_matches_the_endpoint(self):
+        owner = self._create_user("owner@example.com", "Owner")
+        campaign = self._create_campaign(owner)
+        self._create_export_fixture(owner, campaign["id"])
+
+        self.client.force_authenticate(user=owner)
+        response = self.client.get(f"/api/campaigns/{campaign['id']}/export/")
+        expected = b"".join(response.streaming_content).decode()
+
+        out = StringIO()
+        call_command("export_campaign", campaign["id"], "--chunk-size", "1", stdout=out)
+        self.assertEqual(out.getvalue(), expected)
+
+        # Behind a transaction pooler the export pages through each table by primary key instead.
+        out = StringIO()
+        with patch.dict(connection.settings_dict, {"DISABLE_SERVER_SIDE_CURSORS": True}):
+            call_command("export_campaign", campaign["id"], "--chunk-size", "1", stdout=out)
+        self.assertEqual(out.getvalue(), expected)
+
     def test_bulletin_entry_create_list_and_delete_flow(self):
         owner = self._create_user("owner@example.com", "Owner")
         campaign = self._create_campaign(owner, max_players=3)
@@ -1225,6 +1417,80 @@ class CampaignApiTests(APITestCase):
         outsider_list_response = self.client.get(f"/api/campaigns/{campaign['id']}/bulletin/")
         self.assertEqual(outsider_list_response.status_code, 404)
 
+    def test_cached_membership_reflects_permission_and_role_changes(self):
+        owner = self._create_user("owner@example.com", "Owner")
+        campaign = self._create_campaign(owner)
+        target_user = self._create_user("player@example.com", "Player")
+        player_role = CampaignRole.objects.get(slug="player")
+        CampaignMembership.objects.create(campaign_id=campaign["id"], user=target_user, role=player_role)
+
+        self.client.force_authenticate(user=target_user)
+        membership = get_membership(target_user, campaign["id"])
+        self.assertFalse(has_campaign_permission(membership, "manage_rules"))
+        with self.assertNumQueries(0):
+            self.assertEqual(get_membership(target_user, campaign["id"]).role.slug, "player")
+
+        self.client.force_authenticate(user=owner)
+        response = self.client.put(
+            f"/api/campaigns/{campaign['id']}/members/{target_user.id}/permissions/",
+            {"permissions": ["manage_rules"]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        membership = get_membership(target_user, campaign["id"])
+        with self.assertNumQueries(0):
+            self.assertTrue(has_campaign_permission(membership, "manage_rules"))
+
+        response = self.client.patch(
+            f"/api/campaigns/{campaign['id']}/members/{target_user.id}/role/",
+            {"role": "admin"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(get_membership(target_user, campaign["id"]).role.slug, "admin")
+
+    def test_rolled_back_membership_change_is_not_cached(self):
+        owner = self._create_user("owner@example.com", "Owner")
+        campaign = self._create_campaign(owner)
+        target_user = self._create_user("player@example.com", "Player")
+        membership = CampaignMembership.objects.create(
+            campaign_id=campaign["id"], user=target_user, role=CampaignRole.objects.get(slug="player")
+        )
+        self.assertEqual(get_membership(target_user, campaign["id"]).role.slug, "player")
+
+        def failing_view(request):
+            with transaction.atomic():
+                membership.role = CampaignRole.objects.get(slug="admin")
+                membership.save(update_fields=["role"])
+                self.assertEqual(get_membership(target_user, campaign["id"]).role.slug, "admin")
+                raise RuntimeError("rolled back")
+
+        with self.assertRaises(RuntimeError):
+            MembershipCacheMiddleware(failing_view)(None)
+
+        self.assertEqual(get_membership(target_user, campaign["id"]).role.slug, "player")
+
+    def test_membership_cache_is_invalidated_again_on_commit(self):
+        owner = self._create_user("owner@example.com", "Owner")
+        campaign = self._create_campaign(owner)
+        target_user = self._create_user("player@example.com", "Player")
+        player_role = CampaignRole.objects.get(slug="player")
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            membership = CampaignMembership.objects.create(
+                campaign_id=campaign["id"], user=target_user, role=player_role
+            )
+            # Another request reads the pre-commit rows and caches them under the bumped version.
+            stale = CampaignMembership.objects.select_related("role").get(id=membership.id)
+            stale.role = CampaignRole.objects.get(slug="admin")
+            version = cache.get(_membership_version_key(campaign["id"]))
+            cache.set(_membership_cache_key(campaign["id"], target_user.id, version), stale)
+            self.assertEqual(get_membership(target_user, campaign["id"]).role.slug, "admin")
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(get_membership(target_user, campaign["id"]).role.slug, "player")
+
     def test_member_permissions_require_admin_or_owner(self):
         owner = self._create_user("owner@example.com", "Owner")
         campaign = self._create_campaign(owner)
@@ -7,6 +7,7 @@ from .views import (
     CampaignBattleHistoryView,
     CampaignBulletinDetailView,
     CampaignBulletinView,
+    CampaignExportView,
     CampaignHouseRuleDetailView,
     CampaignHouseRulesView,
     CampaignListCreateView,
@@ -59,6 +60,11 @@ urlpatterns = [
         CampaignTopKillersView.as_view(),
         name="campaigns-top-killers",
     ),
+    path(
+        "campaigns/<int:campaign_id>/export/",
+        CampaignExportView.as_view(),
+        name="campaigns-export",
+    ),
     path(
         "campaigns/<int:campaign_id>/bulletin/",
         CampaignBulletinView.as_view(),
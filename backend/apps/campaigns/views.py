@@ -2,33 +2,29 @@ import random
 import string
 from functools import lru_cache
 
+from django.core.handlers.asgi import ASGIRequest
 from django.db import transaction
-from django.db.models import CharField, Count, F, FilteredRelation, Prefetch, Q, Value
-from django.db.models.functions import Cast, Coalesce, Concat, Lower, NullIf, Trim
+from django.http import StreamingHttpResponse
+from django.db.models import Count, F, FilteredRelation, Prefetch, Q
 from django.utils import timezone
 from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.core.pagination import before_cursor, encode_cursor, parse_limit
 from apps.core.throttling import (
     BATTLE_WRITE_THROTTLE_CLASSES,
     CAMPAIGN_CHAT_THROTTLE_CLASSES,
+    CAMPAIGN_EXPORT_THROTTLE_CLASSES,
     CAMPAIGN_PING_THROTTLE_CLASSES,
     MethodScopedThrottleMixin,
 )
-from apps.realtime.services import send_campaign_chat_message, send_campaign_ping
-from apps.items.services import (
-    HALF_PRICE_ARMOUR_EFFECT_KEY,
-    IMPROVED_SHIELDS_EFFECT_KEY,
-    revert_half_price_armour_for_campaign,
-    revert_improved_shields_for_campaign,
-    sync_half_price_armour_for_campaign,
-    sync_improved_shields_for_campaign,
-)
-from apps.warbands.models import Henchman, Hero, HiredSword, Warband
-from apps.warbands.serializers import WarbandSerializer, WarbandSummarySerializer
+from apps.realtime.services import queue_campaign_chat_message, send_campaign_ping
+from apps.items.effects import ITEM_EFFECTS, disable_item_effect, enable_item_effect
+from apps.warbands.models import Warband
+from apps.warbands.serializers import WarbandSerializer
 from apps.warbands.utils.trades import TradeHelper
-from apps.battles.models import Battle, BattleParticipant
+from apps.battles.models import Battle, BattleParticipant, BattleParticipantSummary
 from apps.battles.views.shared import (
     _cancel_battle_for_all_participants,
     _response_with_snapshot,
@@ -36,6 +32,8 @@ from apps.battles.views.shared import (
     _serialize_participant,
 )
 
+from .export import EXPORT_CONTENT_TYPES, EXPORT_FORMATS, aiter_campaign_export, iter_campaign_export
+from .kill_stats import campaign_top_killers
 from .models import (
     Campaign,
     CampaignBulletinEntry,
@@ -47,9 +45,16 @@ from .models import (
     PivotalMoment,
     CampaignRole,
     CampaignSettings,
+    CampaignUnitKillStat,
 )
 from apps.warbands.restrictions import get_valid_campaign_item_settings
-from .permissions import get_membership, has_campaign_permission, is_admin, is_owner
+from .permissions import (
+    get_membership,
+    has_campaign_permission,
+    invalidate_campaign_memberships,
+    is_admin,
+    is_owner,
+)
 from .serializers import (
     CampaignBulletinEntryCreateSerializer,
     CampaignBulletinEntrySerializer,
@@ -75,6 +80,11 @@ ROLE_SEED = [
     ("player", "Player"),
 ]
 
+TOP_KILLERS_DEFAULT_LIMIT = 5
+TOP_KILLERS_MAX_LIMIT = 50
+BATTLE_HISTORY_DEFAULT_LIMIT = 20
+BATTLE_HISTORY_MAX_LIMIT = 100
+
 PERMISSION_SEED = [
     ("add_custom", "Add custom"),
     ("manage_items", "Manage items"),
@@ -158,63 +168,15 @@ def _format_short_date(value):
     return value.strftime("%d/%m/%y")
 
 
-def _battle_history_participant_payload(participant):
-    postbattle_json = participant.postbattle_json if isinstance(participant.postbattle_json, dict) else {}
-    unit_results = postbattle_json.get("unit_results", {})
-    if not isinstance(unit_results, dict) or not unit_results:
-        return {
-            "warband_id": participant.warband_id,
-            "warband_name": participant.warband.name,
-            "kills": None,
-            "ooas": None,
-            "deaths": [],
-            "xp_gain": None,
-            "exploration": [],
-        }
-
-    kills = 0
-    ooas = 0
-    xp_gain = 0
-    deaths = []
-    for result in unit_results.values():
-        if not isinstance(result, dict):
-            continue
-        try:
-            kills += max(0, int(result.get("kill_count", 0)))
-        except (TypeError, ValueError):
-            pass
-        try:
-            xp_gain += max(0, int(result.get("xp_earned", 0)))
-        except (TypeError, ValueError):
-            pass
-        if bool(result.get("out_of_action", False)):
-            ooas += 1
-        if bool(result.get("dead", False)):
-            unit_name = str(result.get("unit_name", "")).strip()
-            if unit_name:
-                deaths.append(unit_name)
-
-    exploration_raw = postbattle_json.get("exploration", {})
-    if not isinstance(exploration_raw, dict):
-        exploration_raw = {}
-    dice_values_raw = exploration_raw.get("dice_values", [])
-    exploration = []
-    if isinstance(dice_values_raw, list):
-        for entry in dice_values_raw:
-            try:
-                die_value = int(entry)
-            except (TypeError, ValueError):
-                continue
-            exploration.append(die_value)
-
+def _battle_history_participant_payload(summary):
     return {
-        "warband_id": participant.warband_id,
-        "warband_name": participant.warband.name,
-        "kills": kills,
-        "ooas": ooas,
-        "deaths": deaths,
-        "xp_gain": xp_gain,
-        "exploration": exploration,
+        "warband_id": summary.warband_id,
+        "warband_name": summary.warband.name,
+        "kills": summary.kills,
+        "ooas": summary.ooas,
+        "deaths": summary.deaths_json,
+        "xp_gain": summary.xp_gain,
+        "exploration": summary.exploration_json,
     }
 
 
@@ -223,135 +185,21 @@ def _normalize_unit_type(value):
     return cleaned or None
 
 
-def _campaign_top_killers_payload(campaign_id, limit=5):
-    empty_value = Value("", output_field=CharField())
-
-    def _annotated_name(name_field, fallback_prefix):
-        return Coalesce(
-            NullIf(Trim(name_field), empty_value),
-            Concat(Value(fallback_prefix), Cast("id", CharField())),
-        )
-
-    def _annotated_unit_type(unit_type_field):
-        return NullIf(Trim(unit_type_field), empty_value)
-
-    hero_rows = (
-        Hero.objects.filter(warband__campaign_id=campaign_id, kills__gt=0)
-        .annotate(
-            unit_id_value=F("id"),
-            unit_kind_value=Value("hero", output_field=CharField()),
-            unit_name_value=_annotated_name("name", "Hero "),
-            unit_type_value=_annotated_unit_type("unit_type"),
-            warband_id_value=F("warband_id"),
-            warband_name_value=F("warband__name"),
-            kills_value=F("kills"),
-            unit_name_sort=Lower(_annotated_name("name", "Hero ")),
-            warband_name_sort=Lower("warband__name"),
-        )
-        .values(
-            "unit_id_value",
-            "unit_kind_value",
-            "unit_name_value",
-            "unit_type_value",
-            "warband_id_value",
-            "warband_name_value",
-            "kills_value",
-            "unit_name_sort",
-            "warband_name_sort",
-        )
-    )
-
-    hired_sword_rows = (
-        HiredSword.objects.filter(warband__campaign_id=campaign_id, kills__gt=0)
-        .annotate(
-            unit_id_value=F("id"),
-            unit_kind_value=Value("hired_sword", output_field=CharField()),
-            unit_name_value=_annotated_name("name", "Hired Sword "),
-            unit_type_value=_annotated_unit_type("unit_type"),
-            warband_id_value=F("warband_id"),
-            warband_name_value=F("warband__name"),
-            kills_value=F("kills"),
-            unit_name_sort=Lower(_annotated_name("name", "Hired Sword ")),
-            warband_name_sort=Lower("warband__name"),
-        )
-        .values(
-            "unit_id_value",
-            "unit_kind_value",
-            "unit_name_value",
-            "unit_type_value",
-            "warband_id_value",
-            "warband_name_value",
-            "kills_value",
-            "unit_name_sort",
-            "warband_name_sort",
-        )
-    )
-
-    henchman_rows = (
-        Henchman.objects.filter(group__warband__campaign_id=campaign_id, kills__gt=0)
-        .annotate(
-            unit_id_value=F("id"),
-            unit_kind_value=Value("henchman", output_field=CharField()),
-            unit_name_value=_annotated_name("name", "Henchman "),
-            unit_type_value=_annotated_unit_type("group__unit_type"),
-            warband_id_value=F("group__warband_id"),
-            warband_name_value=F("group__warband__name"),
-            kills_value=F("kills"),
-            unit_name_sort=Lower(_annotated_name("name", "Henchman ")),
-            warband_name_sort=Lower("group__warband__name"),
-        )
-        .values(
-            "unit_id_value",
-            "unit_kind_value",
-            "unit_name_value",
-            "unit_type_value",
-            "warband_id_value",
-            "warband_name_value",
-            "kills_value",
-            "unit_name_sort",
-            "warband_name_sort",
-        )
-    )
-
-    rows = list(
-        hero_rows.union(hired_sword_rows, henchman_rows, all=True).order_by(
-            "-kills_value",
-            "unit_name_sort",
-            "warband_name_sort",
-            "unit_id_value",
-        )[:limit]
-    )
-
-    return [
-        {
-            "unit_id": row["unit_id_value"],
-            "unit_kind": row["unit_kind_value"],
-            "unit_name": row["unit_name_value"],
-            "unit_type": _normalize_unit_type(row["unit_type_value"]),
-            "warband_id": row["warband_id_value"],
-            "warband_name": row["warband_name_value"],
-            "kills": row["kills_value"],
-        }
-        for row in rows
-    ]
+def _campaign_top_killers_payload(campaign_id, limit=5, offset=0, warband_id=None, unit_kind=None):
+    rows = campaign_top_killers(campaign_id, limit=limit, offset=offset, warband_id=warband_id, unit_kind=unit_kind)
+    return [{**row, "unit_type": _normalize_unit_type(row["unit_type"])} for row in rows]
 
 
 def _sync_house_rule_effect(campaign_id, effect_key):
-    if effect_key == HALF_PRICE_ARMOUR_EFFECT_KEY:
-        sync_half_price_armour_for_campaign(campaign_id)
-    elif effect_key == IMPROVED_SHIELDS_EFFECT_KEY:
-        sync_improved_shields_for_campaign(campaign_id)
+    enable_item_effect(campaign_id, effect_key)
 
 
 def _revert_house_rule_effect_if_unused(campaign_id, effect_key):
-    if effect_key not in (HALF_PRICE_ARMOUR_EFFECT_KEY, IMPROVED_SHIELDS_EFFECT_KEY):
+    if effect_key not in ITEM_EFFECTS:
         return
     if CampaignHouseRule.objects.filter(campaign_id=campaign_id, effect_key=effect_key).exists():
         return
-    if effect_key == HALF_PRICE_ARMOUR_EFFECT_KEY:
-        revert_half_price_armour_for_campaign(campaign_id)
-    elif effect_key == IMPROVED_SHIELDS_EFFECT_KEY:
-        revert_improved_shields_for_campaign(campaign_id)
+    disable_item_effect(campaign_id, effect_key)
 
 
 class CampaignListCreateView(APIView):
@@ -539,6 +387,7 @@ class JoinCampaignView(APIView):
             ],
             ignore_conflicts=True,
         )
+        invalidate_campaign_memberships(campaign.id)
 
         response_serializer = CampaignSerializer(
             _campaigns_for_user(request.user)
@@ -566,9 +415,8 @@ class CampaignPlayersView(APIView):
             .order_by("user__first_name", "user__email")
         )
         warbands = Warband.objects.filter(campaign_id=campaign_id).only(
-            "id", "name", "faction", "user_id", "wins", "losses"
+            "id", "name", "faction", "user_id", "wins", "losses", "rating"
         )
-        warband_rating_serializer = WarbandSummarySerializer()
         warband_by_user = {
             warband.user_id: {
                 "id": warband.id,
@@ -576,7 +424,7 @@ class CampaignPlayersView(APIView):
                 "faction": warband.faction,
                 "wins": warband.wins,
                 "losses": warband.losses,
-                "rating": warband_rating_serializer.get_rating(warband),
+                "rating": float(warband.rating),
             }
             for warband in warbands
         }
@@ -629,38 +477,50 @@ class CampaignBattleHistoryView(APIView):
         if not membership:
             return Response({"detail": "Not found"}, status=404)
 
-        battles = list(
-            Battle.objects.filter(
-                campaign_id=campaign_id,
-                status=Battle.STATUS_ENDED,
+        battles = Battle.objects.filter(
+            campaign_id=campaign_id,
+            status=Battle.STATUS_ENDED,
+            ended_at__isnull=False,
+        )
+        cursor = request.query_params.get("cursor")
+        try:
+            limit = parse_limit(
+                request.query_params.get("limit"), BATTLE_HISTORY_DEFAULT_LIMIT, BATTLE_HISTORY_MAX_LIMIT
             )
+            if cursor:
+                battles = battles.filter(before_cursor("ended_at", cursor))
+        except ValueError:
+            return Response({"detail": "Invalid pagination parameters"}, status=400)
+        battles = list(
+            battles.only("id", "scenario", "winner_warband_ids_json", "ended_at")
             .prefetch_related(
                 Prefetch(
-                    "participants",
-                    queryset=BattleParticipant.objects.select_related("warband").order_by("id"),
+                    "participant_summaries",
+                    queryset=BattleParticipantSummary.objects.select_related("warband").order_by("participant_id"),
                 )
             )
-            .order_by("-ended_at", "-created_at", "-id")
+            .order_by("-ended_at", "-id")[: limit + 1]
         )
+        has_more = len(battles) > limit
+        battles = battles[:limit]
 
         payload = []
         for battle in battles:
-            participants = list(battle.participants.all())
+            summaries = list(battle.participant_summaries.all())
             winner_ids = set(battle.winner_warband_ids_json or [])
-            winner_names = [participant.warband.name for participant in participants if participant.warband_id in winner_ids]
+            winner_names = [summary.warband.name for summary in summaries if summary.warband_id in winner_ids]
             payload.append(
                 {
                     "id": battle.id,
                     "scenario": battle.scenario,
                     "winners": winner_names,
-                    "date": _format_short_date(battle.ended_at or battle.created_at),
-                    "participants": [
-                        _battle_history_participant_payload(participant) for participant in participants
-                    ],
+                    "date": _format_short_date(battle.ended_at),
+                    "participants": [_battle_history_participant_payload(summary) for summary in summaries],
                 }
             )
 
-        return Response(payload)
+        next_cursor = encode_cursor(battles[-1].ended_at, battles[-1].id) if has_more else None
+        return Response({"results": payload, "next_cursor": next_cursor})
 
 
 class CampaignActiveBattlesView(APIView):
@@ -771,11 +631,48 @@ class CampaignTopKillersView(APIView):
         if not membership:
             return Response({"detail": "Not found"}, status=404)
 
-        top_killers = _campaign_top_killers_payload(campaign_id)
+        try:
+            limit = int(request.query_params.get("limit", TOP_KILLERS_DEFAULT_LIMIT))
+            limit = min(max(limit, 1), TOP_KILLERS_MAX_LIMIT)
+            offset = max(int(request.query_params.get("offset", 0)), 0)
+            warband_id = request.query_params.get("warband_id")
+            warband_id = int(warband_id) if warband_id else None
+        except (TypeError, ValueError):
+            return Response({"detail": "Invalid pagination parameters"}, status=400)
+        unit_kind = request.query_params.get("unit_kind") or None
+        if unit_kind and unit_kind not in dict(CampaignUnitKillStat.UNIT_KIND_CHOICES):
+            return Response({"detail": "Invalid unit_kind"}, status=400)
+
+        top_killers = _campaign_top_killers_payload(
+            campaign_id, limit=limit, offset=offset, warband_id=warband_id, unit_kind=unit_kind
+        )
         serializer = CampaignTopKillerSerializer(top_killers, many=True)
         return Response({"top_killers": serializer.data})
 
 
+class CampaignExportView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = CAMPAIGN_EXPORT_THROTTLE_CLASSES
+
+    def get(self, request, campaign_id):
+        membership = get_membership(request.user, campaign_id)
+        if not membership:
+            return Response({"detail": "Not found"}, status=404)
+
+        export_format = request.query_params.get("export_format", "ndjson")
+        if export_format not in EXPORT_FORMATS:
+            return Response({"detail": "Invalid export_format"}, status=400)
+
+        # Under ASGI a sync iterator would be read into memory whole before the first byte is sent.
+        export = aiter_campaign_export if isinstance(request._request, ASGIRequest) else iter_campaign_export
+        response = StreamingHttpResponse(
+            export(campaign_id, export_format, user=request.user),
+            content_type=EXPORT_CONTENT_TYPES[export_format],
+        )
+        response["Content-Disposition"] = f'attachment; filename="campaign-{campaign_id}.{export_format}"'
+        return response
+
+
 class CampaignBulletinView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
@@ -960,6 +857,7 @@ class CampaignMemberPermissionsView(APIView):
                 for permission in allowed_permissions
             ]
         )
+        invalidate_campaign_memberships(campaign_id)
 
         response_serializer = CampaignPermissionSerializer(allowed_permissions, many=True)
         return Response(response_serializer.data)
@@ -990,6 +888,7 @@ class CampaignMemberRoleView(APIView):
         roles = _ensure_roles()
         target_membership.role = roles[requested_role]
         target_membership.save(update_fields=["role"])
+        invalidate_campaign_memberships(campaign_id)
 
         return Response({"id": target_membership.user_id, "role": target_membership.role.slug})
 
@@ -1013,6 +912,7 @@ class CampaignMemberRemoveView(APIView):
             return Response({"detail": "Only players can be removed."}, status=400)
 
         target_membership.delete()
+        invalidate_campaign_memberships(campaign_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -1143,6 +1043,6 @@ class CampaignMessagesView(MethodScopedThrottleMixin, APIView):
             username=username,
             body=body,
         )
-        send_campaign_chat_message(campaign_id, message)
+        queue_campaign_chat_message(campaign_id, message)
         serializer = CampaignMessageSerializer(message)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -0,0 +1,170 @@
+"""Cached reference catalogues (items, skills, spells, ...) with per-campaign overlays.
+
+The base catalogue and each campaign's custom entries are serialized once and cached under
+version counters. Writers bump the counter for the part they changed, which retires the
+cached rows and the ETag clients revalidate against. Base counters also expire with the
+rows, so edits made outside the API (the admin, a shell) reach clients within the TTL.
+"""
+
+import hashlib
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.db.models import Q, QuerySet
+from rest_framework.response import Response
+
+from .pagination import parse_limit
+from .search import ranked_search_ids
+
+CATALOGUE_CACHE_TIMEOUT = 60 * 60 * 6
+CATALOGUE_SEARCH_MAX_LIMIT = 200
+CATALOGUE_KINDS = ("items", "skills", "spells", "specials", "races", "restrictions", "bestiary")
+# Kinds whose cached rows embed another kind's rows, and so go stale along with them.
+CATALOGUE_DEPENDENTS = {"bestiary": ("items",)}
+
+
+def _version_key(kind: str, campaign_id=None) -> str:
+    scope = f"campaign:{campaign_id}" if campaign_id else "base"
+    return f"catalogue:{kind}:version:{scope}"
+
+
+def _initial_version() -> int:
+    # Time-based so an evicted counter never restarts at a value with rows still cached.
+    return time.time_ns() // 1000
+
+
+def _version_timeout(campaign_id=None) -> int | None:
+    # Overlays only change through the API, which bumps them; base rows can change elsewhere.
+    return None if campaign_id else CATALOGUE_CACHE_TIMEOUT
+
+
+def _get_version(kind: str, campaign_id=None) -> int:
+    key = _version_key(kind, campaign_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), timeout=_version_timeout(campaign_id))
+        version = cache.get(key, 0)
+    return version
+
+
+def bump_catalogue_version(kind: str, campaign_id=None) -> None:
+    """Invalidate the base catalogue (campaign_id=None) or one campaign's overlay."""
+    key = _version_key(kind, campaign_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, _initial_version(), timeout=_version_timeout(campaign_id))
+    for dependent in CATALOGUE_DEPENDENTS.get(kind, ()):
+        bump_catalogue_version(dependent, campaign_id)
+
+
+def bump_base_catalogues(*kinds: str) -> None:
+    for kind in kinds or CATALOGUE_KINDS:
+        bump_catalogue_version(kind)
+
+
+@dataclass(frozen=True)
+class Catalogue:
+    kind: str
+    queryset: Callable[[], QuerySet]
+    serialize: Callable[[list], list]
+    order_by: tuple[str, ...] = ("name", "id")
+    key_field: str = "name"
+    search_field: str = "name"
+    type_field: str | None = "type"
+    description_field: str | None = "description"
+    # Read-time transforms of base rows for a campaign: effects(campaign_id) names the active
+    # ones and apply_effects(rows, keys) rewrites the rows. Results are shared by every
+    # campaign with the same set of effects.
+    effects: Callable[[int], tuple[str, ...]] | None = None
+    apply_effects: Callable[[list[dict], tuple[str, ...]], list[dict]] | None = None
+
+    def _rows(self, campaign_id, version: int) -> list[dict]:
+        scope = campaign_id or "base"
+        cache_key = f"catalogue:{self.kind}:rows:{scope}:v{version}"
+        rows = cache.get(cache_key)
+        if rows is None:
+            queryset = self.queryset()
+            if campaign_id:
+                queryset = queryset.filter(campaign_id=campaign_id)
+            else:
+                queryset = queryset.filter(campaign__isnull=True)
+            rows = [dict(row) for row in self.serialize(list(queryset.order_by(*self.order_by)))]
+            cache.set(cache_key, rows, timeout=CATALOGUE_CACHE_TIMEOUT)
+        return rows
+
+    def _base_rows(self, version: int, effect_keys: tuple[str, ...]) -> list[dict]:
+        rows = self._rows(None, version)
+        if not effect_keys:
+            return rows
+        cache_key = f"catalogue:{self.kind}:rows:effects:{'+'.join(effect_keys)}:v{version}"
+        effect_rows = cache.get(cache_key)
+        if effect_rows is None:
+            effect_rows = self.apply_effects(rows, effect_keys)
+            cache.set(cache_key, effect_rows, timeout=CATALOGUE_CACHE_TIMEOUT)
+        return effect_rows
+
+    def _search_ids(self, search: str, campaign_id, base_version: int, overlay_version: int) -> list[int]:
+        digest = hashlib.sha1(search.encode()).hexdigest()[:20]
+        cache_key = f"catalogue:{self.kind}:search:{campaign_id or 'base'}:v{base_version}.{overlay_version}:{digest}"
+        ids = cache.get(cache_key)
+        if ids is None:
+            scope = Q(campaign__isnull=True)
+            if campaign_id:
+                scope |= Q(campaign_id=campaign_id)
+            ids = ranked_search_ids(self.queryset().filter(scope), search, self.search_field, self.description_field)
+            cache.set(cache_key, ids, timeout=CATALOGUE_CACHE_TIMEOUT)
+        return ids
+
+    def _filter_type(self, rows: list[dict], entry_type: str) -> list[dict]:
+        if entry_type and self.type_field:
+            rows = [row for row in rows if str(row.get(self.type_field) or "").lower() == entry_type]
+        return rows
+
+    def _merge(self, base_rows: list[dict], overlay_rows: list[dict]) -> list[dict]:
+        overridden = {row[self.key_field] for row in overlay_rows}
+        return overlay_rows + [row for row in base_rows if row[self.key_field] not in overridden]
+
+    def _ranked(self, rows_by_id: dict, overlay_ids: set, ids: list[int], entry_type: str) -> list[dict]:
+        matched = self._filter_type([rows_by_id[row_id] for row_id in ids if row_id in rows_by_id], entry_type)
+        overridden = {row[self.key_field] for row in matched if row["id"] in overlay_ids}
+        return [row for row in matched if row["id"] in overlay_ids or row[self.key_field] not in overridden]
+
+    def response(self, request, campaign_id=None) -> Response:
+        """Serve the merged catalogue, answering 304 when the client's ETag is still current.
+
+        Without ?search= rows come back in catalogue order; with it they are ranked by relevance.
+        """
+        campaign_id = int(campaign_id) if campaign_id else None
+        entry_type = (request.query_params.get("type") or "").strip().lower()
+        search = (request.query_params.get("search") or "").strip().lower()
+        try:
+            limit = parse_limit(request.query_params.get("limit"), 0, CATALOGUE_SEARCH_MAX_LIMIT)
+        except ValueError:
+            return Response({"detail": "Invalid limit"}, status=400)
+        base_version = _get_version(self.kind)
+        overlay_version = _get_version(self.kind, campaign_id) if campaign_id else 0
+        effect_keys = tuple(self.effects(campaign_id)) if campaign_id and self.effects else ()
+
+        fingerprint = (
+            f"{self.kind}|{base_version}|{campaign_id}|{overlay_version}|{'+'.join(effect_keys)}"
+            f"|{entry_type}|{search}|{limit}"
+        )
+        etag = f'"{hashlib.sha1(fingerprint.encode()).hexdigest()[:20]}"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag in request.headers.get("If-None-Match", ""):
+            return Response(status=304, headers=headers)
+
+        base_rows = self._base_rows(base_version, effect_keys)
+        overlay_rows = self._rows(campaign_id, overlay_version) if campaign_id else []
+        if search:
+            ids = self._search_ids(search, campaign_id, base_version, overlay_version)
+            rows_by_id = {row["id"]: row for row in base_rows + overlay_rows}
+            rows = self._ranked(rows_by_id, {row["id"] for row in overlay_rows}, ids, entry_type)
+        else:
+            rows = self._merge(self._filter_type(base_rows, entry_type), self._filter_type(overlay_rows, entry_type))
+        if limit:
+            rows = rows[:limit]
+        return Response(rows, headers=headers)
@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="SeedSource",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("command", models.CharField(max_length=80)),
+                ("path", models.CharField(max_length=255)),
+                ("digest", models.CharField(max_length=64)),
+                ("seeded_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "seed_source",
+                "constraints": [
+                    models.UniqueConstraint(fields=("command", "path"), name="unique_seed_source"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import models
+
+
+class SeedSource(models.Model):
+    """Content hash of a data file as of the last successful run of a seed command."""
+
+    command = models.CharField(max_length=80)
+    path = models.CharField(max_length=255)
+    digest = models.CharField(max_length=64)
+    seeded_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "seed_source"
+        constraints = [
+            models.UniqueConstraint(fields=["command", "path"], name="unique_seed_source"),
+        ]
+
+    def __str__(self):
+        return f"{self.command}: {self.path}"
@@ -0,0 +1,36 @@
+import base64
+import binascii
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+def encode_cursor(timestamp, row_id: int) -> str:
+    """Encode a (timestamp, id) keyset position as an opaque URL-safe token."""
+    raw = f"{timestamp.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    """Decode a token from encode_cursor. Raises ValueError for malformed tokens."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+    except (binascii.Error, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    timestamp_raw, _, row_id = raw.rpartition("|")
+    timestamp = parse_datetime(timestamp_raw)
+    if timestamp is None:
+        raise ValueError("Invalid cursor")
+    return timestamp, int(row_id)
+
+
+def parse_limit(raw_value, default: int, maximum: int) -> int:
+    if raw_value in (None, ""):
+        return default
+    return min(max(int(raw_value), 1), maximum)
+
+
+def before_cursor(field: str, cursor: str) -> Q:
+    """Rows strictly after the cursor position in a (-field, -id) ordering."""
+    timestamp, row_id = decode_cursor(cursor)
+    return Q(**{f"{field}__lt": timestamp}) | Q(**{field: timestamp, "id__lt": row_id})
@@ -0,0 +1,62 @@
+"""Ranked name/description search shared by the reference catalogues.
+
+On Postgres names are matched by substring or trigram word similarity (typo tolerant) and
+descriptions by full-text search, both served by the GIN indexes from search_indexes().
+Other backends fall back to plain case-insensitive LIKE matching.
+"""
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+from django.db import connection
+from django.db.models import Case, F, FloatField, Q, QuerySet, Value, When
+from django.db.models.functions import Cast, Upper
+
+SEARCH_CONFIG = "simple"
+DESCRIPTION_RANK_WEIGHT = 0.5
+
+
+def search_indexes(prefix: str, name_field: str = "name", description_field: str | None = "description"):
+    indexes = [
+        GinIndex(OpClass(Upper(name_field), name="gin_trgm_ops"), name=f"{prefix}_search_trgm_idx"),
+    ]
+    if description_field:
+        indexes.append(GinIndex(SearchVector(description_field, config=SEARCH_CONFIG), name=f"{prefix}_search_fts_idx"))
+    return indexes
+
+
+def _postgres_search(queryset: QuerySet, search: str, name_field: str, description_field: str | None):
+    rank = TrigramWordSimilarity(search, Upper(name_field))
+    matches = Q(search_name__contains=search.upper()) | Q(search_name__trigram_word_similar=search)
+    queryset = queryset.annotate(search_name=Upper(name_field))
+    if description_field:
+        query = SearchQuery(search, config=SEARCH_CONFIG, search_type="websearch")
+        queryset = queryset.annotate(search_document=SearchVector(description_field, config=SEARCH_CONFIG))
+        rank = rank + SearchRank(F("search_document"), query) * Value(DESCRIPTION_RANK_WEIGHT)
+        matches |= Q(search_document=query)
+    return queryset.filter(matches).annotate(search_rank=Cast(rank, FloatField()))
+
+
+def _fallback_search(queryset: QuerySet, search: str, name_field: str, description_field: str | None):
+    matches = Q(**{f"{name_field}__icontains": search})
+    if description_field:
+        matches |= Q(**{f"{description_field}__icontains": search})
+    return queryset.filter(matches).annotate(
+        search_rank=Case(
+            When(**{f"{name_field}__istartswith": search}, then=Value(1.0)),
+            When(**{f"{name_field}__icontains": search}, then=Value(0.5)),
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+    )
+
+
+def ranked_search_ids(
+    queryset: QuerySet, search: str, name_field: str = "name", description_field: str | None = "description"
+) -> list[int]:
+    """Ids of rows matching the search, best match first."""
+    queryset = queryset.prefetch_related(None)
+    if connection.vendor == "postgresql":
+        queryset = _postgres_search(queryset, search, name_field, description_field)
+    else:
+        queryset = _fallback_search(queryset, search, name_field, description_field)
+    return list(queryset.order_by("-search_rank", name_field, "id").values_list("id", flat=True))
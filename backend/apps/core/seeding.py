@@ -0,0 +1,91 @@
+"""Shared plumbing for the seed_* management commands.
+
+Seeders load the existing rows once into in-memory maps, work out what to insert or change,
+and write the differences in bulk. Each command records a content hash of its source files
+so an unchanged data set is skipped entirely on the next deploy.
+"""
+
+import hashlib
+from pathlib import Path
+
+from django.db import models
+
+from .models import SeedSource
+
+SEED_BATCH_SIZE = 500
+
+
+def file_digest(path: Path) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def _digests(paths) -> dict[str, str]:
+    return {str(path): file_digest(path) for path in paths}
+
+
+def sources_unchanged(command: str, paths) -> bool:
+    """True when every source file still matches the hash recorded by the last run."""
+    current = _digests(paths)
+    if not current:
+        return False
+    recorded = dict(SeedSource.objects.filter(command=command).values_list("path", "digest"))
+    return recorded == current
+
+
+def record_sources(command: str, paths) -> None:
+    current = _digests(paths)
+    SeedSource.objects.filter(command=command).exclude(path__in=current).delete()
+    SeedSource.objects.bulk_create(
+        [SeedSource(command=command, path=path, digest=digest) for path, digest in current.items()],
+        update_conflicts=True,
+        unique_fields=["command", "path"],
+        update_fields=["digest", "seeded_at"],
+    )
+
+
+def forget_sources() -> None:
+    # Truncating one catalogue cascades into rows other seeders own, so all of them must rerun.
+    SeedSource.objects.all().delete()
+
+
+def upsert_rows(model: type[models.Model], existing: dict, desired: dict, fields: list[str]) -> tuple[int, int]:
+    """Create rows missing from `existing` and update the listed fields where they differ.
+
+    `existing` maps a natural key to a saved instance and `desired` maps the same keys to
+    constructor kwargs (foreign keys by attname). New instances are added to `existing`.
+    Returns (created, updated).
+    """
+    to_create = []
+    to_update = []
+    for key, values in desired.items():
+        values = {name: model._meta.get_field(name).to_python(value) for name, value in values.items()}
+        row = existing.get(key)
+        if row is None:
+            row = model(**values)
+            existing[key] = row
+            to_create.append(row)
+        elif any(getattr(row, name) != values[name] for name in fields):
+            for name in fields:
+                setattr(row, name, values[name])
+            to_update.append(row)
+    model.objects.bulk_create(to_create, batch_size=SEED_BATCH_SIZE)
+    if to_update:
+        model.objects.bulk_update(to_update, fields, batch_size=SEED_BATCH_SIZE)
+    return len(to_create), len(to_update)
+
+
+def replace_links(model: type[models.Model], owner_field: str, owner_ids, links: list[models.Model]) -> None:
+    """Make the link rows of the given owners exactly `links`, writing only the differences."""
+    fields = [field.attname for field in model._meta.concrete_fields if not field.primary_key]
+    existing = {
+        tuple(row[1:]): row[0]
+        for row in model.objects.filter(**{f"{owner_field}__in": list(owner_ids)}).values_list("pk", *fields)
+    }
+    desired = {tuple(getattr(link, name) for name in fields): link for link in links}
+    stale_ids = [pk for key, pk in existing.items() if key not in desired]
+    if stale_ids:
+        model.objects.filter(pk__in=stale_ids).delete()
+    model.objects.bulk_create(
+        [link for key, link in desired.items() if key not in existing],
+        batch_size=SEED_BATCH_SIZE,
+    )
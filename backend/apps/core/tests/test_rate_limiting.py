@@ -2,7 +2,7 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.core.cache import cache
-from django.test import override_settings
+from django.test import RequestFactory, override_settings
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
 from rest_framework.test import APIClient, APITestCase
@@ -10,6 +10,7 @@ from rest_framework_simplejwt.tokens import RefreshToken
 
 from apps.battles.models import Battle, BattleParticipant
 from apps.campaigns.models import Campaign, CampaignMembership, CampaignRole
+from apps.core.throttling import AuthLoginMinuteIPRateThrottle, _increment_window
 from apps.warbands.models import Warband
 
 
@@ -129,6 +130,8 @@ class RateLimitingApiTests(APITestCase):
                 "campaign_chat_ip": "60/min",
                 "campaign_ping_user": "30/min",
                 "campaign_ping_ip": "120/min",
+                "campaign_export_user": "10/hour",
+                "campaign_export_ip": "30/hour",
                 "battle_write_user": "60/min",
                 "battle_write_ip": "240/min",
                 "trade_write_user": "20/min",
@@ -148,6 +151,44 @@ class RateLimitingApiTests(APITestCase):
         self.assertEqual(response.status_code, 429)
         self.assertIn("Retry-After", response.headers)
 
+    def test_window_counters_increment_and_read_previous_window(self):
+        self.assertEqual(_increment_window(cache, "throttle_test:2", "throttle_test:1", 120), (1, 0))
+        cache.set("throttle_test:1", 4)
+        self.assertEqual(_increment_window(cache, "throttle_test:2", "throttle_test:1", 120), (2, 4))
+
+    @override_settings(REST_FRAMEWORK=_rest_framework_with_rates(auth_login_minute="1/min"))
+    def test_rejected_requests_do_not_consume_quota(self):
+        request = RequestFactory().post("/api/auth/login/", REMOTE_ADDR="198.51.100.10")
+        throttle = AuthLoginMinuteIPRateThrottle()
+        throttle.timer = lambda: 600.0
+
+        self.assertTrue(throttle.allow_request(request, None))
+        self.assertFalse(throttle.allow_request(request, None))
+        self.assertFalse(throttle.allow_request(request, None))
+        self.assertEqual(cache.get(f"{throttle.key}:10"), 1)
+        # The full window still weighs on the next one until it has slid out completely.
+        self.assertEqual(throttle.wait(), 120)
+
+    @override_settings(REST_FRAMEWORK=_rest_framework_with_rates(auth_login_minute="4/min"))
+    def test_retry_after_accounts_for_the_weighted_previous_window(self):
+        request = RequestFactory().post("/api/auth/login/", REMOTE_ADDR="198.51.100.10")
+        throttle = AuthLoginMinuteIPRateThrottle()
+        now = [590.0]
+        throttle.timer = lambda: now[0]
+        for _ in range(4):
+            self.assertTrue(throttle.allow_request(request, None))
+
+        now[0] = 615.0
+        self.assertTrue(throttle.allow_request(request, None))
+        self.assertFalse(throttle.allow_request(request, None))
+        # 1 request this window + 4 * 0.75 from the last one; the next fits once the weight drops to 2.
+        self.assertEqual(throttle.wait(), 15)
+
+        now[0] = 615.0 + throttle.wait() - 1
+        self.assertFalse(throttle.allow_request(request, None))
+        now[0] = 630.0
+        self.assertTrue(throttle.allow_request(request, None))
+
     @override_settings(REST_FRAMEWORK=_rest_framework_with_rates(auth_login_minute="1/min"))
     def test_login_rate_limit_does_not_leak_between_ips(self):
         self._set_forwarded_ip("198.51.100.10")
@@ -292,6 +333,20 @@ class RateLimitingApiTests(APITestCase):
         )
         self.assertEqual(response.status_code, 429)
 
+    @override_settings(
+        REST_FRAMEWORK=_rest_framework_with_rates(campaign_export_user="2/hour", campaign_export_ip="10/hour")
+    )
+    def test_campaign_export_is_rate_limited(self):
+        self._auth_client(self.owner)
+
+        for _ in range(2):
+            response = self.client.get(f"/api/campaigns/{self.campaign.id}/export/")
+            self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(f"/api/campaigns/{self.campaign.id}/export/")
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response.headers)
+
     @override_settings(REST_FRAMEWORK=_rest_framework_with_rates(battle_write_user="2/min", battle_write_ip="10/min"))
     def test_battle_write_endpoints_enforce_user_or_ip_limit(self):
         self._auth_client(self.owner)
@@ -1,9 +1,49 @@
 from __future__ import annotations
 
+import functools
+
 from django.conf import settings
+from django.core.cache.backends.redis import RedisCache
 from rest_framework.throttling import SimpleRateThrottle
 
 
+@functools.cache
+def _redis_client(location: str):
+    import redis
+
+    return redis.Redis.from_url(location)
+
+
+def _primary_cache_location() -> str:
+    # RedisCache writes to the first server listed, so the counters live there.
+    location = settings.CACHES["default"]["LOCATION"]
+    if isinstance(location, str):
+        location = location.split(",")
+    return location[0]
+
+
+def _increment_window(cache, current_key: str, previous_key: str, timeout: int) -> tuple[int, int]:
+    """Atomically bump the current window counter and read the previous one."""
+    if isinstance(cache, RedisCache):
+        current_key = cache.make_and_validate_key(current_key)
+        previous_key = cache.make_and_validate_key(previous_key)
+        pipeline = _redis_client(_primary_cache_location()).pipeline()
+        pipeline.incr(current_key)
+        pipeline.expire(current_key, timeout)
+        pipeline.get(previous_key)
+        current, _expired, previous = pipeline.execute()
+        return int(current), int(previous or 0)
+
+    cache.add(current_key, 0, timeout)
+    try:
+        current = cache.incr(current_key)
+    except ValueError:
+        # The counter expired between add() and incr().
+        cache.add(current_key, 1, timeout)
+        current = 1
+    return current, int(cache.get(previous_key) or 0)
+
+
 class MethodScopedThrottleMixin:
     throttled_methods = frozenset({"POST"})
 
@@ -14,11 +54,61 @@ class MethodScopedThrottleMixin:
 
 
 class ToggleableScopedRateThrottle(SimpleRateThrottle):
+    """Sliding-window throttle built on per-window INCR counters.
+
+    The request count is the current fixed window plus the previous window weighted by
+    how much of it still overlaps the sliding window, so each check is a single atomic
+    increment rather than DRF's read-modify-write of a timestamp history list.
+    """
+
     def get_rate(self):
         if not getattr(settings, "RATE_LIMIT_ENABLED", True):
             return None
         return settings.REST_FRAMEWORK.get("DEFAULT_THROTTLE_RATES", {}).get(self.scope)
 
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.window_start = window * self.duration
+        current_key = f"{self.key}:{window}"
+        current, previous = _increment_window(
+            self.cache, current_key, f"{self.key}:{window - 1}", self.duration * 2
+        )
+        overlap = 1 - (self.now - window * self.duration) / self.duration
+        if current + previous * overlap > self.num_requests:
+            # Rejected requests do not consume quota.
+            self.cache.decr(current_key)
+            self.current, self.previous = current - 1, previous
+            return self.throttle_failure()
+        return self.throttle_success()
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        """Seconds until one more request fits under the sliding window count."""
+        elapsed = self.now - self.window_start
+        # Room left in this window for the decaying weight of the previous one.
+        allowance = self.num_requests - self.current - 1
+        if allowance >= 0:
+            if self.previous <= allowance:
+                return 0
+            return max(self.duration * (1 - allowance / self.previous) - elapsed, 0)
+
+        # This window is full on its own: wait for it to become the weighted previous window.
+        until_next_window = self.duration - elapsed
+        allowance = self.num_requests - 1
+        if self.current <= allowance:
+            return until_next_window
+        return until_next_window + self.duration * (1 - allowance / self.current)
+
     def _cache_key(self, ident: str | None) -> str | None:
         if not ident:
             return None
@@ -86,6 +176,14 @@ class CampaignPingIPRateThrottle(IPRateThrottle):
     scope = "campaign_ping_ip"
 
 
+class CampaignExportUserRateThrottle(UserOrIPRateThrottle):
+    scope = "campaign_export_user"
+
+
+class CampaignExportIPRateThrottle(IPRateThrottle):
+    scope = "campaign_export_ip"
+
+
 class BattleWriteUserRateThrottle(UserOrIPRateThrottle):
     scope = "battle_write_user"
 
@@ -135,6 +233,11 @@ CAMPAIGN_PING_THROTTLE_CLASSES = [
     CampaignPingIPRateThrottle,
 ]
 
+CAMPAIGN_EXPORT_THROTTLE_CLASSES = [
+    CampaignExportUserRateThrottle,
+    CampaignExportIPRateThrottle,
+]
+
 BATTLE_WRITE_THROTTLE_CLASSES = [
     BattleWriteUserRateThrottle,
     BattleWriteIPRateThrottle,
@@ -0,0 +1,139 @@
+"""House-rule effects applied to base items at read time.
+
+Turning an effect on for a campaign writes a single CampaignItemEffect row. Base items are
+never copied into the campaign and owned rows keep pointing at them; the catalogue, the unit
+item serializers and default purchase costs run rows through the active effects instead.
+"""
+
+import math
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.core.catalogue import bump_catalogue_version
+
+from .models import CampaignItemEffect
+
+HALF_PRICE_ARMOUR_EFFECT_KEY = "half_price_armour"
+IMPROVED_SHIELDS_EFFECT_KEY = "improved_shields"
+ITEM_EFFECTS_CACHE_TIMEOUT = 60 * 60 * 6
+
+
+def _unchanged(value):
+    return value
+
+
+def _half_price(cost):
+    return int(math.ceil((cost or 0) / 2))
+
+
+def _format_improved_shield_save(save_value):
+    cleaned = str(save_value or "").strip()
+    match = re.fullmatch(r"(\d+)\+", cleaned)
+    if not match:
+        return cleaned
+    current_value = int(match.group(1))
+    improved_value = max(1, current_value - 1)
+    return f"{cleaned} ({improved_value}+ CC)"
+
+
+@dataclass(frozen=True)
+class ItemEffect:
+    type: str
+    subtype: str
+    cost: Callable = _unchanged
+    save: Callable = _unchanged
+
+    def applies_to(self, campaign_id, item_type, subtype) -> bool:
+        # Effects only reshape the shared catalogue; a campaign's own items are left as written.
+        return campaign_id is None and item_type == self.type and subtype == self.subtype
+
+
+ITEM_EFFECTS = {
+    HALF_PRICE_ARMOUR_EFFECT_KEY: ItemEffect(type="Armour", subtype="Armour", cost=_half_price),
+    IMPROVED_SHIELDS_EFFECT_KEY: ItemEffect(type="Armour", subtype="Shield", save=_format_improved_shield_save),
+}
+
+
+def _effects_cache_key(campaign_id) -> str:
+    return f"item-effects:campaign:{campaign_id}"
+
+
+def campaign_item_effects(campaign_id) -> tuple[str, ...]:
+    """Sorted keys of the item effects active in the campaign."""
+    if not campaign_id:
+        return ()
+    cache_key = _effects_cache_key(campaign_id)
+    effect_keys = cache.get(cache_key)
+    if effect_keys is None:
+        effect_keys = tuple(
+            CampaignItemEffect.objects.filter(campaign_id=campaign_id, effect_key__in=ITEM_EFFECTS)
+            .order_by("effect_key")
+            .values_list("effect_key", flat=True)
+        )
+        cache.set(cache_key, effect_keys, timeout=ITEM_EFFECTS_CACHE_TIMEOUT)
+    return effect_keys
+
+
+def _effects_changed(campaign_id) -> None:
+    cache_key = _effects_cache_key(campaign_id)
+    cache.delete(cache_key)
+    transaction.on_commit(lambda: cache.delete(cache_key))
+    bump_catalogue_version("items", campaign_id)
+
+
+def enable_item_effect(campaign_id, effect_key) -> None:
+    if effect_key not in ITEM_EFFECTS:
+        return
+    _, created = CampaignItemEffect.objects.get_or_create(campaign_id=campaign_id, effect_key=effect_key)
+    if created:
+        _effects_changed(campaign_id)
+
+
+def disable_item_effect(campaign_id, effect_key) -> None:
+    deleted, _ = CampaignItemEffect.objects.filter(campaign_id=campaign_id, effect_key=effect_key).delete()
+    if deleted:
+        _effects_changed(campaign_id)
+
+
+def _matching_effects(effect_keys, campaign_id, item_type, subtype):
+    return [ITEM_EFFECTS[key] for key in effect_keys if ITEM_EFFECTS[key].applies_to(campaign_id, item_type, subtype)]
+
+
+def apply_item_effects(row: dict, effect_keys) -> dict:
+    """Return a serialized item row with its save and availability costs run through the effects."""
+    effects = _matching_effects(effect_keys, row.get("campaign_id"), row.get("type"), row.get("subtype"))
+    if not effects:
+        return row
+    row = dict(row)
+    availabilities = [dict(availability) for availability in row.get("availabilities") or []]
+    for effect in effects:
+        row["save"] = effect.save(row.get("save"))
+        for availability in availabilities:
+            availability["cost"] = effect.cost(availability.get("cost"))
+    row["availabilities"] = availabilities
+    return row
+
+
+def apply_item_effects_to_rows(rows: list[dict], effect_keys) -> list[dict]:
+    return [apply_item_effects(row, effect_keys) for row in rows]
+
+
+def effective_item_cost(item, cost, effect_keys):
+    """An availability cost of `item` as the campaign pays it."""
+    if cost is None:
+        return None
+    for effect in _matching_effects(effect_keys, item.campaign_id, item.type, item.subtype):
+        cost = effect.cost(cost)
+    return cost
+
+
+def default_item_cost(item, effect_keys):
+    """The cost to record for an owned item when none was given: its only availability's cost."""
+    availabilities = list(item.availabilities.all())
+    if len(availabilities) != 1:
+        return None
+    return effective_item_cost(item, availabilities[0].cost, effect_keys)
@@ -0,0 +1,72 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.campaigns.models import Campaign
+from apps.items.effects import HALF_PRICE_ARMOUR_EFFECT_KEY, disable_item_effect, enable_item_effect
+from apps.items.models import Item
+from apps.warbands.models import Hero, HeroItem, Warband, WarbandItem
+
+DEFAULT_SIZES = [100, 1000, 10000]
+
+
+class Command(BaseCommand):
+    help = "Time enabling and disabling the half price armour effect on campaigns with N owned item rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Owned item rows per run")
+        parser.add_argument("--warbands", type=int, default=10, help="Warbands the owned rows are spread across")
+
+    def handle(self, *args, **options):
+        armour_ids = list(
+            Item.objects.filter(campaign__isnull=True, type="Armour", subtype="Armour").values_list("id", flat=True)
+        )
+        if not armour_ids:
+            raise CommandError("No base armour items found; run seed_items first")
+
+        self.stdout.write(f"{'rows':>8} {'enable ms':>10} {'disable ms':>10}")
+        for size in options["sizes"]:
+            enable_ms, disable_ms = self._run(size, max(1, options["warbands"]), armour_ids)
+            self.stdout.write(f"{size:>8} {enable_ms:>10.1f} {disable_ms:>10.1f}")
+
+    def _run(self, size, warband_count, armour_ids):
+        # Everything is created and torn down inside one rolled back transaction.
+        with transaction.atomic():
+            campaign = Campaign.objects.create(name=f"Benchmark {size}", join_code=f"B{size % 100000:05d}")
+            users = get_user_model().objects.bulk_create(
+                [get_user_model()(username=f"benchmark-{size}-{index}@example.com") for index in range(warband_count)]
+            )
+            warbands = Warband.objects.bulk_create(
+                [
+                    Warband(campaign=campaign, user=user, name=f"Benchmark {index}", faction="Mercenaries")
+                    for index, user in enumerate(users)
+                ]
+            )
+            heroes = Hero.objects.bulk_create(
+                [Hero(warband=warbands[index % warband_count], name=f"Hero {index}") for index in range(size)]
+            )
+            HeroItem.objects.bulk_create(
+                [
+                    HeroItem(hero=hero, item_id=armour_ids[index % len(armour_ids)], cost=0)
+                    for index, hero in enumerate(heroes)
+                ]
+            )
+            WarbandItem.objects.bulk_create(
+                [
+                    WarbandItem(warband=warband, item_id=item_id, quantity=1, cost=0)
+                    for warband in warbands
+                    for item_id in armour_ids
+                ]
+            )
+
+            started = time.perf_counter()
+            enable_item_effect(campaign.id, HALF_PRICE_ARMOUR_EFFECT_KEY)
+            enable_ms = (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            disable_item_effect(campaign.id, HALF_PRICE_ARMOUR_EFFECT_KEY)
+            disable_ms = (time.perf_counter() - started) * 1000
+
+            transaction.set_rollback(True)
+        return enable_ms, disable_ms
@@ -4,17 +4,18 @@ from pathlib import Path
 
 from django.core.management.base import BaseCommand, CommandError
 from django.core.management.color import no_style
-from django.db import connection
-
-from apps.items.models import (
-    Item,
-    ItemAvailability,
-    ItemAvailabilityRestriction,
-    ItemProperty,
-    ItemPropertyLink,
+from django.db import connection, transaction
+
+from apps.core.catalogue import bump_base_catalogues
+from apps.core.seeding import (
+    SEED_BATCH_SIZE,
+    forget_sources,
+    record_sources,
+    sources_unchanged,
+    upsert_rows,
 )
-from apps.restrictions.models import Restriction
-from apps.restrictions.utils import parse_unique_to
+from apps.items.models import Item, ItemProperty, ItemPropertyLink
+from apps.items.seeding import load_restriction_cache, replace_availabilities
 
 DEFAULT_JSON_PATHS = [
     Path("apps/items/data/standard-items.json"),
@@ -41,6 +42,16 @@ HEADER_ALIASES = {
     "properties": ["properties", "item_properties", "special_rules"],
     "availabilities": ["availabilities"],
 }
+ITEM_UPDATE_FIELDS = [
+    "subtype",
+    "grade",
+    "single_use",
+    "description",
+    "strength",
+    "range",
+    "save_value",
+    "statblock",
+]
 
 
 def _normalize(value):
@@ -131,55 +142,26 @@ def _reset_sequence(model):
             cursor.execute(sql)
 
 
-def _resolve_restrictions(unique_to_text, restriction_cache):
-    """Parse a unique_to string and resolve to Restriction objects with notes.
+def _load_json_list(path, label):
+    try:
+        data = json.loads(path.read_text(encoding="utf-8-sig"))
+    except json.JSONDecodeError as exc:
+        raise CommandError(f"Unable to parse JSON ({path}): {exc}") from exc
+    except FileNotFoundError as exc:
+        raise CommandError(f"{label} JSON file not found: {path}") from exc
 
-    Uses the shared parse_unique_to utility. Creates any missing restrictions
-    with a default type of 'Warband'.
+    if not isinstance(data, list):
+        raise CommandError(f"{label} JSON data should be a list of objects: {path}")
+    return data
 
-    Returns a list of (Restriction, additional_note) tuples.
-    """
-    parsed = parse_unique_to(unique_to_text)
-    results = []
-    for entry in parsed:
-        cache_key = entry["restriction"]
-        restriction = restriction_cache.get(cache_key)
-        if not restriction:
-            restriction, _ = Restriction.objects.get_or_create(
-                restriction=entry["restriction"],
-                defaults={"type": entry["type"]},
-            )
-            restriction_cache[cache_key] = restriction
-        results.append((restriction, entry["additional_note"]))
-    return results
 
-
-def _sync_availabilities(item, availabilities_data, restriction_cache):
-    """Replace all availability rows for an item."""
-    item.availabilities.all().delete()
-    if not availabilities_data:
-        return
-    for entry in availabilities_data:
-        avail = ItemAvailability.objects.create(
-            item=item,
-            cost=_parse_int(entry.get("cost"), 0),
-            rarity=_normalize_rarity(entry.get("rarity")),
-            variable_cost=_normalize(entry.get("variable_cost")) or None,
-        )
-        unique_to_text = _normalize(entry.get("unique_to"))
-        if unique_to_text:
-            resolved = _resolve_restrictions(unique_to_text, restriction_cache)
-            if resolved:
-                ItemAvailabilityRestriction.objects.bulk_create(
-                    [
-                        ItemAvailabilityRestriction(
-                            item_availability=avail,
-                            restriction=r,
-                            additional_note=note,
-                        )
-                        for r, note in resolved
-                    ]
-                )
+def _availability_row(entry):
+    return {
+        "cost": _parse_int(entry.get("cost"), 0),
+        "rarity": _normalize_rarity(entry.get("rarity")),
+        "variable_cost": _normalize(entry.get("variable_cost")) or None,
+        "unique_to": _normalize(entry.get("unique_to")),
+    }
 
 
 class Command(BaseCommand):
@@ -197,17 +179,17 @@ class Command(BaseCommand):
             action="store_true",
             help="Delete existing items before importing.",
         )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Import even when the source files are unchanged since the last run.",
+        )
 
     def handle(self, *args, **options):
         json_path = options.get("json_path")
         properties_path = options.get("properties_path")
         truncate = options.get("truncate")
 
-        if truncate:
-            ItemPropertyLink.objects.all().delete()
-            Item.objects.all().delete()
-            ItemProperty.objects.all().delete()
-
         paths = [Path(json_path)] if json_path else _resolve_default_json_paths()
         if not paths:
             raise CommandError(
@@ -215,87 +197,105 @@ class Command(BaseCommand):
             )
 
         property_paths = [Path(properties_path)] if properties_path else _resolve_default_property_paths()
+        source_paths = [*property_paths, *paths]
+        if not truncate and not options.get("force") and sources_unchanged("seed_items", source_paths):
+            self.stdout.write("Items unchanged since the last import, skipping.")
+            return
+
+        with transaction.atomic():
+            if truncate:
+                ItemPropertyLink.objects.all().delete()
+                Item.objects.all().delete()
+                ItemProperty.objects.all().delete()
+                forget_sources()
+
+            property_cache_by_id = {}
+            property_cache_by_key = {}
+            for prop in ItemProperty.objects.all():
+                property_cache_by_id[prop.id] = prop
+                property_cache_by_key[_property_cache_key(prop.name, prop.type)] = prop
+
+            if property_paths:
+                self._seed_properties(property_paths, property_cache_by_id, property_cache_by_key)
+
+            created, updated, skipped = self._seed_items(paths, property_cache_by_id, property_cache_by_key)
+            record_sources("seed_items", source_paths)
+
+        bump_base_catalogues("items")
+        self.stdout.write(
+            self.style.SUCCESS(f"Items import complete. Created: {created}, Updated: {updated}, Skipped: {skipped}")
+        )
 
-        created = 0
-        updated = 0
-        skipped = 0
-        property_cache_by_id = {}
-        property_cache_by_key = {}
-        for prop in ItemProperty.objects.all():
-            property_cache_by_id[prop.id] = prop
-            property_cache_by_key[_property_cache_key(prop.name, prop.type)] = prop
-
-        if property_paths:
-            property_entries = []
-            for path in property_paths:
-                try:
-                    data = json.loads(path.read_text(encoding="utf-8-sig"))
-                except json.JSONDecodeError as exc:
-                    raise CommandError(f"Unable to parse JSON ({path}): {exc}") from exc
-                except FileNotFoundError as exc:
-                    raise CommandError(f"Property JSON file not found: {path}") from exc
-
-                if not isinstance(data, list):
-                    raise CommandError(f"Property JSON data should be a list of objects: {path}")
-                property_entries.extend(data)
-
-            for entry in property_entries:
-                if not isinstance(entry, dict):
-                    continue
-
-                prop_id = _parse_property_id(entry.get("id"))
-                prop_name = _normalize(entry.get("name"))
-                prop_description = _normalize(entry.get("description"))
-                prop_type = _normalize(entry.get("type"))
-
-                if not prop_name:
-                    continue
-
-                cache_key = _property_cache_key(prop_name, prop_type)
-                existing = property_cache_by_key.get(cache_key)
-                if existing and prop_id and existing.id != prop_id:
-                    raise CommandError(
-                        f"Duplicate property name/type with different ids: {prop_name} [{prop_type or 'Any'}] ({prop_id} vs {existing.id})"
-                    )
-
-                if prop_id is not None:
-                    item_property, _ = ItemProperty.objects.update_or_create(
-                        id=prop_id,
-                        defaults={
-                            "name": prop_name,
-                            "description": prop_description,
-                            "type": prop_type,
-                        },
-                    )
-                else:
-                    item_property, _ = ItemProperty.objects.update_or_create(
-                        name=prop_name,
-                        type=prop_type,
-                        defaults={
-                            "description": prop_description,
-                        },
-                    )
-
-                _remove_property_cache_entries_for_id(property_cache_by_key, item_property.id)
-                property_cache_by_id[item_property.id] = item_property
-                property_cache_by_key[_property_cache_key(item_property.name, item_property.type)] = item_property
-
-            _reset_sequence(ItemProperty)
+    def _seed_properties(self, property_paths, property_cache_by_id, property_cache_by_key):
+        property_entries = []
+        for path in property_paths:
+            property_entries.extend(_load_json_list(path, "Property"))
+
+        upserts_by_id = {}
+        new_properties = []
+        changed_properties = {}
+        for entry in property_entries:
+            if not isinstance(entry, dict):
+                continue
+
+            prop_id = _parse_property_id(entry.get("id"))
+            prop_name = _normalize(entry.get("name"))
+            prop_description = _normalize(entry.get("description"))
+            prop_type = _normalize(entry.get("type"))
+
+            if not prop_name:
+                continue
+
+            cache_key = _property_cache_key(prop_name, prop_type)
+            existing = property_cache_by_key.get(cache_key)
+            if existing and prop_id and existing.id != prop_id:
+                raise CommandError(
+                    f"Duplicate property name/type with different ids: {prop_name} [{prop_type or 'Any'}] ({prop_id} vs {existing.id})"
+                )
 
-        restriction_cache = {}
-        for r in Restriction.objects.all():
-            restriction_cache[r.restriction] = r
+            if prop_id is not None:
+                item_property = property_cache_by_id.get(prop_id) or ItemProperty(id=prop_id)
+                item_property.name = prop_name
+                item_property.description = prop_description
+                item_property.type = prop_type
+                upserts_by_id[prop_id] = item_property
+                _remove_property_cache_entries_for_id(property_cache_by_key, prop_id)
+                property_cache_by_id[prop_id] = item_property
+            elif existing is None:
+                item_property = ItemProperty(name=prop_name, description=prop_description, type=prop_type)
+                new_properties.append(item_property)
+            else:
+                item_property = existing
+                if item_property.description != prop_description:
+                    item_property.description = prop_description
+                    if item_property.id is not None and item_property.id not in upserts_by_id:
+                        changed_properties[item_property.id] = item_property
+            property_cache_by_key[cache_key] = item_property
+
+        ItemProperty.objects.bulk_create(
+            list(upserts_by_id.values()),
+            update_conflicts=True,
+            unique_fields=["id"],
+            update_fields=["name", "description", "type"],
+            batch_size=SEED_BATCH_SIZE,
+        )
+        # Explicit ids bypass the sequence, so move it past them before inserting new rows.
+        _reset_sequence(ItemProperty)
+        ItemProperty.objects.bulk_create(new_properties, batch_size=SEED_BATCH_SIZE)
+        if changed_properties:
+            ItemProperty.objects.bulk_update(list(changed_properties.values()), ["description"])
+        for item_property in new_properties:
+            property_cache_by_id[item_property.id] = item_property
+
+    def _seed_items(self, paths, property_cache_by_id, property_cache_by_key):
+        skipped = 0
+        desired_items = {}
+        availabilities = {}
+        item_properties = {}
+        new_properties = []
 
         for path in paths:
-            try:
-                data = json.loads(path.read_text(encoding="utf-8-sig"))
-            except json.JSONDecodeError as exc:
-                raise CommandError(f"Unable to parse JSON ({path}): {exc}") from exc
-
-            if not isinstance(data, list):
-                raise CommandError(f"JSON data should be a list of item objects: {path}")
-
-            for entry in data:
+            for entry in _load_json_list(path, "Item"):
                 raw_name = _normalize(_get_entry_value(entry, HEADER_ALIASES["name"]))
                 raw_type = _normalize(_get_entry_value(entry, HEADER_ALIASES["type"]))
                 raw_subtype = _normalize(_get_entry_value(entry, HEADER_ALIASES["subtype"]))
@@ -315,105 +315,114 @@ class Command(BaseCommand):
                     skipped += 1
                     continue
 
-                single_use_value = _normalize_bool(raw_single_use) if raw_single_use is not None else False
-
-                item, was_created = Item.objects.update_or_create(
-                    name=raw_name,
-                    type=raw_type,
-                    defaults={
-                        "subtype": raw_subtype or "",
-                        "grade": raw_grade or "1a",
-                        "single_use": single_use_value,
-                        "description": raw_description,
-                        "strength": raw_strength or None,
-                        "range": raw_range or None,
-                        "save_value": raw_save or None,
-                        "statblock": raw_statblock or None,
-                    },
-                )
-
-                if was_created:
-                    created += 1
-                else:
-                    updated += 1
+                key = (raw_name, raw_type)
+                desired_items[key] = {
+                    "name": raw_name,
+                    "type": raw_type,
+                    "subtype": raw_subtype or "",
+                    "grade": raw_grade or "1a",
+                    "single_use": _normalize_bool(raw_single_use) if raw_single_use is not None else False,
+                    "description": raw_description,
+                    "strength": raw_strength or None,
+                    "range": raw_range or None,
+                    "save_value": raw_save or None,
+                    "statblock": raw_statblock or None,
+                }
 
-                # Sync availabilities
                 if raw_availabilities and isinstance(raw_availabilities, list):
-                    _sync_availabilities(item, raw_availabilities, restriction_cache)
+                    availabilities[key] = [_availability_row(avail) for avail in raw_availabilities]
                 else:
                     # Backward compat: read flat cost/rarity/unique_to/variable_cost
-                    raw_cost = _get_entry_value(entry, HEADER_ALIASES["cost"])
-                    raw_rarity = _get_entry_value(entry, HEADER_ALIASES["rarity"])
-                    raw_unique = _normalize(_get_entry_value(entry, HEADER_ALIASES["unique_to"]))
-                    raw_variable = _normalize(_get_entry_value(entry, HEADER_ALIASES["variable_cost"]))
-                    _sync_availabilities(
-                        item,
-                        [
+                    availabilities[key] = [
+                        _availability_row(
                             {
-                                "cost": raw_cost,
-                                "rarity": raw_rarity,
-                                "unique_to": raw_unique,
-                                "variable_cost": raw_variable,
+                                "cost": _get_entry_value(entry, HEADER_ALIASES["cost"]),
+                                "rarity": _get_entry_value(entry, HEADER_ALIASES["rarity"]),
+                                "unique_to": _get_entry_value(entry, HEADER_ALIASES["unique_to"]),
+                                "variable_cost": _get_entry_value(entry, HEADER_ALIASES["variable_cost"]),
                             }
-                        ],
-                        restriction_cache,
-                    )
+                        )
+                    ]
 
-                if raw_properties:
-                    property_entries = raw_properties
-                    if isinstance(raw_properties, (str, int)):
-                        property_entries = [raw_properties]
-
-                    if isinstance(property_entries, list):
-                        for prop_entry in property_entries:
-                            prop_id = None
-                            prop_name = ""
-                            prop_description = ""
-                            prop_type = ""
-
-                            if isinstance(prop_entry, dict):
-                                prop_id = _parse_property_id(prop_entry.get("id"))
-                                prop_name = _normalize(prop_entry.get("name"))
-                                prop_description = _normalize(prop_entry.get("description"))
-                                prop_type = _normalize(prop_entry.get("type")) or raw_type
-                            elif isinstance(prop_entry, int):
-                                prop_id = prop_entry
-                            elif isinstance(prop_entry, str):
-                                prop_id = _parse_property_id(prop_entry)
-                                if prop_id is None:
-                                    prop_name = _normalize(prop_entry)
-                                    prop_type = raw_type
-
-                            resolved_prop: ItemProperty | None = None
-                            if prop_id is not None:
-                                resolved_prop = property_cache_by_id.get(prop_id)
-                                if not resolved_prop:
-                                    raise CommandError(f"Unknown property id {prop_id} for item '{raw_name}' in {path}")
-                            elif prop_name:
-                                resolved_prop = _resolve_property_from_cache(
-                                    property_cache_by_key,
-                                    prop_name,
-                                    prop_type or raw_type,
-                                )
-                                if not resolved_prop:
-                                    resolved_prop = ItemProperty.objects.create(
-                                        name=prop_name,
-                                        description=prop_description,
-                                        type=prop_type or raw_type,
-                                    )
-                                    property_cache_by_key[
-                                        _property_cache_key(resolved_prop.name, resolved_prop.type)
-                                    ] = resolved_prop
-                                    property_cache_by_id[resolved_prop.id] = resolved_prop
-
-                            if not resolved_prop:
-                                continue
-
-                            ItemPropertyLink.objects.get_or_create(
-                                item=item,
-                                property=resolved_prop,
-                            )
+                linked = item_properties.setdefault(key, [])
+                for resolved_prop in self._resolve_item_properties(
+                    raw_properties, raw_name, raw_type, path, property_cache_by_id, property_cache_by_key
+                ):
+                    if resolved_prop.id is None and resolved_prop not in new_properties:
+                        new_properties.append(resolved_prop)
+                    linked.append(resolved_prop)
 
-        self.stdout.write(
-            self.style.SUCCESS(f"Items import complete. Created: {created}, Updated: {updated}, Skipped: {skipped}")
+        existing_items = {(item.name, item.type): item for item in Item.objects.filter(campaign__isnull=True)}
+        created, updated = upsert_rows(Item, existing_items, desired_items, ITEM_UPDATE_FIELDS)
+
+        replace_availabilities(
+            {existing_items[key].id: rows for key, rows in availabilities.items()},
+            load_restriction_cache(),
         )
+
+        ItemProperty.objects.bulk_create(new_properties, batch_size=SEED_BATCH_SIZE)
+        ItemPropertyLink.objects.bulk_create(
+            [
+                ItemPropertyLink(item=existing_items[key], property=resolved_prop)
+                for key, props in item_properties.items()
+                for resolved_prop in props
+            ],
+            ignore_conflicts=True,
+            batch_size=SEED_BATCH_SIZE,
+        )
+        return created, updated, skipped
+
+    def _resolve_item_properties(
+        self, raw_properties, raw_name, raw_type, path, property_cache_by_id, property_cache_by_key
+    ):
+        if not raw_properties:
+            return []
+        property_entries = raw_properties
+        if isinstance(raw_properties, (str, int)):
+            property_entries = [raw_properties]
+        if not isinstance(property_entries, list):
+            return []
+
+        resolved = []
+        for prop_entry in property_entries:
+            prop_id = None
+            prop_name = ""
+            prop_description = ""
+            prop_type = ""
+
+            if isinstance(prop_entry, dict):
+                prop_id = _parse_property_id(prop_entry.get("id"))
+                prop_name = _normalize(prop_entry.get("name"))
+                prop_description = _normalize(prop_entry.get("description"))
+                prop_type = _normalize(prop_entry.get("type")) or raw_type
+            elif isinstance(prop_entry, int):
+                prop_id = prop_entry
+            elif isinstance(prop_entry, str):
+                prop_id = _parse_property_id(prop_entry)
+                if prop_id is None:
+                    prop_name = _normalize(prop_entry)
+                    prop_type = raw_type
+
+            resolved_prop: ItemProperty | None = None
+            if prop_id is not None:
+                resolved_prop = property_cache_by_id.get(prop_id)
+                if not resolved_prop:
+                    raise CommandError(f"Unknown property id {prop_id} for item '{raw_name}' in {path}")
+            elif prop_name:
+                resolved_prop = _resolve_property_from_cache(
+                    property_cache_by_key,
+                    prop_name,
+                    prop_type or raw_type,
+                )
+                if not resolved_prop:
+                    # Saved in bulk with the other new properties before links are written.
+                    resolved_prop = ItemProperty(
+                        name=prop_name,
+                        description=prop_description,
+                        type=prop_type or raw_type,
+                    )
+                    property_cache_by_key[_property_cache_key(resolved_prop.name, resolved_prop.type)] = resolved_prop
+
+            if resolved_prop:
+                resolved.append(resolved_prop)
+        return resolved
@@ -0,0 +1,22 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models.functions import Upper
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("items", "0006_item_generated_effect_key_and_source_item"),
+        ("core", "0002_trigram_extension"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="item",
+            index=GinIndex(OpClass(Upper("name"), name="gin_trgm_ops"), name="item_search_trgm_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="item",
+            index=GinIndex(SearchVector("description", config="simple"), name="item_search_fts_idx"),
+        ),
+    ]
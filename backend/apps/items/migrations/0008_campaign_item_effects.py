@@ -0,0 +1,115 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+ITEM_EFFECT_KEYS = ("half_price_armour", "improved_shields")
+
+
+def _merge_rows_into_sources(model, owner_field: str, clone_sources: dict[int, int]) -> None:
+    """Repoint rows at the base item, adding quantities where the owner already has it."""
+    for row in model.objects.filter(item_id__in=clone_sources):
+        source_id = clone_sources[row.item_id]
+        existing = model.objects.filter(**{owner_field: getattr(row, owner_field), "item_id": source_id}).first()
+        if existing:
+            existing.quantity = (existing.quantity or 0) + (row.quantity or 0)
+            existing.save(update_fields=["quantity"])
+            row.delete()
+        else:
+            row.item_id = source_id
+            row.save(update_fields=["item"])
+
+
+def _repoint_offer_items(offer, clone_sources: dict[int, int]) -> bool:
+    items = offer.get("items") if isinstance(offer, dict) else None
+    if not items or not any(entry.get("id") in clone_sources for entry in items):
+        return False
+    merged: dict[int, dict] = {}
+    for entry in items:
+        item_id = clone_sources.get(entry.get("id"), entry.get("id"))
+        if item_id in merged:
+            merged[item_id]["quantity"] = merged[item_id].get("quantity", 0) + entry.get("quantity", 0)
+        else:
+            merged[item_id] = {**entry, "id": item_id}
+    offer["items"] = list(merged.values())
+    return True
+
+
+def fold_generated_clones(apps, schema_editor):
+    """Point owned rows back at the base items, record active effects and drop the clones."""
+    Item = apps.get_model("items", "Item")
+    CampaignItemEffect = apps.get_model("items", "CampaignItemEffect")
+    CampaignHouseRule = apps.get_model("campaigns", "CampaignHouseRule")
+    WarbandItem = apps.get_model("warbands", "WarbandItem")
+    BestiaryEntryItem = apps.get_model("bestiary", "BestiaryEntryItem")
+    TradeRequest = apps.get_model("trades", "TradeRequest")
+
+    CampaignItemEffect.objects.bulk_create(
+        [
+            CampaignItemEffect(campaign_id=campaign_id, effect_key=effect_key)
+            for campaign_id, effect_key in CampaignHouseRule.objects.filter(effect_key__in=ITEM_EFFECT_KEYS)
+            .values_list("campaign_id", "effect_key")
+            .distinct()
+        ],
+        ignore_conflicts=True,
+    )
+
+    clone_sources = dict(Item.objects.filter(source_item__isnull=False).values_list("id", "source_item_id"))
+    if not clone_sources:
+        return
+
+    source_of_clone = Subquery(Item.objects.filter(id=OuterRef("item_id")).values("source_item_id")[:1])
+    for model_name in ("HeroItem", "HenchmenGroupItem", "HiredSwordItem"):
+        model = apps.get_model("warbands", model_name)
+        model.objects.filter(item__source_item__isnull=False).update(item_id=source_of_clone)
+
+    # Both tables are unique per (owner, item), and the Item delete below would cascade into them.
+    _merge_rows_into_sources(WarbandItem, "warband_id", clone_sources)
+    _merge_rows_into_sources(BestiaryEntryItem, "bestiary_entry_id", clone_sources)
+
+    # Open trade offers list item ids in JSON; completing them must find the base item.
+    for trade_request in TradeRequest.objects.filter(status__in=("pending", "accepted")):
+        changed_fields = [
+            field
+            for field in ("from_offer", "to_offer")
+            if _repoint_offer_items(getattr(trade_request, field), clone_sources)
+        ]
+        if changed_fields:
+            trade_request.save(update_fields=changed_fields)
+
+    Item.objects.filter(id__in=clone_sources).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bestiary", "0009_search_indexes"),
+        ("campaigns", "0012_campaignunitkillstat"),
+        ("items", "0007_search_indexes"),
+        ("trades", "0003_trade_request_offers"),
+        ("warbands", "0025_warbandlog_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CampaignItemEffect",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("effect_key", models.CharField(max_length=80)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "campaign",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="item_effects",
+                        to="campaigns.campaign",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "campaign_item_effect",
+                "constraints": [
+                    models.UniqueConstraint(fields=("campaign", "effect_key"), name="unique_campaign_item_effect")
+                ],
+            },
+        ),
+        migrations.RunPython(fold_generated_clones, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("items", "0008_campaign_item_effects"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="item",
+            name="generated_effect_key",
+        ),
+        migrations.RemoveField(
+            model_name="item",
+            name="source_item",
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
+from apps.core.search import search_indexes
+
 
 class Item(models.Model):
     campaign = models.ForeignKey(
@@ -20,14 +22,6 @@ class Item(models.Model):
     range = models.CharField(max_length=40, blank=True, null=True)
     save_value = models.CharField(max_length=40, blank=True, null=True, db_column="save")
     statblock = models.TextField(blank=True, null=True)
-    source_item = models.ForeignKey(
-        "self",
-        related_name="generated_clones",
-        null=True,
-        blank=True,
-        on_delete=models.CASCADE,
-    )
-    generated_effect_key = models.CharField(max_length=80, blank=True, null=True, db_index=True)
     bestiary_entry = models.ForeignKey(
         "bestiary.BestiaryEntry",
         related_name="shop_items",
@@ -39,11 +33,32 @@ class Item(models.Model):
     class Meta:
         db_table = "item"
         ordering = ["type", "name"]
+        indexes = search_indexes("item")
 
     def __str__(self):
         return f"{self.name} ({self.type})"
 
 
+class CampaignItemEffect(models.Model):
+    """A house-rule effect (see apps.items.effects) applied to base items when read for a campaign."""
+
+    campaign = models.ForeignKey("campaigns.Campaign", related_name="item_effects", on_delete=models.CASCADE)
+    effect_key = models.CharField(max_length=80)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "campaign_item_effect"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["campaign", "effect_key"],
+                name="unique_campaign_item_effect",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.campaign_id}:{self.effect_key}"
+
+
 class ItemAvailability(models.Model):
     """
     One availability option for an item. Items may have multiple availabilities
@@ -0,0 +1,63 @@
+from apps.core.seeding import SEED_BATCH_SIZE
+from apps.restrictions.models import Restriction
+from apps.restrictions.utils import parse_unique_to
+
+from .models import ItemAvailability, ItemAvailabilityRestriction
+
+
+def load_restriction_cache():
+    return {restriction.restriction: restriction for restriction in Restriction.objects.all()}
+
+
+def resolve_restrictions(unique_to_text, restriction_cache):
+    """Parse a unique_to string and resolve to Restriction objects with notes.
+
+    Uses the shared parse_unique_to utility. Creates any missing restrictions
+    with a default type of 'Warband'.
+
+    Returns a list of (Restriction, additional_note) tuples.
+    """
+    results = []
+    for entry in parse_unique_to(unique_to_text):
+        cache_key = entry["restriction"]
+        restriction = restriction_cache.get(cache_key)
+        if not restriction:
+            restriction, _ = Restriction.objects.get_or_create(
+                restriction=entry["restriction"],
+                defaults={"type": entry["type"]},
+            )
+            restriction_cache[cache_key] = restriction
+        results.append((restriction, entry["additional_note"]))
+    return results
+
+
+def replace_availabilities(availabilities_by_item, restriction_cache):
+    """Replace all availability rows for the given items in a handful of bulk queries.
+
+    `availabilities_by_item` maps an item id to a list of dicts with already-normalized
+    cost, rarity and variable_cost, plus the raw unique_to text.
+    """
+    ItemAvailability.objects.filter(item_id__in=list(availabilities_by_item)).delete()
+    availabilities = []
+    pending_links = []
+    for item_id, entries in availabilities_by_item.items():
+        for entry in entries:
+            availability = ItemAvailability(
+                item_id=item_id,
+                cost=entry["cost"],
+                rarity=entry["rarity"],
+                variable_cost=entry["variable_cost"],
+            )
+            availabilities.append(availability)
+            if entry["unique_to"]:
+                pending_links.append((availability, resolve_restrictions(entry["unique_to"], restriction_cache)))
+
+    ItemAvailability.objects.bulk_create(availabilities, batch_size=SEED_BATCH_SIZE)
+    ItemAvailabilityRestriction.objects.bulk_create(
+        [
+            ItemAvailabilityRestriction(item_availability=availability, restriction=restriction, additional_note=note)
+            for availability, resolved in pending_links
+            for restriction, note in resolved
+        ],
+        batch_size=SEED_BATCH_SIZE,
+    )
@@ -1,10 +1,12 @@
 import json
+from io import StringIO
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
 from django.core.management import call_command
 from django.test import TestCase
 
+from apps.core.models import SeedSource
 from apps.items.models import Item, ItemProperty, ItemPropertyLink
 
 
@@ -66,3 +68,34 @@ class SeedItemsCommandTests(TestCase):
 
         self.assertTrue(ItemPropertyLink.objects.filter(item=sword, property=weapon_parry).exists())
         self.assertTrue(ItemPropertyLink.objects.filter(item=buckler, property=armour_parry).exists())
+
+    def test_seed_items_skips_unchanged_files_and_reimports_changes(self):
+        items_payload = [
+            {"name": "Dagger", "type": "Weapon", "cost": 2, "rarity": 2, "description": "Short blade."},
+            {"name": "Helmet", "type": "Armour", "cost": 10, "rarity": 2},
+        ]
+
+        with TemporaryDirectory() as temp_dir:
+            items_path = Path(temp_dir) / "items.json"
+            properties_path = Path(temp_dir) / "item-properties.json"
+            properties_path.write_text("[]", encoding="utf-8")
+            items_path.write_text(json.dumps(items_payload), encoding="utf-8")
+            options = {"json_path": str(items_path), "properties_path": str(properties_path)}
+
+            call_command("seed_items", stdout=StringIO(), **options)
+            self.assertEqual(SeedSource.objects.filter(command="seed_items").count(), 2)
+
+            Item.objects.filter(name="Dagger").update(description="Edited")
+            output = StringIO()
+            call_command("seed_items", stdout=output, **options)
+            self.assertIn("skipping", output.getvalue())
+            self.assertEqual(Item.objects.get(name="Dagger").description, "Edited")
+
+            items_payload[1]["cost"] = 15
+            items_path.write_text(json.dumps(items_payload), encoding="utf-8")
+            output = StringIO()
+            call_command("seed_items", stdout=output, **options)
+
+        self.assertIn("Created: 0, Updated: 1", output.getvalue())
+        self.assertEqual(Item.objects.get(name="Dagger").description, "Short blade.")
+        self.assertEqual(list(Item.objects.get(name="Helmet").availabilities.values_list("cost", flat=True)), [15])
@@ -4,8 +4,10 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.campaigns.permissions import get_membership, has_campaign_permission
+from apps.core.catalogue import Catalogue, bump_catalogue_version
 from apps.restrictions.models import Restriction
 
+from .effects import apply_item_effects, apply_item_effects_to_rows, campaign_item_effects
 from .models import (
     Item,
     ItemAvailability,
@@ -27,6 +29,15 @@ def _prefetch_items():
     )
 
 
+ITEM_CATALOGUE = Catalogue(
+    kind="items",
+    queryset=_prefetch_items,
+    serialize=lambda items: ItemSerializer(items, many=True).data,
+    effects=campaign_item_effects,
+    apply_effects=apply_item_effects_to_rows,
+)
+
+
 def _sync_availabilities(item, availabilities_data):
     """Replace all availability rows for an item with the given list.
 
@@ -67,31 +78,13 @@ class ItemListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        items = _prefetch_items()
-        item_type = request.query_params.get("type")
-        if item_type:
-            items = items.filter(type__iexact=item_type.strip())
-        search = request.query_params.get("search")
-        if search:
-            items = items.filter(name__icontains=search.strip())
-
         campaign_id = request.query_params.get("campaign_id")
         if campaign_id:
             membership = get_membership(request.user, campaign_id)
             if not membership:
                 return Response({"detail": "Not found"}, status=404)
 
-            custom_items = items.filter(campaign_id=campaign_id)
-            base_items = items.filter(campaign__isnull=True)
-            if custom_items.exists():
-                base_items = base_items.exclude(name__in=custom_items.values_list("name", flat=True))
-            merged = list(custom_items.order_by("name", "id")) + list(base_items.order_by("name", "id"))
-            serializer = ItemSerializer(merged, many=True)
-            return Response(serializer.data)
-
-        items = items.filter(campaign__isnull=True)
-        serializer = ItemSerializer(items.order_by("name", "id"), many=True)
-        return Response(serializer.data)
+        return ITEM_CATALOGUE.response(request, campaign_id)
 
     def post(self, request):
         campaign_id = request.data.get("campaign_id")
@@ -118,6 +111,7 @@ class ItemListView(APIView):
             for prop in properties:
                 ItemPropertyLink.objects.get_or_create(item=item, property=prop)
 
+        bump_catalogue_version("items", item.campaign_id)
         item_with_links = _prefetch_items().get(id=item.id)
         return Response(ItemSerializer(item_with_links).data, status=status.HTTP_201_CREATED)
 
@@ -130,12 +124,13 @@ class ItemDetailView(APIView):
         if not item:
             return Response({"detail": "Not found"}, status=404)
 
-        if item.campaign_id:
-            membership = get_membership(request.user, item.campaign_id)
+        campaign_id = item.campaign_id or request.query_params.get("campaign_id")
+        if campaign_id:
+            membership = get_membership(request.user, campaign_id)
             if not membership:
                 return Response({"detail": "Not found"}, status=404)
 
-        return Response(ItemSerializer(item).data)
+        return Response(apply_item_effects(ItemSerializer(item).data, campaign_item_effects(campaign_id)))
 
     def patch(self, request, item_id):
         item = Item.objects.filter(id=item_id).first()
@@ -169,6 +164,7 @@ class ItemDetailView(APIView):
                 [ItemPropertyLink(item=item, property=prop) for prop in properties],
             )
 
+        bump_catalogue_version("items", item.campaign_id)
         item_with_links = _prefetch_items().get(id=item.id)
         return Response(ItemSerializer(item_with_links).data)
 
@@ -186,6 +182,7 @@ class ItemDetailView(APIView):
             return Response({"detail": "Forbidden"}, status=403)
 
         item.delete()
+        bump_catalogue_version("items", item.campaign_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
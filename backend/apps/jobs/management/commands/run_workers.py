@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.jobs.queue import drain_jobs, schedule_periodic_jobs
+from apps.jobs.worker import run_pool
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Run every due job once and exit")
+        parser.add_argument("--processes", type=int, default=1, help="Worker processes to start")
+        parser.add_argument("--threads", type=int, default=2, help="Worker threads per process")
+        parser.add_argument(
+            "--interval", type=float, default=1.0, help="Seconds a worker sleeps when the queue is empty"
+        )
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            schedule_periodic_jobs()
+            ran = drain_jobs()
+            close_old_connections()
+            self.stdout.write(self.style.SUCCESS(f"Ran {ran} jobs"))
+            return
+
+        processes = max(options["processes"], 1)
+        threads = max(options["threads"], 1)
+        interval = max(options["interval"], 0.1)
+        self.stdout.write(f"Job workers started processes={processes} threads={threads}")
+        run_pool(processes, threads, interval)
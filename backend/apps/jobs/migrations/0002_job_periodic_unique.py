@@ -0,0 +1,44 @@
+from django.db import migrations, models
+from django.utils import timezone
+
+# Names registered with register_periodic_job when the constraint was added.
+PERIODIC_JOB_NAMES = ("battles.sweep_presence", "trades.expire_stale_trade_requests")
+LIVE_STATUSES = ("pending", "running")
+
+
+def flag_periodic_jobs(apps, schema_editor):
+    """Flag the existing periodic rows and finish all but the oldest live row of each."""
+    Job = apps.get_model("jobs", "Job")
+    for name in PERIODIC_JOB_NAMES:
+        live_ids = list(
+            Job.objects.filter(name=name, status__in=LIVE_STATUSES, max_attempts=1)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        if not live_ids:
+            continue
+        Job.objects.filter(id=live_ids[0]).update(periodic=True)
+        Job.objects.filter(id__in=live_ids[1:]).update(status="succeeded", finished_at=timezone.now(), locked_at=None)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("jobs", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="periodic",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(flag_periodic_jobs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="job",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("periodic", True), ("status__in", ["pending", "running"])),
+                fields=("name",),
+                name="background_job_periodic_live_uniq",
+            ),
+        ),
+    ]
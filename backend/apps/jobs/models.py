@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = (
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_SUCCEEDED, "Succeeded"),
+        (STATUS_FAILED, "Failed"),
+    )
+
+    name = models.CharField(max_length=100)
+    payload_json = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    available_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=120, blank=True, default="")
+    last_error = models.TextField(blank=True, default="")
+    periodic = models.BooleanField(default=False)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="background_jobs",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "background_job"
+        indexes = [
+            models.Index(fields=["status", "available_at", "id"], name="background_job_due_idx"),
+            models.Index(fields=["created_by", "-id"], name="background_job_user_idx"),
+        ]
+        constraints = [
+            # A periodic job has at most one row waiting or running, however many workers schedule it.
+            models.UniqueConstraint(
+                fields=["name"],
+                condition=models.Q(periodic=True, status__in=["pending", "running"]),
+                name="background_job_periodic_live_uniq",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name}:{self.id}:{self.status}"
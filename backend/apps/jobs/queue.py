@@ -0,0 +1,224 @@
+import logging
+import os
+import socket
+import threading
+import time
+from collections.abc import Callable
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+JOB_MAX_ATTEMPTS = 5
+JOB_POLL_SECONDS = 5.0
+JOB_BASE_BACKOFF_SECONDS = 5
+# A running job whose worker died is handed out again once its lock is this old.
+JOB_LOCK_TIMEOUT_SECONDS = 15 * 60
+# Long-running processes queue periodic jobs again this often, in case a row was lost.
+PERIODIC_SCHEDULE_SECONDS = 60
+
+_handlers: dict[str, Callable[..., None]] = {}
+_periodic_jobs: dict[str, int] = {}
+
+
+def register_job(name: str):
+    """Register a handler; it is called with the job payload as keyword arguments."""
+
+    def decorator(func):
+        _handlers[name] = func
+        return func
+
+    return decorator
+
+
+def register_periodic_job(name: str, every_seconds: int):
+    """Register a handler that runs with no payload every `every_seconds`, on whichever worker is free.
+
+    Each periodic job is a single row that goes back to pending after every run, so a missed or
+    failed run is picked up at the next tick rather than retried with backoff. A unique constraint
+    keeps it to one waiting or running row, so it never runs on two workers at once.
+    """
+
+    def decorator(func):
+        _handlers[name] = func
+        _periodic_jobs[name] = max(int(every_seconds), 1)
+        return func
+
+    return decorator
+
+
+def schedule_periodic_jobs() -> int:
+    """Queue every periodic job that has no row waiting or running yet. Returns how many were missing.
+
+    Safe to call from every process at any time: a row another process queued first wins and the
+    insert here is dropped.
+    """
+    queued = Job.objects.filter(
+        name__in=list(_periodic_jobs), periodic=True, status__in=[Job.STATUS_PENDING, Job.STATUS_RUNNING]
+    ).values_list("name", flat=True)
+    missing = set(_periodic_jobs) - set(queued)
+    Job.objects.bulk_create(
+        [Job(name=name, max_attempts=1, periodic=True) for name in sorted(missing)], ignore_conflicts=True
+    )
+    return len(missing)
+
+
+def enqueue_job(name: str, payload: dict | None = None, *, user=None, max_attempts: int = JOB_MAX_ATTEMPTS) -> Job:
+    """Store a job as part of the current transaction. It becomes runnable once the transaction commits."""
+    if name not in _handlers:
+        raise ValueError(f"Unknown job: {name}")
+    job = Job.objects.create(
+        name=name,
+        payload_json=payload or {},
+        max_attempts=max(max_attempts, 1),
+        created_by=user if getattr(user, "is_authenticated", False) else None,
+    )
+    transaction.on_commit(_after_commit)
+    return job
+
+
+def _after_commit() -> None:
+    mode = settings.JOBS_DISPATCH
+    if mode == "inline":
+        try:
+            drain_jobs()
+        except Exception:
+            logger.exception("Inline job run failed")
+    elif mode == "thread":
+        dispatcher.wake()
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+def _backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=JOB_BASE_BACKOFF_SECONDS * (2 ** max(attempts - 1, 0)))
+
+
+def claim_next_job(worker_id: str) -> Job | None:
+    """Lock the oldest due job for `worker_id`. Rows locked by other workers are skipped, not waited on."""
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=JOB_LOCK_TIMEOUT_SECONDS)
+    with transaction.atomic():
+        job = (
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=Job.STATUS_PENDING, available_at__lte=now)
+                | Q(status=Job.STATUS_RUNNING, locked_at__lt=stale_before)
+            )
+            .order_by("available_at", "id")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = Job.STATUS_RUNNING
+        job.attempts += 1
+        job.locked_at = now
+        job.locked_by = worker_id[:120]
+        job.save(update_fields=["status", "attempts", "locked_at", "locked_by"])
+    return job
+
+
+def _reschedule_periodic_job(job: Job, now) -> bool:
+    """Send a periodic job row back to the queue for its next tick."""
+    interval = _periodic_jobs.get(job.name)
+    if interval is None or not job.periodic:
+        return False
+    job.status = Job.STATUS_PENDING
+    job.attempts = 0
+    job.available_at = now + timedelta(seconds=interval)
+    job.finished_at = None
+    return True
+
+
+def run_job(job: Job) -> None:
+    """Run a claimed job and record how it went. Failures are retried with backoff until max_attempts."""
+    handler = _handlers.get(job.name)
+    now = timezone.now()
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for {job.name}")
+        with transaction.atomic():
+            handler(**job.payload_json)
+    except Exception as exc:
+        logger.exception("Job failed id=%s name=%s attempt=%s", job.id, job.name, job.attempts)
+        job.last_error = str(exc)[:1000]
+        if handler is None or job.attempts >= job.max_attempts:
+            job.status = Job.STATUS_FAILED
+            job.finished_at = now
+        else:
+            job.status = Job.STATUS_PENDING
+            job.available_at = now + _backoff(job.attempts)
+    else:
+        job.status = Job.STATUS_SUCCEEDED
+        job.last_error = ""
+        job.finished_at = timezone.now()
+    _reschedule_periodic_job(job, timezone.now())
+    job.locked_at = None
+    job.save(update_fields=["status", "attempts", "last_error", "available_at", "finished_at", "locked_at"])
+
+
+def run_next_job(worker_id: str | None = None) -> bool:
+    job = claim_next_job(worker_id or default_worker_id())
+    if job is None:
+        return False
+    run_job(job)
+    return True
+
+
+def drain_jobs(worker_id: str | None = None) -> int:
+    """Run due jobs until none are left. Returns how many ran."""
+    total = 0
+    while run_next_job(worker_id):
+        total += 1
+    return total
+
+
+class JobDispatcher:
+    """Background thread that drains the queue whenever a transaction enqueues jobs."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def wake(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="background-jobs", daemon=True)
+                self._thread.start()
+        self._wake_event.set()
+
+    def _run(self) -> None:
+        next_schedule = 0.0
+        while True:
+            if time.monotonic() >= next_schedule:
+                try:
+                    schedule_periodic_jobs()
+                except Exception:
+                    logger.exception("Scheduling periodic jobs failed")
+                next_schedule = time.monotonic() + PERIODIC_SCHEDULE_SECONDS
+            self._wake_event.wait(timeout=JOB_POLL_SECONDS)
+            self._wake_event.clear()
+            try:
+                drain_jobs()
+            except Exception:
+                logger.exception("Job dispatcher failed")
+            finally:
+                close_old_connections()
+
+
+dispatcher = JobDispatcher()
+
+
+def start_background_jobs() -> None:
+    """Start this process's job thread when jobs run in the web workers, so periodic jobs tick."""
+    if settings.JOBS_DISPATCH == "thread":
+        dispatcher.wake()
@@ -0,0 +1,185 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
+
+from apps.jobs.models import Job
+from apps.jobs.queue import (
+    JobDispatcher,
+    claim_next_job,
+    drain_jobs,
+    enqueue_job,
+    register_job,
+    register_periodic_job,
+    run_job,
+    schedule_periodic_jobs,
+)
+from apps.users.jobs import SEND_PASSWORD_RESET_EMAIL_JOB
+
+calls = []
+
+
+@register_job("tests.record")
+def record(value: int) -> None:
+    calls.append(value)
+
+
+@register_job("tests.explode")
+def explode() -> None:
+    raise RuntimeError("boom")
+
+
+@register_periodic_job("tests.tick", every_seconds=60)
+def tick() -> None:
+    calls.append("tick")
+
+
+@override_settings(JOBS_DISPATCH="worker")
+class JobQueueTests(APITestCase):
+    client: APIClient
+
+    def setUp(self):
+        calls.clear()
+        self.client = APIClient()
+        self.user_model = get_user_model()
+        self.user = self.user_model.objects.create_user(
+            username="owner@example.com",
+            email="owner@example.com",
+            password="testpass123",
+        )
+        self.other = self.user_model.objects.create_user(
+            username="other@example.com",
+            email="other@example.com",
+            password="testpass123",
+        )
+
+    def test_enqueue_rejects_unknown_job_names(self):
+        with self.assertRaises(ValueError):
+            enqueue_job("tests.missing")
+
+    def test_drain_runs_due_jobs_and_marks_them_succeeded(self):
+        job = enqueue_job("tests.record", {"value": 3}, user=self.user)
+        later = enqueue_job("tests.record", {"value": 4})
+        Job.objects.filter(id=later.id).update(available_at=timezone.now() + timedelta(minutes=5))
+
+        self.assertEqual(drain_jobs(), 1)
+
+        self.assertEqual(calls, [3])
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_SUCCEEDED)
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(Job.objects.get(id=later.id).status, Job.STATUS_PENDING)
+
+    def test_claimed_jobs_are_not_handed_out_twice_until_their_lock_goes_stale(self):
+        job = enqueue_job("tests.record", {"value": 1})
+
+        claimed = claim_next_job("worker-a")
+        self.assertEqual(claimed.id, job.id)
+        self.assertEqual(claimed.status, Job.STATUS_RUNNING)
+        self.assertIsNone(claim_next_job("worker-b"))
+
+        Job.objects.filter(id=job.id).update(locked_at=timezone.now() - timedelta(hours=1))
+        reclaimed = claim_next_job("worker-b")
+        self.assertEqual(reclaimed.id, job.id)
+        self.assertEqual(reclaimed.locked_by, "worker-b")
+        self.assertEqual(reclaimed.attempts, 2)
+
+    def test_failing_jobs_are_retried_with_backoff_then_marked_failed(self):
+        job = enqueue_job("tests.explode", max_attempts=2)
+
+        run_job(claim_next_job("worker"))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_PENDING)
+        self.assertEqual(job.last_error, "boom")
+        self.assertGreater(job.available_at, timezone.now())
+        self.assertIsNone(claim_next_job("worker"))
+
+        Job.objects.filter(id=job.id).update(available_at=timezone.now())
+        run_job(claim_next_job("worker"))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_periodic_jobs_are_queued_once_and_go_back_to_pending_after_each_run(self):
+        self.assertGreaterEqual(schedule_periodic_jobs(), 1)
+        self.assertEqual(schedule_periodic_jobs(), 0)
+        # A second process inserting the same row at the same moment is turned away by the database.
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Job.objects.create(name="tests.tick", max_attempts=1, periodic=True)
+
+        drain_jobs()
+
+        self.assertEqual(calls, ["tick"])
+        repeating = Job.objects.get(name="tests.tick")
+        self.assertEqual(repeating.status, Job.STATUS_PENDING)
+        self.assertEqual(repeating.attempts, 0)
+        self.assertGreater(repeating.available_at, timezone.now() + timedelta(seconds=30))
+        self.assertEqual(drain_jobs(), 0)
+
+    def test_periodic_job_runs_on_one_worker_and_leaves_one_successor(self):
+        schedule_periodic_jobs()
+        Job.objects.exclude(name="tests.tick").update(available_at=timezone.now() + timedelta(hours=1))
+
+        first = claim_next_job("worker-a")
+        self.assertEqual(first.name, "tests.tick")
+        # Another worker, and a process scheduling again while the job runs, find nothing to add or take.
+        self.assertEqual(schedule_periodic_jobs(), 0)
+        self.assertIsNone(claim_next_job("worker-b"))
+
+        run_job(first)
+
+        rows = Job.objects.filter(name="tests.tick")
+        self.assertEqual(list(rows.values_list("status", flat=True)), [Job.STATUS_PENDING])
+        self.assertEqual(schedule_periodic_jobs(), 0)
+
+    def test_job_dispatcher_schedules_periodic_jobs_again_on_an_interval(self):
+        dispatcher = JobDispatcher()
+        with (
+            patch("apps.jobs.queue.schedule_periodic_jobs") as schedule,
+            patch("apps.jobs.queue.drain_jobs"),
+            patch("apps.jobs.queue.close_old_connections"),
+            patch("apps.jobs.queue.time.monotonic", side_effect=[0.0, 0.0, 30.0, 61.0, 61.0]),
+            patch.object(dispatcher._wake_event, "wait", side_effect=[True, True, SystemExit]),
+        ):
+            with self.assertRaises(SystemExit):
+                dispatcher._run()
+
+        self.assertEqual(schedule.call_count, 2)
+
+    def test_password_reset_request_queues_the_email(self):
+        with patch("apps.users.jobs.send_password_reset_email", return_value=True) as send_email:
+            response = self.client.post("/api/auth/password-reset/", {"email": self.user.email}, format="json")
+            self.assertEqual(response.status_code, 200)
+            send_email.assert_not_called()
+
+            job = Job.objects.get(name=SEND_PASSWORD_RESET_EMAIL_JOB)
+            self.assertEqual(job.payload_json, {"user_id": self.user.id, "email": self.user.email})
+            self.assertEqual(drain_jobs(), 1)
+
+        to_email, reset_url = send_email.call_args.args
+        self.assertEqual(to_email, self.user.email)
+        self.assertIn("/reset-password?uid=", reset_url)
+        self.assertEqual(Job.objects.get(id=job.id).status, Job.STATUS_SUCCEEDED)
+
+    def test_job_status_is_visible_to_the_user_who_queued_it(self):
+        own = enqueue_job("tests.record", {"value": 1}, user=self.user)
+        other = enqueue_job("tests.record", {"value": 2}, user=self.other)
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get("/api/jobs/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["id"] for row in response.data], [own.id])
+        self.assertEqual(response.data[0]["status"], Job.STATUS_PENDING)
+
+        response = self.client.get(f"/api/jobs/{own.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["name"], "tests.record")
+
+        response = self.client.get(f"/api/jobs/{other.id}/")
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,8 @@
+from django.urls import path
+
+from .views import JobDetailView, JobListView
+
+urlpatterns = [
+    path("jobs/", JobListView.as_view(), name="jobs-list"),
+    path("jobs/<int:job_id>/", JobDetailView.as_view(), name="jobs-detail"),
+]
@@ -0,0 +1,48 @@
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import Job
+
+JOB_LIST_LIMIT = 50
+
+
+def _serialize_job(job: Job) -> dict:
+    return {
+        "id": job.id,
+        "name": job.name,
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "last_error": job.last_error,
+        "created_at": job.created_at.isoformat(),
+        "available_at": job.available_at.isoformat(),
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+def _visible_jobs(user):
+    if user.is_staff:
+        return Job.objects.all()
+    return Job.objects.filter(created_by=user)
+
+
+class JobListView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        jobs = _visible_jobs(request.user)
+        status = request.query_params.get("status")
+        if status:
+            jobs = jobs.filter(status=status)
+        return Response([_serialize_job(job) for job in jobs.order_by("-id")[:JOB_LIST_LIMIT]])
+
+
+class JobDetailView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, job_id):
+        job = _visible_jobs(request.user).filter(id=job_id).first()
+        if not job:
+            return Response({"detail": "Not found"}, status=404)
+        return Response(_serialize_job(job))
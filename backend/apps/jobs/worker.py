@@ -0,0 +1,100 @@
+"""Worker pool behind `manage.py run_workers`.
+
+Every process runs a number of threads, and each thread claims and runs one job at a time. Child
+processes are spawned rather than forked so the pool behaves the same on every platform; they set
+Django up again before touching the queue.
+"""
+
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import time
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+def _work(index: int, interval: float, stop: threading.Event) -> None:
+    from .queue import run_next_job
+
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{index}"
+    while not stop.is_set():
+        try:
+            ran = run_next_job(worker_id)
+        except Exception:
+            logger.exception("Job worker iteration failed worker=%s", worker_id)
+            ran = False
+        finally:
+            close_old_connections()
+        if not ran:
+            stop.wait(interval)
+
+
+def _schedule_periodic_jobs() -> None:
+    from .queue import schedule_periodic_jobs
+
+    try:
+        schedule_periodic_jobs()
+    except Exception:
+        logger.exception("Scheduling periodic jobs failed")
+    finally:
+        close_old_connections()
+
+
+def run_threads(threads: int, interval: float, stop: threading.Event | None = None) -> None:
+    """Run `threads` job workers in this process until `stop` is set or the process is interrupted.
+
+    The main thread queues periodic jobs at start and every PERIODIC_SCHEDULE_SECONDS after that.
+    """
+    from .queue import PERIODIC_SCHEDULE_SECONDS
+
+    stop = stop or threading.Event()
+    workers = [
+        threading.Thread(target=_work, args=(index, interval, stop), name=f"job-worker-{index}", daemon=True)
+        for index in range(max(threads, 1))
+    ]
+    _schedule_periodic_jobs()
+    next_schedule = time.monotonic() + PERIODIC_SCHEDULE_SECONDS
+    for worker in workers:
+        worker.start()
+    try:
+        while any(worker.is_alive() for worker in workers):
+            for worker in workers:
+                worker.join(timeout=1.0)
+            if not stop.is_set() and time.monotonic() >= next_schedule:
+                _schedule_periodic_jobs()
+                next_schedule = time.monotonic() + PERIODIC_SCHEDULE_SECONDS
+    except KeyboardInterrupt:
+        stop.set()
+
+
+def _process_main(threads: int, interval: float) -> None:
+    import django
+
+    django.setup()
+    run_threads(threads, interval)
+
+
+def run_pool(processes: int, threads: int, interval: float) -> None:
+    if processes <= 1:
+        run_threads(threads, interval)
+        return
+
+    context = multiprocessing.get_context("spawn")
+    children = [
+        context.Process(target=_process_main, args=(threads, interval), name=f"job-process-{index}")
+        for index in range(processes)
+    ]
+    for child in children:
+        child.start()
+    try:
+        for child in children:
+            child.join()
+    except KeyboardInterrupt:
+        for child in children:
+            child.terminate()
+        for child in children:
+            child.join()
@@ -15,7 +15,7 @@ def log_warband_event(
 
     return WarbandLog.objects.create(
         warband_id=warband_id,
-        feature=feature,
+        feature=feature.strip().lower(),
         entry_type=entry_type,
         payload=payload or {},
         parent_id=parent_id,
@@ -70,7 +70,7 @@ def _apply_clear_side_effects(notification: Notification, user, now) -> None:  #
 
 
 def _clear_trade_request(notification: Notification, user, now) -> None:  # type: ignore[no-untyped-def]
-    from apps.realtime.services import send_user_notification, serialize_trade_request
+    from apps.realtime.services import queue_user_notification, serialize_trade_request
     from apps.trades.models import TradeRequest
 
     trade_request = (
@@ -91,15 +91,11 @@ def _clear_trade_request(notification: Notification, user, now) -> None:  # type
     trade_request.responded_at = now
     trade_request.save(update_fields=["status", "responded_at"])
     payload = serialize_trade_request(trade_request)
-    from_user_id = trade_request.from_user_id
-    transaction.on_commit(
-        lambda uid=from_user_id, data=payload: send_user_notification(uid, "trade_declined", data)  # type: ignore[misc]
-    )
+    queue_user_notification(trade_request.from_user_id, "trade_declined", payload)
 
 
 def _clear_battle_result_request(notification: Notification, user, now) -> None:  # type: ignore[no-untyped-def]
     from apps.battles.models import Battle, BattleParticipant
-    from apps.realtime.services import send_user_notification
 
     try:
         battle_id = int(notification.reference_id)
@@ -137,17 +133,14 @@ def _clear_battle_result_request(notification: Notification, user, now) -> None:
     participant_user_ids = list(
         BattleParticipant.objects.filter(battle_id=battle_id).values_list("user_id", flat=True)
     )
-    campaign_id = battle.campaign_id
-    transaction.on_commit(
-        lambda ids=participant_user_ids, bid=battle_id, cid=campaign_id: _send_battle_result_updated(ids, bid, cid)  # type: ignore[misc]
-    )
+    _send_battle_result_updated(participant_user_ids, battle_id, battle.campaign_id)
 
 
 def _send_battle_result_updated(user_ids: list, battle_id: int, campaign_id: int) -> None:
-    from apps.realtime.services import send_user_notification
+    from apps.realtime.services import queue_user_notification
 
     for uid in user_ids:
-        send_user_notification(
+        queue_user_notification(
             uid,
             "battle_result_updated",
             {"battle_id": battle_id, "campaign_id": campaign_id, "status": "canceled"},
@@ -2,7 +2,10 @@ import json
 from pathlib import Path
 
 from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 
+from apps.core.catalogue import bump_base_catalogues
+from apps.core.seeding import forget_sources, record_sources, sources_unchanged, upsert_rows
 from apps.races.models import Race
 
 DEFAULT_JSON_PATH = Path("apps/races/data/races.json")
@@ -20,6 +23,7 @@ HEADER_ALIASES = {
     "attacks": ["attacks", "a"],
     "leadership": ["leadership", "ld", "lead"],
 }
+STAT_FIELDS = [field for field in HEADER_ALIASES if field != "name"]
 
 
 def _normalize(value):
@@ -54,19 +58,24 @@ class Command(BaseCommand):
             action="store_true",
             help="Delete existing races before importing.",
         )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Import even when the source file is unchanged since the last run.",
+        )
 
     def handle(self, *args, **options):
         json_path = options.get("json_path")
         truncate = options.get("truncate")
 
-        if truncate:
-            Race.objects.all().delete()
-
         path = Path(json_path) if json_path else _resolve_default_json_path()
         if not path or not path.exists():
             raise CommandError(
                 "JSON file not found. Provide --json or place data at apps/races/data/races.json or csvs/races.json."
             )
+        if not truncate and not options.get("force") and sources_unchanged("seed_races", [path]):
+            self.stdout.write("Races unchanged since the last import, skipping.")
+            return
 
         try:
             data = json.loads(path.read_text(encoding="utf-8-sig"))
@@ -76,9 +85,8 @@ class Command(BaseCommand):
         if not isinstance(data, list):
             raise CommandError("JSON data should be a list of race objects.")
 
-        created = 0
-        updated = 0
         skipped = 0
+        desired = {}
 
         for entry in data:
             name = _normalize(_get_entry_value(entry, HEADER_ALIASES["name"]))
@@ -86,33 +94,23 @@ class Command(BaseCommand):
                 skipped += 1
                 continue
 
-            fields = {
-                "movement": _normalize(_get_entry_value(entry, HEADER_ALIASES["movement"])),
-                "weapon_skill": _normalize(_get_entry_value(entry, HEADER_ALIASES["weapon_skill"])),
-                "ballistic_skill": _normalize(_get_entry_value(entry, HEADER_ALIASES["ballistic_skill"])),
-                "strength": _normalize(_get_entry_value(entry, HEADER_ALIASES["strength"])),
-                "toughness": _normalize(_get_entry_value(entry, HEADER_ALIASES["toughness"])),
-                "wounds": _normalize(_get_entry_value(entry, HEADER_ALIASES["wounds"])),
-                "initiative": _normalize(_get_entry_value(entry, HEADER_ALIASES["initiative"])),
-                "attacks": _normalize(_get_entry_value(entry, HEADER_ALIASES["attacks"])),
-                "leadership": _normalize(_get_entry_value(entry, HEADER_ALIASES["leadership"])),
-                "campaign": None,
-            }
+            fields = {field: _normalize(_get_entry_value(entry, HEADER_ALIASES[field])) for field in STAT_FIELDS}
 
             if not any(fields.values()):
                 skipped += 1
                 continue
 
-            race = Race.objects.filter(name=name, campaign__isnull=True).first()
-            if race:
-                for key, value in fields.items():
-                    setattr(race, key, value)
-                race.save()
-                updated += 1
-            else:
-                Race.objects.create(name=name, **fields)
-                created += 1
+            desired[name] = {"name": name, **fields}
+
+        with transaction.atomic():
+            if truncate:
+                Race.objects.all().delete()
+                forget_sources()
+            existing = {race.name: race for race in Race.objects.filter(campaign__isnull=True)}
+            created, updated = upsert_rows(Race, existing, desired, STAT_FIELDS)
+            record_sources("seed_races", [path])
 
+        bump_base_catalogues("races")
         self.stdout.write(
             self.style.SUCCESS(f"Races import complete. Created: {created}, Updated: {updated}, Skipped: {skipped}")
         )
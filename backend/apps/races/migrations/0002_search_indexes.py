@@ -0,0 +1,17 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import migrations
+from django.db.models.functions import Upper
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("races", "0001_initial"),
+        ("core", "0002_trigram_extension"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="race",
+            index=GinIndex(OpClass(Upper("name"), name="gin_trgm_ops"), name="race_search_trgm_idx"),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 
+from apps.core.search import search_indexes
 from apps.warbands.models.shared import StatBlock, stat_constraints
 
 
@@ -16,6 +17,7 @@ class Race(StatBlock):
     class Meta:
         db_table = "race"
         ordering = ["name"]
+        indexes = search_indexes("race", description_field=None)
         constraints = stat_constraints("race")
 
     def __str__(self):
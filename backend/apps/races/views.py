@@ -1,44 +1,33 @@
-from typing import Any
-
 from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.campaigns.permissions import get_membership, is_admin, is_owner
+from apps.core.catalogue import Catalogue, bump_catalogue_version
 
 from .models import Race
 from .serializers import RaceCreateSerializer, RaceSerializer
 
+RACE_CATALOGUE = Catalogue(
+    kind="races",
+    queryset=lambda: Race.objects.all(),
+    serialize=lambda races: RaceSerializer(races, many=True).data,
+    type_field=None,
+    description_field=None,
+)
+
 
 class RaceListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        races: Any = Race.objects.all()
         campaign_id = request.query_params.get("campaign_id")
         if campaign_id:
             membership = get_membership(request.user, campaign_id)
             if not membership:
                 return Response({"detail": "Not found"}, status=404)
 
-            custom_races = races.filter(campaign_id=campaign_id)
-            base_races = races.filter(campaign__isnull=True)
-            if custom_races.exists():
-                base_races = base_races.exclude(name__in=custom_races.values_list("name", flat=True))
-            races = list(custom_races.order_by("name", "id")) + list(base_races.order_by("name", "id"))
-        else:
-            races = races.filter(campaign__isnull=True).order_by("name", "id")
-
-        search = request.query_params.get("search")
-        if search:
-            if isinstance(races, list):
-                cleaned = search.strip().lower()
-                races = [race for race in races if cleaned in race.name.lower()]
-            else:
-                races = races.filter(name__icontains=search.strip())
-
-        serializer = RaceSerializer(races, many=True)
-        return Response(serializer.data)
+        return RACE_CATALOGUE.response(request, campaign_id)
 
     def post(self, request):
         campaign_id = request.data.get("campaign_id")
@@ -50,6 +39,7 @@ class RaceListView(APIView):
         serializer = RaceCreateSerializer(data=data)
         serializer.is_valid(raise_exception=True)
         race = serializer.save(campaign_id=campaign_id)
+        bump_catalogue_version("races", race.campaign_id)
         return Response(RaceSerializer(race).data, status=status.HTTP_201_CREATED)
 
 
@@ -79,6 +69,7 @@ class RaceDetailView(APIView):
         serializer = RaceCreateSerializer(race, data=data, partial=partial)
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        bump_catalogue_version("races", race.campaign_id)
         return Response(RaceSerializer(race).data)
 
     def put(self, request, race_id):
@@ -0,0 +1,123 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Every web worker listens on this one Redis channel and delivers to its own sockets.
+REDIS_FANOUT_CHANNEL = "realtime:events"
+REDIS_RECONNECT_SECONDS = 1.0
+
+
+class Subscriber:
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_queue_size: int = 1000):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+
+    def deliver(self, message: dict) -> None:
+        self.loop.call_soon_threadsafe(self._put, message)
+
+    def _put(self, message: dict) -> None:
+        if self.queue.full():
+            # Slow consumer: drop the oldest message rather than blocking publishers.
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+
+class ChannelBroker:
+    """In-process fan-out of realtime events to connected WebSocket subscribers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: defaultdict[str, set[Subscriber]] = defaultdict(set)
+
+    def subscribe(self, channel_name: str, subscriber: Subscriber) -> None:
+        with self._lock:
+            self._subscribers[channel_name].add(subscriber)
+
+    def unsubscribe(self, channel_name: str, subscriber: Subscriber) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(channel_name)
+            if not subscribers:
+                return
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[channel_name]
+
+    def unsubscribe_all(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            for channel_name in [name for name, entries in self._subscribers.items() if subscriber in entries]:
+                self._subscribers[channel_name].discard(subscriber)
+                if not self._subscribers[channel_name]:
+                    del self._subscribers[channel_name]
+
+    def publish(self, channel_name: str, event: str, data: dict) -> int:
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel_name, ()))
+        message = {"type": "event", "channel": channel_name, "event": event, "data": data}
+        for subscriber in subscribers:
+            subscriber.deliver(message)
+        return len(subscribers)
+
+
+broker = ChannelBroker()
+
+
+@lru_cache(maxsize=1)
+def _redis_client():
+    import redis
+
+    return redis.Redis.from_url(settings.REALTIME_BROKER_URL)
+
+
+def publish(channel_name: str, event: str, data: dict) -> None:
+    """Deliver an event to its subscribers in every process, or only this one without Redis."""
+    if not settings.REALTIME_BROKER_URL:
+        broker.publish(channel_name, event, data)
+        return
+    message = json.dumps({"channel": channel_name, "event": event, "data": data})
+    _redis_client().publish(REDIS_FANOUT_CHANNEL, message)
+
+
+def relay_message(raw_message: bytes | str) -> None:
+    message = json.loads(raw_message)
+    broker.publish(message["channel"], message["event"], message["data"])
+
+
+def _listen_forever() -> None:
+    while True:
+        try:
+            pubsub = _redis_client().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(REDIS_FANOUT_CHANNEL)
+            for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                try:
+                    relay_message(message["data"])
+                except (KeyError, TypeError, ValueError):
+                    logger.warning("Dropped malformed realtime message")
+        except Exception:
+            logger.exception("Realtime Redis listener failed")
+            time.sleep(REDIS_RECONNECT_SECONDS)
+
+
+_listener_lock = threading.Lock()
+_listener_thread: threading.Thread | None = None
+
+
+def ensure_listener() -> None:
+    """Start this process's Redis subscriber the first time a socket connects."""
+    global _listener_thread
+    if not settings.REALTIME_BROKER_URL:
+        return
+    with _listener_lock:
+        if _listener_thread is not None and _listener_thread.is_alive():
+            return
+        _listener_thread = threading.Thread(target=_listen_forever, name="realtime-redis-listener", daemon=True)
+        _listener_thread.start()
@@ -0,0 +1,36 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.realtime.outbox import OUTBOX_POLL_SECONDS, drain_outbox
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Deliver queued realtime events from the outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Drain the outbox once and exit")
+        parser.add_argument("--interval", type=float, default=1.0, help="Seconds to sleep when the outbox is empty")
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            sent = drain_outbox()
+            self.stdout.write(self.style.SUCCESS(f"Dispatched {sent} outbox events"))
+            return
+
+        interval = min(max(options["interval"], 0.1), OUTBOX_POLL_SECONDS)
+        self.stdout.write("Realtime outbox worker started")
+        while True:
+            try:
+                sent = drain_outbox()
+            except Exception:
+                logger.exception("Realtime outbox worker iteration failed")
+                sent = 0
+            finally:
+                close_old_connections()
+            if not sent:
+                time.sleep(interval)
@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("realtime", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="realtimeoutboxevent",
+            name="locked_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="realtimeoutboxevent",
+            name="status",
+            field=models.CharField(
+                choices=[("pending", "Pending"), ("sending", "Sending"), ("failed", "Failed")],
+                default="pending",
+                max_length=20,
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import models
+from django.utils import timezone
+
+
+class RealtimeOutboxEvent(models.Model):
+    STATUS_PENDING = "pending"
+    STATUS_SENDING = "sending"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = (
+        (STATUS_PENDING, "Pending"),
+        (STATUS_SENDING, "Sending"),
+        (STATUS_FAILED, "Failed"),
+    )
+
+    channel = models.CharField(max_length=160)
+    event = models.CharField(max_length=80)
+    payload_json = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "realtime_outbox_event"
+        indexes = [
+            models.Index(fields=["status", "available_at", "id"], name="realtime_outbox_pending_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.channel}:{self.event}:{self.status}"
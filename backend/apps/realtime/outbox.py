@@ -0,0 +1,184 @@
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import RealtimeOutboxEvent
+from .transports import PUSHER_BATCH_LIMIT, trigger_batch
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 6
+OUTBOX_POLL_SECONDS = 5.0
+OUTBOX_BASE_BACKOFF_SECONDS = 2
+# Rows are sent in chunks of one provider request each, so a failure only retries its own chunk.
+OUTBOX_CHUNK_SIZE = PUSHER_BATCH_LIMIT
+# A worker that died mid-send leaves rows in "sending"; they go out again after this long.
+OUTBOX_LOCK_TIMEOUT = timedelta(minutes=1)
+
+# Events that only tell clients to refetch; only the latest per channel matters.
+COALESCED_EVENTS = {"battle_state_updated"}
+
+
+def enqueue_event(channel_name: str, event: str, data: dict) -> None:
+    """Store an event in the outbox as part of the current transaction."""
+    RealtimeOutboxEvent.objects.create(channel=channel_name, event=event, payload_json=data)
+    transaction.on_commit(_after_commit)
+
+
+def _after_commit() -> None:
+    mode = settings.REALTIME_OUTBOX_DISPATCH
+    if mode == "inline":
+        try:
+            dispatch_pending()
+        except Exception:
+            logger.exception("Inline realtime outbox dispatch failed")
+    elif mode == "thread":
+        dispatcher.wake()
+
+
+def _event_type(row: RealtimeOutboxEvent) -> str:
+    if isinstance(row.payload_json, dict):
+        return str(row.payload_json.get("type") or row.event)
+    return row.event
+
+
+def coalesce_events(rows: list[RealtimeOutboxEvent]) -> list[RealtimeOutboxEvent]:
+    latest_coalesced: dict[tuple[str, str], int] = {}
+    for index, row in enumerate(rows):
+        if _event_type(row) in COALESCED_EVENTS:
+            latest_coalesced[(row.channel, _event_type(row))] = index
+
+    seen: set[tuple[str, str, str]] = set()
+    kept = []
+    for index, row in enumerate(rows):
+        event_type = _event_type(row)
+        if event_type in COALESCED_EVENTS and latest_coalesced[(row.channel, event_type)] != index:
+            continue
+        fingerprint = (row.channel, row.event, repr(row.payload_json))
+        if fingerprint in seen:
+            continue
+        seen.add(fingerprint)
+        kept.append(row)
+    return kept
+
+
+def _backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=OUTBOX_BASE_BACKOFF_SECONDS * (2 ** max(attempts - 1, 0)))
+
+
+def _claim_rows(now, limit: int) -> list[RealtimeOutboxEvent]:
+    stale = now - OUTBOX_LOCK_TIMEOUT
+    with transaction.atomic():
+        rows = list(
+            RealtimeOutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=RealtimeOutboxEvent.STATUS_PENDING, available_at__lte=now)
+                | Q(status=RealtimeOutboxEvent.STATUS_SENDING, locked_at__lt=stale)
+            )
+            .order_by("id")[:limit]
+        )
+        if rows:
+            RealtimeOutboxEvent.objects.filter(id__in=[row.id for row in rows]).update(
+                status=RealtimeOutboxEvent.STATUS_SENDING, locked_at=now
+            )
+    return rows
+
+
+def _mark_failed_chunk(rows: list[RealtimeOutboxEvent], exc: Exception, now) -> None:
+    for row in rows:
+        row.attempts += 1
+        row.last_error = str(exc)[:1000]
+        row.available_at = now + _backoff(row.attempts)
+        row.locked_at = None
+        row.status = (
+            RealtimeOutboxEvent.STATUS_FAILED
+            if row.attempts >= OUTBOX_MAX_ATTEMPTS
+            else RealtimeOutboxEvent.STATUS_PENDING
+        )
+    RealtimeOutboxEvent.objects.bulk_update(rows, ["attempts", "last_error", "available_at", "locked_at", "status"])
+
+
+def _delivery_payload(row: RealtimeOutboxEvent):
+    if isinstance(row.payload_json, dict):
+        return {**row.payload_json, "event_id": row.id}
+    return row.payload_json
+
+
+def dispatch_pending(limit: int = OUTBOX_BATCH_SIZE) -> int:
+    """Send one batch of due outbox events. Returns how many rows were claimed.
+
+    Rows are claimed in their own short transaction and sent after it commits, so no row
+    locks are held during the provider calls.
+
+    Delivery is at least once: a chunk the provider partly accepted before failing, or
+    one sent by a worker that died before deleting its rows, goes out again. Every
+    payload carries the outbox row id as ``event_id`` so clients can drop repeats.
+    """
+    now = timezone.now()
+    rows = _claim_rows(now, limit)
+    if not rows:
+        return 0
+
+    kept = coalesce_events(rows)
+    kept_ids = {row.id for row in kept}
+    superseded_ids = [row.id for row in rows if row.id not in kept_ids]
+    if superseded_ids:
+        RealtimeOutboxEvent.objects.filter(id__in=superseded_ids).delete()
+
+    for start in range(0, len(kept), OUTBOX_CHUNK_SIZE):
+        chunk = kept[start : start + OUTBOX_CHUNK_SIZE]
+        try:
+            trigger_batch([(row.channel, row.event, _delivery_payload(row)) for row in chunk])
+        except Exception as exc:
+            logger.exception("Realtime outbox chunk failed size=%s", len(chunk))
+            _mark_failed_chunk(chunk, exc, now)
+            continue
+        RealtimeOutboxEvent.objects.filter(id__in=[row.id for row in chunk]).delete()
+    return len(rows)
+
+
+def drain_outbox() -> int:
+    total = 0
+    while True:
+        claimed = dispatch_pending()
+        if not claimed:
+            return total
+        total += claimed
+        if claimed < OUTBOX_BATCH_SIZE:
+            return total
+
+
+class OutboxDispatcher:
+    """Background thread that drains the outbox whenever a transaction queues events."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def wake(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="realtime-outbox", daemon=True)
+                self._thread.start()
+        self._wake_event.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake_event.wait(timeout=OUTBOX_POLL_SECONDS)
+            self._wake_event.clear()
+            try:
+                drain_outbox()
+            except Exception:
+                logger.exception("Realtime outbox dispatcher failed")
+            finally:
+                close_old_connections()
+
+
+dispatcher = OutboxDispatcher()
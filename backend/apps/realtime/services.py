@@ -1,16 +1,9 @@
-import logging
 import uuid
-from functools import lru_cache
 
-from django.conf import settings
 from django.utils import timezone
 
-try:
-    import pusher  # type: ignore[import-untyped]
-except ImportError:  # pragma: no cover - optional dependency
-    pusher = None
-
-logger = logging.getLogger(__name__)
+from .outbox import enqueue_event
+from .transports import trigger
 
 
 def get_campaign_channel_name(campaign_id: int) -> str:
@@ -33,25 +26,6 @@ def get_battle_channel_name(battle_id: int) -> str:
     return f"private-battle-{battle_id}"
 
 
-def _pusher_configured() -> bool:
-    return bool(
-        pusher and settings.PUSHER_APP_ID and settings.PUSHER_KEY and settings.PUSHER_SECRET and settings.PUSHER_CLUSTER
-    )
-
-
-@lru_cache(maxsize=1)
-def get_pusher_client():
-    if not _pusher_configured():
-        return None
-    return pusher.Pusher(
-        app_id=settings.PUSHER_APP_ID,
-        key=settings.PUSHER_KEY,
-        secret=settings.PUSHER_SECRET,
-        cluster=settings.PUSHER_CLUSTER,
-        ssl=True,
-    )
-
-
 def build_ping_payload(campaign_id: int, user, payload: object | None):
     return {
         "type": "ping",
@@ -100,80 +74,33 @@ def serialize_trade_request(trade_request):
     }
 
 
-def send_user_notification(user_id: int, event: str, payload: dict) -> bool:
-    client = get_pusher_client()
-    channel_name = get_user_channel_name(user_id)
-    data = {"type": event, "payload": payload}
-
-    if client:
-        try:
-            client.trigger(channel_name, "notification", data)
-        except Exception:
-            logger.exception(
-                "Pusher user notification failed user_id=%s event=%s channel=%s",
-                user_id,
-                event,
-                channel_name,
-            )
-            raise
-        return True
-    return False
-
-
-def send_trade_event(trade_request_id: uuid.UUID | str, event: str, payload: dict) -> bool:
-    client = get_pusher_client()
-    channel_name = get_trade_channel_name(trade_request_id)
-    data = {"type": event, "payload": payload}
-
-    if client:
-        client.trigger(channel_name, "trade.event", data)
-        return True
-    return False
-
-
-def send_battle_event(battle_id: int, event: str, payload: dict) -> bool:
-    client = get_pusher_client()
-    channel_name = get_battle_channel_name(battle_id)
-    data = {"type": event, "payload": payload}
-
-    if client:
-        try:
-            client.trigger(channel_name, "battle.event", data)
-        except Exception:
-            logger.exception(
-                "Pusher battle event failed battle_id=%s event=%s channel=%s",
-                battle_id,
-                event,
-                channel_name,
-            )
-            raise
-        return True
-    return False
-
-
-def send_campaign_chat_message(campaign_id: int, message) -> bool:
-    client = get_pusher_client()
-    if client:
-        channel_name = get_campaign_chat_channel_name(campaign_id)
-        payload = {
-            "id": message.id,
-            "campaign_id": message.campaign_id,
-            "user_id": message.user_id,
-            "username": message.username,
-            "body": message.body,
-            "created_at": message.created_at.isoformat(),
-        }
-        client.trigger(channel_name, "chat.message", payload)
-        return True
-    return False
+def serialize_chat_message(message) -> dict:
+    return {
+        "id": message.id,
+        "campaign_id": message.campaign_id,
+        "user_id": message.user_id,
+        "username": message.username,
+        "body": message.body,
+        "created_at": message.created_at.isoformat(),
+    }
 
 
 def send_campaign_ping(campaign_id: int, user, payload: object | None = None) -> bool:
     data = build_ping_payload(campaign_id, user, payload)
+    return trigger(get_campaign_channel_name(campaign_id), "ping", data)
+
+
+def queue_user_notification(user_id: int, event: str, payload: dict) -> None:
+    enqueue_event(get_user_channel_name(user_id), "notification", {"type": event, "payload": payload})
+
+
+def queue_trade_event(trade_request_id: uuid.UUID | str, event: str, payload: dict) -> None:
+    enqueue_event(get_trade_channel_name(trade_request_id), "trade.event", {"type": event, "payload": payload})
+
+
+def queue_battle_event(battle_id: int, event: str, payload: dict) -> None:
+    enqueue_event(get_battle_channel_name(battle_id), "battle.event", {"type": event, "payload": payload})
+
 
-    client = get_pusher_client()
-    if client:
-        channel_name = get_campaign_channel_name(campaign_id)
-        client.trigger(channel_name, "ping", data)
-        return True
-    return False
+def queue_campaign_chat_message(campaign_id: int, message) -> None:
+    enqueue_event(get_campaign_chat_channel_name(campaign_id), "chat.message", serialize_chat_message(message))
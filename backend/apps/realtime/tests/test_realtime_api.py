@@ -0,0 +1,260 @@
+import json
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from asgiref.testing import ApplicationCommunicator
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.campaigns.models import Campaign, CampaignMembership, CampaignRole
+from apps.realtime.broker import REDIS_FANOUT_CHANNEL, relay_message
+from apps.realtime.models import RealtimeOutboxEvent
+from apps.realtime.outbox import dispatch_pending
+from apps.realtime.services import queue_battle_event, queue_user_notification, send_campaign_ping
+from apps.realtime.transports import RealtimeTransport, get_transports, trigger_batch
+from apps.realtime.websocket import realtime_websocket_application
+
+
+@override_settings(REALTIME_TRANSPORTS=["websocket"])
+class RealtimeWebSocketTests(APITestCase):
+    client: APIClient
+
+    def setUp(self):
+        get_transports.cache_clear()
+        self.addCleanup(get_transports.cache_clear)
+        self.client = APIClient()
+        self.user_model = get_user_model()
+        self.owner = self.user_model.objects.create_user(
+            username="owner@example.com",
+            email="owner@example.com",
+            password="testpass123",
+        )
+        self.outsider = self.user_model.objects.create_user(
+            username="outsider@example.com",
+            email="outsider@example.com",
+            password="testpass123",
+        )
+        role = CampaignRole.objects.create(slug="owner", name="Owner")
+        self.campaign = Campaign.objects.create(name="Shadows Over Mordheim", join_code="ABC123")
+        CampaignMembership.objects.create(campaign=self.campaign, user=self.owner, role=role)
+
+    def _communicator(self):
+        scope = {"type": "websocket", "path": "/ws/realtime/", "query_string": b""}
+        return ApplicationCommunicator(realtime_websocket_application, scope)
+
+    async def _connect(self, user):
+        communicator = self._communicator()
+        await communicator.send_input({"type": "websocket.connect"})
+        self.assertEqual((await communicator.receive_output(timeout=2))["type"], "websocket.accept")
+        await self._send_json(communicator, {"type": "auth", "token": str(RefreshToken.for_user(user).access_token)})
+        self.assertEqual(await self._receive_json(communicator), {"type": "authenticated"})
+        return communicator
+
+    async def _send_json(self, communicator, payload):
+        await communicator.send_input({"type": "websocket.receive", "text": json.dumps(payload)})
+
+    async def _receive_json(self, communicator):
+        message = await communicator.receive_output(timeout=2)
+        self.assertEqual(message["type"], "websocket.send")
+        return json.loads(message["text"])
+
+    def test_config_lists_websocket_transport(self):
+        self.client.force_authenticate(user=self.owner)
+        response = self.client.get("/api/realtime/config/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["transports"], ["websocket"])
+        self.assertEqual(response.data["websocket_path"], "/ws/realtime/")
+
+    async def test_rejects_invalid_token(self):
+        communicator = self._communicator()
+        await communicator.send_input({"type": "websocket.connect"})
+        self.assertEqual((await communicator.receive_output(timeout=2))["type"], "websocket.accept")
+        await self._send_json(communicator, {"type": "auth", "token": "not-a-token"})
+        message = await communicator.receive_output(timeout=2)
+        self.assertEqual(message, {"type": "websocket.close", "code": 4401})
+
+    async def test_rejects_messages_before_auth(self):
+        communicator = self._communicator()
+        await communicator.send_input({"type": "websocket.connect"})
+        self.assertEqual((await communicator.receive_output(timeout=2))["type"], "websocket.accept")
+        await self._send_json(communicator, {"type": "subscribe", "channel": "private-user-1-notifications"})
+        message = await communicator.receive_output(timeout=2)
+        self.assertEqual(message, {"type": "websocket.close", "code": 4401})
+
+    async def test_subscribed_socket_receives_campaign_events(self):
+        communicator = await self._connect(self.owner)
+
+        channel_name = f"private-campaign-{self.campaign.id}-pings"
+        await self._send_json(communicator, {"type": "subscribe", "channel": channel_name})
+        self.assertEqual(await self._receive_json(communicator), {"type": "subscribed", "channel": channel_name})
+
+        self.assertTrue(send_campaign_ping(self.campaign.id, self.owner, {"x": 1}))
+        message = await self._receive_json(communicator)
+        self.assertEqual(message["channel"], channel_name)
+        self.assertEqual(message["event"], "ping")
+        self.assertEqual(message["data"]["payload"], {"x": 1})
+
+        await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+        await communicator.wait(timeout=2)
+
+    @override_settings(REALTIME_BROKER_URL="redis://redis:6379/1")
+    async def test_events_fan_out_through_redis_to_every_worker(self):
+        redis_client = MagicMock()
+        with (
+            patch("apps.realtime.broker._redis_client", return_value=redis_client),
+            patch("apps.realtime.websocket.ensure_listener") as ensure_listener,
+        ):
+            communicator = await self._connect(self.owner)
+            ensure_listener.assert_called_once()
+
+            channel_name = f"private-campaign-{self.campaign.id}-pings"
+            await self._send_json(communicator, {"type": "subscribe", "channel": channel_name})
+            await self._receive_json(communicator)
+
+            self.assertTrue(send_campaign_ping(self.campaign.id, self.owner, {"x": 1}))
+            self.assertTrue(await communicator.receive_nothing(timeout=0.1))
+
+            # What every worker's listener thread does with the published message.
+            redis_channel, raw_message = redis_client.publish.call_args.args
+            self.assertEqual(redis_channel, REDIS_FANOUT_CHANNEL)
+            relay_message(raw_message)
+            message = await self._receive_json(communicator)
+            self.assertEqual(message["channel"], channel_name)
+            self.assertEqual(message["data"]["payload"], {"x": 1})
+
+            await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+            await communicator.wait(timeout=2)
+
+    async def test_subscribe_uses_private_channel_rules(self):
+        communicator = await self._connect(self.outsider)
+
+        channel_name = f"private-campaign-{self.campaign.id}-pings"
+        await self._send_json(communicator, {"type": "subscribe", "channel": channel_name})
+        message = await self._receive_json(communicator)
+        self.assertEqual(message["type"], "error")
+        self.assertEqual(message["detail"], "Forbidden")
+
+        await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+        await communicator.wait(timeout=2)
+
+
+@override_settings(REALTIME_TRANSPORTS=["websocket"], REALTIME_OUTBOX_DISPATCH="worker")
+class RealtimeOutboxTests(APITestCase):
+    def setUp(self):
+        get_transports.cache_clear()
+        self.addCleanup(get_transports.cache_clear)
+
+    def test_dispatch_coalesces_state_updates_and_clears_outbox(self):
+        queue_battle_event(7, "battle_state_updated", {"status": "prebattle"})
+        queue_battle_event(7, "unit_ooa", {"unit_key": "hero:1"})
+        queue_battle_event(7, "battle_state_updated", {"status": "active"})
+
+        with patch("apps.realtime.outbox.trigger_batch") as trigger_batch:
+            self.assertEqual(dispatch_pending(), 3)
+
+        events = trigger_batch.call_args.args[0]
+        self.assertEqual([data["type"] for _channel, _event, data in events], ["unit_ooa", "battle_state_updated"])
+        self.assertEqual(events[1][2]["payload"], {"status": "active"})
+        self.assertGreater(events[1][2]["event_id"], events[0][2]["event_id"])
+        self.assertFalse(RealtimeOutboxEvent.objects.exists())
+
+    def test_failed_dispatch_is_retried_with_backoff(self):
+        queue_user_notification(3, "trade_request", {"id": "abc"})
+
+        with patch("apps.realtime.outbox.trigger_batch", side_effect=RuntimeError("provider down")):
+            self.assertEqual(dispatch_pending(), 1)
+
+        row = RealtimeOutboxEvent.objects.get()
+        self.assertEqual(row.status, RealtimeOutboxEvent.STATUS_PENDING)
+        self.assertEqual(row.attempts, 1)
+        self.assertEqual(row.last_error, "provider down")
+        self.assertEqual(dispatch_pending(), 0)
+
+    def test_only_the_failing_chunk_is_retried(self):
+        for index in range(12):
+            queue_user_notification(index + 1, "trade_request", {"id": str(index)})
+
+        with patch(
+            "apps.realtime.outbox.trigger_batch", side_effect=[None, RuntimeError("provider down")]
+        ) as trigger_batch:
+            self.assertEqual(dispatch_pending(), 12)
+
+        self.assertEqual([len(call.args[0]) for call in trigger_batch.call_args_list], [10, 2])
+        rows = list(RealtimeOutboxEvent.objects.order_by("id"))
+        self.assertEqual([row.payload_json["payload"]["id"] for row in rows], ["10", "11"])
+        self.assertTrue(all(row.status == RealtimeOutboxEvent.STATUS_PENDING for row in rows))
+        self.assertTrue(all(row.attempts == 1 and row.locked_at is None for row in rows))
+
+    def test_retried_events_keep_their_event_id(self):
+        queue_user_notification(3, "trade_request", {"id": "abc"})
+        row = RealtimeOutboxEvent.objects.get()
+
+        with patch("apps.realtime.outbox.trigger_batch", side_effect=RuntimeError("provider down")):
+            dispatch_pending()
+        RealtimeOutboxEvent.objects.update(available_at=timezone.now())
+        with patch("apps.realtime.outbox.trigger_batch") as trigger_batch:
+            dispatch_pending()
+
+        [(_channel, _event, data)] = trigger_batch.call_args.args[0]
+        self.assertEqual(data["event_id"], row.id)
+        self.assertNotIn("event_id", row.payload_json)
+
+    def test_rows_left_sending_by_a_dead_worker_are_reclaimed(self):
+        queue_user_notification(3, "trade_request", {"id": "abc"})
+        RealtimeOutboxEvent.objects.update(
+            status=RealtimeOutboxEvent.STATUS_SENDING, locked_at=timezone.now() - timedelta(seconds=5)
+        )
+        with patch("apps.realtime.outbox.trigger_batch") as trigger_batch:
+            self.assertEqual(dispatch_pending(), 0)
+
+            RealtimeOutboxEvent.objects.update(locked_at=timezone.now() - timedelta(minutes=5))
+            self.assertEqual(dispatch_pending(), 1)
+
+        trigger_batch.assert_called_once()
+        self.assertFalse(RealtimeOutboxEvent.objects.exists())
+
+
+class RealtimeTransportTests(APITestCase):
+    def setUp(self):
+        get_transports.cache_clear()
+        self.addCleanup(get_transports.cache_clear)
+
+    def test_transport_must_implement_trigger(self):
+        class IncompleteTransport(RealtimeTransport):
+            name = "incomplete"
+
+            def is_available(self) -> bool:
+                return True
+
+        with self.assertRaises(TypeError):
+            IncompleteTransport()
+
+    @override_settings(REALTIME_TRANSPORTS=["pusher", "websocket"])
+    def test_one_failing_transport_does_not_block_the_others(self):
+        events = [("private-user-3-notifications", "notification", {"type": "trade_request"})]
+        with (
+            patch("apps.realtime.transports.PusherTransport.is_available", return_value=True),
+            patch("apps.realtime.transports.PusherTransport.trigger_batch", side_effect=RuntimeError("down")),
+            patch("apps.realtime.transports.broker.publish") as publish,
+            self.assertLogs("apps.realtime.transports", level="ERROR"),
+        ):
+            self.assertTrue(trigger_batch(events))
+
+        publish.assert_called_once_with(*events[0])
+
+    @override_settings(REALTIME_TRANSPORTS=["pusher", "websocket"])
+    def test_batch_fails_only_when_every_transport_fails(self):
+        events = [("private-user-3-notifications", "notification", {"type": "trade_request"})]
+        with (
+            patch("apps.realtime.transports.PusherTransport.is_available", return_value=True),
+            patch("apps.realtime.transports.PusherTransport.trigger_batch", side_effect=RuntimeError("down")),
+            patch("apps.realtime.transports.broker.publish", side_effect=RuntimeError("redis down")),
+            self.assertLogs("apps.realtime.transports", level="ERROR") as logs,
+            self.assertRaises(RuntimeError),
+        ):
+            trigger_batch(events)
+
+        self.assertEqual(len(logs.records), 2)
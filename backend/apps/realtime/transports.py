@@ -0,0 +1,130 @@
+import logging
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from django.conf import settings
+
+from . import broker
+
+try:
+    import pusher  # type: ignore[import-untyped]
+except ImportError:  # pragma: no cover - optional dependency
+    pusher = None
+
+logger = logging.getLogger(__name__)
+
+# Pusher rejects batch triggers with more than ten events.
+PUSHER_BATCH_LIMIT = 10
+
+
+def _pusher_configured() -> bool:
+    return bool(
+        pusher and settings.PUSHER_APP_ID and settings.PUSHER_KEY and settings.PUSHER_SECRET and settings.PUSHER_CLUSTER
+    )
+
+
+@lru_cache(maxsize=1)
+def get_pusher_client():
+    if not _pusher_configured():
+        return None
+    return pusher.Pusher(
+        app_id=settings.PUSHER_APP_ID,
+        key=settings.PUSHER_KEY,
+        secret=settings.PUSHER_SECRET,
+        cluster=settings.PUSHER_CLUSTER,
+        ssl=True,
+    )
+
+
+class RealtimeTransport(ABC):
+    name = ""
+
+    @abstractmethod
+    def is_available(self) -> bool: ...
+
+    @abstractmethod
+    def trigger(self, channel_name: str, event: str, data: dict) -> None: ...
+
+    def trigger_batch(self, events: list[tuple[str, str, dict]]) -> None:
+        for channel_name, event, data in events:
+            self.trigger(channel_name, event, data)
+
+
+class PusherTransport(RealtimeTransport):
+    name = "pusher"
+
+    def is_available(self) -> bool:
+        return get_pusher_client() is not None
+
+    def trigger(self, channel_name: str, event: str, data: dict) -> None:
+        get_pusher_client().trigger(channel_name, event, data)
+
+    def trigger_batch(self, events: list[tuple[str, str, dict]]) -> None:
+        client = get_pusher_client()
+        for start in range(0, len(events), PUSHER_BATCH_LIMIT):
+            client.trigger_batch(
+                [
+                    {"channel": channel_name, "name": event, "data": data}
+                    for channel_name, event, data in events[start : start + PUSHER_BATCH_LIMIT]
+                ]
+            )
+
+
+class WebSocketTransport(RealtimeTransport):
+    name = "websocket"
+
+    def is_available(self) -> bool:
+        return True
+
+    def trigger(self, channel_name: str, event: str, data: dict) -> None:
+        broker.publish(channel_name, event, data)
+
+
+TRANSPORT_CLASSES: dict[str, type[RealtimeTransport]] = {
+    PusherTransport.name: PusherTransport,
+    WebSocketTransport.name: WebSocketTransport,
+}
+
+
+@lru_cache(maxsize=1)
+def get_transports() -> tuple[RealtimeTransport, ...]:
+    transports = []
+    for name in settings.REALTIME_TRANSPORTS:
+        transport_class = TRANSPORT_CLASSES.get(name)
+        if transport_class is None:
+            logger.warning("Unknown realtime transport %s", name)
+            continue
+        transports.append(transport_class())
+    return tuple(transports)
+
+
+def _deliver(send, description: str) -> bool:
+    """Run ``send`` on every available transport, isolating each transport's failure.
+
+    Returns whether any transport was available. Raises only when every available transport
+    failed, so one provider being down neither hides the others nor fails the delivery.
+    """
+    attempted = 0
+    errors = []
+    for transport in get_transports():
+        if not transport.is_available():
+            continue
+        attempted += 1
+        try:
+            send(transport)
+        except Exception as exc:
+            logger.exception("Realtime transport %s failed to send %s", transport.name, description)
+            errors.append(exc)
+    if attempted and len(errors) == attempted:
+        raise errors[-1]
+    return attempted > 0
+
+
+def trigger(channel_name: str, event: str, data: dict) -> bool:
+    return _deliver(lambda transport: transport.trigger(channel_name, event, data), f"{event} to {channel_name}")
+
+
+def trigger_batch(events: list[tuple[str, str, dict]]) -> bool:
+    if not events:
+        return False
+    return _deliver(lambda transport: transport.trigger_batch(events), f"a batch of {len(events)} events")
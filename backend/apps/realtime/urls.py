@@ -1,7 +1,8 @@
 from django.urls import path
 
-from .views import PusherAuthView
+from .views import PusherAuthView, RealtimeConfigView
 
 urlpatterns = [
+    path("realtime/config/", RealtimeConfigView.as_view(), name="realtime-config"),
     path("realtime/pusher/auth/", PusherAuthView.as_view(), name="pusher-auth"),
 ]
@@ -3,7 +3,8 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from .channel_auth import authorize_private_channel
-from .services import get_pusher_client
+from .transports import get_pusher_client, get_transports
+from .websocket import REALTIME_WEBSOCKET_PATH
 
 
 class PusherAuthView(APIView):
@@ -25,3 +26,16 @@ class PusherAuthView(APIView):
 
         auth = client.authenticate(channel=channel_name, socket_id=socket_id)
         return Response(auth)
+
+
+class RealtimeConfigView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        transports = [transport.name for transport in get_transports() if transport.is_available()]
+        return Response(
+            {
+                "transports": transports,
+                "websocket_path": REALTIME_WEBSOCKET_PATH if "websocket" in transports else None,
+            }
+        )
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from .broker import Subscriber, broker, ensure_listener
+from .channel_auth import authorize_private_channel
+
+logger = logging.getLogger(__name__)
+
+REALTIME_WEBSOCKET_PATH = "/ws/realtime/"
+CLOSE_UNAUTHORIZED = 4401
+# The first message must be {"type": "auth", "token": ...}. Tokens are not taken from the
+# URL because query strings end up in access logs.
+AUTH_TIMEOUT_SECONDS = 10
+
+
+def _authenticate_token(raw_token: str):
+    authenticator = JWTAuthentication()
+    try:
+        validated_token = authenticator.get_validated_token(raw_token)
+        return authenticator.get_user(validated_token)
+    except (AuthenticationFailed, InvalidToken, TokenError):
+        return None
+
+
+async def _receive_auth_token(receive) -> str | None:
+    """Wait for the auth message. Returns None if the client disconnected instead."""
+    try:
+        event = await asyncio.wait_for(receive(), timeout=AUTH_TIMEOUT_SECONDS)
+    except TimeoutError:
+        return ""
+    if event["type"] != "websocket.receive":
+        return None
+    try:
+        message = json.loads(event.get("text") or "")
+    except json.JSONDecodeError:
+        return ""
+    if not isinstance(message, dict) or message.get("type") != "auth":
+        return ""
+    return str(message.get("token") or "")
+
+
+async def _send_json(send, payload: dict) -> None:
+    await send({"type": "websocket.send", "text": json.dumps(payload)})
+
+
+async def _handle_client_message(text: str, user, subscriber: Subscriber, send) -> None:
+    try:
+        message = json.loads(text or "")
+    except json.JSONDecodeError:
+        await _send_json(send, {"type": "error", "detail": "Invalid message"})
+        return
+    if not isinstance(message, dict):
+        await _send_json(send, {"type": "error", "detail": "Invalid message"})
+        return
+
+    message_type = message.get("type")
+    channel_name = str(message.get("channel") or "")
+    if message_type == "ping":
+        await _send_json(send, {"type": "pong"})
+    elif message_type == "subscribe":
+        if not await sync_to_async(authorize_private_channel)(user, channel_name):
+            await _send_json(send, {"type": "error", "channel": channel_name, "detail": "Forbidden"})
+            return
+        broker.subscribe(channel_name, subscriber)
+        await _send_json(send, {"type": "subscribed", "channel": channel_name})
+    elif message_type == "unsubscribe":
+        broker.unsubscribe(channel_name, subscriber)
+        await _send_json(send, {"type": "unsubscribed", "channel": channel_name})
+    else:
+        await _send_json(send, {"type": "error", "detail": "Unknown message type"})
+
+
+async def realtime_websocket_application(scope, receive, send):
+    connect = await receive()
+    if connect.get("type") != "websocket.connect":
+        return
+
+    await send({"type": "websocket.accept"})
+    token = await _receive_auth_token(receive)
+    if token is None:
+        return
+    user = await sync_to_async(_authenticate_token)(token) if token else None
+    if user is None:
+        await send({"type": "websocket.close", "code": CLOSE_UNAUTHORIZED})
+        return
+
+    await _send_json(send, {"type": "authenticated"})
+    ensure_listener()
+    subscriber = Subscriber(asyncio.get_running_loop())
+    receive_task = asyncio.ensure_future(receive())
+    outgoing_task = asyncio.ensure_future(subscriber.queue.get())
+    try:
+        while True:
+            done, _pending = await asyncio.wait({receive_task, outgoing_task}, return_when=asyncio.FIRST_COMPLETED)
+            if outgoing_task in done:
+                await _send_json(send, outgoing_task.result())
+                outgoing_task = asyncio.ensure_future(subscriber.queue.get())
+            if receive_task in done:
+                event = receive_task.result()
+                if event["type"] == "websocket.disconnect":
+                    break
+                if event["type"] == "websocket.receive":
+                    await _handle_client_message(event.get("text"), user, subscriber, send)
+                receive_task = asyncio.ensure_future(receive())
+    finally:
+        receive_task.cancel()
+        outgoing_task.cancel()
+        broker.unsubscribe_all(subscriber)
+        logger.debug("Realtime websocket closed user_id=%s", user.id)
@@ -3,8 +3,10 @@ from pathlib import Path
 
 from django.core.management.base import BaseCommand, CommandError
 from django.core.management.color import no_style
-from django.db import connection
+from django.db import connection, transaction
 
+from apps.core.catalogue import bump_base_catalogues
+from apps.core.seeding import forget_sources, record_sources, sources_unchanged, upsert_rows
 from apps.restrictions.models import Restriction
 
 DEFAULT_JSON_PATH = Path("apps/restrictions/data/restrictions.json")
@@ -29,17 +31,22 @@ class Command(BaseCommand):
             action="store_true",
             help="Delete existing restrictions before importing.",
         )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Import even when the source file is unchanged since the last run.",
+        )
 
     def handle(self, *args, **options):
         json_path = options.get("json_path")
         truncate = options.get("truncate")
 
-        if truncate:
-            Restriction.objects.all().delete()
-
         path = Path(json_path) if json_path else DEFAULT_JSON_PATH
         if not path.exists():
             raise CommandError(f"JSON file not found: {path}")
+        if not truncate and not options.get("force") and sources_unchanged("seed_restrictions", [path]):
+            self.stdout.write("Restrictions unchanged since the last import, skipping.")
+            return
 
         try:
             data = json.loads(path.read_text(encoding="utf-8-sig"))
@@ -49,8 +56,7 @@ class Command(BaseCommand):
         if not isinstance(data, list):
             raise CommandError(f"JSON data should be a list: {path}")
 
-        created = 0
-        updated = 0
+        desired = {}
         for entry in data:
             restriction_type = entry.get("type", "Warband").strip()
             restriction_text = entry.get("restriction", "").strip()
@@ -58,15 +64,19 @@ class Command(BaseCommand):
             if not restriction_text:
                 continue
 
-            _, was_created = Restriction.objects.update_or_create(
-                restriction=restriction_text,
-                campaign__isnull=True,
-                defaults={"type": restriction_type},
-            )
-            if was_created:
-                created += 1
-            else:
-                updated += 1
+            desired[restriction_text] = {"restriction": restriction_text, "type": restriction_type}
+
+        with transaction.atomic():
+            if truncate:
+                Restriction.objects.all().delete()
+                forget_sources()
+            existing = {
+                restriction.restriction: restriction
+                for restriction in Restriction.objects.filter(campaign__isnull=True)
+            }
+            created, updated = upsert_rows(Restriction, existing, desired, ["type"])
+            record_sources("seed_restrictions", [path])
 
         _reset_sequence(Restriction)
+        bump_base_catalogues("restrictions")
         self.stdout.write(self.style.SUCCESS(f"Restrictions import complete. Created: {created}, Updated: {updated}"))
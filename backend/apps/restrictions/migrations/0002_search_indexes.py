@@ -0,0 +1,17 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import migrations
+from django.db.models.functions import Upper
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0002_trigram_extension"),
+        ("restrictions", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="restriction",
+            index=GinIndex(OpClass(Upper("restriction"), name="gin_trgm_ops"), name="restriction_search_trgm_idx"),
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 
+from apps.core.search import search_indexes
+
 RESTRICTION_TYPE_CHOICES = [
     ("Warband", "Warband"),
     ("Warband Group", "Warband Group"),
@@ -26,6 +28,7 @@ class Restriction(models.Model):
     class Meta:
         db_table = "restriction"
         ordering = ["type", "restriction"]
+        indexes = search_indexes("restriction", name_field="restriction", description_field=None)
         constraints = [
             models.UniqueConstraint(
                 fields=["campaign", "type", "restriction"],
@@ -5,7 +5,10 @@ from pathlib import Path
 from urllib.request import urlopen
 
 from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 
+from apps.core.catalogue import bump_base_catalogues
+from apps.core.seeding import forget_sources, record_sources, sources_unchanged, upsert_rows
 from apps.skills.models import Skill
 
 DEFAULT_JSON_PATH = Path("apps/skills/data/skills.json")
@@ -91,41 +94,52 @@ class Command(BaseCommand):
             action="store_true",
             help="Delete existing skills before importing.",
         )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Import even when the source file is unchanged since the last run.",
+        )
 
     def handle(self, *args, **options):
         csv_path = options.get("csv_path")
         json_path = options.get("json_path")
         url = options.get("url")
-        truncate = options.get("truncate")
-
-        if truncate:
-            Skill.objects.all().delete()
 
         if json_path:
-            entries = self._load_json_entries(json_path)
-            created, updated, skipped = self._seed_from_entries(entries)
-            self._report(created, updated, skipped)
-            return
-
-        if url or csv_path:
-            raw_data = self._load_csv_data(csv_path, url)
-            created, updated, skipped = self._seed_from_csv(raw_data)
-            self._report(created, updated, skipped)
-            return
-
-        entries = self._load_json_entries(None, allow_missing=True)
-        if entries is not None:
-            created, updated, skipped = self._seed_from_entries(entries)
-            self._report(created, updated, skipped)
-            return
-
-        raw_data = self._load_csv_data(None, None)
-        created, updated, skipped = self._seed_from_csv(raw_data)
+            source_path = Path(json_path)
+            desired, skipped = self._rows_from_entries(self._load_json_entries(json_path))
+        elif url or csv_path:
+            source_path = None if url else Path(csv_path)
+            desired, skipped = self._rows_from_csv(self._load_csv_data(csv_path, url))
+        else:
+            entries = self._load_json_entries(None, allow_missing=True)
+            if entries is not None:
+                source_path = _resolve_default_json_path()
+                desired, skipped = self._rows_from_entries(entries)
+            else:
+                source_path = _resolve_default_csv_path()
+                desired, skipped = self._rows_from_csv(self._load_csv_data(None, None))
+
+        # Downloaded CSVs have no stable file to hash, so they are always imported.
+        source_paths = [source_path] if source_path else []
+        truncate = options.get("truncate")
+        if source_paths and not truncate and not options.get("force"):
+            if sources_unchanged("seed_skills", source_paths):
+                self.stdout.write("Skills unchanged since the last import, skipping.")
+                return
+
+        with transaction.atomic():
+            if truncate:
+                Skill.objects.all().delete()
+                forget_sources()
+            existing = {(skill.name, skill.type): skill for skill in Skill.objects.filter(campaign__isnull=True)}
+            created, updated = upsert_rows(Skill, existing, desired, ["description"])
+            if source_paths:
+                record_sources("seed_skills", source_paths)
         self._report(created, updated, skipped)
 
-    def _seed_from_entries(self, entries):
-        created = 0
-        updated = 0
+    def _rows_from_entries(self, entries):
+        desired = {}
         skipped = 0
 
         for entry in entries:
@@ -137,20 +151,11 @@ class Command(BaseCommand):
                 skipped += 1
                 continue
 
-            skill, was_created = Skill.objects.update_or_create(
-                name=raw_name,
-                type=raw_type,
-                defaults={"description": raw_description},
-            )
-
-            if was_created:
-                created += 1
-            else:
-                updated += 1
+            desired[(raw_name, raw_type)] = {"name": raw_name, "type": raw_type, "description": raw_description}
 
-        return created, updated, skipped
+        return desired, skipped
 
-    def _seed_from_csv(self, raw_data):
+    def _rows_from_csv(self, raw_data):
         reader = csv.DictReader(io.StringIO(raw_data))
 
         if not reader.fieldnames:
@@ -176,8 +181,7 @@ class Command(BaseCommand):
             raise CommandError("Unable to detect the skill name column.")
 
         current_type = ""
-        created = 0
-        updated = 0
+        desired = {}
         skipped = 0
 
         for row in reader:
@@ -196,20 +200,12 @@ class Command(BaseCommand):
                 skipped += 1
                 continue
 
-            skill, was_created = Skill.objects.update_or_create(
-                name=raw_name,
-                type=raw_type,
-                defaults={"description": raw_description},
-            )
-
-            if was_created:
-                created += 1
-            else:
-                updated += 1
+            desired[(raw_name, raw_type)] = {"name": raw_name, "type": raw_type, "description": raw_description}
 
-        return created, updated, skipped
+        return desired, skipped
 
     def _report(self, created, updated, skipped):
+        bump_base_catalogues("skills")
         self.stdout.write(
             self.style.SUCCESS(f"Skills import complete. Created: {created}, Updated: {updated}, Skipped: {skipped}")
         )
@@ -0,0 +1,22 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models.functions import Upper
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("skills", "0002_alter_skill_description"),
+        ("core", "0002_trigram_extension"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="skill",
+            index=GinIndex(OpClass(Upper("name"), name="gin_trgm_ops"), name="skill_search_trgm_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="skill",
+            index=GinIndex(SearchVector("description", config="simple"), name="skill_search_fts_idx"),
+        ),
+    ]
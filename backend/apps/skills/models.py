@@ -1,5 +1,7 @@
 from django.db import models
 
+from apps.core.search import search_indexes
+
 
 class Skill(models.Model):
     campaign = models.ForeignKey(
@@ -16,6 +18,7 @@ class Skill(models.Model):
     class Meta:
         db_table = "skill"
         ordering = ["type", "name"]
+        indexes = search_indexes("skill")
 
     def __str__(self):
         return f"{self.name} ({self.type})"
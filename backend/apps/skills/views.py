@@ -3,40 +3,29 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.campaigns.permissions import get_membership, has_campaign_permission
+from apps.core.catalogue import Catalogue, bump_catalogue_version
 
 from .models import Skill
 from .serializers import SkillCreateSerializer, SkillSerializer
 
+SKILL_CATALOGUE = Catalogue(
+    kind="skills",
+    queryset=lambda: Skill.objects.exclude(type="Pending"),
+    serialize=lambda skills: SkillSerializer(skills, many=True).data,
+)
+
 
 class SkillListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        skills = Skill.objects.exclude(type="Pending")
-        skill_type = request.query_params.get("type")
-        if skill_type:
-            skills = skills.filter(type__iexact=skill_type.strip())
-        search = request.query_params.get("search")
-        if search:
-            skills = skills.filter(name__icontains=search.strip())
-
         campaign_id = request.query_params.get("campaign_id")
         if campaign_id:
             membership = get_membership(request.user, campaign_id)
             if not membership:
                 return Response({"detail": "Not found"}, status=404)
 
-            campaign_skills = skills.filter(campaign_id=campaign_id)
-            base_skills = skills.filter(campaign__isnull=True)
-            if campaign_skills.exists():
-                base_skills = base_skills.exclude(name__in=campaign_skills.values_list("name", flat=True))
-            merged = list(campaign_skills.order_by("name", "id")) + list(base_skills.order_by("name", "id"))
-            serializer = SkillSerializer(merged, many=True)
-            return Response(serializer.data)
-
-        skills = skills.filter(campaign__isnull=True)
-        serializer = SkillSerializer(skills.order_by("name", "id"), many=True)
-        return Response(serializer.data)
+        return SKILL_CATALOGUE.response(request, campaign_id)
 
     def post(self, request):
         campaign_id = request.data.get("campaign_id")
@@ -52,6 +41,7 @@ class SkillListView(APIView):
         serializer = SkillCreateSerializer(data=data)
         serializer.is_valid(raise_exception=True)
         skill = serializer.save()
+        bump_catalogue_version("skills", skill.campaign_id)
         return Response(SkillSerializer(skill).data, status=status.HTTP_201_CREATED)
 
 
@@ -89,6 +79,7 @@ class SkillDetailView(APIView):
         serializer = SkillCreateSerializer(skill, data=data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        bump_catalogue_version("skills", skill.campaign_id)
         return Response(SkillSerializer(skill).data)
 
     def delete(self, request, skill_id):
@@ -105,4 +96,5 @@ class SkillDetailView(APIView):
             return Response({"detail": "Forbidden"}, status=403)
 
         skill.delete()
+        bump_catalogue_version("skills", skill.campaign_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,22 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models.functions import Upper
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("special", "0002_alter_special_description"),
+        ("core", "0002_trigram_extension"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="special",
+            index=GinIndex(OpClass(Upper("name"), name="gin_trgm_ops"), name="special_search_trgm_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="special",
+            index=GinIndex(SearchVector("description", config="simple"), name="special_search_fts_idx"),
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 
+from apps.core.search import search_indexes
+
 
 class Special(models.Model):
     campaign = models.ForeignKey(
@@ -16,6 +18,7 @@ class Special(models.Model):
     class Meta:
         db_table = "special"
         ordering = ["type", "name"]
+        indexes = search_indexes("special")
 
     def __str__(self):
         return f"{self.name} ({self.type})"
@@ -3,40 +3,29 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.campaigns.permissions import get_membership, has_campaign_permission
+from apps.core.catalogue import Catalogue, bump_catalogue_version
 
 from .models import Special
 from .serializers import SpecialCreateSerializer, SpecialSerializer
 
+SPECIAL_CATALOGUE = Catalogue(
+    kind="specials",
+    queryset=lambda: Special.objects.exclude(type="Pending"),
+    serialize=lambda specials: SpecialSerializer(specials, many=True).data,
+)
+
 
 class SpecialListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        specials = Special.objects.exclude(type="Pending")
-        special_type = request.query_params.get("type")
-        if special_type:
-            specials = specials.filter(type__iexact=special_type.strip())
-        search = request.query_params.get("search")
-        if search:
-            specials = specials.filter(name__icontains=search.strip())
-
         campaign_id = request.query_params.get("campaign_id")
         if campaign_id:
             membership = get_membership(request.user, campaign_id)
             if not membership:
                 return Response({"detail": "Not found"}, status=404)
 
-            campaign_specials = specials.filter(campaign_id=campaign_id)
-            base_specials = specials.filter(campaign__isnull=True)
-            if campaign_specials.exists():
-                base_specials = base_specials.exclude(name__in=campaign_specials.values_list("name", flat=True))
-            merged = list(campaign_specials.order_by("name", "id")) + list(base_specials.order_by("name", "id"))
-            serializer = SpecialSerializer(merged, many=True)
-            return Response(serializer.data)
-
-        specials = specials.filter(campaign__isnull=True)
-        serializer = SpecialSerializer(specials.order_by("name", "id"), many=True)
-        return Response(serializer.data)
+        return SPECIAL_CATALOGUE.response(request, campaign_id)
 
     def post(self, request):
         campaign_id = request.data.get("campaign_id")
@@ -52,6 +41,7 @@ class SpecialListView(APIView):
         serializer = SpecialCreateSerializer(data=data)
         serializer.is_valid(raise_exception=True)
         special = serializer.save()
+        bump_catalogue_version("specials", special.campaign_id)
         return Response(SpecialSerializer(special).data, status=status.HTTP_201_CREATED)
 
 
@@ -89,6 +79,7 @@ class SpecialDetailView(APIView):
         serializer = SpecialCreateSerializer(special, data=data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        bump_catalogue_version("specials", special.campaign_id)
         return Response(SpecialSerializer(special).data)
 
     def delete(self, request, special_id):
@@ -105,4 +96,5 @@ class SpecialDetailView(APIView):
             return Response({"detail": "Forbidden"}, status=403)
 
         special.delete()
+        bump_catalogue_version("specials", special.campaign_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
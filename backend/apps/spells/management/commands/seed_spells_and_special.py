@@ -2,7 +2,10 @@ import json
 from pathlib import Path
 
 from django.core.management.base import BaseCommand
+from django.db import transaction
 
+from apps.core.catalogue import bump_base_catalogues
+from apps.core.seeding import forget_sources, record_sources, sources_unchanged, upsert_rows
 from apps.special.models import Special
 from apps.spells.models import Spell
 
@@ -10,6 +13,10 @@ SPELLS_JSON_PATH = Path("apps/spells/data/spells.json")
 SPECIAL_JSON_PATH = Path("apps/special/data/special.json")
 
 
+def _base_rows_by_name_and_type(model):
+    return {(row.name, row.type): row for row in model.objects.filter(campaign__isnull=True)}
+
+
 class Command(BaseCommand):
     help = "Seed spells and special from JSON data files."
 
@@ -19,16 +26,30 @@ class Command(BaseCommand):
             action="store_true",
             help="Delete existing spells and special before seeding.",
         )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Import even when the source files are unchanged since the last run.",
+        )
 
     def handle(self, *args, **options):
         truncate = options.get("truncate")
 
-        if truncate:
-            Spell.objects.all().delete()
-            Special.objects.all().delete()
+        source_paths = [path for path in (SPELLS_JSON_PATH, SPECIAL_JSON_PATH) if path.exists()]
+        if not truncate and not options.get("force") and sources_unchanged("seed_spells_and_special", source_paths):
+            self.stdout.write("Spells and special unchanged since the last import, skipping.")
+            return
 
-        spells_created, spells_updated = self._seed_spells()
-        special_created, special_updated = self._seed_special()
+        with transaction.atomic():
+            if truncate:
+                Spell.objects.all().delete()
+                Special.objects.all().delete()
+                forget_sources()
+
+            spells_created, spells_updated = self._seed_spells()
+            special_created, special_updated = self._seed_special()
+            record_sources("seed_spells_and_special", source_paths)
+        bump_base_catalogues("spells", "specials")
 
         self.stdout.write(
             self.style.SUCCESS(
@@ -44,8 +65,7 @@ class Command(BaseCommand):
             return 0, 0
 
         data = json.loads(SPELLS_JSON_PATH.read_text(encoding="utf-8-sig"))
-        created = 0
-        updated = 0
+        desired = {}
 
         for entry in data:
             name = entry.get("name", "").strip()
@@ -57,18 +77,15 @@ class Command(BaseCommand):
             if not name or not spell_type:
                 continue
 
-            _, was_created = Spell.objects.update_or_create(
-                name=name,
-                type=spell_type,
-                defaults={"description": description, "dc": dc, "roll": roll},
-            )
-
-            if was_created:
-                created += 1
-            else:
-                updated += 1
+            desired[(name, spell_type)] = {
+                "name": name,
+                "type": spell_type,
+                "description": description,
+                "dc": dc,
+                "roll": roll,
+            }
 
-        return created, updated
+        return upsert_rows(Spell, _base_rows_by_name_and_type(Spell), desired, ["description", "dc", "roll"])
 
     def _seed_special(self):
         if not SPECIAL_JSON_PATH.exists():
@@ -76,8 +93,7 @@ class Command(BaseCommand):
             return 0, 0
 
         data = json.loads(SPECIAL_JSON_PATH.read_text(encoding="utf-8-sig"))
-        created = 0
-        updated = 0
+        desired = {}
 
         for entry in data:
             name = entry.get("name", "").strip()
@@ -87,15 +103,6 @@ class Command(BaseCommand):
             if not name or not special_type:
                 continue
 
-            _, was_created = Special.objects.update_or_create(
-                name=name,
-                type=special_type,
-                defaults={"description": description},
-            )
-
-            if was_created:
-                created += 1
-            else:
-                updated += 1
+            desired[(name, special_type)] = {"name": name, "type": special_type, "description": description}
 
-        return created, updated
+        return upsert_rows(Special, _base_rows_by_name_and_type(Special), desired, ["description"])
@@ -0,0 +1,22 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models.functions import Upper
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("spells", "0002_alter_spell_description"),
+        ("core", "0002_trigram_extension"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="spell",
+            index=GinIndex(OpClass(Upper("name"), name="gin_trgm_ops"), name="spell_search_trgm_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="spell",
+            index=GinIndex(SearchVector("description", config="simple"), name="spell_search_fts_idx"),
+        ),
+    ]
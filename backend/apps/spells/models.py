@@ -1,5 +1,7 @@
 from django.db import models
 
+from apps.core.search import search_indexes
+
 
 class Spell(models.Model):
     campaign = models.ForeignKey(
@@ -18,6 +20,7 @@ class Spell(models.Model):
     class Meta:
         db_table = "spell"
         ordering = ["type", "name"]
+        indexes = search_indexes("spell")
 
     def __str__(self):
         return f"{self.name} ({self.type})"
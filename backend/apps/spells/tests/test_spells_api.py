@@ -1,8 +1,10 @@
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
+from django.db import connection
 from rest_framework.test import APIClient, APITestCase
 
 from apps.campaigns.views import _ensure_permissions, _ensure_roles
+from apps.spells.models import Spell
 
 
 class SpellApiTests(APITestCase):
@@ -58,3 +60,59 @@ class SpellApiTests(APITestCase):
 
         self.assertEqual(response.status_code, 201)
         self.assertEqual(response.data["description"], long_description)
+
+    def test_spell_list_is_cached_with_etag_and_campaign_overlay(self):
+        owner = self._create_user("owner@example.com", "Owner")
+        campaign = self._create_campaign(owner)
+        Spell.objects.create(name="Fireball", type="Lesser Magic", description="Base", dc="7")
+        self.client.force_authenticate(user=owner)
+
+        first = self.client.get(f"/api/spells/?campaign_id={campaign['id']}")
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual([spell["description"] for spell in first.data], ["Base"])
+        etag = first["ETag"]
+
+        unchanged = self.client.get(f"/api/spells/?campaign_id={campaign['id']}", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(unchanged.status_code, 304)
+
+        create_response = self.client.post(
+            "/api/spells/",
+            {
+                "campaign_id": campaign["id"],
+                "name": "Fireball",
+                "type": "Lesser Magic",
+                "description": "House rule",
+                "dc": "8",
+            },
+            format="json",
+        )
+        self.assertEqual(create_response.status_code, 201)
+
+        refreshed = self.client.get(f"/api/spells/?campaign_id={campaign['id']}", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(refreshed.status_code, 200)
+        self.assertNotEqual(refreshed["ETag"], etag)
+        self.assertEqual([spell["description"] for spell in refreshed.data], ["House rule"])
+
+        base_only = self.client.get("/api/spells/?search=fire")
+        self.assertEqual([spell["description"] for spell in base_only.data], ["Base"])
+
+    def test_spell_search_ranks_name_matches_before_description_matches(self):
+        owner = self._create_user("owner@example.com", "Owner")
+        Spell.objects.create(name="Flame Wall", type="Lesser Magic", description="A wall of fire rises.")
+        Spell.objects.create(name="Fireball", type="Lesser Magic", description="Hurls a ball.")
+        Spell.objects.create(name="Ice Lance", type="Lesser Magic", description="Freezes a foe.")
+        self.client.force_authenticate(user=owner)
+
+        response = self.client.get("/api/spells/?search=fire")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([spell["name"] for spell in response.data], ["Fireball", "Flame Wall"])
+
+        if connection.vendor == "postgresql":
+            typo = self.client.get("/api/spells/?search=firebll")
+            self.assertEqual([spell["name"] for spell in typo.data], ["Fireball"])
+
+        limited = self.client.get("/api/spells/?search=fire&limit=1")
+        self.assertEqual([spell["name"] for spell in limited.data], ["Fireball"])
+
+        invalid = self.client.get("/api/spells/?search=fire&limit=many")
+        self.assertEqual(invalid.status_code, 400)
@@ -3,40 +3,29 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.campaigns.permissions import get_membership, has_campaign_permission
+from apps.core.catalogue import Catalogue, bump_catalogue_version
 
 from .models import Spell
 from .serializers import SpellCreateSerializer, SpellSerializer
 
+SPELL_CATALOGUE = Catalogue(
+    kind="spells",
+    queryset=lambda: Spell.objects.exclude(type="Pending"),
+    serialize=lambda spells: SpellSerializer(spells, many=True).data,
+)
+
 
 class SpellListView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        spells = Spell.objects.exclude(type="Pending")
-        spell_type = request.query_params.get("type")
-        if spell_type:
-            spells = spells.filter(type__iexact=spell_type.strip())
-        search = request.query_params.get("search")
-        if search:
-            spells = spells.filter(name__icontains=search.strip())
-
         campaign_id = request.query_params.get("campaign_id")
         if campaign_id:
             membership = get_membership(request.user, campaign_id)
             if not membership:
                 return Response({"detail": "Not found"}, status=404)
 
-            campaign_spells = spells.filter(campaign_id=campaign_id)
-            base_spells = spells.filter(campaign__isnull=True)
-            if campaign_spells.exists():
-                base_spells = base_spells.exclude(name__in=campaign_spells.values_list("name", flat=True))
-            merged = list(campaign_spells.order_by("name", "id")) + list(base_spells.order_by("name", "id"))
-            serializer = SpellSerializer(merged, many=True)
-            return Response(serializer.data)
-
-        spells = spells.filter(campaign__isnull=True)
-        serializer = SpellSerializer(spells.order_by("name", "id"), many=True)
-        return Response(serializer.data)
+        return SPELL_CATALOGUE.response(request, campaign_id)
 
     def post(self, request):
         campaign_id = request.data.get("campaign_id")
@@ -52,6 +41,7 @@ class SpellListView(APIView):
         serializer = SpellCreateSerializer(data=data)
         serializer.is_valid(raise_exception=True)
         spell = serializer.save()
+        bump_catalogue_version("spells", spell.campaign_id)
         return Response(SpellSerializer(spell).data, status=status.HTTP_201_CREATED)
 
 
@@ -89,6 +79,7 @@ class SpellDetailView(APIView):
         serializer = SpellCreateSerializer(spell, data=data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        bump_catalogue_version("spells", spell.campaign_id)
         return Response(SpellSerializer(spell).data)
 
     def delete(self, request, spell_id):
@@ -105,4 +96,5 @@ class SpellDetailView(APIView):
             return Response({"detail": "Forbidden"}, status=403)
 
         spell.delete()
+        bump_catalogue_version("spells", spell.campaign_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,105 @@
+"""Expire trade requests that nobody touched before they ran out.
+
+Views still expire a request they happen to load, but `expire_stale_trade_requests` runs as a
+periodic background job so stale requests do not linger in the pending lists and traders locked
+into an abandoned trade get their trading action back.
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.notifications.models import Notification
+from apps.realtime.services import queue_trade_event, queue_user_notification, serialize_trade_request
+from apps.warbands.models import Hero
+
+from .models import TradeRequest
+from .utils import get_offer_trader_id
+
+TRADE_EXPIRY_BATCH_SIZE = 500
+TRADE_EXPIRY_SWEEP_SECONDS = 30
+
+
+def _restore_accepted_traders_in_bulk(trade_requests: list[TradeRequest]) -> None:
+    """`_restore_accepted_traders` for many requests in one update."""
+    traders = Q()
+    for trade_request in trade_requests:
+        if trade_request.status != TradeRequest.STATUS_ACCEPTED:
+            continue
+        sides = (
+            (trade_request.from_accepted, trade_request.from_offer, trade_request.from_warband_id),
+            (trade_request.to_accepted, trade_request.to_offer, trade_request.to_warband_id),
+        )
+        for accepted, offer, warband_id in sides:
+            trader_id = get_offer_trader_id(offer) if accepted else None
+            if trader_id is not None:
+                traders |= Q(id=trader_id, warband_id=warband_id)
+    if traders:
+        Hero.objects.filter(traders).update(trading_action=True)
+
+
+def _expire_batch(now, batch_size: int, expired_by_user: defaultdict[int, list[dict]]) -> int:
+    with transaction.atomic():
+        batch = list(
+            TradeRequest.objects.select_for_update(skip_locked=True, of=("self",))
+            .select_related("from_user", "to_user", "from_warband", "to_warband")
+            .filter(
+                status__in=(TradeRequest.STATUS_PENDING, TradeRequest.STATUS_ACCEPTED),
+                expires_at__lte=now,
+            )
+            .order_by("expires_at")[:batch_size]
+        )
+        if not batch:
+            return 0
+
+        _restore_accepted_traders_in_bulk(batch)
+        TradeRequest.objects.filter(id__in=[trade_request.id for trade_request in batch]).update(
+            status=TradeRequest.STATUS_EXPIRED,
+            responded_at=now,
+            from_accepted=False,
+            to_accepted=False,
+        )
+        Notification.objects.filter(
+            notification_type=Notification.TYPE_TRADE_REQUEST,
+            reference_id__in=[str(trade_request.id) for trade_request in batch],
+            is_resolved=False,
+        ).update(is_resolved=True, resolved_at=now)
+
+        for trade_request in batch:
+            trade_request.status = TradeRequest.STATUS_EXPIRED
+            trade_request.responded_at = now
+            trade_request.from_accepted = False
+            trade_request.to_accepted = False
+            # Anyone still in the trade session is closed out the same way as a declined trade.
+            queue_trade_event(trade_request.id, "trade.closed", serialize_trade_request(trade_request))
+
+    for trade_request in batch:
+        entry = {
+            "id": str(trade_request.id),
+            "campaign_id": trade_request.campaign_id,
+            "status": TradeRequest.STATUS_EXPIRED,
+        }
+        expired_by_user[trade_request.from_user_id].append(entry)
+        expired_by_user[trade_request.to_user_id].append(entry)
+    return len(batch)
+
+
+def expire_stale_trade_requests(now=None, batch_size: int = TRADE_EXPIRY_BATCH_SIZE) -> int:
+    """Expire every pending or accepted request past its deadline. Returns how many were expired."""
+    now = now or timezone.now()
+    batch_size = max(batch_size, 1)
+    expired_by_user: defaultdict[int, list[dict]] = defaultdict(list)
+    total = 0
+    while True:
+        expired = _expire_batch(now, batch_size, expired_by_user)
+        total += expired
+        if expired < batch_size:
+            break
+
+    # One message per user however many of their requests expired in this sweep.
+    with transaction.atomic():
+        for user_id, trade_requests in expired_by_user.items():
+            queue_user_notification(user_id, "trade_requests_expired", {"trade_requests": trade_requests})
+    return total
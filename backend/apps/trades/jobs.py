@@ -0,0 +1,10 @@
+from apps.jobs.queue import register_periodic_job
+
+from .expiry import TRADE_EXPIRY_SWEEP_SECONDS, expire_stale_trade_requests
+
+EXPIRE_TRADE_REQUESTS_JOB = "trades.expire_stale_trade_requests"
+
+
+@register_periodic_job(EXPIRE_TRADE_REQUESTS_JOB, every_seconds=TRADE_EXPIRY_SWEEP_SECONDS)
+def expire_trade_requests() -> None:
+    expire_stale_trade_requests()
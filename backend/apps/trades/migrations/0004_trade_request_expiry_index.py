@@ -0,0 +1,14 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("trades", "0003_trade_request_offers"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="traderequest",
+            index=models.Index(fields=["status", "expires_at"], name="trade_request_expiry_idx"),
+        ),
+    ]
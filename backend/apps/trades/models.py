@@ -63,6 +63,7 @@ class TradeRequest(models.Model):
         indexes = [
             models.Index(fields=["campaign", "status"]),
             models.Index(fields=["to_user", "status"]),
+            models.Index(fields=["status", "expires_at"], name="trade_request_expiry_idx"),
         ]
 
     def __str__(self) -> str:
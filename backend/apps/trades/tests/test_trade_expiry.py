@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from apps.campaigns.models import Campaign
+from apps.notifications.models import Notification
+from apps.realtime.models import RealtimeOutboxEvent
+from apps.realtime.services import get_trade_channel_name, get_user_channel_name
+from apps.trades.expiry import expire_stale_trade_requests
+from apps.trades.models import TradeRequest
+from apps.warbands.models import Hero, Warband
+
+
+class TradeExpirySweepTests(APITestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.alice = user_model.objects.create_user(username="alice@example.com", password="testpass123")
+        self.bob = user_model.objects.create_user(username="bob@example.com", password="testpass123")
+        self.campaign = Campaign.objects.create(name="Shadows Over Mordheim", join_code="TRADE1")
+        self.alice_warband = Warband.objects.create(
+            campaign=self.campaign, user=self.alice, name="Alice's Band", faction="Mercenaries"
+        )
+        self.bob_warband = Warband.objects.create(
+            campaign=self.campaign, user=self.bob, name="Bob's Band", faction="Skaven"
+        )
+
+    def _trade_request(self, *, expires_in, **fields):
+        return TradeRequest.objects.create(
+            campaign=self.campaign,
+            from_user=self.alice,
+            to_user=self.bob,
+            from_warband=self.alice_warband,
+            to_warband=self.bob_warband,
+            expires_at=timezone.now() + expires_in,
+            **fields,
+        )
+
+    def test_sweep_expires_stale_requests_and_gives_traders_back(self):
+        alice_trader = Hero.objects.create(warband=self.alice_warband, name="Merchant", trading_action=False)
+        bob_trader = Hero.objects.create(warband=self.bob_warband, name="Fence", trading_action=False)
+        accepted = self._trade_request(
+            expires_in=timedelta(minutes=-1),
+            status=TradeRequest.STATUS_ACCEPTED,
+            from_offer={"trader_id": alice_trader.id, "gold": 0, "items": []},
+            to_offer={"trader_id": bob_trader.id, "gold": 0, "items": []},
+            from_accepted=True,
+        )
+        pending = self._trade_request(expires_in=timedelta(minutes=-2))
+        Notification.objects.create(
+            user=self.bob,
+            notification_type=Notification.TYPE_TRADE_REQUEST,
+            campaign_id=self.campaign.id,
+            reference_id=str(pending.id),
+        )
+        live = self._trade_request(expires_in=timedelta(minutes=5))
+
+        self.assertEqual(expire_stale_trade_requests(batch_size=1), 2)
+
+        statuses = dict(TradeRequest.objects.values_list("id", "status"))
+        self.assertEqual(statuses[accepted.id], TradeRequest.STATUS_EXPIRED)
+        self.assertEqual(statuses[pending.id], TradeRequest.STATUS_EXPIRED)
+        self.assertEqual(statuses[live.id], TradeRequest.STATUS_PENDING)
+        self.assertFalse(TradeRequest.objects.get(id=accepted.id).from_accepted)
+
+        alice_trader.refresh_from_db()
+        bob_trader.refresh_from_db()
+        self.assertTrue(alice_trader.trading_action)
+        # Bob never locked his side in, so his trader was never consumed by this trade.
+        self.assertFalse(bob_trader.trading_action)
+        self.assertFalse(Notification.objects.filter(is_resolved=False).exists())
+
+        for user in (self.alice, self.bob):
+            rows = list(RealtimeOutboxEvent.objects.filter(channel=get_user_channel_name(user.id)))
+            self.assertEqual(len(rows), 1)
+            self.assertEqual(rows[0].payload_json["type"], "trade_requests_expired")
+            self.assertEqual(
+                {entry["id"] for entry in rows[0].payload_json["payload"]["trade_requests"]},
+                {str(accepted.id), str(pending.id)},
+            )
+
+        for trade_request in (accepted, pending):
+            rows = list(RealtimeOutboxEvent.objects.filter(channel=get_trade_channel_name(trade_request.id)))
+            self.assertEqual([row.payload_json["type"] for row in rows], ["trade.closed"])
+            self.assertEqual(rows[0].payload_json["payload"]["status"], TradeRequest.STATUS_EXPIRED)
+        self.assertFalse(RealtimeOutboxEvent.objects.filter(channel=get_trade_channel_name(live.id)).exists())
+
+        self.assertEqual(expire_stale_trade_requests(), 0)
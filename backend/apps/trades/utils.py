@@ -0,0 +1,13 @@
+def get_offer_trader_id(offer: dict | None) -> int | None:
+    """The hero an offer names as its trader, or None when it names none."""
+    if not isinstance(offer, dict):
+        return None
+
+    trader_id = offer.get("trader_id")
+    if trader_id is None or trader_id == "":
+        return None
+
+    try:
+        return int(trader_id)
+    except (TypeError, ValueError):
+        return None
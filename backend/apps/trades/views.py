@@ -12,36 +12,19 @@ from apps.core.throttling import MethodScopedThrottleMixin, TRADE_WRITE_THROTTLE
 from apps.notifications.models import Notification
 from apps.notifications.utils import create_notification, resolve_notification
 from apps.realtime.services import (
-    send_trade_event,
-    send_user_notification,
+    queue_trade_event,
+    queue_user_notification,
     serialize_trade_request,
 )
 from apps.warbands.models import Hero, Warband, WarbandItem, WarbandTrade
 
 from .models import TradeRequest
-
-EXPENSE_ACTIONS = {
-    "buy",
-    "bought",
-    "recruit",
-    "recruited",
-    "hired",
-    "hire",
-    "upkeep",
-    "trade sent",
-}
+from .utils import get_offer_trader_id
 
 
 def _calculate_trade_total(warband_id: int) -> int:
-    total = 0
-    for trade in WarbandTrade.objects.filter(warband_id=warband_id):
-        price = trade.price or 0
-        action = (trade.action or "").strip().lower()
-        if action in EXPENSE_ACTIONS:
-            total -= abs(price)
-        else:
-            total += abs(price)
-    return max(total, 0)
+    gold = Warband.objects.filter(id=warband_id).values_list("gold", flat=True).first()
+    return max(gold or 0, 0)
 
 
 def _normalize_offer_items(items, warband_id: int):
@@ -144,29 +127,15 @@ def _set_offer_data(trade_request, side: str, offer: dict):
         trade_request.to_offer = offer
 
 
-def _get_offer_trader_id(offer: dict | None) -> int | None:
-    if not isinstance(offer, dict):
-        return None
-
-    trader_id = offer.get("trader_id")
-    if trader_id is None or trader_id == "":
-        return None
-
-    try:
-        return int(trader_id)
-    except (TypeError, ValueError):
-        return None
-
-
 def _restore_offer_trader(offer: dict | None, warband_id: int) -> None:
-    trader_id = _get_offer_trader_id(offer)
+    trader_id = get_offer_trader_id(offer)
     if trader_id is None:
         return
     Hero.objects.filter(id=trader_id, warband_id=warband_id).update(trading_action=True)
 
 
 def _consume_offer_trader(offer: dict | None, warband_id: int) -> None:
-    trader_id = _get_offer_trader_id(offer)
+    trader_id = get_offer_trader_id(offer)
     if trader_id is None:
         return
 
@@ -398,7 +367,7 @@ class CampaignTradeRequestListCreateView(MethodScopedThrottleMixin, APIView):
             campaign_id=campaign_id,
             payload=payload,
         )
-        send_user_notification(target_user_id, "trade_request", {**payload, "notification_id": notif.id})
+        queue_user_notification(target_user_id, "trade_request", {**payload, "notification_id": notif.id})
 
         return Response(payload, status=status.HTTP_201_CREATED)
 
@@ -446,7 +415,7 @@ class CampaignTradeOfferUpdateView(APIView):
         trade_request.save(update_fields=["from_offer", "to_offer", "from_accepted", "to_accepted"])
 
         payload = serialize_trade_request(trade_request)
-        send_trade_event(trade_request.id, "trade.offer_updated", payload)
+        queue_trade_event(trade_request.id, "trade.offer_updated", payload)
         return Response(payload)
 
 
@@ -516,8 +485,8 @@ class CampaignTradeRequestAcceptView(APIView):
         resolve_notification(request.user.id, Notification.TYPE_TRADE_REQUEST, str(trade_request.id))
 
         payload = serialize_trade_request(trade_request)
-        send_trade_event(trade_request.id, "trade.accepted", payload)
-        send_user_notification(trade_request.from_user_id, "trade_accepted", payload)
+        queue_trade_event(trade_request.id, "trade.accepted", payload)
+        queue_user_notification(trade_request.from_user_id, "trade_accepted", payload)
 
         return Response(payload)
 
@@ -564,7 +533,7 @@ class CampaignTradeOfferAcceptView(APIView):
             return Response({"detail": str(exc)}, status=400)
 
         payload = serialize_trade_request(trade_request)
-        send_trade_event(trade_request.id, "trade.locked", payload)
+        queue_trade_event(trade_request.id, "trade.locked", payload)
 
         if trade_request.from_accepted and trade_request.to_accepted:
             try:
@@ -592,7 +561,7 @@ class CampaignTradeOfferAcceptView(APIView):
                 return Response({"detail": str(exc)}, status=400)
 
             payload = serialize_trade_request(locked)
-            send_trade_event(trade_request.id, "trade.completed", payload)
+            queue_trade_event(trade_request.id, "trade.completed", payload)
             return Response(payload)
 
         return Response(payload)
@@ -637,7 +606,7 @@ class CampaignTradeOfferUnlockView(APIView):
         trade_request.save(update_fields=["from_accepted", "to_accepted"])
 
         payload = serialize_trade_request(trade_request)
-        send_trade_event(trade_request.id, "trade.offer_updated", payload)
+        queue_trade_event(trade_request.id, "trade.offer_updated", payload)
         return Response(payload)
 
 
@@ -678,7 +647,7 @@ class CampaignTradeRequestDeclineView(APIView):
         resolve_notification(request.user.id, Notification.TYPE_TRADE_REQUEST, str(trade_request.id))
 
         payload = serialize_trade_request(trade_request)
-        send_user_notification(trade_request.from_user_id, "trade_declined", payload)
+        queue_user_notification(trade_request.from_user_id, "trade_declined", payload)
 
         return Response(payload)
 
@@ -725,6 +694,6 @@ class CampaignTradeRequestCloseView(APIView):
         trade_request.save(update_fields=["status", "responded_at", "from_accepted", "to_accepted"])
 
         payload = serialize_trade_request(trade_request)
-        send_trade_event(trade_request.id, "trade.closed", payload)
+        queue_trade_event(trade_request.id, "trade.closed", payload)
 
         return Response(payload)
@@ -6,6 +6,12 @@ from django.conf import settings
 logger = logging.getLogger(__name__)
 
 
+def build_password_reset_url(uid, token):
+    base = settings.FRONTEND_URL.rstrip("/")
+    reset_path = "/reset-password"
+    return f"{base}{reset_path}?uid={uid}&token={token}"
+
+
 def send_password_reset_email(to_email, reset_url):
     api_key = getattr(settings, "RESEND_API_KEY", "")
     if not api_key:
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import PasswordResetTokenGenerator
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from apps.jobs.queue import register_job
+
+from .emails import build_password_reset_url, send_password_reset_email
+
+SEND_PASSWORD_RESET_EMAIL_JOB = "users.send_password_reset_email"
+
+
+@register_job(SEND_PASSWORD_RESET_EMAIL_JOB)
+def send_password_reset(user_id: int, email: str) -> None:
+    # The token is made here rather than stored in the job payload, so it never sits in the database.
+    user = get_user_model().objects.filter(pk=user_id, is_active=True).first()
+    if user is None:
+        return
+    uid = urlsafe_base64_encode(force_bytes(user.pk))
+    token = PasswordResetTokenGenerator().make_token(user)
+    sent = send_password_reset_email(email, build_password_reset_url(uid, token))
+    if not sent and getattr(settings, "RESEND_API_KEY", ""):
+        raise RuntimeError("Password reset email was not sent")
@@ -1,8 +1,8 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.db.models import Q
-from django.utils.encoding import force_bytes, force_str
-from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+from django.utils.encoding import force_str
+from django.utils.http import urlsafe_base64_decode
 from rest_framework import generics, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -16,7 +16,9 @@ from apps.core.throttling import (
     REFRESH_THROTTLE_CLASSES,
     REGISTER_THROTTLE_CLASSES,
 )
-from .emails import send_password_reset_email
+from apps.jobs.queue import enqueue_job
+
+from .jobs import SEND_PASSWORD_RESET_EMAIL_JOB
 from .serializers import (
     EmailTokenObtainPairSerializer,
     PasswordResetConfirmSerializer,
@@ -44,14 +46,6 @@ def _get_user_from_uid(uid):
     return user_model.objects.filter(pk=user_id, is_active=True).first()
 
 
-def _build_reset_url(uid, token):
-    from django.conf import settings
-
-    base = settings.FRONTEND_URL.rstrip("/")
-    reset_path = "/reset-password"
-    return f"{base}{reset_path}?uid={uid}&token={token}"
-
-
 class RegisterView(generics.CreateAPIView):
     serializer_class = RegisterSerializer
     permission_classes = [permissions.AllowAny]
@@ -99,10 +93,7 @@ class PasswordResetRequestView(APIView):
 
         user = _get_user_by_email(email)
         if user:
-            uid = urlsafe_base64_encode(force_bytes(user.pk))
-            token = PasswordResetTokenGenerator().make_token(user)
-            reset_url = _build_reset_url(uid, token)
-            send_password_reset_email(user.email or email, reset_url)
+            enqueue_job(SEND_PASSWORD_RESET_EMAIL_JOB, {"user_id": user.pk, "email": user.email or email})
 
         return Response({"detail": "If an account exists for that email, a reset link has been sent."})
 
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class WarbandsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.warbands"
+
+    def ready(self):
+        from .signals import connect_warband_total_signals
+
+        connect_warband_total_signals()
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.warbands.models import Warband
+from apps.warbands.utils.totals import compute_warband_gold, compute_warband_rating
+
+
+class Command(BaseCommand):
+    help = "Rebuild the stored rating and gold totals on warbands"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true", help="Report drifted warbands without writing")
+        parser.add_argument("--campaign", type=int, help="Only process warbands in this campaign")
+
+    def handle(self, *args, **options):
+        warbands = Warband.objects.order_by("id").only("id", "name", "rating", "gold")
+        if options["campaign"]:
+            warbands = warbands.filter(campaign_id=options["campaign"])
+
+        drifted = 0
+        for warband in warbands.iterator():
+            with transaction.atomic():
+                rating = compute_warband_rating(warband.id)
+                gold = compute_warband_gold(warband.id)
+                if warband.rating == rating and warband.gold == gold:
+                    continue
+                drifted += 1
+                self.stdout.write(
+                    f"{warband.id} {warband.name}: rating {warband.rating} -> {rating}, gold {warband.gold} -> {gold}"
+                )
+                if not options["check"]:
+                    Warband.objects.filter(id=warband.id).update(rating=rating, gold=gold)
+
+        if options["check"]:
+            self.stdout.write(self.style.SUCCESS(f"{drifted} warbands out of date"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Updated {drifted} warbands"))
@@ -0,0 +1,54 @@
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def backfill_warband_totals(apps, schema_editor):
+    Warband = apps.get_model("warbands", "Warband")
+    Hero = apps.get_model("warbands", "Hero")
+    HenchmenGroup = apps.get_model("warbands", "HenchmenGroup")
+    HiredSword = apps.get_model("warbands", "HiredSword")
+    WarbandTrade = apps.get_model("warbands", "WarbandTrade")
+
+    expense_actions = {"buy", "bought", "recruit", "recruited", "hired", "hire", "upkeep", "trade sent"}
+
+    for warband in Warband.objects.all().only("id"):
+        rating = Decimal(0)
+        for row in Hero.objects.filter(warband_id=warband.id, dead=False).values("xp", "large"):
+            rating += (20 if row["large"] else 5) + (row["xp"] or 0)
+        groups = (
+            HenchmenGroup.objects.filter(warband_id=warband.id, dead=False)
+            .annotate(henchmen_count=models.Count("henchmen", filter=models.Q(henchmen__dead=False)))
+            .values("xp", "large", "henchmen_count")
+        )
+        for row in groups:
+            rating += (row["henchmen_count"] or 0) * ((20 if row["large"] else 5) + (row["xp"] or 0))
+        for row in HiredSword.objects.filter(warband_id=warband.id, dead=False).values("rating", "xp"):
+            rating += (row["rating"] or 0) + (row["xp"] or 0)
+
+        gold = 0
+        for row in WarbandTrade.objects.filter(warband_id=warband.id).values("action", "price"):
+            amount = abs(row["price"] or 0)
+            gold += -amount if (row["action"] or "").strip().lower() in expense_actions else amount
+
+        Warband.objects.filter(id=warband.id).update(rating=rating, gold=gold)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("warbands", "0023_alter_henchmengroup_hired_sword_xp_decimal"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="warband",
+            name="rating",
+            field=models.DecimalField(decimal_places=1, default=0, max_digits=9),
+        ),
+        migrations.AddField(
+            model_name="warband",
+            name="gold",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_warband_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations, models
+from django.db.models.functions import Lower, Trim
+
+
+def normalize_log_features(apps, schema_editor):
+    WarbandLog = apps.get_model("warbands", "WarbandLog")
+    normalized = Lower(Trim("feature"))
+    WarbandLog.objects.exclude(feature=normalized).update(feature=normalized)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("warbands", "0024_warband_rating_gold"),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_log_features, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="warbandlog",
+            index=models.Index(
+                condition=models.Q(parent__isnull=True),
+                fields=["warband", "-created_at", "-id"],
+                name="warband_log_recent_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="warbandlog",
+            index=models.Index(
+                condition=models.Q(parent__isnull=True),
+                fields=["warband", "feature", "-created_at", "-id"],
+                name="warband_log_feature_idx",
+            ),
+        ),
+    ]
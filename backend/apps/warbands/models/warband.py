@@ -11,6 +11,9 @@ HEX_COLOR_VALIDATOR = RegexValidator(
 
 
 class Warband(models.Model):
+    # Kept current by set-based .update() calls in apps.warbands.utils.totals.
+    DENORMALIZED_FIELDS = frozenset({"rating", "gold"})
+
     campaign = models.ForeignKey("campaigns.Campaign", related_name="warbands", on_delete=models.CASCADE)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name="warbands", on_delete=models.CASCADE)
     name = models.CharField(max_length=120)
@@ -26,6 +29,8 @@ class Warband(models.Model):
     warband_link = models.URLField(max_length=500, null=True, blank=True)
     max_units = models.PositiveSmallIntegerField(default=0)
     show_loadout_on_mobile = models.BooleanField(default=False)
+    rating = models.DecimalField(max_digits=9, decimal_places=1, default=0)
+    gold = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -48,6 +53,17 @@ class Warband(models.Model):
     def __str__(self):
         return f"{self.name} ({self.campaign_id}:{self.user_id})"
 
+    def save(self, *args, **kwargs):
+        # A warband loaded earlier in the request would write stale totals back over concurrent
+        # refreshes, so updates leave them out unless asked for by name.
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.DENORMALIZED_FIELDS
+            ]
+        return super().save(*args, **kwargs)
+
 
 class WarbandItem(models.Model):
     warband = models.ForeignKey(Warband, related_name="warband_items", on_delete=models.CASCADE)
@@ -74,6 +90,18 @@ class WarbandLog(models.Model):
     class Meta:
         db_table = "warband_log"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["warband", "-created_at", "-id"],
+                condition=models.Q(parent__isnull=True),
+                name="warband_log_recent_idx",
+            ),
+            models.Index(
+                fields=["warband", "feature", "-created_at", "-id"],
+                condition=models.Q(parent__isnull=True),
+                name="warband_log_feature_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.warband_id}:{self.feature}:{self.entry_type}"
@@ -28,6 +28,7 @@ from .warbands import (
     WarbandItemSummarySerializer,
     WarbandItemTransferSerializer,
     WarbandLogCreateSerializer,
+    WarbandLogGroupSerializer,
     WarbandLogSerializer,
     WarbandResourceCreateSerializer,
     WarbandResourceSerializer,
@@ -63,6 +64,7 @@ __all__ = [
     "WarbandItemSummarySerializer",
     "WarbandItemTransferSerializer",
     "WarbandLogCreateSerializer",
+    "WarbandLogGroupSerializer",
     "WarbandLogSerializer",
     "WarbandResourceCreateSerializer",
     "WarbandResourceSerializer",
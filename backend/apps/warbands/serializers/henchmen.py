@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from apps.campaigns.kill_stats import refresh_henchmen_group_kill_stats
 from apps.skills.models import Skill
 from apps.special.models import Special
 from apps.warbands.models import (
@@ -10,11 +11,11 @@ from apps.warbands.models import (
     HenchmenGroupSpecial,
 )
 from apps.warbands.utils.henchmen_level import count_new_henchmen_level_ups
+from apps.warbands.utils.totals import refresh_warband_rating
 
 from .heroes import (
     LARGE_SPECIAL_NAME,
     STAT_FIELDS,
-    ItemDetailSerializer,
     ItemSummarySerializer,
     RaceSummarySerializer,
     SkillDetailSerializer,
@@ -25,6 +26,7 @@ from .heroes import (
     _sync_special_db,
     _sync_special_list,
     get_trait_specials,
+    serialize_owned_items,
 )
 from .utils import get_prefetched_or_query
 
@@ -99,14 +101,7 @@ class HenchmenGroupDetailSerializer(serializers.ModelSerializer):
 
     def get_items(self, obj):
         links = get_prefetched_or_query(obj, "henchmen_group_items", "henchmen_group_items")
-        items = []
-        for entry in links:
-            if not entry.item_id:
-                continue
-            data = ItemDetailSerializer(entry.item).data
-            data["cost"] = getattr(entry, "cost", None)
-            items.append(data)
-        return items
+        return serialize_owned_items(self, obj.warband_id, links)
 
     def get_skills(self, obj):
         links = get_prefetched_or_query(obj, "henchmen_group_skills", "henchmen_group_skills")
@@ -242,6 +237,7 @@ class HenchmenGroupCreateSerializer(serializers.ModelSerializer):
             )
 
         Henchman.objects.bulk_create([Henchman(group=group, name=entry.get("name", "")) for entry in henchmen_data])
+        refresh_warband_rating(group.warband_id)
 
         return group
 
@@ -384,6 +380,8 @@ class HenchmenGroupUpdateSerializer(serializers.ModelSerializer):
                 Henchman.objects.filter(id__in=ids_to_delete, group=group).delete()
             if to_create:
                 Henchman.objects.bulk_create(to_create)
+            refresh_warband_rating(group.warband_id)
+            refresh_henchmen_group_kill_stats(group.id)
 
         if hasattr(group, "_prefetched_objects_cache"):
             group._prefetched_objects_cache.pop("henchmen_group_items", None)
@@ -1,11 +1,12 @@
 from rest_framework import serializers
 
+from apps.items.effects import apply_item_effects, campaign_item_effects, default_item_cost
 from apps.items.models import Item, ItemPropertyLink
 from apps.items.serializers import ItemAvailabilitySerializer
 from apps.skills.models import Skill
 from apps.special.models import Special
 from apps.spells.models import Spell
-from apps.warbands.models import Hero, HeroItem, HeroSkill, HeroSpecial, HeroSpell
+from apps.warbands.models import Hero, HeroItem, HeroSkill, HeroSpecial, HeroSpell, Warband
 from apps.warbands.utils.leaders import ensure_single_living_leader
 from apps.warbands.utils.hero_level import count_new_level_ups
 
@@ -100,6 +101,28 @@ class ItemDetailSerializer(serializers.ModelSerializer):
         )
 
 
+def _warband_item_effects(serializer, warband_id):
+    # Memoized on the serializer, which many=True shares across every unit in the list.
+    effects_by_warband = serializer.__dict__.setdefault("_item_effects_by_warband", {})
+    if warband_id not in effects_by_warband:
+        campaign_id = Warband.objects.filter(id=warband_id).values_list("campaign_id", flat=True).first()
+        effects_by_warband[warband_id] = campaign_item_effects(campaign_id)
+    return effects_by_warband[warband_id]
+
+
+def serialize_owned_items(serializer, warband_id, entries):
+    """Serialize a unit's item join rows with its campaign's item effects applied."""
+    effect_keys = _warband_item_effects(serializer, warband_id)
+    items = []
+    for entry in entries:
+        if not entry.item_id:
+            continue
+        data = apply_item_effects(ItemDetailSerializer(entry.item).data, effect_keys)
+        data["cost"] = getattr(entry, "cost", None)
+        items.append(data)
+    return items
+
+
 class SkillSummarySerializer(serializers.ModelSerializer):
     class Meta:
         model = Skill
@@ -214,14 +237,7 @@ class HeroDetailSerializer(serializers.ModelSerializer):
 
     def get_items(self, obj):
         hero_items = get_prefetched_or_query(obj, "hero_items", "hero_items")
-        items = []
-        for entry in hero_items:
-            if not entry.item_id:
-                continue
-            data = ItemDetailSerializer(entry.item).data
-            data["cost"] = getattr(entry, "cost", None)
-            items.append(data)
-        return items
+        return serialize_owned_items(self, obj.warband_id, hero_items)
 
     def get_skills(self, obj):
         hero_skills = get_prefetched_or_query(obj, "hero_skills", "hero_skills")
@@ -268,6 +284,7 @@ class HeroDetailSerializer(serializers.ModelSerializer):
 def _build_item_join_rows(JoinModel, parent_field, parent, items_data):
     """Create join-table rows from a list of {id, cost} dicts."""
     item_ids = [entry["id"] for entry in items_data]
+    effect_keys = campaign_item_effects(parent.warband.campaign_id)
     items_by_id = {
         item.id: item
         for item in Item.objects.filter(id__in=item_ids).prefetch_related("availabilities")
@@ -281,9 +298,7 @@ def _build_item_join_rows(JoinModel, parent_field, parent, items_data):
         kwargs = {parent_field: parent, "item": item}
         cost = entry.get("cost")
         if cost is None:
-            availabilities = list(item.availabilities.all())
-            if len(availabilities) == 1:
-                cost = availabilities[0].cost
+            cost = default_item_cost(item, effect_keys)
         if cost is not None and hasattr(JoinModel, "cost"):
             kwargs["cost"] = cost
         rows.append(JoinModel(**kwargs))
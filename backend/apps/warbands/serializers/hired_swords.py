@@ -16,7 +16,6 @@ from .heroes import (
     CASTER_SPECIAL_MAP,
     LARGE_SPECIAL_NAME,
     STAT_FIELDS,
-    ItemDetailSerializer,
     ItemSummarySerializer,
     RaceSummarySerializer,
     SkillDetailSerializer,
@@ -29,6 +28,7 @@ from .heroes import (
     _sync_special_db,
     _sync_special_list,
     get_trait_specials,
+    serialize_owned_items,
 )
 from .utils import get_prefetched_or_query
 
@@ -104,14 +104,7 @@ class HiredSwordDetailSerializer(serializers.ModelSerializer):
 
     def get_items(self, obj):
         links = get_prefetched_or_query(obj, "hired_sword_items", "hired_sword_items")
-        items = []
-        for entry in links:
-            if not entry.item_id:
-                continue
-            data = ItemDetailSerializer(entry.item).data
-            data["cost"] = getattr(entry, "cost", None)
-            items.append(data)
-        return items
+        return serialize_owned_items(self, obj.warband_id, links)
 
     def get_skills(self, obj):
         links = get_prefetched_or_query(obj, "hired_sword_skills", "hired_sword_skills")
@@ -1,4 +1,3 @@
-from django.db import models
 from rest_framework import serializers
 
 from apps.restrictions.serializers import RestrictionSerializer
@@ -16,17 +15,6 @@ from apps.warbands.models import (
 
 HEX_COLOR_REGEX = r"^#(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})$"
 
-_EXPENSE_ACTIONS = {
-    "buy",
-    "bought",
-    "recruit",
-    "recruited",
-    "hired",
-    "hire",
-    "upkeep",
-    "trade sent",
-}
-
 
 class WarbandSerializer(serializers.ModelSerializer):
     restrictions = serializers.SerializerMethodField()
@@ -69,55 +57,18 @@ class WarbandUnitSummarySerializer(serializers.Serializer):
 
 class WarbandSummarySerializer(serializers.ModelSerializer):
     resources = serializers.SerializerMethodField()
-    rating = serializers.SerializerMethodField()
-    gold = serializers.SerializerMethodField()
+    rating = serializers.FloatField(read_only=True)
+    gold = serializers.IntegerField(read_only=True)
     heroes = serializers.SerializerMethodField()
     hired_swords = serializers.SerializerMethodField()
     henchmen_groups = serializers.SerializerMethodField()
 
-    def get_gold(self, obj):
-        total = 0
-        for trade in obj.trades.all():
-            price = trade.price or 0
-            action = (trade.action or "").strip().lower()
-            if action in _EXPENSE_ACTIONS:
-                total -= abs(price)
-            else:
-                total += abs(price)
-        return total
-
     def get_resources(self, obj):
         resources = getattr(obj, "resources", None)
         if resources is None:
             return []
         return WarbandResourceSerializer(resources.all(), many=True).data
 
-    def get_rating(self, obj):
-        def _as_number(value):
-            if value is None:
-                return 0
-            try:
-                return float(value)
-            except (TypeError, ValueError):
-                return 0
-
-        hero_rows = Hero.objects.filter(warband=obj, dead=False).values("xp", "large")
-        hero_rating = sum(((20 if row["large"] else 5) + _as_number(row["xp"])) for row in hero_rows)
-
-        group_rows = (
-            HenchmenGroup.objects.filter(warband=obj, dead=False)
-            .annotate(henchmen_count=models.Count("henchmen", filter=models.Q(henchmen__dead=False)))
-            .values("xp", "large", "henchmen_count")
-        )
-        henchmen_rating = sum(
-            (row["henchmen_count"] or 0) * ((20 if row["large"] else 5) + _as_number(row["xp"])) for row in group_rows
-        )
-
-        hired_rows = HiredSword.objects.filter(warband=obj, dead=False).values("rating", "xp")
-        hired_rating = sum((_as_number(row["rating"]) + _as_number(row["xp"])) for row in hired_rows)
-
-        return hero_rating + henchmen_rating + hired_rating
-
     def get_heroes(self, obj):
         heroes = Hero.objects.filter(warband=obj, dead=False).only("id", "name", "unit_type").order_by("id")
         return WarbandUnitSummarySerializer(heroes, many=True).data
@@ -231,6 +182,16 @@ class WarbandLogSerializer(serializers.ModelSerializer):
         fields = ("id", "warband_id", "parent_id", "feature", "entry_type", "payload", "created_at")
 
 
+class WarbandLogGroupSerializer(WarbandLogSerializer):
+    children = serializers.SerializerMethodField()
+
+    class Meta(WarbandLogSerializer.Meta):
+        fields = WarbandLogSerializer.Meta.fields + ("children",)
+
+    def get_children(self, obj):
+        return WarbandLogSerializer(obj.children.all(), many=True).data
+
+
 class WarbandLogCreateSerializer(serializers.Serializer):
     feature = serializers.CharField(max_length=80, required=False, allow_blank=True)
     entry_type = serializers.CharField(max_length=80, required=False, allow_blank=True)
@@ -0,0 +1,46 @@
+from django.db.models.signals import post_delete, post_save
+
+from .models import Henchman, HenchmenGroup, Hero, HiredSword, WarbandTrade
+from .utils.totals import apply_gold_delta, refresh_warband_gold, refresh_warband_rating, trade_gold_delta
+
+RATED_UNIT_MODELS = (Hero, HiredSword, HenchmenGroup)
+RATING_FIELDS = {"warband", "warband_id", "xp", "large", "dead", "rating"}
+
+
+def _touches_rating(update_fields) -> bool:
+    return update_fields is None or bool(RATING_FIELDS.intersection(update_fields))
+
+
+def _refresh_unit_rating(sender, instance, update_fields=None, **kwargs):
+    if _touches_rating(update_fields):
+        refresh_warband_rating(instance.warband_id)
+
+
+def _refresh_henchman_rating(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and "dead" not in update_fields and "group" not in update_fields:
+        return
+    warband_id = HenchmenGroup.objects.filter(id=instance.group_id).values_list("warband_id", flat=True).first()
+    refresh_warband_rating(warband_id)
+
+
+def _trade_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        apply_gold_delta(instance.warband_id, trade_gold_delta(instance.action, instance.price))
+    elif update_fields is None or {"action", "price"}.intersection(update_fields):
+        refresh_warband_gold(instance.warband_id)
+
+
+def _trade_deleted(sender, instance, **kwargs):
+    apply_gold_delta(instance.warband_id, -trade_gold_delta(instance.action, instance.price))
+
+
+def connect_warband_total_signals():
+    for model in RATED_UNIT_MODELS:
+        post_save.connect(_refresh_unit_rating, sender=model, dispatch_uid=f"warband-rating-{model.__name__}-save")
+        post_delete.connect(
+            _refresh_unit_rating, sender=model, dispatch_uid=f"warband-rating-{model.__name__}-delete"
+        )
+    post_save.connect(_refresh_henchman_rating, sender=Henchman, dispatch_uid="warband-rating-Henchman-save")
+    post_delete.connect(_refresh_henchman_rating, sender=Henchman, dispatch_uid="warband-rating-Henchman-delete")
+    post_save.connect(_trade_saved, sender=WarbandTrade, dispatch_uid="warband-gold-trade-save")
+    post_delete.connect(_trade_deleted, sender=WarbandTrade, dispatch_uid="warband-gold-trade-delete")
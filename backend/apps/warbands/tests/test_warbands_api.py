@@ -4,6 +4,7 @@ from rest_framework.test import APIClient, APITestCase
 
 from apps.campaigns.models import Campaign, CampaignMembership, CampaignRole, CampaignSettings
 from apps.items.models import Item, ItemAvailability
+from apps.logs.utils import log_warband_event
 from apps.warbands.models import (
     Henchman,
     HenchmenGroup,
@@ -15,6 +16,8 @@ from apps.warbands.models import (
     Warband,
     WarbandItem,
 )
+from apps.warbands.utils.totals import compute_warband_gold, compute_warband_rating
+from apps.warbands.utils.trades import TradeHelper
 
 
 class WarbandsApiTests(APITestCase):
@@ -365,3 +368,70 @@ class WarbandsApiTests(APITestCase):
 
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.data["detail"], "No level ups available")
+
+    def test_summary_uses_stored_rating_updated_by_unit_writes(self):
+        response = self.client.get(f"/api/warbands/{self.warband.id}/summary/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["rating"], 10.0)
+
+        self.client.patch(
+            f"/api/warbands/{self.warband.id}/hired-swords/{self.hired_sword.id}/",
+            {"xp": 5},
+            format="json",
+        )
+        Henchman.objects.create(group=self.group, name="Blade Two")
+
+        self.warband.refresh_from_db()
+        self.assertEqual(self.warband.rating, 20)
+        self.assertEqual(self.warband.rating, compute_warband_rating(self.warband.id))
+
+    def test_stored_gold_tracks_trade_ledger(self):
+        TradeHelper.create_trade(warband=self.warband, action="Starting Gold", description="Start", price=500)
+        purchase = TradeHelper.create_trade(warband=self.warband, action="Buy", description="Sword", price=35)
+        self.warband.refresh_from_db()
+        self.assertEqual(self.warband.gold, 465)
+
+        purchase.delete()
+        self.warband.refresh_from_db()
+        self.assertEqual(self.warband.gold, 500)
+        self.assertEqual(self.warband.gold, compute_warband_gold(self.warband.id))
+
+    def test_warband_patch_keeps_totals_refreshed_during_the_request(self):
+        TradeHelper.create_trade(warband=self.warband, action="Starting Gold", description="Start", price=500)
+        stale = Warband.objects.get(id=self.warband.id)
+        TradeHelper.create_trade(warband=self.warband, action="Buy", description="Sword", price=35)
+
+        stale.name = "Renamed"
+        stale.save()
+
+        self.warband.refresh_from_db()
+        self.assertEqual(self.warband.name, "Renamed")
+        self.assertEqual(self.warband.gold, 465)
+
+        response = self.client.patch(f"/api/warbands/{self.warband.id}/", {"wins": 2}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.warband.refresh_from_db()
+        self.assertEqual(self.warband.wins, 2)
+        self.assertEqual(self.warband.gold, 465)
+
+    def test_logs_are_cursor_paginated_with_children_and_feature_filter(self):
+        header = log_warband_event(self.warband.id, "personnel", "new_henchmen_group_batch", {"count": 2})
+        log_warband_event(self.warband.id, "personnel", "new_henchman", {"name": "A"}, parent_id=header.id)
+        log_warband_event(self.warband.id, "personnel", "new_henchman", {"name": "B"}, parent_id=header.id)
+        advance = log_warband_event(self.warband.id, "advance", "hero", {"hero": "Captain Wolf"})
+        latest = log_warband_event(self.warband.id, "Loadout", "hero_skill", {"hero": "Captain Wolf"})
+
+        url = f"/api/warbands/{self.warband.id}/logs/"
+        first_page = self.client.get(url, {"limit": 2})
+        self.assertEqual(first_page.status_code, 200)
+        self.assertEqual([entry["id"] for entry in first_page.data["results"]], [latest.id, advance.id])
+        self.assertEqual(first_page.data["features"], ["advance", "loadout", "personnel"])
+
+        second_page = self.client.get(url, {"limit": 2, "cursor": first_page.data["next_cursor"]})
+        self.assertEqual([entry["id"] for entry in second_page.data["results"]], [header.id])
+        self.assertEqual([child["payload"]["name"] for child in second_page.data["results"][0]["children"]], ["A", "B"])
+        self.assertIsNone(second_page.data["next_cursor"])
+        self.assertNotIn("features", second_page.data)
+
+        filtered = self.client.get(url, {"feature": "Personnel"})
+        self.assertEqual([entry["id"] for entry in filtered.data["results"]], [header.id])
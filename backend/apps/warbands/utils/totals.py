@@ -0,0 +1,79 @@
+from decimal import Decimal
+
+from django.db import models
+from django.db.models.functions import Abs, Coalesce, Lower, Trim
+
+from apps.warbands.models import HenchmenGroup, Hero, HiredSword, Warband, WarbandTrade
+
+EXPENSE_ACTIONS = {
+    "buy",
+    "bought",
+    "recruit",
+    "recruited",
+    "hired",
+    "hire",
+    "upkeep",
+    "trade sent",
+}
+
+
+def trade_gold_delta(action: str | None, price: int | None) -> int:
+    amount = abs(price or 0)
+    if (action or "").strip().lower() in EXPENSE_ACTIONS:
+        return -amount
+    return amount
+
+
+def _unit_base(large: bool) -> int:
+    return 20 if large else 5
+
+
+def compute_warband_rating(warband_id: int) -> Decimal:
+    hero_rows = Hero.objects.filter(warband_id=warband_id, dead=False).values("xp", "large")
+    hero_rating = sum((_unit_base(row["large"]) + (row["xp"] or 0)) for row in hero_rows)
+
+    group_rows = (
+        HenchmenGroup.objects.filter(warband_id=warband_id, dead=False)
+        .annotate(henchmen_count=models.Count("henchmen", filter=models.Q(henchmen__dead=False)))
+        .values("xp", "large", "henchmen_count")
+    )
+    henchmen_rating = sum(
+        (row["henchmen_count"] or 0) * (_unit_base(row["large"]) + (row["xp"] or 0)) for row in group_rows
+    )
+
+    hired_rows = HiredSword.objects.filter(warband_id=warband_id, dead=False).values("rating", "xp")
+    hired_rating = sum(((row["rating"] or 0) + (row["xp"] or 0)) for row in hired_rows)
+
+    return Decimal(hero_rating + henchmen_rating + hired_rating)
+
+
+def compute_warband_gold(warband_id: int) -> int:
+    signed_price = models.Case(
+        models.When(action_key__in=EXPENSE_ACTIONS, then=-Abs("price")),
+        default=Abs("price"),
+        output_field=models.IntegerField(),
+    )
+    total = (
+        WarbandTrade.objects.filter(warband_id=warband_id)
+        .annotate(action_key=Lower(Trim("action")))
+        .aggregate(total=Coalesce(models.Sum(signed_price), 0))["total"]
+    )
+    return int(total)
+
+
+def refresh_warband_rating(warband_id: int | None) -> None:
+    if not warband_id:
+        return
+    Warband.objects.filter(id=warband_id).update(rating=compute_warband_rating(warband_id))
+
+
+def refresh_warband_gold(warband_id: int | None) -> None:
+    if not warband_id:
+        return
+    Warband.objects.filter(id=warband_id).update(gold=compute_warband_gold(warband_id))
+
+
+def apply_gold_delta(warband_id: int | None, delta: int) -> None:
+    if not warband_id or not delta:
+        return
+    Warband.objects.filter(id=warband_id).update(gold=models.F("gold") + delta)
@@ -20,20 +20,12 @@ def _serialize_named_kills(events) -> list[dict]:
             continue
 
         victim_name = str(victim.get("name", "") or "").strip()
-        if not victim_name:
-            continue
-
-        victim_warband_id = victim.get("warband_id")
-        try:
-            parsed_victim_warband_id = int(victim_warband_id)
-        except (TypeError, ValueError):
-            continue
-        if parsed_victim_warband_id <= 0:
+        if not victim_name or event.victim_warband_id is None:
             continue
 
         scenario_name = str(getattr(event.battle, "scenario", "") or "").strip()
-        normalized_events.append((victim_name, parsed_victim_warband_id, scenario_name))
-        victim_warband_ids.add(parsed_victim_warband_id)
+        normalized_events.append((victim_name, event.victim_warband_id, scenario_name))
+        victim_warband_ids.add(event.victim_warband_id)
 
     warband_names = {
         warband_id: warband_name
@@ -84,8 +76,8 @@ class WarbandHeroKillHistoryView(WarbandObjectMixin, APIView):
         events = (
             BattleEvent.objects.filter(
                 type=BattleEvent.TYPE_UNIT_KILL_RECORDED,
-                payload_json__killer__unit_type="hero",
-                payload_json__killer__unit_id=hero.id,
+                killer_unit_type="hero",
+                killer_unit_id=hero.id,
             )
             .select_related("battle")
             .order_by("-created_at", "-id")
@@ -112,8 +104,8 @@ class WarbandHiredSwordKillHistoryView(WarbandObjectMixin, APIView):
         events = (
             BattleEvent.objects.filter(
                 type=BattleEvent.TYPE_UNIT_KILL_RECORDED,
-                payload_json__killer__unit_type="hired_sword",
-                payload_json__killer__unit_id=hired_sword.id,
+                killer_unit_type="hired_sword",
+                killer_unit_id=hired_sword.id,
             )
             .select_related("battle")
             .order_by("-created_at", "-id")
@@ -146,8 +138,8 @@ class WarbandHenchmenGroupKillHistoryView(WarbandObjectMixin, APIView):
         events = (
             BattleEvent.objects.filter(
                 type=BattleEvent.TYPE_UNIT_KILL_RECORDED,
-                payload_json__killer__unit_type="henchman",
-                payload_json__killer__unit_id__in=member_ids,
+                killer_unit_type="henchman",
+                killer_unit_id__in=member_ids,
             )
             .select_related("battle")
             .order_by("-created_at", "-id")
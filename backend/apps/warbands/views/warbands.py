@@ -1,10 +1,14 @@
 from django.db import transaction
+from django.db.models import Prefetch
 from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.battles.roster_cache import invalidate_warband_roster
 from apps.campaigns.models import CampaignSettings
 from apps.campaigns.permissions import get_membership
+from apps.core.pagination import before_cursor, encode_cursor, parse_limit
+from apps.items.effects import campaign_item_effects, default_item_cost
 from apps.items.models import Item
 from apps.logs.utils import log_warband_event
 from apps.restrictions.serializers import RestrictionSerializer
@@ -34,6 +38,7 @@ from apps.warbands.serializers import (
     WarbandItemSummarySerializer,
     WarbandItemTransferSerializer,
     WarbandLogCreateSerializer,
+    WarbandLogGroupSerializer,
     WarbandLogSerializer,
     WarbandResourceCreateSerializer,
     WarbandResourceSerializer,
@@ -48,6 +53,8 @@ from apps.warbands.utils.trades import TradeHelper
 
 from .mixins import WarbandObjectMixin
 
+WARBAND_LOG_DEFAULT_LIMIT = 50
+WARBAND_LOG_MAX_LIMIT = 200
 
 UNIT_TYPE_CONFIG = {
     "hero": {
@@ -131,6 +138,7 @@ def _add_unit_items(unit_type, unit, item, costs):
             kwargs["cost"] = cost
         rows.append(config["item_model"](**kwargs))
     config["item_model"].objects.bulk_create(rows)
+    invalidate_warband_roster(unit.warband_id)
 
 
 def _remove_stash_items(warband, item_id, quantity):
@@ -177,6 +185,7 @@ def _build_item_change_response(
     stash_item=None,
     removed_stash_item_id=None,
 ):
+    warband.refresh_from_db(fields=["rating", "gold"])
     return {
         "summary": WarbandSummarySerializer(warband).data,
         "source": source,
@@ -334,9 +343,7 @@ class WarbandItemListView(WarbandObjectMixin, APIView):
         if not item:
             return Response({"detail": "Item not found"}, status=404)
         if cost is None:
-            availabilities = list(item.availabilities.all())
-            if len(availabilities) == 1:
-                cost = availabilities[0].cost
+            cost = default_item_cost(item, campaign_item_effects(warband.campaign_id))
 
         warband_item = WarbandItem.objects.filter(warband=warband, item=item).first()
         if warband_item:
@@ -536,13 +543,38 @@ class WarbandLogListView(WarbandObjectMixin, APIView):
         if not CanViewWarband().has_object_permission(request, self, warband):
             return Response({"detail": "Not found"}, status=404)
 
-        logs = WarbandLog.objects.filter(warband=warband)
-        feature = request.query_params.get("feature")
+        # Batch children (e.g. henchmen recruited under one header) ride along with their parent entry.
+        logs = WarbandLog.objects.filter(warband=warband, parent__isnull=True)
+        feature = (request.query_params.get("feature") or "").strip().lower()
         if feature:
-            logs = logs.filter(feature__iexact=feature.strip())
+            logs = logs.filter(feature=feature)
+        cursor = request.query_params.get("cursor")
+        try:
+            limit = parse_limit(request.query_params.get("limit"), WARBAND_LOG_DEFAULT_LIMIT, WARBAND_LOG_MAX_LIMIT)
+            if cursor:
+                logs = logs.filter(before_cursor("created_at", cursor))
+        except ValueError:
+            return Response({"detail": "Invalid pagination parameters"}, status=400)
+
+        entries = list(
+            logs.prefetch_related(
+                Prefetch("children", queryset=WarbandLog.objects.order_by("created_at", "id"))
+            ).order_by("-created_at", "-id")[: limit + 1]
+        )
+        has_more = len(entries) > limit
+        entries = entries[:limit]
 
-        serializer = WarbandLogSerializer(logs.order_by("-created_at"), many=True)
-        return Response(serializer.data)
+        payload = {
+            "results": WarbandLogGroupSerializer(entries, many=True).data,
+            "next_cursor": encode_cursor(entries[-1].created_at, entries[-1].id) if has_more else None,
+        }
+        if not cursor:
+            payload["features"] = sorted(
+                WarbandLog.objects.filter(warband=warband, parent__isnull=True)
+                .values_list("feature", flat=True)
+                .distinct()
+            )
+        return Response(payload)
 
     def post(self, request, warband_id):
         warband, error_response = self.get_warband_or_404(warband_id)
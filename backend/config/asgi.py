@@ -4,4 +4,18 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from apps.jobs.queue import start_background_jobs  # noqa: E402
+from apps.realtime.websocket import REALTIME_WEBSOCKET_PATH, realtime_websocket_application  # noqa: E402
+
+start_background_jobs()
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "websocket":
+        if scope.get("path") == REALTIME_WEBSOCKET_PATH:
+            return await realtime_websocket_application(scope, receive, send)
+        await send({"type": "websocket.close", "code": 4404})
+        return None
+    return await django_application(scope, receive, send)
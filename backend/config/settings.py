@@ -36,6 +36,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "corsheaders",
     "rest_framework",
     "rest_framework_simplejwt",
@@ -52,6 +53,7 @@ INSTALLED_APPS = [
     "apps.warbands.apps.WarbandsConfig",
     "apps.trades.apps.TradesConfig",
     "apps.realtime.apps.RealtimeConfig",
+    "apps.jobs.apps.JobsConfig",
     "apps.battles.apps.BattlesConfig",
     "apps.bestiary.apps.BestiaryConfig",
     "apps.notifications.apps.NotificationsConfig",
@@ -64,6 +66,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.campaigns.permissions.MembershipCacheMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -90,8 +93,25 @@ WSGI_APPLICATION = "config.wsgi.application"
 ASGI_APPLICATION = "config.asgi.application"
 
 # Database configuration for Neon
+# Persistent connections avoid a TLS handshake + auth round trip per request; health
+# checks drop connections the server (or Neon's idle suspend) has closed.
+# Under ASGI the default is 0: each request's sync code runs on its own executor thread,
+# so a persistent connection is never reused and stays open until that thread goes away,
+# piling up connections on the server.
+SERVER_INTERFACE = os.environ.get("DJANGO_SERVER_INTERFACE", "wsgi").strip().lower()
+DB_CONN_MAX_AGE = _env_int("DB_CONN_MAX_AGE")
+if DB_CONN_MAX_AGE is None:
+    DB_CONN_MAX_AGE = 0 if SERVER_INTERFACE == "asgi" else 60
+DB_CONN_HEALTH_CHECKS = _env_bool("DB_CONN_HEALTH_CHECKS", True)
+
 if os.environ.get("DATABASE_URL"):
-    DATABASES = {"default": dj_database_url.config(default=os.environ.get("DATABASE_URL"))}
+    DATABASES = {
+        "default": dj_database_url.config(
+            default=os.environ.get("DATABASE_URL"),
+            conn_max_age=DB_CONN_MAX_AGE,
+            conn_health_checks=DB_CONN_HEALTH_CHECKS,
+        )
+    }
 else:
     DATABASES = {
         "default": {
@@ -101,9 +121,16 @@ else:
             "PASSWORD": os.environ.get("POSTGRES_PASSWORD", "postgres"),
             "HOST": os.environ.get("POSTGRES_HOST", "db"),
             "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+            "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": DB_CONN_HEALTH_CHECKS,
         }
     }
 
+# Set when connecting through a transaction-mode pooler (PgBouncer, Neon's -pooler host):
+# server-side cursors cannot survive across pooled transactions.
+if _env_bool("DB_TRANSACTION_POOLER", False):
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": ("rest_framework_simplejwt.authentication.JWTAuthentication",),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
@@ -120,6 +147,8 @@ REST_FRAMEWORK = {
         "campaign_chat_ip": "60/min",
         "campaign_ping_user": "30/min",
         "campaign_ping_ip": "120/min",
+        "campaign_export_user": "10/hour",
+        "campaign_export_ip": "30/hour",
         "battle_write_user": "60/min",
         "battle_write_ip": "240/min",
         "trade_write_user": "20/min",
@@ -160,12 +189,33 @@ STATIC_URL = "static/"
 
 RATE_LIMIT_ENABLED = _env_bool("RATE_LIMIT_ENABLED", True)
 
-CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-        "LOCATION": "rate-limit",
+# Throttle counters and app caches must be shared between workers in production, so
+# point CACHE_URL at Redis there. file:// gives a cross-process stand-in for local use
+# only: FileBasedCache.incr is a read then a write, so concurrent requests lose counts
+# and rate limits leak. Anything with more than one worker process needs Redis.
+CACHE_URL = os.environ.get("CACHE_URL", "")
+if CACHE_URL.startswith(("redis://", "rediss://", "unix://")):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+            "KEY_PREFIX": os.environ.get("CACHE_KEY_PREFIX", "mordheim"),
+        }
+    }
+elif CACHE_URL.startswith("file://"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": CACHE_URL.removeprefix("file://"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "rate-limit",
+        }
     }
-}
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -183,7 +233,16 @@ PUSHER_APP_ID = os.environ.get("PUSHER_APP_ID", "")
 PUSHER_KEY = os.environ.get("PUSHER_KEY", "")
 PUSHER_SECRET = os.environ.get("PUSHER_SECRET", "")
 PUSHER_CLUSTER = os.environ.get("PUSHER_CLUSTER", "")
-
-MIGRATION_MODULES = {
-    "realtime": None,
-}
+REALTIME_TRANSPORTS = [
+    name.strip().lower() for name in os.environ.get("REALTIME_TRANSPORTS", "pusher").split(",") if name.strip()
+]
+# WebSocket events are fanned out to every web worker through Redis pub/sub. Without it
+# they only reach sockets held by the process that dispatched them.
+REALTIME_BROKER_URL = os.environ.get("REALTIME_BROKER_URL", "") or (
+    CACHE_URL if CACHE_URL.startswith(("redis://", "rediss://", "unix://")) else ""
+)
+# "thread" drains the outbox in a background thread of each web worker, "worker"
+# leaves it to `manage.py run_realtime_outbox`, "inline" sends on commit.
+REALTIME_OUTBOX_DISPATCH = os.environ.get("REALTIME_OUTBOX_DISPATCH", "thread").strip().lower()
+# Same choices for background jobs: "worker" leaves them to `manage.py run_workers`.
+JOBS_DISPATCH = os.environ.get("JOBS_DISPATCH", "thread").strip().lower()
@@ -4,6 +4,7 @@ urlpatterns = [
     path("api/", include("apps.core.urls")),
     path("api/auth/", include("apps.users.urls")),
     path("api/", include("apps.realtime.urls")),
+    path("api/", include("apps.jobs.urls")),
     path("api/", include("apps.trades.urls")),
     path("api/", include("apps.battles.urls")),
     path("api/", include("apps.campaigns.urls")),
@@ -3,4 +3,12 @@ set -e
 
 python /app/wait_for_db.py
 python /app/manage.py migrate --noinput
+
+if [ "${DJANGO_RUN_MODE:-dev}" = "production" ]; then
+  if [ "${DJANGO_SERVER_INTERFACE:-wsgi}" = "asgi" ]; then
+    exec gunicorn -c /app/gunicorn.conf.py config.asgi:application
+  fi
+  exec gunicorn -c /app/gunicorn.conf.py config.wsgi:application
+fi
+
 exec python /app/manage.py runserver 0.0.0.0:8000
@@ -0,0 +1,24 @@
+import multiprocessing
+import os
+
+server_interface = os.environ.get("DJANGO_SERVER_INTERFACE", "wsgi").strip().lower()
+
+bind = os.environ.get("GUNICORN_BIND", f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.environ.get(
+    "GUNICORN_WORKER_CLASS",
+    "uvicorn.workers.UvicornWorker" if server_interface == "asgi" else "gthread",
+)
+# Each thread keeps its own persistent database connection, so the connection count
+# to Postgres is roughly workers * threads.
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", "5"))
+# Recycling an ASGI worker drops its WebSockets and the outbox and job threads mid-batch,
+# so it is off there unless asked for.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "0" if server_interface == "asgi" else "1000"))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+accesslog = "-"
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
@@ -0,0 +1,55 @@
+"""Small HTTP load generator for comparing server profiles.
+
+Example:
+    python loadtest.py http://localhost:8000/api/health/ --requests 2000 --concurrency 20
+    python loadtest.py http://localhost:8000/api/campaigns/ --token "$ACCESS_TOKEN"
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+def _percentile(samples: list[float], percentile: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(percentile / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def run(url: str, total: int, concurrency: int, token: str | None) -> None:
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    sessions = [requests.Session() for _ in range(concurrency)]
+
+    def _request(index: int) -> tuple[float, int]:
+        session = sessions[index % concurrency]
+        started = time.perf_counter()
+        response = session.get(url, headers=headers, timeout=30)
+        return (time.perf_counter() - started) * 1000, response.status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(_request, range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for latency, _status in results]
+    errors = sum(1 for _latency, status in results if status >= 400)
+    print(f"requests      {total} ({errors} errors) at concurrency {concurrency}")
+    print(f"throughput    {total / elapsed:.1f} req/s")
+    print(f"latency mean  {statistics.fmean(latencies):.1f} ms")
+    for percentile in (50, 95, 99):
+        print(f"latency p{percentile:<3}  {_percentile(latencies, percentile):.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("url")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--token", help="JWT access token for authenticated endpoints")
+    args = parser.parse_args()
+    run(args.url, args.requests, args.concurrency, args.token)
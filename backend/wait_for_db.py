@@ -5,7 +5,7 @@ import psycopg
 
 
 def wait_for_db():
-    conninfo = psycopg.conninfo.make_conninfo(
+    conninfo = os.environ.get("DATABASE_URL") or psycopg.conninfo.make_conninfo(
         dbname=os.environ.get("POSTGRES_DB", "mordheim"),
         user=os.environ.get("POSTGRES_USER", "postgres"),
         password=os.environ.get("POSTGRES_PASSWORD", "postgres"),
@@ -3,7 +3,7 @@ import { apiRequest } from "../../../lib/api-client";
 
 // types
 import type {
-  CampaignBattleHistoryEntry,
+  CampaignBattleHistoryPage,
   CampaignBulletinEntry,
   CampaignCreatePayload,
   CampaignActiveBattle,
@@ -55,9 +55,16 @@ export function listCampaignPlayers(campaignId: number) {
   });
 }
 
-export function listCampaignBattleHistory(campaignId: number) {
-  return apiRequest<CampaignBattleHistoryEntry[]>(`/campaigns/${campaignId}/battle-history/`, {
-  });
+export function listCampaignBattleHistory(campaignId: number, cursor?: string | null) {
+  const params = new URLSearchParams();
+  if (cursor) {
+    params.set("cursor", cursor);
+  }
+  const query = params.toString();
+  const path = query
+    ? `/campaigns/${campaignId}/battle-history/?${query}`
+    : `/campaigns/${campaignId}/battle-history/`;
+  return apiRequest<CampaignBattleHistoryPage>(path);
 }
 
 export function listCampaignActiveBattles(campaignId: number) {
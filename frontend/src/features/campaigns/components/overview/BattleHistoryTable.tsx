@@ -2,6 +2,7 @@ import { Fragment, useMemo, useState } from "react";
 
 import { ChevronDown } from "lucide-react";
 
+import { Button } from "@components/button";
 import { RosterSkeleton } from "@components/card-skeleton";
 import { useAuth } from "@/features/auth/hooks/use-auth";
 import {
@@ -22,6 +23,9 @@ type BattleHistoryTableProps = {
   isLoading: boolean;
   error: string;
   battles: CampaignBattleHistoryEntry[];
+  hasMore: boolean;
+  isLoadingMore: boolean;
+  onLoadMore: () => void;
   players: CampaignPlayer[];
   isMobile: boolean;
   mobileExpanded: boolean;
@@ -176,6 +180,9 @@ export default function BattleHistoryTable({
   isLoading,
   error,
   battles,
+  hasMore,
+  isLoadingMore,
+  onLoadMore,
   players,
   isMobile,
   mobileExpanded,
@@ -332,6 +339,13 @@ export default function BattleHistoryTable({
                 </tbody>
               </table>
             </div>
+            {hasMore ? (
+              <div className="flex justify-center border-t border-border/40 p-2">
+                <Button variant="ghost" size="sm" onClick={onLoadMore} disabled={isLoadingMore}>
+                  {isLoadingMore ? "Loading..." : "Load more"}
+                </Button>
+              </div>
+            ) : null}
           </div>
         )}
         </>
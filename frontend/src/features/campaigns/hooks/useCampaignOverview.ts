@@ -62,6 +62,8 @@ export function useCampaignOverview({ campaignId, campaign }: UseCampaignOvervie
   const [battleHistory, setBattleHistory] = useState<CampaignBattleHistoryEntry[]>([]);
   const [battleHistoryError, setBattleHistoryError] = useState("");
   const [isBattleHistoryLoading, setIsBattleHistoryLoading] = useState(true);
+  const [battleHistoryCursor, setBattleHistoryCursor] = useState<string | null>(null);
+  const [isBattleHistoryLoadingMore, setIsBattleHistoryLoadingMore] = useState(false);
   const [pivotalMoments, setPivotalMoments] = useState<CampaignPivotalMoment[]>([]);
   const [pivotalMomentsError, setPivotalMomentsError] = useState("");
   const [isPivotalMomentsLoading, setIsPivotalMomentsLoading] = useState(true);
@@ -146,7 +148,10 @@ export function useCampaignOverview({ campaignId, campaign }: UseCampaignOvervie
     setBattleHistoryError("");
 
     listCampaignBattleHistory(campaignId)
-      .then((data) => setBattleHistory(data))
+      .then((data) => {
+        setBattleHistory(data.results);
+        setBattleHistoryCursor(data.next_cursor);
+      })
       .catch((errorResponse) => {
         if (errorResponse instanceof Error) {
           setBattleHistoryError(errorResponse.message || "Unable to load battle history");
@@ -343,6 +348,28 @@ export function useCampaignOverview({ campaignId, campaign }: UseCampaignOvervie
     }
   };
 
+  const loadMoreBattleHistory = async () => {
+    if (!battleHistoryCursor || isBattleHistoryLoadingMore) {
+      return;
+    }
+    setIsBattleHistoryLoadingMore(true);
+    setBattleHistoryError("");
+
+    try {
+      const data = await listCampaignBattleHistory(campaignId, battleHistoryCursor);
+      setBattleHistory((prev) => [...prev, ...data.results]);
+      setBattleHistoryCursor(data.next_cursor);
+    } catch (errorResponse) {
+      if (errorResponse instanceof Error) {
+        setBattleHistoryError(errorResponse.message || "Unable to load battle history");
+      } else {
+        setBattleHistoryError("Unable to load battle history");
+      }
+    } finally {
+      setIsBattleHistoryLoadingMore(false);
+    }
+  };
+
   const handleCreateBulletinEntry = async (body: string) => {
     setIsCreatingBulletinEntry(true);
     setBulletinActionError("");
@@ -392,6 +419,9 @@ export function useCampaignOverview({ campaignId, campaign }: UseCampaignOvervie
     battleHistory,
     battleHistoryError,
     isBattleHistoryLoading,
+    hasMoreBattleHistory: battleHistoryCursor !== null,
+    isBattleHistoryLoadingMore,
+    loadMoreBattleHistory,
     pivotalMoments,
     pivotalMomentsError,
     isPivotalMomentsLoading,
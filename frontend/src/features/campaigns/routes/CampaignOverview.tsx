@@ -61,6 +61,9 @@ export default function CampaignOverview() {
     battleHistory,
     battleHistoryError,
     isBattleHistoryLoading,
+    hasMoreBattleHistory,
+    isBattleHistoryLoadingMore,
+    loadMoreBattleHistory,
     pivotalMoments,
     pivotalMomentsError,
     isPivotalMomentsLoading,
@@ -136,6 +139,9 @@ export default function CampaignOverview() {
           isLoading={isBattleHistoryLoading}
           error={battleHistoryError}
           battles={battleHistory}
+          hasMore={hasMoreBattleHistory}
+          isLoadingMore={isBattleHistoryLoadingMore}
+          onLoadMore={loadMoreBattleHistory}
           players={players}
           isMobile={isMobile}
           mobileExpanded={mobileExpandedSections.battleHistory}
@@ -99,6 +99,11 @@ export type CampaignBattleHistoryEntry = {
   participants: CampaignBattleHistoryParticipant[];
 };
 
+export type CampaignBattleHistoryPage = {
+  results: CampaignBattleHistoryEntry[];
+  next_cursor: string | null;
+};
+
 export type CampaignActiveBattle = {
   battle: BattleSummary;
   participants: BattleParticipant[];
@@ -240,6 +240,20 @@ export function useNotifications(connect = true) {
         return;
       }
 
+      if (message.type === "trade_requests_expired") {
+        const payload = message.payload as { trade_requests?: Array<{ id?: string }> };
+        for (const request of payload?.trade_requests ?? []) {
+          if (!request?.id) {
+            continue;
+          }
+          removeTradeRequestNotification(request.id);
+          if (tradeSession?.requestId === request.id) {
+            setTradeSession(null);
+          }
+        }
+        return;
+      }
+
       if (message.type === "battle_invite") {
         const payload = message.payload as BattleNotificationPayload;
         const notification = toBattleInviteNotification(payload, payload.notification_id ?? 0);
@@ -1,18 +1,26 @@
 import { apiRequest } from "../../../lib/api-client";
 
-import type { WarbandLog, WarbandLogCreatePayload } from "../types/warband-types";
+import type { WarbandLog, WarbandLogCreatePayload, WarbandLogPage } from "../types/warband-types";
 import { emitWarbandUpdate, type WarbandUpdateOptions } from "./warbands-events";
 
-export function listWarbandLogs(warbandId: number, feature?: string) {
+type ListWarbandLogsOptions = {
+  feature?: string;
+  cursor?: string | null;
+};
+
+export function listWarbandLogs(warbandId: number, options: ListWarbandLogsOptions = {}) {
   const params = new URLSearchParams();
-  if (feature) {
-    params.set("feature", feature);
+  if (options.feature) {
+    params.set("feature", options.feature);
+  }
+  if (options.cursor) {
+    params.set("cursor", options.cursor);
   }
   const query = params.toString();
   const path = query
     ? `/warbands/${warbandId}/logs/?${query}`
     : `/warbands/${warbandId}/logs/`;
-  return apiRequest<WarbandLog[]>(path);
+  return apiRequest<WarbandLogPage>(path);
 }
 
 export function createWarbandLog(
@@ -5,7 +5,7 @@ import { listWarbandLogs } from "../../api/warbands-api";
 import { formatLogMessage } from "../../data/log-translations";
 import { FEATURE_COLORS, DEFAULT_FEATURE_COLOR, LOG_FORMATTERS } from "../../data/log-formatters";
 
-import type { Warband, WarbandLog } from "../../types/warband-types";
+import type { Warband, WarbandLog, WarbandLogGroup } from "../../types/warband-types";
 
 const LOGS_PER_PAGE = 12;
 
@@ -14,24 +14,35 @@ type LogsTabProps = {
 };
 
 export default function LogsTab({ warband }: LogsTabProps) {
-  const [logs, setLogs] = useState<WarbandLog[]>([]);
+  const [logs, setLogs] = useState<WarbandLogGroup[]>([]);
+  const [featureOptions, setFeatureOptions] = useState<string[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [isLogsLoading, setIsLogsLoading] = useState(false);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [logsError, setLogsError] = useState("");
   const [selectedFeature, setSelectedFeature] = useState("all");
   const [page, setPage] = useState(0);
 
+  useEffect(() => {
+    setSelectedFeature("all");
+  }, [warband.id]);
+
   useEffect(() => {
     let isActive = true;
 
     setIsLogsLoading(true);
     setLogsError("");
-    setSelectedFeature("all");
-    listWarbandLogs(warband.id)
+    setPage(0);
+    listWarbandLogs(warband.id, { feature: selectedFeature === "all" ? undefined : selectedFeature })
       .then((data) => {
         if (!isActive) {
           return;
         }
-        setLogs(data);
+        setLogs(data.results);
+        setNextCursor(data.next_cursor);
+        if (data.features) {
+          setFeatureOptions([...data.features].sort((a, b) => a.localeCompare(b)));
+        }
       })
       .catch((errorResponse) => {
         if (!isActive) {
@@ -52,30 +63,45 @@ export default function LogsTab({ warband }: LogsTabProps) {
     return () => {
       isActive = false;
     };
-  }, [warband.id]);
-
-  const featureOptions = useMemo(() => {
-    const unique = new Set(logs.map((log) => log.feature).filter(Boolean));
-    return Array.from(unique).sort((a, b) => a.localeCompare(b));
-  }, [logs]);
-
-  const filteredLogs = useMemo(() => {
-    if (selectedFeature === "all") {
-      return logs;
-    }
-    return logs.filter((log) => log.feature === selectedFeature);
-  }, [logs, selectedFeature]);
+  }, [warband.id, selectedFeature]);
 
-  // Reset page when filter changes
-  useEffect(() => {
-    setPage(0);
-  }, [selectedFeature]);
+  // Batched entries arrive nested under their header; show them as consecutive lines.
+  const logLines = useMemo(
+    () => logs.flatMap((log): WarbandLog[] => [log, ...log.children]),
+    [logs]
+  );
 
-  const totalPages = Math.ceil(filteredLogs.length / LOGS_PER_PAGE);
-  const paginatedLogs = filteredLogs.slice(
+  const totalPages = Math.ceil(logLines.length / LOGS_PER_PAGE);
+  const paginatedLogs = logLines.slice(
     page * LOGS_PER_PAGE,
     (page + 1) * LOGS_PER_PAGE
   );
+  const hasNextPage = page < totalPages - 1 || nextCursor !== null;
+
+  const goToNextPage = async () => {
+    const nextPage = page + 1;
+    if ((nextPage + 1) * LOGS_PER_PAGE > logLines.length && nextCursor) {
+      setIsLoadingMore(true);
+      try {
+        const data = await listWarbandLogs(warband.id, {
+          feature: selectedFeature === "all" ? undefined : selectedFeature,
+          cursor: nextCursor,
+        });
+        setLogs((prev) => [...prev, ...data.results]);
+        setNextCursor(data.next_cursor);
+      } catch (errorResponse) {
+        if (errorResponse instanceof Error) {
+          setLogsError(errorResponse.message || "Unable to load logs");
+        } else {
+          setLogsError("Unable to load logs");
+        }
+        return;
+      } finally {
+        setIsLoadingMore(false);
+      }
+    }
+    setPage(nextPage);
+  };
 
   const featureLabelMap: Record<string, string> = {
     advance: "Advances",
@@ -148,7 +174,7 @@ export default function LogsTab({ warband }: LogsTabProps) {
           <p className="px-3 py-3 text-sm text-muted-foreground">Gathering log entries...</p>
         ) : logsError ? (
           <p className="px-3 py-3 text-sm text-red-600">{logsError}</p>
-        ) : filteredLogs.length === 0 ? (
+        ) : logLines.length === 0 ? (
           <p className="px-3 py-3 text-sm text-muted-foreground">No log entries yet.</p>
         ) : (
           <div className="space-y-0">
@@ -183,7 +209,7 @@ export default function LogsTab({ warband }: LogsTabProps) {
         )}
       </div>
 
-      {filteredLogs.length > 0 && totalPages > 1 ? (
+      {logLines.length > 0 && (totalPages > 1 || nextCursor !== null) ? (
         <div className="flex items-center justify-center gap-3 pt-4">
           <button
             type="button"
@@ -195,13 +221,13 @@ export default function LogsTab({ warband }: LogsTabProps) {
             <ChevronLeft className="h-4 w-4" />
           </button>
           <span className="text-xs text-muted-foreground">
-            Page {page + 1} of {totalPages}
+            Page {page + 1} of {nextCursor ? `${totalPages}+` : totalPages}
           </span>
           <button
             type="button"
             className="rounded border border-border/60 p-1.5 text-muted-foreground transition-colors duration-150 hover:border-white/40 hover:text-foreground disabled:cursor-not-allowed disabled:opacity-30 disabled:hover:border-border/60 disabled:hover:text-muted-foreground"
-            disabled={page >= totalPages - 1}
-            onClick={() => setPage((p) => p + 1)}
+            disabled={!hasNextPage || isLoadingMore}
+            onClick={goToNextPage}
             aria-label="Next page"
           >
             <ChevronRight className="h-4 w-4" />
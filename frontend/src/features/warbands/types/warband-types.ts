@@ -415,6 +415,16 @@ export type WarbandLog = {
   created_at: string;
 };
 
+export type WarbandLogGroup = WarbandLog & {
+  children: WarbandLog[];
+};
+
+export type WarbandLogPage = {
+  results: WarbandLogGroup[];
+  next_cursor: string | null;
+  features?: string[];
+};
+
 export type WarbandLogCreatePayload = {
   feature?: string;
   entry_type?: string;
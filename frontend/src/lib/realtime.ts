@@ -14,36 +14,35 @@ type PingMessage = {
 type NotificationMessage = {
   type: string;
   payload?: unknown;
+  event_id?: number;
 };
 
 type TradeEventMessage = {
   type: string;
   payload?: unknown;
+  event_id?: number;
 };
 
 type PingSocket = {
-  socket: Pusher | null;
   sendPing: (payload?: unknown) => void;
   close: () => void;
 };
 
 type NotificationSocket = {
-  socket: Pusher | null;
   close: () => void;
 };
 
 type TradeSessionSocket = {
-  socket: Pusher | null;
   close: () => void;
 };
 
 type BattleEventMessage = {
   type: string;
   payload?: unknown;
+  event_id?: number;
 };
 
 type BattleSessionSocket = {
-  socket: Pusher | null;
   close: () => void;
 };
 
@@ -54,10 +53,10 @@ type ChatMessage = {
   username: string;
   body: string;
   created_at: string;
+  event_id?: number;
 };
 
 type CampaignChatSocket = {
-  socket: Pusher | null;
   close: () => void;
 };
 
@@ -66,39 +65,189 @@ const PUSHER_CLUSTER = import.meta.env.VITE_PUSHER_CLUSTER as string | undefined
 const PUSHER_AUTH_ENDPOINT = import.meta.env
   .VITE_PUSHER_AUTH_ENDPOINT as string | undefined;
 
+// Close codes sent by the backend WebSocket endpoint.
+const CLOSE_UNAUTHORIZED = 4401;
+const MAX_RECONNECT_DELAY_MS = 30000;
+// How many recent outbox event ids each subscription remembers to drop redeliveries.
+const SEEN_EVENT_ID_LIMIT = 200;
+
+type RealtimeConfig = {
+  transports: string[];
+  websocket_path: string | null;
+};
+
+type Subscription = {
+  close: () => void;
+};
+
+type ChannelListener = (event: string, data: unknown) => void;
+
 const isPusherEnabled = () => Boolean(PUSHER_KEY && PUSHER_CLUSTER);
 
-const ensurePusher = () => {
-  if (isPusherEnabled()) {
-    return true;
-  }
-  if (typeof window !== "undefined") {
-    console.warn("Pusher is not configured. Realtime features are disabled.");
+let realtimeConfigPromise: Promise<RealtimeConfig | null> | null = null;
+
+const loadRealtimeConfig = () => {
+  if (!realtimeConfigPromise) {
+    realtimeConfigPromise = apiRequest<RealtimeConfig>("/realtime/config/").catch(() => {
+      realtimeConfigPromise = null;
+      return null;
+    });
   }
-  return false;
+  return realtimeConfigPromise;
 };
 
-export const createCampaignPingSocket = (
-  campaignId: number,
-  onPing?: (message: PingMessage) => void
-): PingSocket => {
-  if (!ensurePusher()) {
-    return {
-      socket: null,
-      sendPing: () => undefined,
-      close: () => undefined,
+const toWebSocketUrl = (path: string) => {
+  const url = new URL(API_BASE_URL, window.location.href);
+  url.protocol = url.protocol === "https:" ? "wss:" : "ws:";
+  url.pathname = path;
+  url.search = "";
+  return url.toString();
+};
+
+/**
+ * One WebSocket per tab, shared by every channel subscription. The access token is sent
+ * as the first message rather than in the URL so it never ends up in access logs.
+ */
+class RealtimeSocket {
+  private socket: WebSocket | null = null;
+  private authenticated = false;
+  private reconnectDelay = 1000;
+  private reconnectTimer: ReturnType<typeof setTimeout> | null = null;
+  private readonly channels = new Map<string, Set<ChannelListener>>();
+
+  constructor(private readonly url: string) {
+    window.addEventListener("auth:tokens-changed", () => {
+      if (this.channels.size > 0 && !this.socket) {
+        this.connect();
+      }
+    });
+  }
+
+  subscribe(channelName: string, listener: ChannelListener) {
+    let listeners = this.channels.get(channelName);
+    if (!listeners) {
+      listeners = new Set();
+      this.channels.set(channelName, listeners);
+      if (this.authenticated) {
+        this.send({ type: "subscribe", channel: channelName });
+      }
+    }
+    listeners.add(listener);
+    if (!this.socket) {
+      this.connect();
+    }
+  }
+
+  unsubscribe(channelName: string, listener: ChannelListener) {
+    const listeners = this.channels.get(channelName);
+    if (!listeners) {
+      return;
+    }
+    listeners.delete(listener);
+    if (listeners.size > 0) {
+      return;
+    }
+    this.channels.delete(channelName);
+    if (this.authenticated) {
+      this.send({ type: "unsubscribe", channel: channelName });
+    }
+    if (this.channels.size === 0) {
+      this.disconnect();
+    }
+  }
+
+  private connect() {
+    const token = getToken();
+    if (!token) {
+      return;
+    }
+    if (this.reconnectTimer) {
+      clearTimeout(this.reconnectTimer);
+      this.reconnectTimer = null;
+    }
+
+    const socket = new WebSocket(this.url);
+    this.socket = socket;
+    socket.onopen = () => {
+      socket.send(JSON.stringify({ type: "auth", token }));
+    };
+    socket.onmessage = (message) => {
+      let data: { type?: string; channel?: string; event?: string; data?: unknown };
+      try {
+        data = JSON.parse(String(message.data));
+      } catch {
+        return;
+      }
+      if (data.type === "authenticated") {
+        this.authenticated = true;
+        this.reconnectDelay = 1000;
+        this.channels.forEach((_listeners, channelName) => {
+          this.send({ type: "subscribe", channel: channelName });
+        });
+      } else if (data.type === "event" && data.channel && data.event) {
+        this.channels.get(data.channel)?.forEach((listener) => listener(data.event as string, data.data));
+      }
+    };
+    socket.onclose = (event) => {
+      if (this.socket !== socket) {
+        return;
+      }
+      this.socket = null;
+      this.authenticated = false;
+      // A rejected token waits for the next "auth:tokens-changed" instead of retrying.
+      if (this.channels.size === 0 || event.code === CLOSE_UNAUTHORIZED) {
+        return;
+      }
+      this.reconnectTimer = setTimeout(() => this.connect(), this.reconnectDelay);
+      this.reconnectDelay = Math.min(this.reconnectDelay * 2, MAX_RECONNECT_DELAY_MS);
     };
   }
 
-  return createCampaignPingPusher(campaignId, onPing);
+  private disconnect() {
+    if (this.reconnectTimer) {
+      clearTimeout(this.reconnectTimer);
+      this.reconnectTimer = null;
+    }
+    const socket = this.socket;
+    this.socket = null;
+    this.authenticated = false;
+    socket?.close();
+  }
+
+  private send(payload: unknown) {
+    if (this.socket?.readyState === WebSocket.OPEN) {
+      this.socket.send(JSON.stringify(payload));
+    }
+  }
+}
+
+let realtimeSocket: RealtimeSocket | null = null;
+
+const subscribeWebSocket = <T>(
+  websocketPath: string,
+  channelName: string,
+  eventName: string,
+  handler: (data: T) => void
+): Subscription => {
+  if (!realtimeSocket) {
+    realtimeSocket = new RealtimeSocket(toWebSocketUrl(websocketPath));
+  }
+  const socket = realtimeSocket;
+  const listener: ChannelListener = (event, data) => {
+    if (event === eventName) {
+      handler(data as T);
+    }
+  };
+  socket.subscribe(channelName, listener);
+  return { close: () => socket.unsubscribe(channelName, listener) };
 };
 
-const createCampaignPingPusher = (
-  campaignId: number,
-  onPing?: (message: PingMessage) => void
-): PingSocket => {
+const subscribePusher = <T>(
+  channelName: string,
+  eventName: string,
+  handler: (data: T) => void
+): Subscription => {
   const token = getToken();
-  const channelName = `private-campaign-${campaignId}-pings`;
   const authEndpoint = PUSHER_AUTH_ENDPOINT || `${API_BASE_URL}/realtime/pusher/auth/`;
 
   const pusher = new Pusher(PUSHER_KEY as string, {
@@ -111,15 +260,85 @@ const createCampaignPingPusher = (
   });
 
   const channel = pusher.subscribe(channelName);
+  channel.bind(eventName, handler);
+
+  return {
+    close: () => {
+      channel.unbind(eventName, handler);
+      pusher.unsubscribe(channelName);
+      pusher.disconnect();
+    },
+  };
+};
+
+/**
+ * Drop events the outbox already delivered. Delivery is at least once, and every queued
+ * event carries its outbox row id as `event_id`.
+ */
+const dedupeEvents = <T>(handler: (data: T) => void) => {
+  const seen = new Set<number>();
+  return (data: T) => {
+    const eventId = (data as { event_id?: unknown } | null)?.event_id;
+    if (typeof eventId === "number") {
+      if (seen.has(eventId)) {
+        return;
+      }
+      seen.add(eventId);
+      if (seen.size > SEEN_EVENT_ID_LIMIT) {
+        seen.delete(seen.values().next().value as number);
+      }
+    }
+    handler(data);
+  };
+};
 
-  const handlePing = (data: PingMessage) => {
-    if (!data || data.type !== "ping") {
+/**
+ * Subscribe over the backend WebSocket when the server offers it, otherwise through Pusher.
+ */
+const subscribeChannel = <T>(
+  channelName: string,
+  eventName: string,
+  onData: (data: T) => void
+): Subscription => {
+  let closed = false;
+  let subscription: Subscription | null = null;
+  const handler = dedupeEvents(onData);
+
+  loadRealtimeConfig().then((config) => {
+    if (closed) {
       return;
     }
-    onPing?.(data);
+    if (config?.websocket_path) {
+      subscription = subscribeWebSocket(config.websocket_path, channelName, eventName, handler);
+    } else if (isPusherEnabled()) {
+      subscription = subscribePusher(channelName, eventName, handler);
+    } else if (typeof window !== "undefined") {
+      console.warn("No realtime transport is configured. Realtime features are disabled.");
+    }
+  });
+
+  return {
+    close: () => {
+      closed = true;
+      subscription?.close();
+    },
   };
+};
 
-  channel.bind("ping", handlePing);
+export const createCampaignPingSocket = (
+  campaignId: number,
+  onPing?: (message: PingMessage) => void
+): PingSocket => {
+  const subscription = subscribeChannel<PingMessage>(
+    `private-campaign-${campaignId}-pings`,
+    "ping",
+    (data) => {
+      if (!data || data.type !== "ping") {
+        return;
+      }
+      onPing?.(data);
+    }
+  );
 
   const sendPing = (payload?: unknown) => {
     apiRequest(`/campaigns/${campaignId}/pings/`, {
@@ -128,177 +347,54 @@ const createCampaignPingPusher = (
     }).catch(() => undefined);
   };
 
-  const close = () => {
-    channel.unbind("ping", handlePing);
-    pusher.unsubscribe(channelName);
-    pusher.disconnect();
-  };
-
-  return { socket: pusher, sendPing, close };
+  return { sendPing, close: subscription.close };
 };
 
 export const createUserNotificationSocket = (
   userId: number,
   onMessage?: (message: NotificationMessage) => void
-): NotificationSocket => {
-  if (!ensurePusher()) {
-    return {
-      socket: null,
-      close: () => undefined,
-    };
-  }
-
-  const token = getToken();
-  const channelName = `private-user-${userId}-notifications`;
-  const authEndpoint = PUSHER_AUTH_ENDPOINT || `${API_BASE_URL}/realtime/pusher/auth/`;
-
-  const pusher = new Pusher(PUSHER_KEY as string, {
-    cluster: PUSHER_CLUSTER as string,
-    channelAuthorization: {
-      transport: "ajax",
-      endpoint: authEndpoint,
-      headers: token ? { Authorization: `Bearer ${token}` } : undefined,
-    },
-  });
-
-  const channel = pusher.subscribe(channelName);
-  const handleNotification = (data: NotificationMessage) => {
-    if (!data || !data.type) {
-      return;
+): NotificationSocket =>
+  subscribeChannel<NotificationMessage>(
+    `private-user-${userId}-notifications`,
+    "notification",
+    (data) => {
+      if (!data || !data.type) {
+        return;
+      }
+      onMessage?.(data);
     }
-    onMessage?.(data);
-  };
-  channel.bind("notification", handleNotification);
-
-  const close = () => {
-    channel.unbind("notification", handleNotification);
-    pusher.unsubscribe(channelName);
-    pusher.disconnect();
-  };
-
-  return { socket: pusher, close };
-};
+  );
 
 export const createTradeSessionSocket = (
   tradeRequestId: string,
   onEvent?: (message: TradeEventMessage) => void
-): TradeSessionSocket => {
-  if (!ensurePusher()) {
-    return {
-      socket: null,
-      close: () => undefined,
-    };
-  }
-
-  const token = getToken();
-  const channelName = `private-trade-${tradeRequestId}`;
-  const authEndpoint = PUSHER_AUTH_ENDPOINT || `${API_BASE_URL}/realtime/pusher/auth/`;
-
-  const pusher = new Pusher(PUSHER_KEY as string, {
-    cluster: PUSHER_CLUSTER as string,
-    channelAuthorization: {
-      transport: "ajax",
-      endpoint: authEndpoint,
-      headers: token ? { Authorization: `Bearer ${token}` } : undefined,
-    },
-  });
-
-  const channel = pusher.subscribe(channelName);
-  const handleEvent = (data: TradeEventMessage) => {
+): TradeSessionSocket =>
+  subscribeChannel<TradeEventMessage>(`private-trade-${tradeRequestId}`, "trade.event", (data) => {
     if (!data || !data.type) {
       return;
     }
     onEvent?.(data);
-  };
-  channel.bind("trade.event", handleEvent);
-
-  const close = () => {
-    channel.unbind("trade.event", handleEvent);
-    pusher.unsubscribe(channelName);
-    pusher.disconnect();
-  };
-
-  return { socket: pusher, close };
-};
+  });
 
 export const createBattleSessionSocket = (
   battleId: number,
   onEvent?: (message: BattleEventMessage) => void
-): BattleSessionSocket => {
-  if (!ensurePusher()) {
-    return {
-      socket: null,
-      close: () => undefined,
-    };
-  }
-
-  const token = getToken();
-  const channelName = `private-battle-${battleId}`;
-  const authEndpoint = PUSHER_AUTH_ENDPOINT || `${API_BASE_URL}/realtime/pusher/auth/`;
-
-  const pusher = new Pusher(PUSHER_KEY as string, {
-    cluster: PUSHER_CLUSTER as string,
-    channelAuthorization: {
-      transport: "ajax",
-      endpoint: authEndpoint,
-      headers: token ? { Authorization: `Bearer ${token}` } : undefined,
-    },
-  });
-
-  const channel = pusher.subscribe(channelName);
-  const handleEvent = (data: BattleEventMessage) => {
+): BattleSessionSocket =>
+  subscribeChannel<BattleEventMessage>(`private-battle-${battleId}`, "battle.event", (data) => {
     if (!data || !data.type) {
       return;
     }
     onEvent?.(data);
-  };
-  channel.bind("battle.event", handleEvent);
-
-  const close = () => {
-    channel.unbind("battle.event", handleEvent);
-    pusher.unsubscribe(channelName);
-    pusher.disconnect();
-  };
-
-  return { socket: pusher, close };
-};
+  });
 
 export const createCampaignChatSocket = (
   campaignId: number,
   onMessage?: (message: ChatMessage) => void
-): CampaignChatSocket => {
-  if (!ensurePusher()) {
-    return { socket: null, close: () => undefined };
-  }
-
-  const token = getToken();
-  const channelName = `private-campaign-${campaignId}-chat`;
-  const authEndpoint = PUSHER_AUTH_ENDPOINT || `${API_BASE_URL}/realtime/pusher/auth/`;
-
-  const pusher = new Pusher(PUSHER_KEY as string, {
-    cluster: PUSHER_CLUSTER as string,
-    channelAuthorization: {
-      transport: "ajax",
-      endpoint: authEndpoint,
-      headers: token ? { Authorization: `Bearer ${token}` } : undefined,
-    },
-  });
-
-  const channel = pusher.subscribe(channelName);
-  const handleMessage = (data: ChatMessage) => {
+): CampaignChatSocket =>
+  subscribeChannel<ChatMessage>(`private-campaign-${campaignId}-chat`, "chat.message", (data) => {
     if (!data || !data.id) return;
     onMessage?.(data);
-  };
-  channel.bind("chat.message", handleMessage);
-
-  const close = () => {
-    channel.unbind("chat.message", handleMessage);
-    pusher.unsubscribe(channelName);
-    pusher.disconnect();
-  };
-
-  return { socket: pusher, close };
-};
+  });
 
 export type {
   PingMessage,